@@ -0,0 +1,134 @@
+# Benchmarks/bench_memory.py
+"""
+Memory benchmark for bulk-loaded rows: DictCursor dicts vs Panels/records.py slotted rows.
+
+Builds synthetic residents / requests / staff_activity rows (Panels/synthetic_data.py)
+and measures, with tracemalloc, what holding them costs in each representation. The
+dict side copies every string the way the driver decodes each value into a new object;
+the slotted side goes through records.rows_from_cursor, interning included.
+
+    python -m Benchmarks.bench_memory
+    python -m Benchmarks.bench_memory --rows 1000000 --output Benchmarks/results/memory.json
+
+No database is needed.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import chain
+
+from Panels import synthetic_data
+from Panels.records import ActivityEntry, Request, Resident, rows_from_cursor
+from Benchmarks.bench_queries import RESULTS_DIR, git_commit
+
+ROW_CLASSES = {
+    "residents": Resident,
+    "requests": Request,
+    "staff_activity": ActivityEntry,
+}
+
+
+class _ResultCursor:
+    """The slice of the DB-API cursor interface rows_from_cursor reads."""
+
+    def __init__(self, columns, rows):
+        self.description = [(name,) + (None,) * 6 for name in columns]
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+def _as_fetched(value):
+    # The driver decodes every column into a fresh str; generated rows share the pool's copy
+    return value.encode().decode() if value.__class__ is str else value
+
+
+def table_rows(table, rows, seed, anchor):
+    """``(columns, [tuple])`` for ``rows`` rows of ``table``, ids included."""
+    counts = synthetic_data.dataset_counts(rows)
+    generated = chain.from_iterable(
+        synthetic_data.generate_chunk(table, chunk, row_count, counts, seed, anchor)
+        for _, chunk, _, row_count in synthetic_data.table_chunks(counts, [table])
+    )
+    columns = ("id",) + synthetic_data.TABLE_COLUMNS[table]
+    return columns, [(i,) + tuple(_as_fetched(v) for v in row) for i, row in enumerate(generated, 1)]
+
+
+def measure(build):
+    """``(result, bytes_held, ms)`` for one call of ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = (time.perf_counter() - started) * 1000
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held, elapsed
+
+
+def bench_table(table, rows, seed, anchor):
+    columns, fetched = table_rows(table, rows, seed, anchor)
+
+    def as_dicts():
+        return [dict(zip(columns, (_as_fetched(v) for v in values))) for values in fetched]
+
+    def as_slots():
+        copies = [tuple(_as_fetched(v) for v in values) for values in fetched]
+        return rows_from_cursor(_ResultCursor(columns, copies), ROW_CLASSES[table])
+
+    dicts, dict_bytes, dict_ms = measure(as_dicts)
+    del dicts
+    slots, slot_bytes, slot_ms = measure(as_slots)
+    del slots
+
+    return {
+        "rows": len(fetched),
+        "dict_bytes": dict_bytes,
+        "slot_bytes": slot_bytes,
+        "dict_bytes_per_row": round(dict_bytes / len(fetched), 1),
+        "slot_bytes_per_row": round(slot_bytes / len(fetched), 1),
+        "saving": round(1 - slot_bytes / dict_bytes, 3),
+        "dict_ms": round(dict_ms, 1),
+        "slot_ms": round(slot_ms, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare memory of dict rows vs slotted rows")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tables", nargs="*", default=list(ROW_CLASSES), choices=list(ROW_CLASSES))
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    anchor = synthetic_data.default_anchor()
+    results = {}
+    print(f"{'table':<16}{'rows':>10}{'dict B/row':>12}{'slot B/row':>12}{'saving':>9}{'dict ms':>10}{'slot ms':>10}")
+    for table in args.tables:
+        r = results[table] = bench_table(table, args.rows, args.seed, anchor)
+        print(f"{table:<16}{r['rows']:>10,}{r['dict_bytes_per_row']:>12}{r['slot_bytes_per_row']:>12}"
+              f"{r['saving']:>9.0%}{r['dict_ms']:>10}{r['slot_ms']:>10}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)) or RESULTS_DIR, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_commit(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "rows": args.rows,
+                "seed": args.seed,
+                "tables": results,
+            }, f, indent=2)
+        print(f"📦 Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
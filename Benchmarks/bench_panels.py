@@ -0,0 +1,214 @@
+# Benchmarks/bench_panels.py
+"""
+Offscreen Qt benchmark for panel construction, table population and chart drawing.
+
+Loads the deterministic synthetic dataset into a scratch MariaDB database (same loader
+as bench_queries), then runs every panel in its own subprocess under
+QT_QPA_PLATFORM=offscreen with BRMS_DATABASE pointing at that database, so peak RSS is
+per panel. For each panel it reports:
+
+  • construct_ms / reload_ms   - constructor and median reload (load_* / refresh_*) time
+  • rows / rows_per_sec        - table rows populated per second of reload
+  • polish_ms                  - ensurePolished() over the panel and every child widget
+  • paint_ms                   - one full offscreen grab() of the panel
+  • chart_ms / charts          - FigureCanvas.draw() over every chart in the panel
+  • qt_objects / qt_widgets    - QObject children of the panel, QApplication.allWidgets()
+  • leaked_objects             - QObject growth across repeated reloads
+  • peak_rss_kb                - peak resident set size of the worker process
+  • stylesheet                 - app-wide (window) stylesheet size and build/install time (Panels/styles.py)
+
+    python -m Benchmarks.bench_panels --size 1k
+    python -m Benchmarks.bench_panels --size 1k --panels AdminRequests StaffInfographics
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from Panels import synthetic_data
+from Benchmarks.bench_queries import MySQLBackend, RESULTS_DIR, git_commit, load_dataset
+
+
+def _widen_history(panel):
+    """Activity histories default to the last 7 days; benchmark the whole table instead."""
+    from PyQt6.QtCore import QDate
+    panel.date_from.blockSignals(True)
+    panel.date_from.setDate(QDate(2000, 1, 1))
+    panel.date_from.blockSignals(False)
+
+
+# name -> (module, class, constructor args, reload method, table attribute, prepare hook)
+PANELS = {
+    "AdminRequests": ("Panels.admin_requests", "AdminRequests", (1,), "load_requests", "table", None),
+    "AdminResidents": ("Panels.admin_residents", "AdminResidents", (1,), "load_residents", "table", None),
+    "StaffRequests": ("Panels.staff_requests", "StaffRequests", (1,), "load_requests", "table", None),
+    "StaffResidentProfiles": ("Panels.staff_resident_profiles", "StaffResidentProfiles", (1,),
+                              "load_residents", "table", None),
+    "StaffActivityHistory": ("Panels.admin_StaffActivityHistory", "StaffActivityHistory", (1,),
+                             "load_activities", "table", _widen_history),
+    "AdminActivityHistory": ("Panels.admin_AdminActivityHistory", "AdminActivityHistory", (1,),
+                             "load_activities", "table", _widen_history),
+    "StaffInfographics": ("Panels.staff_infographics", "StaffInfographics", (1,), "refresh_data", None, None),
+    "StaffResidentDemographics": ("Panels.staff_resident_demographics", "StaffResidentDemographics", (1,),
+                                  "update_charts", None, None),
+    "AdminReports": ("Panels.admin_reports", "AdminReports", (), "refresh_data", None, None),
+}
+
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:  # Windows has no resource module
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+# -----------------------------
+# Worker (one panel per process)
+# -----------------------------
+def run_worker(name, repeat):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QEvent, QObject
+    from PyQt6.QtWidgets import QApplication, QWidget
+    from Panels import styles
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    styles.install_app_stylesheet(app)  # as login.py does at startup, outside construct_ms
+
+    def settle():
+        app.processEvents()
+        app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+    module_name, class_name, ctor_args, reload_name, table_attr, prepare = PANELS[name]
+    panel_class = getattr(importlib.import_module(module_name), class_name)
+
+    started = time.perf_counter()
+    panel = panel_class(*ctor_args)
+    settle()
+    construct_ms = (time.perf_counter() - started) * 1000
+
+    if prepare:
+        prepare(panel)
+
+    reload = getattr(panel, reload_name)
+    reload_runs = []
+    objects_after_first = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        reload()
+        settle()
+        reload_runs.append((time.perf_counter() - started) * 1000)
+        if objects_after_first is None:
+            objects_after_first = len(panel.findChildren(QObject))
+
+    started = time.perf_counter()
+    for widget in [panel] + panel.findChildren(QWidget):
+        widget.ensurePolished()
+    polish_ms = (time.perf_counter() - started) * 1000
+
+    panel.resize(1400, 900)
+    started = time.perf_counter()
+    panel.grab()
+    paint_ms = (time.perf_counter() - started) * 1000
+
+    canvases = [w for w in panel.findChildren(QWidget) if hasattr(w, "figure") and hasattr(w, "draw")]
+    started = time.perf_counter()
+    for canvas in canvases:
+        canvas.draw()
+    chart_ms = (time.perf_counter() - started) * 1000
+
+    rows = getattr(panel, table_attr).rowCount() if table_attr else None
+    reload_ms = statistics.median(reload_runs)
+    qt_objects = len(panel.findChildren(QObject))
+    return {
+        "construct_ms": round(construct_ms, 2),
+        "reload_ms": round(reload_ms, 2),
+        "reload_runs_ms": [round(r, 2) for r in reload_runs],
+        "rows": rows,
+        "rows_per_sec": round(rows / (reload_ms / 1000), 1) if rows and reload_ms else None,
+        "polish_ms": round(polish_ms, 2),
+        "paint_ms": round(paint_ms, 2),
+        "charts": len(canvases),
+        "chart_ms": round(chart_ms, 2),
+        "qt_objects": qt_objects,
+        "qt_widgets": len(app.allWidgets()),
+        "leaked_objects": qt_objects - objects_after_first,
+        "peak_rss_kb": peak_rss_kb(),
+        "stylesheet": dict(styles.stats),
+    }
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def run_panel_subprocess(name, database, repeat):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", BRMS_DATABASE=database)
+    proc = subprocess.run(
+        [sys.executable, "-m", "Benchmarks.bench_panels", "--worker", name, "--repeat", str(repeat)],
+        env=env, capture_output=True, text=True,
+    )
+    result_lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not result_lines:
+        return {"error": (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["no output"]}
+    return json.loads(result_lines[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offscreen Qt benchmark for Panels/*")
+    parser.add_argument("--size", choices=list(synthetic_data.SIZES), default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="reloads per panel")
+    parser.add_argument("--database", default="brms_bench", help="scratch MariaDB database name")
+    parser.add_argument("--panels", nargs="*", choices=list(PANELS), help="subset of panels to run")
+    parser.add_argument("--output", help="JSON results path (default: Benchmarks/results/...)")
+    parser.add_argument("--worker", choices=list(PANELS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.repeat)))
+        return 0
+
+    rows = synthetic_data.SIZES[args.size]
+    backend = MySQLBackend(args.database)
+    print(f"📦 Dataset: {rows:,} rows/table, seed {args.seed}, database {args.database}")
+    load_dataset(backend, rows, args.seed)
+    backend.close()
+
+    results = {}
+    for name in args.panels or list(PANELS):
+        results[name] = entry = run_panel_subprocess(name, args.database, args.repeat)
+        if "error" in entry:
+            print(f"  ❌ {name:<26} {entry['error'][0]}")
+            continue
+        rate = f"{entry['rows_per_sec']:>10,.0f} rows/s" if entry["rows_per_sec"] else " " * 17
+        print(f"  {name:<28} reload {entry['reload_ms']:>9.1f} ms  {rate}  polish {entry['polish_ms']:>7.1f} ms"
+              f"  charts {entry['chart_ms']:>7.1f} ms"
+              f"  objects {entry['qt_objects']:>7,}  rss {entry['peak_rss_kb'] or 0:>9,} KB")
+
+    commit = git_commit()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"panels_{args.size}_{commit}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "size": args.size,
+            "rows": rows,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "panels": results,
+        }, f, indent=2)
+    print(f"✅ Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
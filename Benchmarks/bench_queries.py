@@ -0,0 +1,392 @@
+# Benchmarks/bench_queries.py
+"""
+Database query benchmark for the Panels/* SQL.
+
+Builds a deterministic synthetic dataset (Panels/synthetic_data.py) in either a SQLite
+stand-in or a scratch MariaDB database with the schema of every Migrations/*.sql file,
+times every statement in Benchmarks/queries.py and writes the timings as JSON so two
+commits can be compared.
+
+    python -m Benchmarks.bench_queries --size 1k
+    python -m Benchmarks.bench_queries --backend mysql --database brms_bench --size 100k
+    python -m Benchmarks.bench_queries --size 100k --compare Benchmarks/results/old.json
+
+The MariaDB backend never touches brms_db: it refuses to run against it.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+from Panels import synthetic_data
+from Benchmarks.queries import QUERIES
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, "Migrations")
+DATA_DIR = os.path.join(BASE_DIR, "Benchmarks", ".data")
+RESULTS_DIR = os.path.join(BASE_DIR, "Benchmarks", "results")
+
+INSERT_BATCH = 5_000
+
+# Tables created by Migrations/001_baseline_schema.sql
+BASELINE_TABLES = {"admins", "staff", "residents", "requests", "staff_activity", "admin_activity"}
+
+
+# -----------------------------
+# SQL dialect helpers
+# -----------------------------
+def split_statements(sql_text):
+    """Split a .sql file into statements, dropping ``--`` comment lines."""
+    lines = [line for line in sql_text.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def schema_statements():
+    """Every statement of Migrations/NNN_*.sql in order, as ``(version, statement)``."""
+    statements = []
+    for filename in sorted(f for f in os.listdir(MIGRATIONS_DIR) if re.match(r"^\d{3}_\w+\.sql$", f)):
+        with open(os.path.join(MIGRATIONS_DIR, filename), "r", encoding="utf-8") as f:
+            statements.extend((int(filename[:3]), stmt) for stmt in split_statements(f.read()))
+    return statements
+
+
+def _clauses(body):
+    """Split an ALTER TABLE body on the commas outside parentheses."""
+    clauses, depth, start = [], 0, 0
+    for i, char in enumerate(body):
+        depth += (char == "(") - (char == ")")
+        if char == "," and depth == 0:
+            clauses.append(body[start:i].strip())
+            start = i + 1
+    clauses.append(body[start:].strip())
+    return clauses
+
+
+def ddl_to_sqlite(version, statement):
+    """
+    SQLite statements for one migration statement. The baseline tables are created as
+    they are; later migrations only contribute the columns and indexes they add to
+    those tables (side tables, backfills and partitioning do not matter to the queries).
+    """
+    if version == 1:
+        statement = re.sub(r"\bINT AUTO_INCREMENT PRIMARY KEY\b", "INTEGER PRIMARY KEY AUTOINCREMENT", statement)
+        return [re.sub(r"\)\s*ENGINE=.*$", ")", statement, flags=re.DOTALL)]
+
+    alter = re.match(r"ALTER TABLE (\w+)\s+(.*)$", statement, flags=re.DOTALL)
+    if not alter or alter.group(1) not in BASELINE_TABLES:
+        return []
+    table, translated = alter.group(1), []
+    for clause in _clauses(alter.group(2)):
+        column = re.match(r"ADD COLUMN (?:IF NOT EXISTS )?(.*?)(?:\s+AFTER \w+)?$", clause, flags=re.DOTALL)
+        key = re.match(r"ADD KEY (?:IF NOT EXISTS )?(\w+)\s*(\(.*\))$", clause, flags=re.DOTALL)
+        drop = re.match(r"DROP COLUMN (?:IF EXISTS )?(\w+)$", clause)
+        if column:
+            translated.append(f"ALTER TABLE {table} ADD COLUMN {column.group(1)}")
+        elif key:
+            translated.append(f"CREATE INDEX IF NOT EXISTS {key.group(1)} ON {table} {key.group(2)}")
+        elif drop:
+            translated.append(f"ALTER TABLE {table} DROP COLUMN {drop.group(1)}")
+    return translated
+
+
+def query_to_sqlite(sql, has_params):
+    """Translate the MariaDB-only functions the panels use into SQLite equivalents."""
+    sql = re.sub(r"DATE_FORMAT\(\s*([\w.]+)\s*,\s*'([^']*)'\s*\)", r"strftime('\2', \1)", sql)
+    sql = re.sub(r"DATE_SUB\(\s*NOW\(\)\s*,\s*INTERVAL\s+(\d+)\s+DAY\s*\)",
+                 r"datetime('now', 'localtime', '-\1 days')", sql)
+    sql = re.sub(r"TIMESTAMPDIFF\(YEAR,\s*([\w.]+),\s*CURDATE\(\)\)",
+                 r"(CAST(strftime('%Y', 'now', 'localtime') AS INTEGER) - CAST(strftime('%Y', \1) AS INTEGER)"
+                 r" - (strftime('%m-%d', 'now', 'localtime') < strftime('%m-%d', \1)))", sql)
+    sql = re.sub(r"CURDATE\(\)\s*\+\s*INTERVAL\s+(\d+)\s+DAY", r"date('now', 'localtime', '+\1 days')", sql)
+    sql = sql.replace("CURDATE()", "date('now', 'localtime')")
+    sql = sql.replace("NOW()", "datetime('now', 'localtime')")
+    if "UNION" in sql and "ORDER BY" in sql:
+        # SQLite only sorts a compound SELECT by bare result names; sort the union as a subquery
+        split_at = sql.rfind("ORDER BY")
+        sql = f"SELECT * FROM ({sql[:split_at]}) {sql[split_at:]}"
+    if has_params:
+        sql = sql.replace("%s", "?").replace("%%", "%")
+    return sql
+
+
+def _sqlite_value(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class SQLiteBackend:
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+
+    def create_schema(self, statements):
+        for version, stmt in statements:
+            for translated in ddl_to_sqlite(version, stmt):
+                self.conn.execute(translated)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS bench_meta (meta_key VARCHAR(50) PRIMARY KEY, meta_value TEXT)")
+        self.conn.commit()
+
+    def insert_rows(self, table, columns, rows):
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        while True:
+            batch = [tuple(_sqlite_value(v) for v in row) for row in islice(rows, INSERT_BATCH)]
+            if not batch:
+                break
+            self.conn.executemany(sql, batch)
+        self.conn.commit()
+
+    def execute(self, sql, params):
+        cursor = self.conn.execute(query_to_sqlite(sql, params is not None),
+                                   tuple(_sqlite_value(v) for v in params or ()))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def close(self):
+        self.conn.close()
+
+
+class MySQLBackend:
+    name = "mysql"
+
+    def __init__(self, database):
+        from Panels.db import get_connection
+
+        if database == "brms_db":
+            raise SystemExit("❌ Refusing to benchmark against the live brms_db database.")
+
+        server = get_connection(database=None)
+        cursor = server.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+        cursor.close()
+        server.close()
+
+        self.database = database
+        self.conn = get_connection(database=database)
+
+    def create_schema(self, statements):
+        cursor = self.conn.cursor()
+        for _, stmt in statements:
+            cursor.execute(stmt)
+        cursor.execute("CREATE TABLE IF NOT EXISTS bench_meta (meta_key VARCHAR(50) PRIMARY KEY, meta_value TEXT)")
+        self.conn.commit()
+        cursor.close()
+
+    def insert_rows(self, table, columns, rows):
+        placeholders = ", ".join("%s" for _ in columns)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        cursor = self.conn.cursor()
+        while True:
+            batch = list(islice(rows, INSERT_BATCH))
+            if not batch:
+                break
+            cursor.executemany(sql, batch)  # pymysql folds this into multi-row INSERTs
+            self.conn.commit()
+        cursor.close()
+
+    def execute(self, sql, params):
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def close(self):
+        self.conn.close()
+
+
+# -----------------------------
+# Dataset
+# -----------------------------
+def read_meta(backend):
+    try:
+        rows = backend.execute("SELECT meta_key, meta_value FROM bench_meta", None)
+    except Exception:
+        return {}
+    return {(r["meta_key"] if isinstance(r, dict) else r[0]): (r["meta_value"] if isinstance(r, dict) else r[1])
+            for r in rows}
+
+
+def load_dataset(backend, rows, seed):
+    """Populate the backend unless it already holds this exact (rows, seed) dataset."""
+    wanted = {"rows": str(rows), "seed": str(seed)}
+    meta = read_meta(backend)
+    if all(meta.get(k) == v for k, v in wanted.items()):
+        print(f"♻️  Reusing existing dataset ({rows:,} rows, seed {seed}, built {meta.get('anchor')})")
+        return datetime.strptime(meta["anchor"], "%Y-%m-%d %H:%M:%S")
+    if meta:
+        raise SystemExit("❌ Target already holds a different dataset; use a fresh --db-path / --database.")
+
+    backend.create_schema(schema_statements())
+
+    anchor = synthetic_data.default_anchor()
+    for table, columns, generator in synthetic_data.generate_dataset(rows, seed=seed, anchor=anchor):
+        started = time.perf_counter()
+        backend.insert_rows(table, columns, generator)
+        print(f"  • {table:<15} loaded in {time.perf_counter() - started:6.1f}s")
+
+    meta_rows = [("rows", str(rows)), ("seed", str(seed)), ("anchor", anchor.strftime("%Y-%m-%d %H:%M:%S"))]
+    backend.insert_rows("bench_meta", ("meta_key", "meta_value"), iter(meta_rows))
+    return anchor
+
+
+def build_context(backend, rows, anchor):
+    """Parameter values shared by every query run, picked deterministically from the dataset."""
+    counts = synthetic_data.dataset_counts(rows)
+    resident_id = max(1, counts["residents"] // 2)
+    resident = backend.execute("SELECT name, contact_number FROM residents WHERE id = %s", (resident_id,))[0]
+    if isinstance(resident, dict):
+        resident = (resident["name"], resident["contact_number"])
+    today = anchor - timedelta(days=1)
+    from Panels.dedup import name_key
+
+    return {
+        "staff_id": 1,
+        "staff_username": "staff_00001",
+        "resident_id": resident_id,
+        "resident_name": resident[0],
+        "resident_name_key": name_key(resident[0]),
+        "resident_contact": resident[1],
+        "request_id": max(1, counts["requests"] // 2),
+        "search": "Santos",
+        "date_from": (today - timedelta(days=7)).strftime("%Y-%m-%d"),
+        "date_to": today.strftime("%Y-%m-%d"),
+        "date_end": (today + timedelta(days=1)).strftime("%Y-%m-%d"),
+        "serial_year": today.year,
+    }
+
+
+# -----------------------------
+# Timing
+# -----------------------------
+def time_queries(backend, context, repeat, only=None):
+    results = {}
+    for query in QUERIES:
+        if only and not any(pattern in query.name for pattern in only):
+            continue
+        params = query.params(context)
+        backend.execute(query.sql, params)  # warm-up (caches, plan)
+        runs = []
+        row_count = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            row_count = len(backend.execute(query.sql, params))
+            runs.append((time.perf_counter() - started) * 1000)
+        results[query.name] = {
+            "source": query.source,
+            "rows": row_count,
+            "runs_ms": [round(r, 3) for r in runs],
+            "min_ms": round(min(runs), 3),
+            "median_ms": round(statistics.median(runs), 3),
+            "mean_ms": round(statistics.mean(runs), 3),
+        }
+        print(f"  {query.name:<40} {results[query.name]['median_ms']:>10.2f} ms  ({row_count:,} rows)")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def compare_results(old, new, threshold):
+    """Print median deltas against an earlier result file; return the names that regressed."""
+    regressions = []
+    print(f"\nComparison with {old.get('commit', '?')} (threshold ×{threshold}):")
+    for name, entry in new["queries"].items():
+        before = old.get("queries", {}).get(name)
+        if not before:
+            print(f"  {name:<40} (new)")
+            continue
+        ratio = entry["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = "⚠️ " if ratio > threshold else "  "
+        print(f"{flag}{name:<40} {before['median_ms']:>10.2f} → {entry['median_ms']:>10.2f} ms  (×{ratio:.2f})")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the SQL embedded in Panels/*")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--size", choices=list(synthetic_data.SIZES), default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query")
+    parser.add_argument("--db-path", help="SQLite file (default: Benchmarks/.data/brms_<size>_<seed>.sqlite3)")
+    parser.add_argument("--database", default="brms_bench", help="scratch MariaDB database name")
+    parser.add_argument("--only", nargs="*", help="only run queries whose name contains one of these")
+    parser.add_argument("--output", help="JSON results path (default: Benchmarks/results/...)")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="median ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    rows = synthetic_data.SIZES[args.size]
+    if args.backend == "sqlite":
+        path = args.db_path or os.path.join(DATA_DIR, f"brms_{args.size}_{args.seed}.sqlite3")
+        backend = SQLiteBackend(path)
+    else:
+        backend = MySQLBackend(args.database)
+
+    print(f"📦 Dataset: {rows:,} rows/table, seed {args.seed}, backend {backend.name}")
+    anchor = load_dataset(backend, rows, args.seed)
+    context = build_context(backend, rows, anchor)
+
+    print(f"⏱️  Timing queries × {args.repeat} runs")
+    timings = time_queries(backend, context, args.repeat, args.only)
+    backend.close()
+
+    commit = git_commit()
+    result = {
+        "commit": commit,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "backend": backend.name,
+        "size": args.size,
+        "rows": rows,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "queries": timings,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"db_{backend.name}_{args.size}_{commit}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare_results(json.load(f), result, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} query(ies) regressed beyond ×{args.threshold}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# Benchmarks/bench_snapshot.py
+"""
+Analytics benchmark: per-row Python over fetched dict rows vs the columnar
+ResidentSnapshot (Panels/resident_snapshot.py) the demographics panels share.
+
+Builds synthetic residents (Panels/synthetic_data.py), then times each aggregate both
+ways and checks they agree: age groups, a category's counts, gender x civil status,
+a filtered count (as a row mask and as facet bitmaps, Panels/facets.py) and the mean
+age. "build" is the one-off cost of the snapshot's arrays, paid on load and not again
+while change_log catch-ups keep it current.
+
+    python -m Benchmarks.bench_snapshot
+    python -m Benchmarks.bench_snapshot --rows 1000000 --output Benchmarks/results/snapshot.json
+
+No database is needed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+
+from Panels import synthetic_data
+from Panels.ages import age_on
+from Panels.facets import FacetIndex, popcount
+from Panels.reporting import AGE_GROUPS
+from Panels.resident_snapshot import CATEGORIES, ResidentSnapshot
+from Benchmarks.bench_memory import table_rows
+from Benchmarks.bench_queries import RESULTS_DIR, git_commit
+
+REPEAT = 5
+
+
+def timed(run, repeat=REPEAT):
+    """``(result, best ms)`` over ``repeat`` calls of ``run``."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def resident_dicts(rows, seed, anchor):
+    columns, fetched = table_rows("residents", rows, seed, anchor)
+    return [dict(zip(columns, values)) for values in fetched]
+
+
+# -----------------------------
+# Per-row Python (what the panels did with fetched rows)
+# -----------------------------
+def python_age_groups(residents, today):
+    counts = {label: 0 for label, _, _ in AGE_GROUPS}
+    for r in residents:
+        age = age_on(r["birth_date"], today)
+        if age is None:
+            continue
+        for label, low, high in AGE_GROUPS:
+            if age >= low and (high is None or age <= high):
+                counts[label] += 1
+                break
+    return counts
+
+
+def python_value_counts(residents, column):
+    values = [r[column] for r in residents if r.get(column)]
+    return {label: values.count(label) for label in set(values)}
+
+
+def python_crosstab(residents, rows, columns):
+    counts = {}
+    for r in residents:
+        if r.get(rows) and r.get(columns):
+            key = (r[rows], r[columns])
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def python_filtered_count(residents, today):
+    return sum(1 for r in residents if r.get("gender") == "Female"
+               and r["birth_date"] is not None and 18 <= age_on(r["birth_date"], today) <= 35)
+
+
+def python_mean_age(residents, today):
+    ages = [age_on(r["birth_date"], today) for r in residents if r["birth_date"] is not None]
+    return sum(ages) / len(ages) if ages else 0.0
+
+
+def bench(rows, seed, anchor):
+    residents = resident_dicts(rows, seed, anchor)
+    today = date.today()
+    snapshot_rows = [(r["id"], r["birth_date"]) + tuple(r[c] for c in CATEGORIES)
+                     + (r["residency_years"], r["created_at"]) for r in residents]
+    snapshot, build_ms = timed(lambda: ResidentSnapshot.from_rows(snapshot_rows), repeat=1)
+    snapshot.ages(today)  # what the first chart of a refresh pays; cached for the rest
+    facets = FacetIndex(snapshot)
+
+    def crosstab():
+        row_labels, col_labels, counts = snapshot.crosstab("gender", "civil_status")
+        return {(r, c): int(counts[i, j]) for i, r in enumerate(row_labels)
+                for j, c in enumerate(col_labels) if counts[i, j]}
+
+    cases = {
+        "age_groups": (lambda: python_age_groups(residents, today),
+                       lambda: snapshot.age_histogram(AGE_GROUPS, today=today)),
+        "education_counts": (lambda: python_value_counts(residents, "education_level"),
+                             lambda: {k: n for k, n in snapshot.value_counts("education_level").items() if n}),
+        "gender_x_civil_status": (lambda: python_crosstab(residents, "gender", "civil_status"), crosstab),
+        "female_18_35": (lambda: python_filtered_count(residents, today),
+                         lambda: snapshot.count(snapshot.filter(min_age=18, max_age=35, today=today,
+                                                                gender="Female"))),
+        "female_18_35_bitmaps": (lambda: python_filtered_count(residents, today),
+                                 lambda: popcount(facets.select({"gender": ["Female"], "age": ["18–35"]}))),
+        "mean_age": (lambda: round(python_mean_age(residents, today), 6),
+                     lambda: round(snapshot.mean_age(today=today), 6)),
+    }
+
+    results = {"rows": len(residents), "build_ms": round(build_ms, 1), "cases": {}}
+    for name, (python, vectorized) in cases.items():
+        expected, python_ms = timed(python)
+        actual, numpy_ms = timed(vectorized)
+        if expected != actual:
+            raise AssertionError(f"{name}: snapshot {actual!r} != per-row {expected!r}")
+        results["cases"][name] = {
+            "python_ms": round(python_ms, 2),
+            "numpy_ms": round(numpy_ms, 2),
+            "speedup": round(python_ms / numpy_ms, 1) if numpy_ms else None,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-row Python analytics with the columnar snapshot")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = bench(args.rows, args.seed, synthetic_data.default_anchor())
+    print(f"Snapshot of {results['rows']:,} residents built in {results['build_ms']} ms")
+    print(f"{'aggregate':<24}{'python ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for name, r in results["cases"].items():
+        print(f"{name:<24}{r['python_ms']:>12}{r['numpy_ms']:>12}{r['speedup']:>9}x")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)) or RESULTS_DIR, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_commit(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "seed": args.seed,
+                **results,
+            }, f, indent=2)
+        print(f"📦 Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# Benchmarks/explain_queries.py
+"""
+Index check for the Panels/* SQL.
+
+EXPLAINs every statement in Benchmarks/queries.py against the benchmark dataset and
+fails when one reads a whole table it is not expected to (``BenchQuery.scans``): a
+missing index, or a predicate no index can serve (``DATE(created_at) = CURDATE()``).
+
+    python -m Benchmarks.explain_queries --size 1k
+    python -m Benchmarks.explain_queries --backend mysql --database brms_bench --size 100k
+
+The schema is built from every Migrations/*.sql file, so this checks the indexes a
+fresh `python -m Panels.migrate` creates. MariaDB chooses plans from table statistics;
+a pass on the 1k dataset is not a pass on 100k, so check MariaDB at a realistic size.
+"""
+import argparse
+import os
+import re
+import sys
+
+from Panels import synthetic_data
+from Benchmarks.bench_queries import (
+    DATA_DIR, MySQLBackend, SQLiteBackend, _sqlite_value, build_context, load_dataset, query_to_sqlite
+)
+from Benchmarks.queries import QUERIES
+
+
+# -----------------------------
+# Plans
+# -----------------------------
+def mysql_plan(backend, sql, params):
+    """``[(table, access)]`` from MariaDB EXPLAIN; access is its join type (ALL = full scan)."""
+    rows = backend.execute("EXPLAIN " + sql, params)
+    return [(row["table"], row["type"]) for row in rows
+            if row["table"] and not row["table"].startswith("<")]  # <derivedN>, <unionN,M>
+
+
+def sqlite_plan(backend, sql, params):
+    """``[(table, access)]`` from SQLite EXPLAIN QUERY PLAN; a bare ``SCAN t`` is reported as ALL."""
+    rows = backend.conn.execute("EXPLAIN QUERY PLAN " + query_to_sqlite(sql, params is not None),
+                                tuple(_sqlite_value(v) for v in params or ())).fetchall()
+    details = [row[3] for row in rows]
+    derived = {m.group(1) for d in details for m in [re.match(r"(?:CO-ROUTINE|MATERIALIZE) (\w+)", d)] if m}
+    plan = []
+    for detail in details:
+        match = re.match(r"(SCAN|SEARCH) (\w+)(?: USING (.*))?$", detail)
+        if match and match.group(2) not in derived:
+            access = match.group(3) or "ALL" if match.group(1) == "SCAN" else "SEARCH"
+            plan.append((match.group(2), access))
+    return plan
+
+
+def check_queries(backend, context, only=None):
+    """EXPLAIN every registered query; returns the names that scan an unexpected table."""
+    explain = mysql_plan if backend.name == "mysql" else sqlite_plan
+    failures = []
+    for query in QUERIES:
+        if only and not any(pattern in query.name for pattern in only):
+            continue
+        plan = explain(backend, query.sql, query.params(context))
+        scanned = sorted({table for table, access in plan if access == "ALL"} - set(query.scans))
+        if scanned:
+            failures.append(query.name)
+            print(f"  ❌ {query.name:<40} full scan of {', '.join(scanned)}  ({query.source})")
+        else:
+            print(f"  ✅ {query.name:<40} {', '.join(f'{t}:{a}' for t, a in plan)}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN the SQL embedded in Panels/* and fail on full scans")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--size", choices=list(synthetic_data.SIZES), default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-path", help="SQLite file (default: Benchmarks/.data/brms_<size>_<seed>.sqlite3)")
+    parser.add_argument("--database", default="brms_bench", help="scratch MariaDB database name")
+    parser.add_argument("--only", nargs="*", help="only check queries whose name contains one of these")
+    args = parser.parse_args(argv)
+
+    rows = synthetic_data.SIZES[args.size]
+    if args.backend == "sqlite":
+        backend = SQLiteBackend(args.db_path or os.path.join(DATA_DIR, f"brms_{args.size}_{args.seed}.sqlite3"))
+    else:
+        backend = MySQLBackend(args.database)
+
+    print(f"📦 Dataset: {rows:,} rows/table, seed {args.seed}, backend {backend.name}")
+    anchor = load_dataset(backend, rows, args.seed)
+    context = build_context(backend, rows, anchor)
+
+    print("🔍 Explaining queries")
+    failures = check_queries(backend, context, args.only)
+    backend.close()
+
+    if failures:
+        print(f"❌ {len(failures)} query(ies) read a whole table; add the index they need in a migration")
+        return 1
+    print("✅ No unexpected full scans")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
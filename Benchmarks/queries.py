@@ -0,0 +1,331 @@
+# Benchmarks/queries.py
+"""
+Registry of the SQL statements embedded in Panels/*.
+
+Each entry mirrors one ``cursor.execute`` call site (same SQL, same parameter shape) so
+the benchmark measures exactly what the panels send. When a panel query changes, update
+its entry here; ``source`` points at the call site.
+
+``params`` is a function of the benchmark context (see ``bench_queries.build_context``)
+returning the parameter tuple, or ``None`` for statements executed without parameters.
+
+``scans`` names the tables (as EXPLAIN shows them: alias or table name) the statement
+reads in full by design: whole-table lists and exports, and LIKE '%...%' searches.
+``python -m Benchmarks.explain_queries`` fails on a full scan of any other table.
+"""
+from collections import namedtuple
+
+from Panels.ages import age_sql
+
+BenchQuery = namedtuple("BenchQuery", ["name", "source", "sql", "params", "scans"], defaults=((),))
+
+
+def _no_params(ctx):
+    return None
+
+
+def _like(text):
+    return f"%{text}%"
+
+
+REQUESTS_LIST_SQL = """
+    SELECT r.id, res.name AS resident_name, r.document_type, r.purpose,
+           r.request_date, r.status, r.completed_date, s.username AS handled_by
+    FROM requests r
+    JOIN residents res ON r.resident_id = res.id
+    LEFT JOIN staff s ON r.created_by = s.id
+"""
+
+REQUESTS_EXPORT_SQL = """
+    SELECT r.id, res.name AS resident, r.document_type, r.purpose,
+           r.request_date, r.status, r.completed_date, r.control_number, s.username AS handled_by
+    FROM requests r
+    JOIN residents res ON r.resident_id = res.id
+    LEFT JOIN staff s ON r.created_by = s.id
+    ORDER BY r.created_at DESC
+"""
+
+ADMIN_RESIDENTS_SQL = f"""
+    SELECT r.*, {age_sql("r")} AS age, s.username AS added_by
+    FROM residents r
+    LEFT JOIN staff s ON r.created_by = s.id
+    WHERE 1=1
+"""
+
+SNAPSHOT_SELECT = """
+    SELECT id, birth_date, gender, civil_status, education_level, employment_status, residency_years,
+           created_at
+    FROM residents
+"""
+
+TODAY = "created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY"
+
+RECENT_ACTIVITY_UNION_SQL = """
+    SELECT * FROM (
+        SELECT 'Staff' AS role, sa.action_type, sa.description, sa.created_at, s.username
+        FROM staff_activity sa
+        JOIN staff s ON sa.staff_id = s.id
+        ORDER BY sa.created_at DESC
+        LIMIT 5
+    ) recent_staff
+
+    UNION ALL
+
+    SELECT * FROM (
+        SELECT 'Admin' AS role, aa.action_type, aa.description, aa.created_at, a.username
+        FROM admin_activity aa
+        JOIN admins a ON aa.admin_id = a.id
+        ORDER BY aa.created_at DESC
+        LIMIT 5
+    ) recent_admin
+
+    ORDER BY created_at DESC
+    LIMIT 5
+"""
+
+DUPLICATE_CHECK_COLUMNS = f"SELECT id, name, {age_sql()} AS age, address, contact_number FROM residents"
+
+REQUESTS_PER_MONTH_SQL = """
+    SELECT DATE_FORMAT(request_date, '%Y-%m') AS month, COUNT(*) AS total
+    FROM requests
+    GROUP BY month ORDER BY month
+"""
+
+STAFF_ACTIVITY_HISTORY_SQL = """
+    SELECT sa.*, s.username
+    FROM staff_activity sa
+    LEFT JOIN staff s ON sa.staff_id = s.id
+    WHERE 1=1
+     AND sa.created_at >= %s AND sa.created_at < %s
+"""
+
+ADMIN_ACTIVITY_HISTORY_SQL = """
+    SELECT aa.*, a.username
+    FROM admin_activity aa
+    LEFT JOIN admins a ON aa.admin_id = a.id
+    WHERE 1=1
+     AND aa.created_at >= %s AND aa.created_at < %s
+"""
+
+QUERIES = [
+    # -----------------------------
+    # Login / accounts
+    # -----------------------------
+    BenchQuery("login.staff_by_username", "Panels/login.py:LoginPage.handle_login",
+               "SELECT * FROM staff WHERE username = %s",
+               lambda ctx: (ctx["staff_username"],)),
+    BenchQuery("worker_management.counts", "Panels/admin_worker_management.py:update_metrics",
+               "SELECT COUNT(*) as total FROM staff", _no_params),
+    BenchQuery("worker_management.staff_search", "Panels/admin_worker_management.py:load_users",
+               "SELECT id, username, email, 'Staff' as role, status FROM staff WHERE 1=1"
+               " AND (username LIKE %s OR email LIKE %s)",
+               lambda ctx: (_like("staff_00"), _like("staff_00")), scans=("staff",)),
+
+    # -----------------------------
+    # Dashboard metrics
+    # -----------------------------
+    BenchQuery("admin_dashboard.requests_today", "Panels/admin_dashboard.py:get_metrics",
+               f"SELECT COUNT(*) AS total FROM requests WHERE {TODAY}", _no_params),
+    BenchQuery("admin_dashboard.residents_today", "Panels/admin_dashboard.py:get_metrics",
+               f"SELECT COUNT(*) AS total FROM residents WHERE {TODAY}", _no_params),
+    BenchQuery("admin_dashboard.total_residents", "Panels/admin_dashboard.py:refresh_dashboard",
+               "SELECT COUNT(*) AS total FROM residents", _no_params),
+    BenchQuery("admin_dashboard.recent_activities", "Panels/admin_dashboard.py:get_recent_activities",
+               RECENT_ACTIVITY_UNION_SQL, _no_params),
+    BenchQuery("staff_dashboard.processed_today", "Panels/staff_dashboard.py:get_metrics",
+               """
+               SELECT COUNT(*) AS total
+               FROM staff_activity
+               WHERE staff_id=%s AND created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
+                 AND action_type LIKE '%%REQUEST%%'
+               """,
+               lambda ctx: (ctx["staff_id"],)),
+    BenchQuery("staff_dashboard.residents_added_today", "Panels/staff_dashboard.py:get_metrics",
+               """
+               SELECT COUNT(*) AS total
+               FROM staff_activity
+               WHERE staff_id=%s AND created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
+                 AND action_type='ADD_RESIDENT'
+               """,
+               lambda ctx: (ctx["staff_id"],)),
+    BenchQuery("staff_dashboard.recent_activities", "Panels/staff_dashboard.py:get_recent_activities",
+               """
+               SELECT action_type, description, created_at
+               FROM staff_activity
+               WHERE staff_id=%s
+               ORDER BY created_at DESC
+               LIMIT 5
+               """,
+               lambda ctx: (ctx["staff_id"],)),
+
+    # -----------------------------
+    # Residents
+    # -----------------------------
+    BenchQuery("admin_residents.list_all", "Panels/admin_residents.py:load_residents",
+               ADMIN_RESIDENTS_SQL + " ORDER BY r.created_at DESC", _no_params, scans=("r",)),
+    BenchQuery("admin_residents.search", "Panels/admin_residents.py:load_residents",
+               ADMIN_RESIDENTS_SQL + " AND (r.name LIKE %s OR r.address LIKE %s) ORDER BY r.created_at DESC",
+               lambda ctx: (_like(ctx["search"]), _like(ctx["search"])), scans=("r",)),
+    BenchQuery("admin_residents.by_staff", "Panels/admin_residents.py:load_residents",
+               ADMIN_RESIDENTS_SQL + " AND r.created_by = %s ORDER BY r.created_at DESC",
+               lambda ctx: (ctx["staff_id"],)),
+    BenchQuery("admin_residents.has_requests", "Panels/admin_residents.py:resident_has_requests",
+               "SELECT COUNT(*) as request_count FROM requests WHERE resident_id = %s",
+               lambda ctx: (ctx["resident_id"],)),
+    BenchQuery("staff_profiles.list_all", "Panels/staff_resident_profiles.py:load_residents",
+               f"SELECT *, {age_sql()} AS age FROM residents WHERE 1=1", _no_params, scans=("residents",)),
+    BenchQuery("staff_profiles.search", "Panels/staff_resident_profiles.py:load_residents",
+               f"SELECT *, {age_sql()} AS age FROM residents WHERE 1=1 AND (name LIKE %s OR address LIKE %s)",
+               lambda ctx: (_like(ctx["search"]), _like(ctx["search"])), scans=("residents",)),
+    BenchQuery("resident_dialog.duplicate_check", "Panels/dedup.py:find_matches",
+               f"""
+               {DUPLICATE_CHECK_COLUMNS} WHERE name_key = %s
+               UNION {DUPLICATE_CHECK_COLUMNS} WHERE contact_key = %s
+               UNION {DUPLICATE_CHECK_COLUMNS} WHERE name_key IS NULL AND name = %s
+               """,
+               lambda ctx: (ctx["resident_name_key"], ctx["resident_contact"][-10:], ctx["resident_name"])),
+    BenchQuery("resident_dialog.load", "Panels/staff_resident_dialog.py:load_resident_data",
+               "SELECT * FROM residents WHERE id=%s", lambda ctx: (ctx["resident_id"],)),
+    BenchQuery("request_dialog.residents_dropdown", "Panels/staff_request_dialog.py:load_residents",
+               "SELECT id, name FROM residents ORDER BY name ASC", _no_params),
+
+    # -----------------------------
+    # Requests
+    # -----------------------------
+    BenchQuery("admin_requests.list_all", "Panels/admin_requests.py:load_requests",
+               REQUESTS_LIST_SQL + " ORDER BY r.request_date DESC", _no_params, scans=("r", "res")),
+    BenchQuery("admin_requests.list_pending", "Panels/admin_requests.py:load_requests",
+               REQUESTS_LIST_SQL + " WHERE r.status=%s ORDER BY r.request_date DESC",
+               lambda ctx: ("Pending",)),
+    BenchQuery("admin_requests.completed_count", "Panels/admin_requests.py:update_metrics",
+               "SELECT COUNT(*) as total FROM requests WHERE status='Completed'", _no_params),
+    BenchQuery("admin_requests.export", "Panels/admin_requests.py:export_to_csv",
+               REQUESTS_EXPORT_SQL, _no_params, scans=("r", "res")),
+    BenchQuery("staff_requests.list", "Panels/staff_requests.py:load_requests",
+               """
+               SELECT r.id, res.name AS resident, r.document_type, r.purpose,
+                      r.request_date, r.status, r.completed_date
+               FROM requests r
+               JOIN residents res ON r.resident_id = res.id
+               ORDER BY r.created_at DESC
+               """,
+               _no_params, scans=("r", "res")),
+    BenchQuery("view_request.load", "Panels/staff_view_request.py:load_document",
+               """
+               SELECT r.id, res.name AS resident_name, res.address, res.photo_hash, r.document_type,
+                      r.purpose, r.request_date, r.status, r.completed_date, r.control_number
+               FROM requests r
+               JOIN residents res ON r.resident_id = res.id
+               WHERE r.id=%s
+               """,
+               lambda ctx: (ctx["request_id"],)),
+    BenchQuery("serials.issued", "Panels/serials.py:serial_gaps",
+               """
+               SELECT document_type, serial_value FROM requests
+               WHERE serial_year = %s AND serial_value IS NOT NULL
+               """,
+               lambda ctx: (ctx["serial_year"],)),
+
+    # -----------------------------
+    # Infographics / reports aggregates
+    # -----------------------------
+    BenchQuery("reports.total_requests", "Panels/admin_reports.py:refresh_data",
+               "SELECT COUNT(*) AS total FROM requests", _no_params),
+    BenchQuery("reports.requests_per_month", "Panels/admin_reports.py:refresh_data",
+               REQUESTS_PER_MONTH_SQL, _no_params),
+    BenchQuery("reports.document_types", "Panels/admin_reports.py:refresh_data",
+               "SELECT document_type, COUNT(*) AS total FROM requests GROUP BY document_type", _no_params),
+    BenchQuery("reports.activity_7_days", "Panels/admin_reports.py:refresh_data",
+               """
+               SELECT 'Staff' AS role, sa.action_type, COUNT(*) AS total
+               FROM staff_activity sa
+               WHERE sa.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+               GROUP BY sa.action_type
+               UNION ALL
+               SELECT 'Admin' AS role, aa.action_type, COUNT(*) AS total
+               FROM admin_activity aa
+               WHERE aa.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+               GROUP BY aa.action_type
+               ORDER BY total DESC
+               LIMIT 5
+               """,
+               _no_params),
+    BenchQuery("infographics.top_actions", "Panels/staff_infographics.py:refresh_data",
+               """
+               SELECT action_type, COUNT(*) AS total
+               FROM staff_activity
+               GROUP BY action_type
+               ORDER BY total DESC
+               LIMIT 5
+               """,
+               _no_params),
+
+    # -----------------------------
+    # Resident snapshot (demographics, infographics and report age groups)
+    # -----------------------------
+    BenchQuery("resident_snapshot.load", "Panels/resident_snapshot.py:ResidentSnapshot._load",
+               f"{SNAPSHOT_SELECT} ORDER BY id", _no_params, scans=("residents",)),
+    BenchQuery("resident_snapshot.changed", "Panels/resident_snapshot.py:ResidentSnapshot._catch_up",
+               f"{SNAPSHOT_SELECT} WHERE id IN (%s, %s) ORDER BY id",
+               lambda ctx: (ctx["resident_id"], ctx["resident_id"] + 1)),
+
+    # -----------------------------
+    # Staff productivity rollups
+    # -----------------------------
+    BenchQuery("productivity.completed", "Panels/productivity.py:_rollup_chunk",
+               """
+               SELECT created_by, DATE(completed_date) AS day, resident_id
+               FROM requests
+               WHERE completed_date >= %s AND completed_date < %s
+                 AND status = 'Completed' AND created_by IS NOT NULL
+               """,
+               lambda ctx: (ctx["date_from"], ctx["date_end"])),
+    BenchQuery("productivity.registered", "Panels/productivity.py:_rollup_chunk",
+               """
+               SELECT created_by, DATE(created_at) AS day, COUNT(*) AS total
+               FROM residents
+               WHERE created_at >= %s AND created_at < %s AND created_by IS NOT NULL
+               GROUP BY created_by, DATE(created_at)
+               """,
+               lambda ctx: (ctx["date_from"], ctx["date_end"])),
+    BenchQuery("productivity.activity", "Panels/productivity.py:_rollup_chunk",
+               """
+               SELECT staff_id, DATE(created_at) AS day, COUNT(*) AS total
+               FROM staff_activity
+               WHERE created_at >= %s AND created_at < %s AND staff_id IS NOT NULL
+               GROUP BY staff_id, DATE(created_at)
+               """,
+               lambda ctx: (ctx["date_from"], ctx["date_end"])),
+
+    # -----------------------------
+    # Activity history filters
+    # -----------------------------
+    BenchQuery("staff_history.action_types", "Panels/admin_StaffActivityHistory.py:load_filters",
+               "SELECT DISTINCT action_type FROM staff_activity ORDER BY action_type", _no_params),
+    BenchQuery("staff_history.last_7_days", "Panels/admin_StaffActivityHistory.py:load_activities",
+               STAFF_ACTIVITY_HISTORY_SQL + " ORDER BY sa.created_at DESC",
+               lambda ctx: (ctx["date_from"], ctx["date_end"])),
+    BenchQuery("staff_history.by_staff_and_type", "Panels/admin_StaffActivityHistory.py:load_activities",
+               STAFF_ACTIVITY_HISTORY_SQL + " AND sa.staff_id = %s AND sa.action_type = %s"
+               " ORDER BY sa.created_at DESC",
+               lambda ctx: (ctx["date_from"], ctx["date_end"], ctx["staff_id"], "ADD_REQUEST")),
+    BenchQuery("staff_history.search", "Panels/admin_StaffActivityHistory.py:load_activities",
+               STAFF_ACTIVITY_HISTORY_SQL
+               + " AND (s.username LIKE %s OR sa.description LIKE %s OR sa.action_type LIKE %s)"
+               " ORDER BY sa.created_at DESC",
+               lambda ctx: (ctx["date_from"], ctx["date_end"], _like("resident"), _like("resident"),
+                            _like("resident"))),
+    BenchQuery("admin_history.action_types", "Panels/admin_AdminActivityHistory.py:load_filters",
+               "SELECT DISTINCT action_type FROM admin_activity ORDER BY action_type", _no_params),
+    BenchQuery("admin_history.last_7_days", "Panels/admin_AdminActivityHistory.py:load_activities",
+               ADMIN_ACTIVITY_HISTORY_SQL + " ORDER BY aa.created_at DESC",
+               lambda ctx: (ctx["date_from"], ctx["date_end"])),
+    BenchQuery("staff_history.export", "Panels/admin_StaffActivityHistory.py:export_to_csv",
+               """
+               SELECT sa.created_at, s.username, sa.action_type, sa.description, sa.role, sa.ip_address
+               FROM staff_activity sa
+               LEFT JOIN staff s ON sa.staff_id = s.id
+               ORDER BY sa.created_at DESC
+               """,
+               _no_params, scans=("sa",)),
+]
@@ -0,0 +1,70 @@
+-- Migrations/001_baseline_schema.sql
+-- Baseline BRIMS schema, reconstructed from the columns the Panels/* modules read and write.
+-- Written in a plain MariaDB/MySQL subset so the benchmark SQLite stand-in can translate it.
+
+CREATE TABLE IF NOT EXISTS admins (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    password VARCHAR(255) NOT NULL,
+    email VARCHAR(100),
+    role VARCHAR(30) DEFAULT 'Admin',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS staff (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    password VARCHAR(255) NOT NULL,
+    email VARCHAR(100),
+    role VARCHAR(30) DEFAULT 'Staff',
+    status VARCHAR(20) DEFAULT 'active',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS residents (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(150) NOT NULL,
+    age INT,
+    gender VARCHAR(10),
+    address VARCHAR(255),
+    contact_number VARCHAR(30),
+    civil_status VARCHAR(30),
+    employment_status VARCHAR(50),
+    education_level VARCHAR(50),
+    residency_years INT DEFAULT 0,
+    status VARCHAR(20) DEFAULT 'Active',
+    created_by INT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS requests (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    resident_id INT NOT NULL,
+    document_type VARCHAR(100) NOT NULL,
+    purpose VARCHAR(255),
+    request_date DATETIME,
+    status VARCHAR(20) DEFAULT 'Pending',
+    staff_notes TEXT,
+    completed_date DATETIME,
+    created_by INT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS staff_activity (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    staff_id INT,
+    role VARCHAR(30) DEFAULT 'Staff',
+    action_type VARCHAR(50),
+    description TEXT,
+    ip_address VARCHAR(45),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS admin_activity (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    admin_id INT,
+    action_type VARCHAR(50),
+    description TEXT,
+    ip_address VARCHAR(45),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
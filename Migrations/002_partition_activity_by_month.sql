@@ -0,0 +1,34 @@
+-- Migrations/002_partition_activity_by_month.sql
+-- Range-partition both activity tables on created_at so old months can be archived with
+-- DROP PARTITION instead of row-by-row DELETEs, and date-filtered queries prune partitions.
+--
+-- MariaDB requires the partitioning column in every unique key, so the primary key
+-- becomes (id, created_at) and created_at becomes NOT NULL. Everything starts in the
+-- catch-all p_future partition; `python -m Panels.retention run` splits it into monthly
+-- pYYYYMM partitions and keeps a few months ahead of the current one.
+
+UPDATE staff_activity SET created_at = NOW() WHERE created_at IS NULL;
+
+ALTER TABLE staff_activity
+    MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, created_at),
+    ADD KEY idx_staff_activity_created_at (created_at);
+
+ALTER TABLE staff_activity
+    PARTITION BY RANGE (TO_DAYS(created_at)) (
+        PARTITION p_future VALUES LESS THAN MAXVALUE
+    );
+
+UPDATE admin_activity SET created_at = NOW() WHERE created_at IS NULL;
+
+ALTER TABLE admin_activity
+    MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, created_at),
+    ADD KEY idx_admin_activity_created_at (created_at);
+
+ALTER TABLE admin_activity
+    PARTITION BY RANGE (TO_DAYS(created_at)) (
+        PARTITION p_future VALUES LESS THAN MAXVALUE
+    );
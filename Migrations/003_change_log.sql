@@ -0,0 +1,16 @@
+-- Migrations/003_change_log.sql
+-- Change feed for desks running the app side by side. Every write to residents, requests,
+-- staff or admins appends (entity, entity_id, op) here in the same transaction
+-- (Panels/change_feed.record_change); each desk polls for seq > its last seen seq and
+-- patches only the rows that changed. origin identifies the writing desk so it can skip
+-- its own entries. Old entries are pruned by `python -m Panels.retention run`.
+
+CREATE TABLE IF NOT EXISTS change_log (
+    seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+    entity VARCHAR(20) NOT NULL,
+    entity_id INT NOT NULL,
+    op ENUM('insert', 'update', 'delete') NOT NULL,
+    origin VARCHAR(64) NOT NULL DEFAULT '',
+    changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_change_log_changed_at (changed_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
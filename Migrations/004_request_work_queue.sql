@@ -0,0 +1,10 @@
+-- Migrations/004_request_work_queue.sql
+-- Lease columns for the staff "Next request" work queue (Panels/work_queue.py).
+-- A desk claims the oldest unclaimed Pending request with SELECT ... FOR UPDATE SKIP LOCKED
+-- (MariaDB 10.6+) and holds it until claimed_until; an expired lease puts the request back
+-- in the queue. The index serves the queue's "status = 'Pending' ORDER BY request_date" scan.
+
+ALTER TABLE requests
+    ADD COLUMN IF NOT EXISTS claimed_by INT NULL,
+    ADD COLUMN IF NOT EXISTS claimed_until DATETIME NULL,
+    ADD KEY IF NOT EXISTS idx_requests_queue (status, request_date);
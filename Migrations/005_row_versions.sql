@@ -0,0 +1,12 @@
+-- Migrations/005_row_versions.sql
+-- Row versions for optimistic concurrency (Panels/conflict_dialog.py). The resident and
+-- request edit dialogs remember the version they loaded and save with
+-- "... WHERE id = ? AND version = ?", bumping it; if another desk saved in between, the
+-- UPDATE matches nothing and the user resolves the conflict instead of overwriting it.
+-- Every content write bumps version; work-queue lease bookkeeping does not.
+
+ALTER TABLE residents
+    ADD COLUMN IF NOT EXISTS version INT UNSIGNED NOT NULL DEFAULT 0;
+
+ALTER TABLE requests
+    ADD COLUMN IF NOT EXISTS version INT UNSIGNED NOT NULL DEFAULT 0;
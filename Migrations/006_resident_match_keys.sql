@@ -0,0 +1,39 @@
+-- Migrations/006_resident_match_keys.sql
+-- Blocking keys for fuzzy duplicate-resident detection (Panels/dedup.py). name_key is the
+-- Soundex of the normalized surname, without particles, plus the given name's initial
+-- ("Juan dela Cruz Jr.", "JUAN DELA CRUZ" and "Cruz, Juan" all become C620J);
+-- contact_key is the last 10 digits of the contact number. Only residents sharing a key
+-- are ever compared, so a check touches one small indexed block instead of the whole
+-- registry. name_key needs the Python normalization (Panels/dedup.py), so
+-- ResidentDialog writes it on save and `python -m Panels.cli dedup scan` fills it in for
+-- rows that do not have it yet (seeded or pre-existing residents); contact_key is simple
+-- enough to backfill here.
+--
+-- duplicate_candidates is the review queue the scan fills: one row per pair
+-- (resident_a < resident_b) scoring at least dedup.REVIEW_SCORE. Re-scans refresh the
+-- score of Pending pairs and leave reviewed ones alone.
+
+ALTER TABLE residents
+    ADD COLUMN IF NOT EXISTS name_key CHAR(5) NULL,
+    ADD COLUMN IF NOT EXISTS contact_key VARCHAR(10) NULL,
+    ADD KEY IF NOT EXISTS idx_residents_name_key (name_key),
+    ADD KEY IF NOT EXISTS idx_residents_contact_key (contact_key);
+
+UPDATE residents
+SET contact_key = RIGHT(REGEXP_REPLACE(contact_number, '[^0-9]', ''), 10)
+WHERE contact_key IS NULL
+  AND CHAR_LENGTH(REGEXP_REPLACE(contact_number, '[^0-9]', '')) >= 7;
+
+CREATE TABLE IF NOT EXISTS duplicate_candidates (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    resident_a INT NOT NULL,
+    resident_b INT NOT NULL,
+    score DECIMAL(4, 3) NOT NULL,
+    reasons VARCHAR(255) NOT NULL DEFAULT '',
+    status ENUM('Pending', 'Merged', 'Dismissed') NOT NULL DEFAULT 'Pending',
+    reviewed_by INT NULL,
+    reviewed_at DATETIME NULL,
+    found_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_duplicate_pair (resident_a, resident_b),
+    KEY idx_duplicate_queue (status, score)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,31 @@
+-- Migrations/007_address_index.sql
+-- Parsed address columns (Panels/addresses.py). residents.address stays the free text
+-- people typed; house_no / street / purok / sitio are parsed out of it and household_key
+-- joins them ("3|centro|mabini st|364"), so "residents in Purok 3" or "who lives at this
+-- address" is an index lookup instead of a LIKE scan. ResidentDialog fills them on save;
+-- `python -m Panels.cli address backfill` parses the rows that predate this migration.
+-- Zones ("Zone 2") are stored as puroks. Addresses without a purok use purok 0.
+--
+-- zone_counts holds residents and households per purok / sitio, recomputed from the
+-- covering index whenever change_log has moved on (addresses.zone_summary), so the
+-- demographics page reads a few dozen rows instead of grouping the registry.
+
+ALTER TABLE residents
+    ADD COLUMN IF NOT EXISTS house_no VARCHAR(20) NULL,
+    ADD COLUMN IF NOT EXISTS street VARCHAR(100) NULL,
+    ADD COLUMN IF NOT EXISTS purok SMALLINT UNSIGNED NULL,
+    ADD COLUMN IF NOT EXISTS sitio VARCHAR(60) NULL,
+    ADD COLUMN IF NOT EXISTS household_key VARCHAR(200) NULL,
+    ADD KEY IF NOT EXISTS idx_residents_zone (purok, sitio, household_key),
+    ADD KEY IF NOT EXISTS idx_residents_street (street, house_no),
+    ADD KEY IF NOT EXISTS idx_residents_household (household_key);
+
+CREATE TABLE IF NOT EXISTS zone_counts (
+    purok SMALLINT UNSIGNED NOT NULL,
+    sitio VARCHAR(60) NOT NULL,
+    residents INT NOT NULL,
+    households INT NOT NULL,
+    data_version BIGINT NOT NULL,
+    refreshed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (purok, sitio)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,27 @@
+-- Migrations/008_birth_date.sql
+-- Residents store their birth date instead of an age (Panels/ages.py). A stored age is
+-- only right until the resident's next birthday; birth_date never goes stale and the age
+-- is computed when it is read (TIMESTAMPDIFF(YEAR, birth_date, CURDATE())).
+--
+-- Age groups are counted as birth_date ranges for today ("18-35" is born after today
+-- minus 36 years and on or before today minus 18), so each group is a range scan of
+-- idx_residents_birth_date. MariaDB does not allow CURDATE() in a generated column, so
+-- the age and its bucket cannot be stored as indexed generated columns; the range form
+-- gets the same index use.
+--
+-- Existing residents only have an age, recorded some time ago: their birth date is
+-- estimated as the middle of the year they were born in, counted from when the record
+-- was added, and birth_date_estimated marks it until someone enters the real date.
+-- age is dropped last, once every row has been converted.
+
+ALTER TABLE residents
+    ADD COLUMN IF NOT EXISTS birth_date DATE NULL AFTER name,
+    ADD COLUMN IF NOT EXISTS birth_date_estimated TINYINT(1) NOT NULL DEFAULT 0 AFTER birth_date,
+    ADD KEY IF NOT EXISTS idx_residents_birth_date (birth_date);
+
+UPDATE residents
+SET birth_date = DATE(COALESCE(created_at, NOW())) - INTERVAL age YEAR - INTERVAL 182 DAY,
+    birth_date_estimated = 1
+WHERE birth_date IS NULL AND age IS NOT NULL;
+
+ALTER TABLE residents DROP COLUMN IF EXISTS age;
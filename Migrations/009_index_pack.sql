@@ -0,0 +1,33 @@
+-- Migrations/009_index_pack.sql
+-- Indexes for the predicates the panels filter, join and sort on. The baseline schema
+-- (001) only had primary keys and the username UNIQUE keys, so every "requests of this
+-- resident", "added today" or "this staff member's activity" read the whole table.
+-- `python -m Benchmarks.explain_queries` EXPLAINs every query in Benchmarks/queries.py
+-- against a seeded database and fails on a full scan the query is not expected to do;
+-- a new query that needs an index adds it in a migration like this one.
+--
+-- staff.username / admins.username (login) are already UNIQUE; requests (status,
+-- request_date) comes with the work queue (004) and serves the status filters and counts.
+
+ALTER TABLE requests
+    ADD KEY IF NOT EXISTS idx_requests_resident (resident_id),
+    ADD KEY IF NOT EXISTS idx_requests_request_date (request_date),
+    ADD KEY IF NOT EXISTS idx_requests_created_at (created_at),
+    ADD KEY IF NOT EXISTS idx_requests_created_by (created_by, created_at),
+    ADD KEY IF NOT EXISTS idx_requests_document_type (document_type);
+
+ALTER TABLE residents
+    ADD KEY IF NOT EXISTS idx_residents_created_at (created_at),
+    ADD KEY IF NOT EXISTS idx_residents_created_by (created_by, created_at),
+    ADD KEY IF NOT EXISTS idx_residents_name (name);
+
+ALTER TABLE staff_activity
+    ADD KEY IF NOT EXISTS idx_staff_activity_staff (staff_id, created_at),
+    ADD KEY IF NOT EXISTS idx_staff_activity_action (action_type);
+
+ALTER TABLE admin_activity
+    ADD KEY IF NOT EXISTS idx_admin_activity_admin (admin_id, created_at),
+    ADD KEY IF NOT EXISTS idx_admin_activity_action (action_type);
+
+ALTER TABLE change_log
+    ADD KEY IF NOT EXISTS idx_change_log_entity (entity, entity_id, seq);
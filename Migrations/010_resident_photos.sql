@@ -0,0 +1,23 @@
+-- Migrations/010_resident_photos.sql
+-- Resident photos (Panels/photos.py). The image lives in resident_photos, one row per
+-- resident, so the residents row every list reads stays small; residents only gets
+-- photo_hash, the SHA-256 of the stored JPEG. The lists read that to know a resident
+-- has a photo and to find its thumbnail in the local cache (cache/thumbnails/), and only
+-- go to resident_photos on a cache miss, through idx_resident_photos_hash.
+--
+-- Photos are re-encoded before they are stored (at most 1024 px, a few hundred KB), so
+-- MEDIUMBLOB is plenty and they stay well under the default max_allowed_packet.
+
+ALTER TABLE residents
+    ADD COLUMN IF NOT EXISTS photo_hash CHAR(64) NULL;
+
+CREATE TABLE IF NOT EXISTS resident_photos (
+    resident_id INT PRIMARY KEY,
+    photo_hash CHAR(64) NOT NULL,
+    width SMALLINT UNSIGNED NOT NULL,
+    height SMALLINT UNSIGNED NOT NULL,
+    photo MEDIUMBLOB NOT NULL,
+    uploaded_by INT NULL,
+    uploaded_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_resident_photos_hash (photo_hash)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,32 @@
+-- Migrations/011_document_serials.sql
+-- Control numbers for issued documents (Panels/serials.py), per document type and year.
+--
+-- serial_blocks is the ledger: every row is a run of numbers one workstation reserved
+-- in a single statement, and (document_type, serial_year, first_value) is unique, so
+-- two desks can never hold overlapping runs. Desks then number completed requests from
+-- their own run without touching this table; a run a desk did not finish shows up as
+-- a gap in `python -m Panels.cli serials gaps`.
+--
+-- requests keeps the number it was issued. The unique key on (document_type,
+-- serial_year, serial_value) means a number can only ever be stamped on one request.
+
+CREATE TABLE IF NOT EXISTS serial_blocks (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    document_type VARCHAR(100) NOT NULL,
+    serial_year SMALLINT UNSIGNED NOT NULL,
+    first_value INT UNSIGNED NOT NULL,
+    last_value INT UNSIGNED NOT NULL,
+    workstation VARCHAR(64) NOT NULL,
+    reserved_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_serial_blocks_start (document_type, serial_year, first_value),
+    KEY idx_serial_blocks_end (document_type, serial_year, last_value),
+    KEY idx_serial_blocks_year (serial_year)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+ALTER TABLE requests
+    ADD COLUMN IF NOT EXISTS control_number VARCHAR(32) NULL,
+    ADD COLUMN IF NOT EXISTS serial_year SMALLINT UNSIGNED NULL,
+    ADD COLUMN IF NOT EXISTS serial_value INT UNSIGNED NULL,
+    ADD UNIQUE KEY IF NOT EXISTS uq_requests_serial (document_type, serial_year, serial_value),
+    ADD KEY IF NOT EXISTS idx_requests_control_number (control_number),
+    ADD KEY IF NOT EXISTS idx_requests_serial_year (serial_year);
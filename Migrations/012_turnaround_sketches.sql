@@ -0,0 +1,24 @@
+-- Migrations/012_turnaround_sketches.sql
+-- Request turnaround quantiles for the reports (Panels/turnaround.py).
+--
+-- requests.turnaround_hours is filled once, when a request is first completed. Each
+-- turnaround_sketches row is a serialized t-digest of those hours for one dimension
+-- ("all", "document_type" or "staff"), key, month and workstation. Every desk only
+-- updates its own rows, in the transaction that completes the request; the Reports
+-- page merges the rows of the last twelve months instead of reading every request.
+-- `python -m Panels.cli turnaround rebuild` recomputes them from requests.
+
+CREATE TABLE IF NOT EXISTS turnaround_sketches (
+    dimension VARCHAR(20) NOT NULL,
+    sketch_key VARCHAR(100) NOT NULL,
+    month CHAR(7) NOT NULL,
+    workstation VARCHAR(64) NOT NULL,
+    samples INT UNSIGNED NOT NULL,
+    digest BLOB NOT NULL,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (dimension, sketch_key, month, workstation),
+    KEY idx_turnaround_sketches_month (dimension, month)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+ALTER TABLE requests
+    ADD COLUMN IF NOT EXISTS turnaround_hours DECIMAL(10, 2) NULL;
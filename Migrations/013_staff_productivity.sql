@@ -0,0 +1,24 @@
+-- Migrations/013_staff_productivity.sql
+-- Daily per-staff rollups for the productivity view (Panels/productivity.py).
+--
+-- One row per staff member and day: requests completed, residents registered and
+-- staff_activity rows, plus served_sketch, a HyperLogLog of the residents whose
+-- requests were completed that day (residents_served is its estimate). Weeks and
+-- months merge the daily sketches, so the view never reads staff_activity itself.
+--
+-- The completed_date index serves the rollup's "completed that day" range.
+
+CREATE TABLE IF NOT EXISTS staff_daily_rollups (
+    staff_id INT NOT NULL,
+    day DATE NOT NULL,
+    requests_completed INT UNSIGNED NOT NULL DEFAULT 0,
+    residents_registered INT UNSIGNED NOT NULL DEFAULT 0,
+    activity INT UNSIGNED NOT NULL DEFAULT 0,
+    residents_served INT UNSIGNED NOT NULL DEFAULT 0,
+    served_sketch BLOB NOT NULL,
+    PRIMARY KEY (staff_id, day),
+    KEY idx_staff_daily_rollups_day (day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+ALTER TABLE requests
+    ADD KEY IF NOT EXISTS idx_requests_completed_date (completed_date);
@@ -0,0 +1,236 @@
+# Panels/addresses.py
+"""
+Address normalization and the household / zone index.
+
+residents.address is free text ("#364 Mabini Street, Prk. 1, Sitio Bagong Silang").
+parse_address() splits it into house number, street, purok and sitio, with the common
+spellings folded together (St./Street, Ave./Avenue, Prk./Purok, Zone = purok), and
+builds a household_key from the four. The parts live in indexed columns
+(Migrations/007_address_index.sql):
+
+- ResidentDialog writes them on every save (address_columns()).
+- backfill_addresses() parses existing rows in batches from a server-side cursor.
+- address_filter() turns a search like "purok 3", "sitio ilaya" or "364 mabini st"
+  into equality filters on those columns; resident_search() ORs them into the panels'
+  name / address LIKE, so addresses stored as "Mabini St", rows not backfilled yet and
+  names that merely parse as an address ("Jose So Cruz") are still found.
+- zone_summary() serves per-purok / sitio resident and household counts from
+  zone_counts, recomputing them only when change_log has moved on.
+
+    python -m Panels.cli address backfill
+
+No Qt imports here.
+"""
+import re
+
+from pymysql.cursors import SSCursor
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+BATCH_ROWS = 2_000
+
+STREET_TYPES = {
+    "st": "St", "street": "St", "ave": "Ave", "avenue": "Ave", "av": "Ave", "blvd": "Blvd",
+    "boulevard": "Blvd", "hwy": "Hwy", "highway": "Hwy", "rd": "Rd", "road": "Rd",
+    "ext": "Ext", "extension": "Ext", "dr": "Dr", "drive": "Dr",
+}
+
+_PUROK = re.compile(r"\b(?:purok|prk|zone|zn)\.?\s*(?:no\.?\s*)?#?\s*(\d{1,3})\b")
+_SITIO = re.compile(r"\b(?:sitio|so)\.?\s+([a-z][a-z .'-]*?)\s*(?:,|$)")
+_HOUSE = re.compile(r"^(?:#|no\.?\s*|house\s+)?(\d+[a-z]?(?:-[0-9a-z]+)?|blk\.?\s*\d+\s*lot\.?\s*\d+)\b[\s,]*")
+
+
+# -----------------------------
+# Parsing
+# -----------------------------
+def _title(text):
+    return " ".join(word.capitalize() for word in text.split())
+
+
+def _street(text):
+    words = re.findall(r"[a-z0-9']+", text)
+    if not words:
+        return None
+    if words[-1] in STREET_TYPES:
+        return " ".join([_title(" ".join(words[:-1])), STREET_TYPES[words[-1]]]).strip() or None
+    return _title(" ".join(words))
+
+
+def parse_address(address):
+    """
+    ``{"house_no", "street", "purok", "sitio", "household_key"}`` for a free-text address.
+
+    Parts that cannot be found are None; purok is 0 when the address names none.
+    household_key is None unless both a house number and a street were found.
+    """
+    text = " ".join((address or "").lower().split())
+
+    purok = _PUROK.search(text)
+    if purok:
+        text = text[:purok.start()] + text[purok.end():]
+    sitio = _SITIO.search(text + ",")
+    if sitio:
+        text = text[:sitio.start()] + text[min(sitio.end(), len(text)):]
+
+    house_no, street = None, None
+    segment = text.strip(" ,").split(",")[0].strip()
+    house = _HOUSE.match(segment)
+    if house:
+        house_no = re.sub(r"[\s.]", "", house.group(1)).upper()
+        segment = segment[house.end():]
+    street = _street(segment)
+
+    parts = {
+        "house_no": house_no,
+        "street": street,
+        "purok": int(purok.group(1)) if purok else 0,
+        "sitio": _title(sitio.group(1).strip(" .")) if sitio else None,
+    }
+    parts["household_key"] = household_key(parts)
+    return parts
+
+
+def household_key(parts):
+    if not (parts["house_no"] and parts["street"]):
+        return None
+    return "|".join([str(parts["purok"]), (parts["sitio"] or "").lower(),
+                     parts["street"].lower(), parts["house_no"].lower()])
+
+
+# Column widths in residents (Migrations/007_address_index.sql)
+COLUMNS = {"house_no": 20, "street": 100, "purok": None, "sitio": 60, "household_key": 200}
+
+
+def address_columns(address):
+    """The parsed columns for a resident with ``address``, ready to add to an INSERT / UPDATE."""
+    parts = parse_address(address)
+    return {column: parts[column][:width] if width and parts[column] else parts[column]
+            for column, width in COLUMNS.items()}
+
+
+# -----------------------------
+# Search
+# -----------------------------
+def address_filter(text, alias=""):
+    """
+    ``(sql, params)`` matching the address parts in a search string, or None when the
+    text does not look like an address. On its own it misses unparsed rows; see
+    resident_search().
+    """
+    parts = parse_address(text)
+    column = f"{alias}." if alias else ""
+    clauses, params = [], []
+    if _PUROK.search(text.lower()):
+        clauses.append(f"{column}purok = %s")
+        params.append(parts["purok"])
+    if parts["sitio"]:
+        clauses.append(f"{column}sitio = %s")
+        params.append(parts["sitio"])
+    if parts["house_no"] and parts["street"]:
+        clauses.append(f"{column}street = %s AND {column}house_no = %s")
+        params.extend([parts["street"], parts["house_no"]])
+    if not clauses:
+        return None
+    return " AND ".join(clauses), params
+
+
+def resident_search(text, alias=""):
+    """``(sql, params)`` for the resident panels' search box: name or address LIKE, or the parsed address."""
+    column = f"{alias}." if alias else ""
+    clauses = [f"{column}name LIKE %s", f"{column}address LIKE %s"]
+    params = [f"%{text}%", f"%{text}%"]
+    zone = address_filter(text, alias)
+    if zone:
+        clauses.append(f"({zone[0]})")
+        params.extend(zone[1])
+    return f"({' OR '.join(clauses)})", params
+
+
+# -----------------------------
+# Backfill
+# -----------------------------
+def backfill_addresses(database=DEFAULT_DATABASE, rebuild=False):
+    """Parse the address of residents not parsed yet (all of them with ``rebuild``)."""
+    reader = get_connection(database)
+    writer = get_connection(database)
+    cursor = reader.cursor(SSCursor)
+    write = writer.cursor()
+    updated = 0
+    try:
+        write.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS resident_addresses (
+                id INT PRIMARY KEY, house_no VARCHAR(20) NULL, street VARCHAR(100) NULL,
+                purok SMALLINT UNSIGNED NOT NULL, sitio VARCHAR(60) NULL, household_key VARCHAR(200) NULL
+            ) ENGINE=InnoDB
+        """)
+        cursor.execute(f"SELECT id, address FROM residents{'' if rebuild else ' WHERE purok IS NULL'}")
+        while True:
+            rows = cursor.fetchmany(BATCH_ROWS)
+            if not rows:
+                break
+            parsed = [(resident_id, *address_columns(address).values()) for resident_id, address in rows]
+            write.executemany("""
+                INSERT INTO resident_addresses (id, house_no, street, purok, sitio, household_key)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, parsed)
+            write.execute("""
+                UPDATE residents r JOIN resident_addresses a ON r.id = a.id
+                SET r.house_no = a.house_no, r.street = a.street, r.purok = a.purok,
+                    r.sitio = a.sitio, r.household_key = a.household_key
+            """)
+            write.execute("DELETE FROM resident_addresses")
+            writer.commit()
+            updated += len(rows)
+    finally:
+        cursor.close()
+        reader.close()
+        write.close()
+        writer.close()
+    return updated
+
+
+# -----------------------------
+# Zone aggregates
+# -----------------------------
+def refresh_zone_counts(cursor, version):
+    """Recompute zone_counts from the (purok, sitio, household_key) index; caller commits."""
+    cursor.execute("DELETE FROM zone_counts")
+    cursor.execute("""
+        INSERT INTO zone_counts (purok, sitio, residents, households, data_version)
+        SELECT COALESCE(purok, 0), COALESCE(sitio, ''), COUNT(*), COUNT(DISTINCT household_key), %s
+        FROM residents
+        GROUP BY COALESCE(purok, 0), COALESCE(sitio, '')
+    """, (version,))
+
+
+def zone_summary(database=DEFAULT_DATABASE, refresh=False):
+    """
+    ``(zones, unparsed)``: zones are ``{"purok", "sitio", "residents", "households"}`` rows
+    ordered by purok and sitio (purok 0 last), unparsed the residents whose address has
+    not been parsed yet. The counts are recomputed only when something was written since
+    the last time (or with ``refresh``).
+    """
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COALESCE(MAX(seq), 0) AS seq FROM change_log")
+        version = cursor.fetchone()["seq"]
+        cursor.execute("SELECT MIN(data_version) AS version FROM zone_counts")
+        stored = cursor.fetchone()["version"]
+        if refresh or stored is None or stored < version:
+            refresh_zone_counts(cursor, version)
+            conn.commit()
+
+        cursor.execute("""
+            SELECT purok, sitio, residents, households
+            FROM zone_counts
+            ORDER BY purok = 0, purok, sitio
+        """)
+        zones = cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) AS total FROM residents WHERE purok IS NULL")
+        unparsed = cursor.fetchone()["total"]
+        return zones, unparsed
+    finally:
+        cursor.close()
+        conn.close()
+
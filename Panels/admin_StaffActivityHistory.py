@@ -1,4 +1,3 @@
-import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame,
     QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
@@ -6,27 +5,24 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QDate
 from PyQt6.QtGui import QFont
+from datetime import datetime
 from Panels.db import get_connection
+from Panels.records import ActivityEntry, query_rows
+from Panels.retention import archived_activity
+from Panels.reporting import export_csv, export_pdf
+from Panels.styles import apply_style_scope
 
 
 class StaffActivityHistory(QWidget):
     def __init__(self, admin_id):
         super().__init__()
         self.admin_id = admin_id
-        self.init_ui()
-        self.load_activities()
 
-        # --- Project Paths ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
+        # --- Stylesheet (Styles/admin_activity_history.qss) ---
+        apply_style_scope(self, "admin_activity_history")
 
-        qss_path = os.path.join(styles_dir, "admin_activity_history.qss")
-
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
+        self.init_ui()
+        self.load_activities()
 
     def init_ui(self):
         # Main scroll area
@@ -252,6 +248,7 @@ class StaffActivityHistory(QWidget):
 
     def load_filters(self):
         """Load filter dropdowns"""
+        self.staff_usernames = {}  # also names archived rows (no JOIN there)
         conn = get_connection()
         cursor = conn.cursor()
 
@@ -260,6 +257,7 @@ class StaffActivityHistory(QWidget):
         staff_list = cursor.fetchall()
         for staff in staff_list:
             self.staff_filter.addItem(f"{staff['username']} (ID: {staff['id']})", staff['id'])
+            self.staff_usernames[staff['id']] = staff['username']
 
         # Load activity types
         cursor.execute("SELECT DISTINCT action_type FROM staff_activity ORDER BY action_type")
@@ -273,9 +271,6 @@ class StaffActivityHistory(QWidget):
 
     def load_activities(self):
         """Load staff activities with filters"""
-        conn = get_connection()
-        cursor = conn.cursor()
-
         # Build query with filters
         query = """
             SELECT sa.*, s.username 
@@ -285,19 +280,21 @@ class StaffActivityHistory(QWidget):
         """
         params = []
 
-        # Date filter
-        date_from = self.date_from.date().toString("yyyy-MM-dd")
-        date_to = self.date_to.date().toString("yyyy-MM-dd")
-        query += " AND DATE(sa.created_at) BETWEEN %s AND %s"
-        params.extend([date_from, date_to])
+        # Date filter (a plain range on created_at lets MariaDB prune monthly partitions)
+        start = datetime.combine(self.date_from.date().toPyDate(), datetime.min.time())
+        end = datetime.combine(self.date_to.date().addDays(1).toPyDate(), datetime.min.time())
+        query += " AND sa.created_at >= %s AND sa.created_at < %s"
+        params.extend([start, end])
 
         # Staff filter
+        actor_id = None
         if self.staff_filter.currentText() != "All Staff":
-            staff_id = self.staff_filter.currentData()
+            actor_id = self.staff_filter.currentData()
             query += " AND sa.staff_id = %s"
-            params.append(staff_id)
+            params.append(actor_id)
 
         # Activity type filter
+        activity_type = None
         if self.activity_filter.currentText() != "All Activities":
             activity_type = self.activity_filter.currentText()
             query += " AND sa.action_type = %s"
@@ -311,12 +308,30 @@ class StaffActivityHistory(QWidget):
 
         query += " ORDER BY sa.created_at DESC"
 
-        cursor.execute(query, params)
-        activities = cursor.fetchall()
+        activities = query_rows(ActivityEntry, query, params)
+
+        # Months past the retention horizon were moved to Archives/ (see retention.py)
+        archived = archived_activity("staff_activity", start, end, "staff_id", actor_id, activity_type,
+                                     search_text, self.staff_usernames)
+        if archived:
+            activities = sorted(activities + archived, key=lambda a: a["created_at"], reverse=True)
 
         self.populate_table(activities)
-        cursor.close()
-        conn.close()
+
+    def show_staff(self, staff_id, first_day, last_day):
+        """Drill-down from AdminProductivity: one staff member's activity between two days"""
+        filters = (self.date_from, self.date_to, self.staff_filter, self.activity_filter, self.search_input)
+        for widget in filters:  # one reload below, not one per filter
+            widget.blockSignals(True)
+        self.date_from.setDate(QDate(first_day.year, first_day.month, first_day.day))
+        self.date_to.setDate(QDate(last_day.year, last_day.month, last_day.day))
+        index = self.staff_filter.findData(staff_id)
+        self.staff_filter.setCurrentIndex(index if index >= 0 else 0)
+        self.activity_filter.setCurrentIndex(0)
+        self.search_input.clear()
+        for widget in filters:
+            widget.blockSignals(False)
+        self.load_activities()
 
     def populate_table(self, activities):
         """Populate table with activity data"""
@@ -358,97 +373,10 @@ class StaffActivityHistory(QWidget):
 
     def export_to_csv(self):
         """Export activities to CSV"""
-        import csv
-        from datetime import datetime
-
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT sa.created_at, s.username, sa.action_type, sa.description, sa.role, sa.ip_address
-            FROM staff_activity sa 
-            LEFT JOIN staff s ON sa.staff_id = s.id 
-            ORDER BY sa.created_at DESC
-        """)
-        activities = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"staff_activities_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Timestamp", "Staff Member", "Activity Type", "Description", "Role", "IP Address"])
-            for activity in activities:
-                writer.writerow([
-                    activity["created_at"].strftime("%Y-%m-%d %H:%M:%S"),
-                    activity.get("username", "Unknown"),
-                    activity.get("action_type", "N/A"),
-                    activity.get("description", "N/A"),
-                    activity.get("role", "Staff"),
-                    activity.get("ip_address", "N/A")
-                ])
-
+        filename = export_csv("staff_activity")
         QMessageBox.information(self, "Export Successful", f"Staff activities exported to:\n{filename}")
 
     def export_to_pdf(self):
-        """Export activities to PDF"""
-        from datetime import datetime
-        from reportlab.lib.pagesizes import letter, landscape
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import inch
-
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT sa.created_at, s.username, sa.action_type, sa.description, sa.role
-            FROM staff_activity sa 
-            LEFT JOIN staff s ON sa.staff_id = s.id 
-            ORDER BY sa.created_at DESC
-            LIMIT 100  # Limit for PDF readability
-        """)
-        activities = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"staff_activities_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-
-        c = canvas.Canvas(filename, pagesize=landscape(letter))
-        width, height = landscape(letter)
-
-        # Title
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(1 * inch, height - 0.75 * inch, "Staff Activity Report")
-
-        c.setFont("Helvetica", 10)
-        c.drawString(1 * inch, height - 1 * inch, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        # Headers
-        y = height - 1.5 * inch
-        headers = ["Timestamp", "Staff", "Activity", "Description"]
-        x_positions = [0.5, 2.0, 3.0, 4.5]
-
-        c.setFont("Helvetica-Bold", 10)
-        for i, h in enumerate(headers):
-            c.drawString(x_positions[i] * inch, y, h)
-
-        # Data
-        y -= 0.25 * inch
-        c.setFont("Helvetica", 8)
-        for activity in activities:
-            if y < 1 * inch:
-                c.showPage()
-                y = height - 1 * inch
-                c.setFont("Helvetica", 8)
-
-            c.drawString(x_positions[0] * inch, y, activity["created_at"].strftime("%m/%d %H:%M"))
-            c.drawString(x_positions[1] * inch, y, activity.get("username", "Unknown")[:12])
-            c.drawString(x_positions[2] * inch, y, activity.get("action_type", "N/A")[:15])
-            c.drawString(x_positions[3] * inch, y, activity.get("description", "N/A")[:40])
-            y -= 0.25 * inch
-
-        c.save()
-        QMessageBox.information(self, "Export Successful", f"PDF report generated:\n{filename}")
\ No newline at end of file
+        """Export the latest 100 activities to PDF"""
+        filename = export_pdf("staff_activity")
+        QMessageBox.information(self, "Export Successful", f"PDF report generated:\n{filename}")
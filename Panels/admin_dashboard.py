@@ -9,6 +9,9 @@ from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QPixmap, QFont
 
 from Panels.db import get_connection
+from Panels.change_poller import ChangeFeedPoller
+from Panels.events import DATA_EVENTS, get_event_bus
+from Panels.styles import apply_style_scope
 from Panels.admin_worker_management import AdminWorkerManagement
 from Panels.staff_infographics import StaffInfographics
 from Panels.admin_reports import AdminReports
@@ -16,29 +19,52 @@ from Panels.admin_requests import AdminRequests
 from Panels.admin_residents import AdminResidents
 from Panels.admin_StaffActivityHistory import StaffActivityHistory
 from Panels.admin_AdminActivityHistory import AdminActivityHistory
+from Panels.admin_slow_queries import AdminSlowQueries
+from Panels.admin_productivity import AdminProductivity
+
+# Rows added today, as a range the created_at index can serve (DATE(created_at) cannot)
+TODAY = "created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY"
+
+# The five newest entries of each log (newest-first on the created_at indexes), then
+# the five newest of those ten
+RECENT_ACTIVITY_SQL = """
+    SELECT * FROM (
+        SELECT 'Staff' AS role, sa.action_type, sa.description, sa.created_at, s.username
+        FROM staff_activity sa
+        JOIN staff s ON sa.staff_id = s.id
+        ORDER BY sa.created_at DESC
+        LIMIT 5
+    ) recent_staff
+
+    UNION ALL
+
+    SELECT * FROM (
+        SELECT 'Admin' AS role, aa.action_type, aa.description, aa.created_at, a.username
+        FROM admin_activity aa
+        JOIN admins a ON aa.admin_id = a.id
+        ORDER BY aa.created_at DESC
+        LIMIT 5
+    ) recent_admin
+
+    ORDER BY created_at DESC
+    LIMIT 5
+"""
 
 
 class AdminDashboard(QMainWindow):
     def __init__(self, admin_id):
         super().__init__()
         self.admin_id = admin_id
-        self._refresh_pending = False  # ⬅️ ADDED: Prevent multiple rapid refreshes
 
         # --- Project Paths ---
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
         images_dir = os.path.join(base_dir, "Images")
 
-        qss_path = os.path.join(styles_dir, "admin_dashboard.qss")
         logo_path = os.path.join(images_dir, "BRIMS_logo.png")
 
         self.logo_path = logo_path
 
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
+        apply_style_scope(self, "admin_dashboard")
 
         self.setWindowTitle("BRIMS - Admin Panel")
         self.setGeometry(100, 100, 1400, 800)
@@ -107,27 +133,31 @@ class AdminDashboard(QMainWindow):
         self.infographics_panel = StaffInfographics()
         self.pages.addWidget(self.infographics_panel)
 
-        # ✅ ADDED: Auto-refresh signal connections
-        self.worker_management_panel.workers_changed.connect(self.safe_refresh_dashboard)
-        self.residents_panel.residents_changed.connect(self.safe_refresh_dashboard)
-        self.requests_panel.requests_changed.connect(self.safe_refresh_dashboard)
+        # Page 8: Slow Queries (this desk's slow-query log)
+        self.slow_queries_panel = AdminSlowQueries()
+        self.pages.addWidget(self.slow_queries_panel)
+
+        # Page 9: Staff Productivity (drills down into Staff Activities)
+        self.productivity_panel = AdminProductivity()
+        self.productivity_panel.drill_down.connect(self.open_staff_activity)
+        self.pages.addWidget(self.productivity_panel)
 
-    def safe_refresh_dashboard(self):
-        """Safely refresh dashboard with debouncing"""
-        if self._refresh_pending:
-            return
+        # Data changes from any panel, or from other desks via the change feed
+        get_event_bus().subscribe(DATA_EVENTS, self.safe_refresh_dashboard, owner=self)
+        self.change_feed = ChangeFeedPoller(self)
+        self.change_feed.start()
 
-        self._refresh_pending = True
-        QTimer.singleShot(200, self._execute_dashboard_refresh)
+    def open_staff_activity(self, staff_id, first_day, last_day):
+        self.pages.setCurrentIndex(4)
+        self.set_active_button(self.btn_staff_activities)
+        self.staff_activities_panel.show_staff(staff_id, first_day, last_day)
 
-    def _execute_dashboard_refresh(self):
-        """Execute the actual refresh after delay"""
+    def safe_refresh_dashboard(self, events=None):
+        """Refresh the dashboard; as the event-bus handler it runs once per batch of changes"""
         try:
             self.refresh_dashboard()
         except Exception as e:
             print(f"Error refreshing admin dashboard: {e}")
-        finally:
-            self._refresh_pending = False
 
     # -------------------------
     # DB Helpers
@@ -150,11 +180,11 @@ class AdminDashboard(QMainWindow):
         cursor = conn.cursor()
 
         # Total documents processed today
-        cursor.execute("SELECT COUNT(*) AS total FROM requests WHERE DATE(created_at) = CURDATE()")
+        cursor.execute(f"SELECT COUNT(*) AS total FROM requests WHERE {TODAY}")
         processed = cursor.fetchone()["total"] or 0
 
         # Total residents added today
-        cursor.execute("SELECT COUNT(*) AS total FROM residents WHERE DATE(created_at) = CURDATE()")
+        cursor.execute(f"SELECT COUNT(*) AS total FROM residents WHERE {TODAY}")
         residents_added = cursor.fetchone()["total"] or 0
 
         cursor.close()
@@ -164,20 +194,7 @@ class AdminDashboard(QMainWindow):
     def get_recent_activities(self):
         conn = get_connection()
         cursor = conn.cursor()
-        cursor.execute(f"""
-            SELECT 'Staff' AS role, sa.action_type, sa.description, sa.created_at, s.username
-            FROM staff_activity sa
-            JOIN staff s ON sa.staff_id = s.id
-
-            UNION ALL
-
-            SELECT 'Admin' AS role, aa.action_type, aa.description, aa.created_at, a.username
-            FROM admin_activity aa
-            JOIN admins a ON aa.admin_id = a.id
-
-            ORDER BY created_at DESC
-            LIMIT 5
-        """)
+        cursor.execute(RECENT_ACTIVITY_SQL)
         logs = cursor.fetchall()
         cursor.close()
         conn.close()
@@ -243,16 +260,19 @@ class AdminDashboard(QMainWindow):
 
         # ✅ ADD THESE TWO NEW BUTTONS RIGHT HERE:
         btn_staff_activities = self.create_nav_button("📋", "Staff Activities")
+        self.btn_staff_activities = btn_staff_activities
         btn_admin_activities = self.create_nav_button("📝", "Admin Activities")
 
         btn_reports_admin = self.create_nav_button("📉", "Reports (Admin)")
         btn_reports_staff = self.create_nav_button("📊", "Infographics (Staff View)")
+        btn_slow_queries = self.create_nav_button("🐢", "Slow Queries")
+        btn_productivity = self.create_nav_button("📈", "Staff Productivity")
 
         # Collect for styling / highlight management
         self.sidebar_buttons = [
             btn_dashboard, btn_worker_management, btn_residents,
             btn_requests, btn_staff_activities, btn_admin_activities,  # ✅ ADD NEW BUTTONS
-            btn_reports_admin, btn_reports_staff
+            btn_reports_admin, btn_reports_staff, btn_slow_queries, btn_productivity
         ]
 
         # Connections (with highlighting)
@@ -288,6 +308,20 @@ class AdminDashboard(QMainWindow):
         btn_reports_staff.clicked.connect(
             lambda: (self.pages.setCurrentIndex(7), self.set_active_button(btn_reports_staff))  # ✅ CHANGED from 5 to 7
         )
+        btn_slow_queries.clicked.connect(
+            lambda: (
+                self.pages.setCurrentIndex(8),
+                self.set_active_button(btn_slow_queries),
+                self.slow_queries_panel.load_summary()
+            )
+        )
+        btn_productivity.clicked.connect(
+            lambda: (
+                self.pages.setCurrentIndex(9),
+                self.set_active_button(btn_productivity),
+                self.productivity_panel.refresh()
+            )
+        )
 
         # Add nav widgets
         layout.addWidget(btn_dashboard)
@@ -301,6 +335,8 @@ class AdminDashboard(QMainWindow):
 
         layout.addWidget(btn_reports_admin)
         layout.addWidget(btn_reports_staff)
+        layout.addWidget(btn_slow_queries)
+        layout.addWidget(btn_productivity)
 
         layout.addStretch()
 
@@ -651,6 +687,8 @@ class AdminDashboard(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             from Panels.login import LoginPage  # ✅ FIXED: Correct import path
+            self.change_feed.stop()
+            get_event_bus().unsubscribe(self)
             self.close()
             self.login_page = LoginPage()
             self.login_page.show()
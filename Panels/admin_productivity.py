@@ -0,0 +1,216 @@
+import threading
+from datetime import timedelta
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame,
+    QTableWidget, QTableWidgetItem, QScrollArea, QComboBox, QDateEdit
+)
+from PyQt6.QtCore import Qt, QDate, pyqtSignal
+from PyQt6.QtGui import QFont
+from Panels.productivity import productivity, refresh_rollups
+from Panels.styles import apply_style_scope
+
+COLUMNS = ["Staff", "Period", "Requests Completed", "Residents Registered", "Residents Served", "Activity"]
+PERIOD_LABELS = {"Whole range": "total", "By week": "week", "By day": "day"}
+
+
+class AdminProductivity(QWidget):
+    """Per-staff productivity from the daily rollups (Panels/productivity.py)."""
+
+    rollups_refreshed = pyqtSignal(object)  # rows written, or the exception that stopped the refresh
+    drill_down = pyqtSignal(int, object, object)  # staff_id, first day, last day -> StaffActivityHistory
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._refreshing = False
+
+        # --- Stylesheet (Styles/admin_productivity.qss) ---
+        apply_style_scope(self, "admin_productivity")
+
+        self.init_ui()
+        self.rollups_refreshed.connect(self.on_rollups_refreshed)
+
+    def init_ui(self):
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setObjectName("productivityScroll")
+
+        content = QWidget()
+        content.setObjectName("productivityContent")
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(25)
+
+        # --- Header Section ---
+        header_frame = QFrame()
+        header_frame.setObjectName("headerSection")
+        header_layout = QHBoxLayout(header_frame)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+
+        page_title = QLabel("Staff Productivity")
+        page_title.setObjectName("pageTitle")
+        title_font = QFont()
+        title_font.setPointSize(18)
+        title_font.setBold(True)
+        page_title.setFont(title_font)
+        header_layout.addWidget(page_title, alignment=Qt.AlignmentFlag.AlignLeft)
+        header_layout.addStretch()
+
+        self.refresh_btn = QPushButton("🔄 Refresh")
+        self.refresh_btn.setObjectName("refreshButton")
+        self.refresh_btn.setFixedHeight(40)
+        self.refresh_btn.clicked.connect(self.refresh)
+        header_layout.addWidget(self.refresh_btn, alignment=Qt.AlignmentFlag.AlignRight)
+        layout.addWidget(header_frame)
+
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("description")
+        layout.addWidget(self.status_label)
+
+        # --- Table Card ---
+        table_card = QFrame()
+        table_card.setObjectName("tableCard")
+        table_layout = QVBoxLayout(table_card)
+        table_layout.setContentsMargins(25, 25, 25, 25)
+        table_layout.setSpacing(15)
+
+        list_title = QLabel("Requests, Registrations and Residents Served")
+        list_title.setObjectName("listTitle")
+        list_subtitle = QLabel("Residents served is estimated (±2%); double-click a row to open that staff "
+                               "member's activity for the period")
+        list_subtitle.setObjectName("listSubtitle")
+        table_layout.addWidget(list_title)
+        table_layout.addWidget(list_subtitle)
+
+        # --- Filters Row ---
+        filters_row = QHBoxLayout()
+        filters_row.setSpacing(10)
+
+        self.date_from = QDateEdit()
+        self.date_from.setDate(QDate.currentDate().addDays(-27))  # Default: last 4 weeks
+        self.date_from.setDisplayFormat("yyyy-MM-dd")
+        self.date_to = QDateEdit()
+        self.date_to.setDate(QDate.currentDate())
+        self.date_to.setDisplayFormat("yyyy-MM-dd")
+        self.period_filter = QComboBox()
+        self.period_filter.addItems(list(PERIOD_LABELS))
+
+        for label_text, widget in (("From Date", self.date_from), ("To Date", self.date_to),
+                                   ("Group", self.period_filter)):
+            column = QVBoxLayout()
+            column.setSpacing(5)
+            label = QLabel(label_text)
+            label.setObjectName("filterLabel")
+            column.addWidget(label)
+            column.addWidget(widget)
+            filters_row.addLayout(column)
+        filters_row.addStretch()
+
+        self.date_from.dateChanged.connect(self.load_rows)
+        self.date_to.dateChanged.connect(self.load_rows)
+        self.period_filter.currentTextChanged.connect(self.load_rows)
+        table_layout.addLayout(filters_row)
+
+        self.table = QTableWidget()
+        self.table.setObjectName("productivityTable")
+        self.table.setColumnCount(len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+
+        header = self.table.horizontalHeader()
+        for i in range(len(COLUMNS)):
+            header.setSectionResizeMode(i, header.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(0, header.ResizeMode.Stretch)  # Staff
+
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(self.table.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(self.table.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(self.table.EditTrigger.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        self.table.setShowGrid(False)
+        self.table.setMinimumHeight(420)
+        self.table.cellDoubleClicked.connect(self.open_activity)
+        table_layout.addWidget(self.table)
+
+        layout.addWidget(table_card)
+        scroll.setWidget(content)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addWidget(scroll)
+
+    # --- Rollups ---
+    def refresh(self):
+        """Bring the daily rollups up to today in a worker thread, then reload the table"""
+        if self._refreshing:
+            return
+        self._refreshing = True
+        self.refresh_btn.setEnabled(False)
+        self.status_label.setText("⏳ Updating daily rollups…")
+        threading.Thread(target=self._refresh_rollups, daemon=True).start()
+
+    def _refresh_rollups(self):
+        # Worker thread: queries only, no widgets
+        try:
+            result = refresh_rollups()
+        except Exception as e:
+            result = e
+        try:
+            self.rollups_refreshed.emit(result)
+        except RuntimeError:  # the panel was closed meanwhile
+            pass
+
+    def on_rollups_refreshed(self, result):
+        self._refreshing = False
+        self.refresh_btn.setEnabled(True)
+        if isinstance(result, Exception):
+            print(f"⚠️ Failed to refresh productivity rollups: {result}")
+            self.status_label.setText("⚠️ Could not update the rollups; showing the last ones")
+        else:
+            self.status_label.setText("Counts from the daily staff rollups, updated just now")
+        self.load_rows()
+
+    # --- Table ---
+    def load_rows(self):
+        start = self.date_from.date().toPyDate()
+        end = self.date_to.date().toPyDate()
+        period = PERIOD_LABELS[self.period_filter.currentText()]
+        try:
+            self.rows = productivity(start, end, period)
+        except Exception as e:
+            print(f"⚠️ Failed to load productivity: {e}")
+            self.rows = []
+
+        self.table.setRowCount(len(self.rows))
+        for row, entry in enumerate(self.rows):
+            if period == "week":
+                label = f"Week of {entry['period']:%Y-%m-%d}"
+            elif period == "day":
+                label = f"{entry['period']:%Y-%m-%d}"
+            else:
+                label = f"{start:%Y-%m-%d} – {end:%Y-%m-%d}"
+            values = [
+                entry["username"],
+                label,
+                f"{entry['requests_completed']:,}",
+                f"{entry['residents_registered']:,}",
+                f"≈ {entry['residents_served']:,}",
+                f"{entry['activity']:,}",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column >= 2:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def open_activity(self, row, column):
+        if not 0 <= row < len(self.rows):
+            return
+        entry = self.rows[row]
+        start = self.date_from.date().toPyDate()
+        end = self.date_to.date().toPyDate()
+        if entry["period"] is not None:  # one week or day of the range
+            length = 6 if PERIOD_LABELS[self.period_filter.currentText()] == "week" else 0
+            start = max(start, entry["period"])
+            end = min(end, entry["period"] + timedelta(days=length))
+        self.drill_down.emit(entry["staff_id"], start, end)
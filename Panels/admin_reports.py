@@ -1,28 +1,29 @@
 # Panels/admin_reports.py
 import sys
-import os
-import datetime
-import matplotlib.dates as mdates
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QScrollArea
-from PyQt6.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+import threading
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QScrollArea, QPushButton
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QPixmap
 
-from Panels.db import get_connection
+from Panels.report_snapshots import (
+    CHART_DPI, build_snapshot, data_version, describe_age, is_stale, load_snapshot, snapshot_age
+)
+from Panels.styles import apply_style_scope
+
+# How often the page re-checks its snapshot's age and the data version
+SNAPSHOT_CHECK_MS = 60_000
 
 
 class AdminReports(QWidget):
+    snapshot_built = pyqtSignal(object)  # new manifest, or the exception that stopped the build
+
     def __init__(self):
         super().__init__()
+        self.manifest = None
+        self._building = False
 
-        # --- Project Paths ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
-        qss_path = os.path.join(styles_dir, "admin_reports.qss")
-
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
+        # --- Stylesheet (Styles/admin_reports.qss) ---
+        apply_style_scope(self, "admin_reports")
 
         self.setObjectName("infographicsPanel")
 
@@ -52,6 +53,20 @@ class AdminReports(QWidget):
 
         header_layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignLeft)
         header_layout.addWidget(subtitle, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        # Snapshot age + manual recompute
+        snapshot_row = QHBoxLayout()
+        snapshot_row.setSpacing(10)
+        self.snapshot_info = QLabel("")
+        self.snapshot_info.setObjectName("snapshotInfo")
+        self.recompute_btn = QPushButton("⟳ Recompute Now")
+        self.recompute_btn.setObjectName("recomputeButton")
+        self.recompute_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.recompute_btn.clicked.connect(self.recompute)
+        snapshot_row.addWidget(self.snapshot_info)
+        snapshot_row.addStretch()
+        snapshot_row.addWidget(self.recompute_btn)
+        header_layout.addLayout(snapshot_row)
         main_layout.addWidget(header_frame)
 
         # --- KPIs Section ---
@@ -70,9 +85,11 @@ class AdminReports(QWidget):
 
         self.total_residents = self.create_kpi_box("👥 Total Residents", "0", "#8B5CF6")
         self.documents_issued = self.create_kpi_box("📄 Documents Issued", "0", "#10B981")
+        self.median_turnaround = self.create_kpi_box("⏱️ Median Turnaround", "-", "#F59E0B")
 
         kpi_layout.addWidget(self.total_residents)
         kpi_layout.addWidget(self.documents_issued)
+        kpi_layout.addWidget(self.median_turnaround)
         kpi_layout.addStretch()
 
         kpi_section_layout.addLayout(kpi_layout)
@@ -105,12 +122,25 @@ class AdminReports(QWidget):
         second_chart_row.setSpacing(20)
 
         self.demographics_box = self.create_chart_box("👨‍👩‍👧‍👦 Resident Demographics", "Population by age group")
-        self.summary_box = self.create_summary_box()
+        self.summary_box = self.create_summary_box("📋 Recent Activity", "System-wide activity in the past 7 days")
 
         second_chart_row.addWidget(self.demographics_box, 2)
         second_chart_row.addWidget(self.summary_box, 1)
         charts_layout.addLayout(second_chart_row)
 
+        # Third row: turnaround quantiles (Panels/turnaround.py)
+        third_chart_row = QHBoxLayout()
+        third_chart_row.setSpacing(20)
+
+        self.turnaround_box = self.create_chart_box("⏱️ Turnaround Time",
+                                                    "P50 / P90 / P99 hours by document type, last 12 months")
+        self.staff_turnaround_box = self.create_summary_box("🧑‍💼 Turnaround by Staff",
+                                                            "Median / P90 hours, last 12 months")
+
+        third_chart_row.addWidget(self.turnaround_box, 2)
+        third_chart_row.addWidget(self.staff_turnaround_box, 1)
+        charts_layout.addLayout(third_chart_row)
+
         main_layout.addWidget(charts_section)
         main_layout.addStretch()
 
@@ -122,8 +152,14 @@ class AdminReports(QWidget):
         final_layout.setContentsMargins(0, 0, 0, 0)
         final_layout.addWidget(scroll)
 
-        # ✅ Load real data
-        self.refresh_data()
+        # ✅ Show the last snapshot at once; rebuild it in the background if it is stale
+        self.snapshot_built.connect(self.on_snapshot_built)
+        self.show_snapshot(load_snapshot())
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.setInterval(SNAPSHOT_CHECK_MS)
+        self.snapshot_timer.timeout.connect(self.check_snapshot)
+        self.snapshot_timer.start()
+        self.check_snapshot()
 
     # --- KPI Box ---
     def create_kpi_box(self, title, value, color):
@@ -178,13 +214,13 @@ class AdminReports(QWidget):
         return frame
 
     # --- Summary Box ---
-    def create_summary_box(self):
+    def create_summary_box(self, title, subtitle):
         frame = QFrame()
         frame.setObjectName("summaryBox")
 
-        self.summary_layout = QVBoxLayout(frame)
-        self.summary_layout.setContentsMargins(20, 20, 20, 20)
-        self.summary_layout.setSpacing(15)
+        layout = QVBoxLayout(frame)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
 
         # Header
         header_widget = QWidget()
@@ -192,151 +228,141 @@ class AdminReports(QWidget):
         header_layout.setContentsMargins(0, 0, 0, 0)
         header_layout.setSpacing(5)
 
-        title = QLabel("📋 Recent Activity")
-        title.setObjectName("chartTitle")
+        label_title = QLabel(title)
+        label_title.setObjectName("chartTitle")
 
-        subtitle = QLabel("System-wide activity in the past 7 days")
-        subtitle.setObjectName("chartSubtitle")
+        label_sub = QLabel(subtitle)
+        label_sub.setObjectName("chartSubtitle")
 
-        header_layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignLeft)
-        header_layout.addWidget(subtitle, alignment=Qt.AlignmentFlag.AlignLeft)
+        header_layout.addWidget(label_title, alignment=Qt.AlignmentFlag.AlignLeft)
+        header_layout.addWidget(label_sub, alignment=Qt.AlignmentFlag.AlignLeft)
 
-        self.summary_layout.addWidget(header_widget)
+        layout.addWidget(header_widget)
+        frame.layout_box = layout
         return frame
 
-    # --- Charts Helpers (NO CHANGES) ---
-    def _replace_chart(self, layout, new_canvas):
-        while layout.count() > 2:  # keep title + subtitle
-            old_item = layout.takeAt(2)
-            if old_item.widget():
-                old_item.widget().deleteLater()
-        layout.addWidget(new_canvas)
-
-    def add_line_chart(self, layout, x, y, label):
-        fig = Figure(figsize=(4, 3))
-        canvas = FigureCanvas(fig)
-        ax = fig.add_subplot(111)
-
+    # --- Snapshots (Panels/report_snapshots.py) ---
+    def check_snapshot(self):
+        """Timer tick: refresh the age shown and rebuild the snapshot once it is stale."""
+        self.update_snapshot_info()
+        if self._building:
+            return
         try:
-            x_dates = [datetime.datetime.strptime(m, "%Y-%m") for m in x]
-            ax.plot(x_dates, y, marker="o", label=label)
-            ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
-            fig.autofmt_xdate()
-        except Exception:
-            ax.plot(x, y, marker="o", label=label)
-
-        ax.set_ylabel("Requests")
-        ax.legend()
-        self._replace_chart(layout, canvas)
-
-    def add_pie_chart(self, layout, labels, sizes):
-        fig = Figure(figsize=(3, 3))
-        canvas = FigureCanvas(fig)
-        ax = fig.add_subplot(111)
-        ax.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=90)
-        ax.axis("equal")
-        self._replace_chart(layout, canvas)
-
-    def add_bar_chart(self, layout, labels, values, color="#9C27B0"):
-        fig = Figure(figsize=(4, 3))
-        canvas = FigureCanvas(fig)
-        ax = fig.add_subplot(111)
-        ax.bar(labels, values, color=color)
-        self._replace_chart(layout, canvas)
-
-    # --- Refresh Data (NO CHANGES) ---
-    def refresh_data(self):
+            version = data_version()
+        except Exception as e:
+            print(f"⚠️ Report snapshot check failed: {e}")
+            version = None
+        if is_stale(self.manifest, version):
+            self.recompute()
+
+    def recompute(self):
+        """Build a new snapshot in a worker thread; the page keeps showing the last one."""
+        if self._building:
+            return
+        self._building = True
+        self.recompute_btn.setEnabled(False)
+        self.snapshot_info.setText("⏳ Recomputing reports…")
+        threading.Thread(target=self._build_snapshot, daemon=True).start()
+
+    def _build_snapshot(self):
+        # Worker thread: queries and Agg rendering only, no widgets
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-
-            # KPIs
-            cursor.execute("SELECT COUNT(*) AS total FROM residents")
-            total_residents = cursor.fetchone()["total"]
-
-            cursor.execute("SELECT COUNT(*) AS total FROM requests")
-            total_docs = cursor.fetchone()["total"]
-
-            self.total_residents.value_label.setText(str(total_residents))
-            self.documents_issued.value_label.setText(str(total_docs))
-
-            # Requests over time
-            cursor.execute("""
-                SELECT DATE_FORMAT(request_date, '%Y-%m') AS month, COUNT(*) AS total
-                FROM requests
-                GROUP BY month ORDER BY month
-            """)
-            req_data = cursor.fetchall()
-            months = [r["month"] for r in req_data]
-            totals = [r["total"] for r in req_data]
-            self.add_line_chart(self.doc_requests_box.layout_box, months, totals, "Requests")
-
-            # Document type distribution
-            cursor.execute("SELECT document_type, COUNT(*) AS total FROM requests GROUP BY document_type")
-            type_data = cursor.fetchall()
-            labels = [r["document_type"] for r in type_data]
-            sizes = [r["total"] for r in type_data]
-            self.add_pie_chart(self.doc_distribution_box.layout_box, labels, sizes)
-
-            # Age demographics
-            cursor.execute("""
-                SELECT 
-                    SUM(age BETWEEN 0 AND 17) AS age_0_17,
-                    SUM(age BETWEEN 18 AND 35) AS age_18_35,
-                    SUM(age BETWEEN 36 AND 50) AS age_36_50,
-                    SUM(age BETWEEN 51 AND 65) AS age_51_65,
-                    SUM(age >= 66) AS age_65_plus
-                FROM residents
-            """)
-            age_data = cursor.fetchone()
-            groups = ["0-17", "18-35", "36-50", "51-65", "65+"]
-            values = [age_data["age_0_17"], age_data["age_18_35"],
-                      age_data["age_36_50"], age_data["age_51_65"],
-                      age_data["age_65_plus"]]
-            self.add_bar_chart(self.demographics_box.layout_box, groups, values)
-
-            # Activity summary (last 7 days)
-            cursor.execute("""
-                SELECT 'Staff' AS role, sa.action_type, COUNT(*) AS total
-                FROM staff_activity sa
-                WHERE sa.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                GROUP BY sa.action_type
-                UNION ALL
-                SELECT 'Admin' AS role, aa.action_type, COUNT(*) AS total
-                FROM admin_activity aa
-                WHERE aa.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                GROUP BY aa.action_type
-                ORDER BY total DESC
-                LIMIT 5
-            """)
-            act_data = cursor.fetchall()
-
-            # Clear old summary
-            for i in reversed(range(self.summary_layout.count())):
-                if i < 2:  # keep title/subtitle
-                    continue
-                item = self.summary_layout.itemAt(i)
-                if item and item.widget():
-                    item.widget().deleteLater()
-
-            # Add new summary rows
-            for act in act_data:
-                row = QHBoxLayout()
-                l = QLabel(f"[{act['role']}] {act['action_type']}")
-                l.setObjectName("summaryLabel")
-                v = QLabel(str(act["total"]))
-                v.setObjectName("summaryValue")
-                row.addWidget(l)
-                row.addStretch()
-                row.addWidget(v)
-                self.summary_layout.addLayout(row)
-
-            cursor.close()
-            conn.close()
-
+            result = build_snapshot()
         except Exception as e:
-            print(f"⚠️ Failed to refresh reports: {e}")
-
+            result = e
+        try:
+            self.snapshot_built.emit(result)
+        except RuntimeError:  # the panel was closed meanwhile
+            pass
+
+    def on_snapshot_built(self, result):
+        self._building = False
+        self.recompute_btn.setEnabled(True)
+        if isinstance(result, Exception):
+            print(f"⚠️ Failed to refresh reports: {result}")
+            self.update_snapshot_info(failed=True)
+            return
+        self.show_snapshot(load_snapshot())
+
+    def update_snapshot_info(self, failed=False):
+        if self._building:
+            return
+        if self.manifest is None:
+            text = "No report snapshot yet"
+        else:
+            text = (f"Snapshot {describe_age(snapshot_age(self.manifest))} · "
+                    f"data v{self.manifest['data_version']} · built in {self.manifest['build_ms']} ms")
+        if failed:
+            text += " · ⚠️ last recompute failed"
+        self.snapshot_info.setText(text)
+
+    def show_snapshot(self, manifest):
+        if manifest is None:
+            self.update_snapshot_info()
+            return
+        self.manifest = manifest
+        summary = manifest["summary"]
+
+        # KPIs
+        self.total_residents.value_label.setText(str(summary["total_residents"]))
+        self.documents_issued.value_label.setText(str(summary["total_requests"]))
+        turnaround = summary["turnaround"]
+        median = turnaround["overall"][1][0]
+        self.median_turnaround.value_label.setText("-" if median is None else f"{median:.1f} h")
+
+        # Charts
+        self._show_chart(self.doc_requests_box.layout_box, manifest["charts"]["requests_by_month"])
+        self._show_chart(self.doc_distribution_box.layout_box, manifest["charts"]["requests_by_type"])
+        self._show_chart(self.demographics_box.layout_box, manifest["charts"]["age_groups"])
+        self._show_chart(self.turnaround_box.layout_box, manifest["charts"]["turnaround_by_type"])
+
+        # Summary rows (activity, last 7 days; turnaround per staff member)
+        self._show_summary(self.summary_box.layout_box,
+                           [(f"[{role}] {action_type}", str(total))
+                            for role, action_type, total in summary["top_activity"]])
+        self._show_summary(self.staff_turnaround_box.layout_box,
+                           [(f"{name} ({total:,})", f"{hours[0]:.1f} / {hours[1]:.1f}")
+                            for name, total, hours in turnaround["by_staff"][:10]])
+
+        self.update_snapshot_info()
+
+    def _show_summary(self, layout, rows):
+        # Clear old rows
+        for i in reversed(range(layout.count())):
+            if i < 1:  # keep the header
+                continue
+            item = layout.takeAt(i)
+            if item.layout():
+                while item.layout().count():
+                    child = item.layout().takeAt(0)
+                    if child.widget():
+                        child.widget().deleteLater()
+            elif item.widget():
+                item.widget().deleteLater()
+
+        for label, value in rows:
+            row = QHBoxLayout()
+            l = QLabel(label)
+            l.setObjectName("summaryLabel")
+            v = QLabel(value)
+            v.setObjectName("summaryValue")
+            row.addWidget(l)
+            row.addStretch()
+            row.addWidget(v)
+            layout.addLayout(row)
+
+    def _show_chart(self, layout, path):
+        while layout.count() > 1:  # keep the chart box header
+            old_item = layout.takeAt(1)
+            if old_item.widget():
+                old_item.widget().deleteLater()
+        pixmap = QPixmap(path)
+        pixmap.setDevicePixelRatio(CHART_DPI / 100)  # charts are drawn at 100 dpi in layout units
+        chart = QLabel()
+        chart.setObjectName("chartImage")
+        chart.setPixmap(pixmap)
+        chart.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(chart)
 
 if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
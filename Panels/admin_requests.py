@@ -1,46 +1,38 @@
-import os
-import csv
 from datetime import datetime
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QComboBox, QFrame, QTableWidget, QTableWidgetItem,
     QHeaderView, QSizePolicy, QMessageBox, QScrollArea
 )
 from PyQt6.QtGui import QColor, QFont
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
 
 from Panels.db import get_connection
+from Panels.change_feed import record_change
+from Panels.change_poller import patch_table_rows
+from Panels.events import (
+    REQUEST_EVENTS, RequestChanged, RequestStatusChanged, ResyncRequired, get_event_bus, publish, remote_ids
+)
+from Panels.records import Request, query_rows
+from Panels.reporting import export_csv, export_pdf
+from Panels.serials import assign_control_number
+from Panels.turnaround import record_turnaround
+from Panels.styles import apply_style_scope
 from Panels.logger import log_admin_activity
 
 
 class AdminRequests(QWidget):
-    requests_changed = pyqtSignal()
-
     def __init__(self, admin_id):
         super().__init__()
         self.admin_id = admin_id
         self.load_stylesheet()
         self.init_ui()
         self.load_requests()
+        get_event_bus().subscribe(REQUEST_EVENTS, self.on_requests_changed, owner=self)
 
     def load_stylesheet(self):
-        """Load the external QSS stylesheet using standard project paths"""
-        try:
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            styles_dir = os.path.join(base_dir, "Styles")
-            qss_path = os.path.join(styles_dir, "admin_requests.qss")
-
-            if os.path.exists(qss_path):
-                with open(qss_path, "r", encoding="utf-8") as style_file:
-                    self.setStyleSheet(style_file.read())
-            else:
-                print(f"⚠️ QSS file not found at: {qss_path}")
-
-        except Exception as e:
-            print(f"Error loading stylesheet: {e}")
+        """Attach this panel to Styles/admin_requests.qss in the app-wide stylesheet"""
+        apply_style_scope(self, "admin_requests")
 
     # -----------------------------
     # UI Setup
@@ -262,226 +254,224 @@ class AdminRequests(QWidget):
     # -----------------------------
     # Load Data - UPDATED FOR NEW COLUMNS
     # -----------------------------
-    def load_requests(self):
-        """Fetch requests from DB, optionally filtered."""
-        conn = get_connection()
-        cursor = conn.cursor()
-
+    def request_query(self, ids=None):
+        """SQL and params for the requests matching the status filter (only ``ids`` if given)."""
         filter_status = self.filter_box.currentText()
 
-        base_query = """
+        query = """
             SELECT r.id, res.name AS resident_name, r.document_type, r.purpose,
                    r.request_date, r.status, r.completed_date, s.username AS handled_by
             FROM requests r
             JOIN residents res ON r.resident_id = res.id
             LEFT JOIN staff s ON r.created_by = s.id
+            WHERE 1=1
         """
+        params = []
 
-        if filter_status == "All":
-            cursor.execute(base_query + " ORDER BY r.request_date DESC")
-        else:
-            cursor.execute(base_query + " WHERE r.status=%s ORDER BY r.request_date DESC", (filter_status,))
+        if filter_status != "All":
+            query += " AND r.status=%s"
+            params.append(filter_status)
 
-        requests = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        if ids is not None:
+            query += f" AND r.id IN ({', '.join(['%s'] * len(ids))})"
+            params.extend(ids)
+
+        return query + " ORDER BY r.request_date DESC", params
+
+    def load_requests(self):
+        """Fetch requests from DB, optionally filtered."""
+        requests = query_rows(Request, *self.request_query())
 
         # Populate table
         self.table.setRowCount(len(requests))
+        self.row_ids = [req["id"] for req in requests]
         for row, req in enumerate(requests):
-            # Resident name with icon
-            resident_widget = QWidget()
-            resident_layout = QHBoxLayout(resident_widget)
-            resident_layout.setContentsMargins(10, 5, 10, 5)
-            resident_layout.setSpacing(8)
-
-            person_icon = QLabel("👤")
-            person_icon.setFixedWidth(20)
-            resident_name = QLabel(req["resident_name"])
-            resident_name.setObjectName("residentName")
-
-            resident_layout.addWidget(person_icon)
-            resident_layout.addWidget(resident_name)
-            resident_layout.addStretch()
-
-            self.table.setCellWidget(row, 0, resident_widget)
-
-            # Document type with icon
-            doc_widget = QWidget()
-            doc_layout = QHBoxLayout(doc_widget)
-            doc_layout.setContentsMargins(10, 5, 10, 5)
-            doc_layout.setSpacing(8)
-
-            doc_icon = QLabel("📄")
-            doc_icon.setFixedWidth(20)
-            doc_type = QLabel(req["document_type"])
-            doc_type.setObjectName("docType")
-
-            doc_layout.addWidget(doc_icon)
-            doc_layout.addWidget(doc_type)
-            doc_layout.addStretch()
-
-            self.table.setCellWidget(row, 1, doc_widget)
-
-            # Purpose
-            purpose_item = QTableWidgetItem(req["purpose"])
-            purpose_item.setFlags(purpose_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(row, 2, purpose_item)
-
-            # ✅ FIXED: Request date with proper formatting including seconds
-            date_widget = QWidget()
-            date_layout = QHBoxLayout(date_widget)
-            date_layout.setContentsMargins(10, 5, 10, 5)
-            date_layout.setSpacing(8)
-
-            calendar_icon = QLabel("📅")
-            calendar_icon.setFixedWidth(20)
-
-            # Format request date with seconds if it's a datetime
-            if req["request_date"]:
-                if hasattr(req["request_date"], 'strftime'):  # It's a datetime object
-                    request_date_str = req["request_date"].strftime("%Y-%m-%d %H:%M:%S")
-                else:  # It's already a string
-                    request_date_str = str(req["request_date"])
-            else:
-                request_date_str = "N/A"
-
-            date_label = QLabel(request_date_str)
-            date_label.setObjectName("dateLabel")
-
-            date_layout.addWidget(calendar_icon)
-            date_layout.addWidget(date_label)
-            date_layout.addStretch()
-
-            self.table.setCellWidget(row, 3, date_widget)
-
-            # --- Status Column ---
-            status_widget = QWidget()
-            status_layout = QHBoxLayout(status_widget)
-            status_layout.setContentsMargins(0, 0, 0, 0)
-            status_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            status_label = QLabel(req["status"])
-            status_label.setObjectName("statusBadge")
-            status_label.setProperty("statusType", req["status"].lower().replace(" ", "_"))
-            status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            status_label.setMinimumWidth(80)
-            status_label.setMaximumWidth(100)
-
-            status_layout.addWidget(status_label)
-            self.table.setCellWidget(row, 4, status_widget)
-
-            # ✅ FIXED: Completed Date with proper formatting including seconds
-            completed_date_widget = QWidget()
-            completed_date_layout = QHBoxLayout(completed_date_widget)
-            completed_date_layout.setContentsMargins(10, 5, 10, 5)
-            completed_date_layout.setSpacing(8)
-
-            completed_icon = QLabel("✅")
-            completed_icon.setFixedWidth(20)
-
-            # Format completed date with seconds if it exists
-            if req["completed_date"]:
-                if hasattr(req["completed_date"], 'strftime'):  # It's a datetime object
-                    completed_date_str = req["completed_date"].strftime("%Y-%m-%d %H:%M:%S")
-                else:  # It's already a string
-                    completed_date_str = str(req["completed_date"])
-            else:
-                completed_date_str = "—"
-
-            completed_date_label = QLabel(completed_date_str)
-            completed_date_label.setObjectName("dateLabel")
-
-            completed_date_layout.addWidget(completed_icon)
-            completed_date_layout.addWidget(completed_date_label)
-            completed_date_layout.addStretch()
-
-            self.table.setCellWidget(row, 5, completed_date_widget)
-
-            # --- Handled By Column ---
-            handled_by_item = QTableWidgetItem(req["handled_by"] or "—")
-            handled_by_item.setFlags(handled_by_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            handled_by_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 6, handled_by_item)
-
-            # --- Actions Column ---
-            actions_frame = QFrame()
-            actions_layout = QHBoxLayout(actions_frame)
-            actions_layout.setContentsMargins(8, 5, 8, 5)
-            actions_layout.setSpacing(6)
-            actions_layout.addStretch()
-
-            if req["status"] in ["Pending", "In Progress"]:
-                # Approve button
-                btn_approve = QPushButton("✓")
-                btn_approve.setFont(QFont("Segoe UI", 12))
-                btn_approve.setFixedSize(32, 25)
-                btn_approve.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_approve.setToolTip("Approve request")
-                btn_approve.setStyleSheet("""
-                    QPushButton {
-                        background-color: #D1FAE5;
-                        border: 1px solid #A7F3D0;
-                        border-radius: 6px;
-                        color: #065F46;
-                    }
-                    QPushButton:hover {
-                        background-color: #A7F3D0;
-                    }
-                """)
-                btn_approve.clicked.connect(lambda _, rid=req["id"]: self.approve_request(rid))
-                actions_layout.addWidget(btn_approve)
-
-                # Reject button
-                btn_reject = QPushButton("✗")
-                btn_reject.setFont(QFont("Segoe UI", 12))
-                btn_reject.setFixedSize(32, 25)
-                btn_reject.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_reject.setToolTip("Reject request")
-                btn_reject.setStyleSheet("""
-                    QPushButton {
-                        background-color: #FEE2E2;
-                        border: 1px solid #FECACA;
-                        border-radius: 6px;
-                        color: #DC2626;
-                    }
-                    QPushButton:hover {
-                        background-color: #FECACA;
-                    }
-                """)
-                btn_reject.clicked.connect(lambda _, rid=req["id"]: self.reject_request(rid))
-                actions_layout.addWidget(btn_reject)
-
-            elif req["status"] == "Completed":
-                # Reopen button
-                btn_reopen = QPushButton("🔁")
-                btn_reopen.setFont(QFont("Segoe UI", 12))
-                btn_reopen.setFixedSize(32, 25)
-                btn_reopen.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_reopen.setToolTip("Reopen request")
-                btn_reopen.setStyleSheet("""
-                    QPushButton {
-                        background-color: #FEF3C7;
-                        border: 1px solid #FDE68A;
-                        border-radius: 6px;
-                        color: #92400E;
-                    }
-                    QPushButton:hover {
-                        background-color: #FDE68A;
-                    }
-                """)
-                btn_reopen.clicked.connect(lambda _, rid=req["id"]: self.reopen_request(rid))
-                actions_layout.addWidget(btn_reopen)
-
-            actions_layout.addStretch()
-            self.table.setCellWidget(row, 7, actions_frame)  # Changed from 6 to 7
-            self.table.setRowHeight(row, 60)
+            self.fill_row(row, req)
 
         self.update_metrics()
 
+    def on_requests_changed(self, events):
+        """Event-bus handler: this panel reloads itself after its own changes, so only remote ones matter."""
+        if any(isinstance(e, ResyncRequired) for e in events):
+            self.load_requests()
+            return
+        ids = remote_ids(events, RequestChanged, "request_id") + remote_ids(events, RequestStatusChanged, "request_id")
+        if ids:
+            self.apply_changes(list(dict.fromkeys(ids)))
+
+    def apply_changes(self, ids):
+        """Patch the rows of requests ``ids`` instead of reloading the table."""
+        fresh = query_rows(Request, *self.request_query(ids))
+        patch_table_rows(self.table, self.row_ids, ids, fresh, self.fill_row)
+        self.update_metrics()
+
+    def fill_row(self, row, req):
+        # Resident name with icon
+        resident_widget = QWidget()
+        resident_layout = QHBoxLayout(resident_widget)
+        resident_layout.setContentsMargins(10, 5, 10, 5)
+        resident_layout.setSpacing(8)
+
+        person_icon = QLabel("👤")
+        person_icon.setFixedWidth(20)
+        resident_name = QLabel(req["resident_name"])
+        resident_name.setObjectName("residentName")
+
+        resident_layout.addWidget(person_icon)
+        resident_layout.addWidget(resident_name)
+        resident_layout.addStretch()
+
+        self.table.setCellWidget(row, 0, resident_widget)
+
+        # Document type with icon
+        doc_widget = QWidget()
+        doc_layout = QHBoxLayout(doc_widget)
+        doc_layout.setContentsMargins(10, 5, 10, 5)
+        doc_layout.setSpacing(8)
+
+        doc_icon = QLabel("📄")
+        doc_icon.setFixedWidth(20)
+        doc_type = QLabel(req["document_type"])
+        doc_type.setObjectName("docType")
+
+        doc_layout.addWidget(doc_icon)
+        doc_layout.addWidget(doc_type)
+        doc_layout.addStretch()
+
+        self.table.setCellWidget(row, 1, doc_widget)
+
+        # Purpose
+        purpose_item = QTableWidgetItem(req["purpose"])
+        purpose_item.setFlags(purpose_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self.table.setItem(row, 2, purpose_item)
+
+        # ✅ FIXED: Request date with proper formatting including seconds
+        date_widget = QWidget()
+        date_layout = QHBoxLayout(date_widget)
+        date_layout.setContentsMargins(10, 5, 10, 5)
+        date_layout.setSpacing(8)
+
+        calendar_icon = QLabel("📅")
+        calendar_icon.setFixedWidth(20)
+
+        # Format request date with seconds if it's a datetime
+        if req["request_date"]:
+            if hasattr(req["request_date"], 'strftime'):  # It's a datetime object
+                request_date_str = req["request_date"].strftime("%Y-%m-%d %H:%M:%S")
+            else:  # It's already a string
+                request_date_str = str(req["request_date"])
+        else:
+            request_date_str = "N/A"
+
+        date_label = QLabel(request_date_str)
+        date_label.setObjectName("dateLabel")
+
+        date_layout.addWidget(calendar_icon)
+        date_layout.addWidget(date_label)
+        date_layout.addStretch()
+
+        self.table.setCellWidget(row, 3, date_widget)
+
+        # --- Status Column ---
+        status_widget = QWidget()
+        status_layout = QHBoxLayout(status_widget)
+        status_layout.setContentsMargins(0, 0, 0, 0)
+        status_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        status_label = QLabel(req["status"])
+        status_label.setObjectName("statusBadge")
+        status_label.setProperty("statusType", req["status"].lower().replace(" ", "_"))
+        status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        status_label.setMinimumWidth(80)
+        status_label.setMaximumWidth(100)
+
+        status_layout.addWidget(status_label)
+        self.table.setCellWidget(row, 4, status_widget)
+
+        # ✅ FIXED: Completed Date with proper formatting including seconds
+        completed_date_widget = QWidget()
+        completed_date_layout = QHBoxLayout(completed_date_widget)
+        completed_date_layout.setContentsMargins(10, 5, 10, 5)
+        completed_date_layout.setSpacing(8)
+
+        completed_icon = QLabel("✅")
+        completed_icon.setFixedWidth(20)
+
+        # Format completed date with seconds if it exists
+        if req["completed_date"]:
+            if hasattr(req["completed_date"], 'strftime'):  # It's a datetime object
+                completed_date_str = req["completed_date"].strftime("%Y-%m-%d %H:%M:%S")
+            else:  # It's already a string
+                completed_date_str = str(req["completed_date"])
+        else:
+            completed_date_str = "—"
+
+        completed_date_label = QLabel(completed_date_str)
+        completed_date_label.setObjectName("dateLabel")
+
+        completed_date_layout.addWidget(completed_icon)
+        completed_date_layout.addWidget(completed_date_label)
+        completed_date_layout.addStretch()
+
+        self.table.setCellWidget(row, 5, completed_date_widget)
+
+        # --- Handled By Column ---
+        handled_by_item = QTableWidgetItem(req["handled_by"] or "—")
+        handled_by_item.setFlags(handled_by_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        handled_by_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 6, handled_by_item)
+
+        # --- Actions Column ---
+        actions_frame = QFrame()
+        actions_layout = QHBoxLayout(actions_frame)
+        actions_layout.setContentsMargins(8, 5, 8, 5)
+        actions_layout.setSpacing(6)
+        actions_layout.addStretch()
+
+        if req["status"] in ["Pending", "In Progress"]:
+            # Approve button
+            btn_approve = QPushButton("✓")
+            btn_approve.setObjectName("approveButton")
+            btn_approve.setFont(QFont("Segoe UI", 12))
+            btn_approve.setFixedSize(32, 25)
+            btn_approve.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn_approve.setToolTip("Approve request")
+            btn_approve.clicked.connect(lambda _, rid=req["id"]: self.approve_request(rid))
+            actions_layout.addWidget(btn_approve)
+
+            # Reject button
+            btn_reject = QPushButton("✗")
+            btn_reject.setObjectName("rejectButton")
+            btn_reject.setFont(QFont("Segoe UI", 12))
+            btn_reject.setFixedSize(32, 25)
+            btn_reject.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn_reject.setToolTip("Reject request")
+            btn_reject.clicked.connect(lambda _, rid=req["id"]: self.reject_request(rid))
+            actions_layout.addWidget(btn_reject)
+
+        elif req["status"] == "Completed":
+            # Reopen button
+            btn_reopen = QPushButton("🔁")
+            btn_reopen.setObjectName("reopenButton")
+            btn_reopen.setFont(QFont("Segoe UI", 12))
+            btn_reopen.setFixedSize(32, 25)
+            btn_reopen.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn_reopen.setToolTip("Reopen request")
+            btn_reopen.clicked.connect(lambda _, rid=req["id"]: self.reopen_request(rid))
+            actions_layout.addWidget(btn_reopen)
+
+        actions_layout.addStretch()
+        self.table.setCellWidget(row, 7, actions_frame)  # Changed from 6 to 7
+        self.table.setRowHeight(row, 60)
+
     # -----------------------------
     # Admin Actions (NO CHANGES TO LOGIC)
     # -----------------------------
+    def current_status(self, cursor, request_id):
+        cursor.execute("SELECT status FROM requests WHERE id=%s", (request_id,))
+        row = cursor.fetchone()
+        return row["status"] if row else None
+
     def approve_request(self, request_id):
         reply = QMessageBox.question(
             self, "Approve Request", "Approve this request as completed?",
@@ -490,11 +480,15 @@ class AdminRequests(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             conn = get_connection()
             cursor = conn.cursor()
+            old_status = self.current_status(cursor, request_id)
             completed_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             cursor.execute(
-                "UPDATE requests SET status='Completed', completed_date=%s WHERE id=%s",
+                "UPDATE requests SET status='Completed', completed_date=%s, version=version+1 WHERE id=%s",
                 (completed_time, request_id)
             )
+            assign_control_number(cursor, request_id)
+            record_turnaround(cursor, request_id)
+            record_change(cursor, "request", request_id, "update")
             conn.commit()
             cursor.close()
             conn.close()
@@ -502,7 +496,7 @@ class AdminRequests(QWidget):
             log_admin_activity(self.admin_id, "APPROVE_REQUEST", f"Approved request {request_id}")
             QMessageBox.information(self, "Approved", "Request marked as completed.")
             self.load_requests()
-            self.requests_changed.emit()
+            publish(RequestStatusChanged(request_id, old_status, "Completed"))
 
     def reject_request(self, request_id):
         reply = QMessageBox.question(
@@ -512,7 +506,9 @@ class AdminRequests(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             conn = get_connection()
             cursor = conn.cursor()
-            cursor.execute("UPDATE requests SET status='Rejected' WHERE id=%s", (request_id,))
+            old_status = self.current_status(cursor, request_id)
+            cursor.execute("UPDATE requests SET status='Rejected', version=version+1 WHERE id=%s", (request_id,))
+            record_change(cursor, "request", request_id, "update")
             conn.commit()
             cursor.close()
             conn.close()
@@ -520,7 +516,7 @@ class AdminRequests(QWidget):
             log_admin_activity(self.admin_id, "REJECT_REQUEST", f"Rejected request {request_id}")
             QMessageBox.warning(self, "Rejected", "Request has been rejected.")
             self.load_requests()
-            self.requests_changed.emit()
+            publish(RequestStatusChanged(request_id, old_status, "Rejected"))
 
     def reopen_request(self, request_id):
         reply = QMessageBox.question(
@@ -530,7 +526,9 @@ class AdminRequests(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             conn = get_connection()
             cursor = conn.cursor()
-            cursor.execute("UPDATE requests SET status='In Progress', completed_date=NULL WHERE id=%s", (request_id,))
+            old_status = self.current_status(cursor, request_id)
+            cursor.execute("UPDATE requests SET status='In Progress', completed_date=NULL, version=version+1 WHERE id=%s", (request_id,))
+            record_change(cursor, "request", request_id, "update")
             conn.commit()
             cursor.close()
             conn.close()
@@ -538,193 +536,18 @@ class AdminRequests(QWidget):
             log_admin_activity(self.admin_id, "REOPEN_REQUEST", f"Reopened request {request_id}")
             QMessageBox.information(self, "Reopened", "Request set back to 'In Progress'.")
             self.load_requests()
-            self.requests_changed.emit()
+            publish(RequestStatusChanged(request_id, old_status, "In Progress"))
 
     # -----------------------------
     # File Handling (NO CHANGES TO LOGIC)
     # -----------------------------
     def export_to_csv(self):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.id, res.name AS resident, r.document_type, r.purpose,
-                   r.request_date, r.status, r.completed_date, s.username AS handled_by
-            FROM requests r
-            JOIN residents res ON r.resident_id = res.id
-            LEFT JOIN staff s ON r.created_by = s.id
-            ORDER BY r.created_at DESC
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"requests_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "Resident", "Document Type", "Purpose", "Request Date", "Status",
-                "Completed Date", "Handled By"
-            ])
-            for row in rows:
-                # ✅ FIXED: Format dates properly for CSV export
-                request_date = row["request_date"]
-                if request_date and hasattr(request_date, 'strftime'):
-                    request_date_str = request_date.strftime("%Y-%m-%d %H:%M:%S")
-                else:
-                    request_date_str = str(request_date) if request_date else ""
-
-                completed_date = row["completed_date"]
-                if completed_date and hasattr(completed_date, 'strftime'):
-                    completed_date_str = completed_date.strftime("%Y-%m-%d %H:%M:%S")
-                else:
-                    completed_date_str = str(completed_date) if completed_date else ""
-
-                writer.writerow([
-                    row["resident"],
-                    row["document_type"],
-                    row["purpose"],
-                    request_date_str,
-                    row["status"],
-                    completed_date_str,
-                    row["handled_by"] or ""
-                ])
-
+        filename = export_csv("requests")
         QMessageBox.information(self, "Export Successful", f"Requests exported to:\n{filename}")
         log_admin_activity(self.admin_id, "EXPORT_REQUESTS", "Exported all requests to CSV.")
 
     def export_to_pdf(self):
         """Exports all requests to a PDF report (official format)."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.id, res.name AS resident, r.document_type, r.purpose,
-                   r.request_date, r.status, r.completed_date, s.username AS handled_by
-            FROM requests r
-            JOIN residents res ON r.resident_id = res.id
-            LEFT JOIN staff s ON r.created_by = s.id
-            ORDER BY r.created_at DESC
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"requests_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-
-        c = canvas.Canvas(filename, pagesize=landscape(letter))
-        width, height = landscape(letter)
-
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(1 * inch, height - 0.75 * inch, "Barangay Document Requests Report")
-
-        c.setFont("Helvetica", 10)
-        c.drawString(1 * inch, height - 1.05 * inch, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        headers = ["Resident", "Document Type", "Purpose", "Request Date", "Status", "Completed Date", "Handled By"]
-        x_positions = [0.5, 2.0, 3.5, 5.0, 6.5, 7.5, 8.5]
-        y = height - 1.5 * inch
-
-        c.setFont("Helvetica-Bold", 10)
-        for i, h in enumerate(headers):
-            c.drawString(x_positions[i] * inch, y, h)
-
-        c.line(0.5 * inch, y - 2, 10.5 * inch, y - 2)
-        y -= 0.25 * inch
-
-        c.setFont("Helvetica", 9)
-        for row in rows:
-            if y < 1 * inch:
-                c.showPage()
-                y = height - 1 * inch
-                c.setFont("Helvetica", 9)
-
-            # ✅ FIXED: Format dates properly for PDF export
-            request_date = row["request_date"]
-            if request_date and hasattr(request_date, 'strftime'):
-                request_date_str = request_date.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                request_date_str = str(request_date) if request_date else ""
-
-            completed_date = row["completed_date"]
-            if completed_date and hasattr(completed_date, 'strftime'):
-                completed_date_str = completed_date.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                completed_date_str = str(completed_date) if completed_date else "-"
-
-            c.drawString(x_positions[0] * inch, y, str(row["resident"]))
-            c.drawString(x_positions[1] * inch, y, str(row["document_type"]))
-            c.drawString(x_positions[2] * inch, y, str(row["purpose"])[:25])
-            c.drawString(x_positions[3] * inch, y, request_date_str)
-            c.drawString(x_positions[4] * inch, y, str(row["status"]))
-            c.drawString(x_positions[5] * inch, y, completed_date_str)
-            c.drawString(x_positions[6] * inch, y, str(row["handled_by"] or "-"))
-            y -= 0.25 * inch
-
-        c.save()
-
+        filename = export_pdf("requests")
         QMessageBox.information(self, "Export Successful", f"PDF report generated:\n{filename}")
         log_admin_activity(self.admin_id, "EXPORT_PDF", "Exported requests report to PDF.")
-
-    def export_to_pdf(self):
-        """Exports all requests to a PDF report (official format)."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.id, res.name AS resident, r.document_type, r.purpose,
-                   r.request_date, r.status, r.completed_date, s.username AS handled_by
-            FROM requests r
-            JOIN residents res ON r.resident_id = res.id
-            LEFT JOIN staff s ON r.created_by = s.id
-            ORDER BY r.created_at DESC
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"requests_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-
-        c = canvas.Canvas(filename, pagesize=landscape(letter))
-        width, height = landscape(letter)
-
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(1 * inch, height - 0.75 * inch, "Barangay Document Requests Report")
-
-        c.setFont("Helvetica", 10)
-        c.drawString(1 * inch, height - 1.05 * inch, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        headers = ["Resident", "Document Type", "Purpose", "Request Date", "Status", "Completed Date", "Handled By"]
-        x_positions = [0.5, 2.0, 3.5, 5.0, 6.5, 7.5, 8.5]
-        y = height - 1.5 * inch
-
-        c.setFont("Helvetica-Bold", 10)
-        for i, h in enumerate(headers):
-            c.drawString(x_positions[i] * inch, y, h)
-
-        c.line(0.5 * inch, y - 2, 10.5 * inch, y - 2)
-        y -= 0.25 * inch
-
-        c.setFont("Helvetica", 9)
-        for row in rows:
-            if y < 1 * inch:
-                c.showPage()
-                y = height - 1 * inch
-                c.setFont("Helvetica", 9)
-            c.drawString(x_positions[0] * inch, y, str(row["resident"]))
-            c.drawString(x_positions[1] * inch, y, str(row["document_type"]))
-            c.drawString(x_positions[2] * inch, y, str(row["purpose"])[:25])
-            c.drawString(x_positions[3] * inch, y, str(row["request_date"]))
-            c.drawString(x_positions[4] * inch, y, str(row["status"]))
-            c.drawString(x_positions[5] * inch, y, str(row["completed_date"] or "-"))
-            c.drawString(x_positions[6] * inch, y, str(row["handled_by"] or "-"))
-            y -= 0.25 * inch
-
-        c.save()
-
-        QMessageBox.information(self, "Export Successful", f"PDF report generated:\n{filename}")
-        log_admin_activity(self.admin_id, "EXPORT_PDF", "Exported requests report to PDF.")
\ No newline at end of file
@@ -1,42 +1,39 @@
-import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QFrame,
     QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QComboBox, QScrollArea
 )
-from PyQt6.QtCore import Qt, pyqtSignal  # ⬅️ ADD pyqtSignal
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QFont
+from Panels.addresses import resident_search
+from Panels.ages import age_sql
 from Panels.db import get_connection
+from Panels.change_feed import patch_rows, record_change
+from Panels.change_poller import patch_table_rows
+from Panels.facet_bar import FacetBar
+from Panels.events import RESIDENT_EVENTS, ResidentChanged, ResyncRequired, get_event_bus, publish, remote_ids
+from Panels.records import Resident, query_rows
+from Panels.reporting import export_csv, export_pdf
+from Panels.styles import apply_style_scope
 from Panels.logger import log_admin_activity
+from Panels.photos import delete_photo
+from Panels.thumbnail_loader import PHOTO_ROLE, TableThumbnails
 from functools import partial
-from datetime import datetime
 
 
 class AdminResidents(QWidget):
-    residents_changed = pyqtSignal()  # ⬅️ ADD THIS SIGNAL
-
     def __init__(self, admin_id):
         super().__init__()
         self.admin_id = admin_id
+        self.search_results = []  # rows of the current search, before the facet filters
         self.load_stylesheet()
         self.init_ui()
         self.load_staff_filter()
         self.load_residents()
+        get_event_bus().subscribe(RESIDENT_EVENTS, self.on_residents_changed, owner=self)
 
     def load_stylesheet(self):
-        """Load the external QSS stylesheet using standard project paths"""
-        try:
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            styles_dir = os.path.join(base_dir, "Styles")
-            qss_path = os.path.join(styles_dir, "admin_residents.qss")
-
-            if os.path.exists(qss_path):
-                with open(qss_path, "r") as style_file:
-                    self.setStyleSheet(style_file.read())
-            else:
-                print(f"⚠️ QSS file not found at: {qss_path}")
-
-        except Exception as e:
-            print(f"Error loading stylesheet: {e}")
+        """Attach this panel to Styles/admin_residents.qss in the app-wide stylesheet"""
+        apply_style_scope(self, "admin_residents")
 
     def init_ui(self):
         # Main scroll area
@@ -81,6 +78,12 @@ class AdminResidents(QWidget):
         self.export_pdf_btn.setObjectName("exportButton")
         self.export_pdf_btn.clicked.connect(self.export_to_pdf)
 
+        self.duplicates_btn = QPushButton("👥 Review Duplicates")
+        self.duplicates_btn.setObjectName("exportButton")
+        self.duplicates_btn.setToolTip("Possible duplicate residents found by `python -m Panels.cli dedup scan`")
+        self.duplicates_btn.clicked.connect(self.review_duplicates)
+
+        export_layout.addWidget(self.duplicates_btn)
         export_layout.addWidget(self.export_csv_btn)
         export_layout.addWidget(self.export_pdf_btn)
 
@@ -140,7 +143,7 @@ class AdminResidents(QWidget):
         filters_row.setSpacing(10)
 
         self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText("🔍 Search residents by name or address...")
+        self.search_bar.setPlaceholderText("🔍 Search by name or address, e.g. \"Purok 3\" or \"364 Mabini St\"...")
         self.search_bar.setObjectName("searchBar")
         self.search_bar.textChanged.connect(self.filter_residents)
         filters_row.addWidget(self.search_bar)
@@ -154,6 +157,11 @@ class AdminResidents(QWidget):
 
         table_layout.addLayout(filters_row)
 
+        # --- Facets Row (gender, civil status, ..., with live counts) ---
+        self.facet_bar = FacetBar()
+        self.facet_bar.changed.connect(self.apply_facets)
+        table_layout.addWidget(self.facet_bar)
+
         # --- Table ---
         self.table = QTableWidget()
         self.table.setObjectName("residentsTable")
@@ -193,6 +201,7 @@ class AdminResidents(QWidget):
         self.table.setSelectionMode(self.table.SelectionMode.SingleSelection)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
+        self.thumbnails = TableThumbnails(self.table)  # photos next to names, for rows in view
 
         table_layout.addWidget(self.table)
 
@@ -223,157 +232,168 @@ class AdminResidents(QWidget):
     # ---------------------------------------
     # Load all residents (NO CHANGES TO LOGIC)
     # ---------------------------------------
-    def load_residents(self, search_query="", staff_filter=None):
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        query = """
-            SELECT r.*, s.username AS added_by
+    def resident_query(self, search_query="", staff_filter=None, ids=None):
+        """SQL and params for the residents matching the filters (only ``ids`` if given)."""
+        query = f"""
+            SELECT r.*, {age_sql("r")} AS age, s.username AS added_by
             FROM residents r
             LEFT JOIN staff s ON r.created_by = s.id
             WHERE 1=1
         """
         params = []
 
-        if search_query:
-            query += " AND (r.name LIKE %s OR r.address LIKE %s)"
-            params.extend([f"%{search_query}%", f"%{search_query}%"])
+        if search_query:  # name / address, or "purok 3", "sitio ilaya", "364 mabini st"
+            search, search_params = resident_search(search_query, "r")
+            query += f" AND {search}"
+            params.extend(search_params)
 
         if staff_filter and staff_filter != "All Staff":
             query += " AND r.created_by = %s"
             params.append(staff_filter)
 
-        query += " ORDER BY r.created_at DESC"
-        cursor.execute(query, params)
-        residents = cursor.fetchall()
+        if ids is not None:
+            query += f" AND r.id IN ({', '.join(['%s'] * len(ids))})"
+            params.extend(ids)
 
-        cursor.close()
-        conn.close()
+        return query + " ORDER BY r.created_at DESC", params
+
+    def load_residents(self, search_query="", staff_filter=None):
+        self.current_filters = (search_query, staff_filter)
+        self.search_results = query_rows(Resident, *self.resident_query(search_query, staff_filter))
 
-        self.populate_table(residents)
+        self.populate_table(self.facet_bar.filter_rows(self.search_results))
+
+    def apply_facets(self):
+        """A facet was picked: re-filter the rows of the current search, no query needed."""
+        self.populate_table(self.facet_bar.filter_rows(self.search_results, refresh=False))
+
+    def on_residents_changed(self, events):
+        """Event-bus handler: this panel reloads itself after its own changes, so only remote ones matter."""
+        if any(isinstance(e, ResyncRequired) for e in events):
+            self.filter_residents()
+            return
+        ids = remote_ids(events, ResidentChanged, "resident_id")
+        if ids:
+            self.apply_changes(ids)
+
+    def apply_changes(self, ids):
+        """Patch the rows of residents ``ids`` instead of reloading the table."""
+        fresh = query_rows(Resident, *self.resident_query(*self.current_filters, ids=ids))
+        self.search_results = patch_rows(self.search_results, ids, fresh)
+        matching = {r["id"] for r in self.facet_bar.filter_rows(self.search_results)}
+        fresh = [r for r in fresh if r["id"] in matching]
+        patch_table_rows(self.table, self.row_ids, ids, fresh, self.fill_row)
+        self.thumbnails.refresh()
 
     # ---------------------------------------
     # Populate table - UPDATED FOR ALL COLUMNS
     # ---------------------------------------
     def populate_table(self, residents):
         self.table.setRowCount(len(residents))
+        self.row_ids = [r["id"] for r in residents]
 
         for row, r in enumerate(residents):
-            # Name
-            name_item = QTableWidgetItem(r["name"])
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(row, 0, name_item)
-
-            # Age with color coding for seniors
-            age_item = QTableWidgetItem(str(r["age"]))
-            age_item.setFlags(age_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            age_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if r["age"] >= 60:
-                age_item.setForeground(QColor(231, 76, 60))  # Red for seniors
-            self.table.setItem(row, 1, age_item)
-
-            # Gender with color coding
-            gender_item = QTableWidgetItem(r["gender"])
-            gender_item.setFlags(gender_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            gender_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if r["gender"].lower() == "female":
-                gender_item.setForeground(QColor(155, 89, 182))  # Purple
-            else:
-                gender_item.setForeground(QColor(52, 152, 219))  # Blue
-            self.table.setItem(row, 2, gender_item)
-
-            # Address
-            address_item = QTableWidgetItem(r["address"])
-            address_item.setFlags(address_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(row, 3, address_item)
-
-            # Contact
-            contact_item = QTableWidgetItem(r["contact_number"])
-            contact_item.setFlags(contact_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            contact_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 4, contact_item)
-
-            # Civil Status
-            civil_status_item = QTableWidgetItem(r["civil_status"])
-            civil_status_item.setFlags(civil_status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            civil_status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 5, civil_status_item)
-
-            # Employment Status
-            employment_item = QTableWidgetItem(r["employment_status"])
-            employment_item.setFlags(employment_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            employment_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 6, employment_item)
-
-            # Education Level
-            education_item = QTableWidgetItem(r["education_level"])
-            education_item.setFlags(education_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            education_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 7, education_item)
-
-            # Residency Years
-            residency_item = QTableWidgetItem(str(r["residency_years"]))
-            residency_item.setFlags(residency_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            residency_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 8, residency_item)
-
-            # Added By
-            added_by_item = QTableWidgetItem(r.get("added_by", "Unknown"))
-            added_by_item.setFlags(added_by_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            added_by_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 9, added_by_item)
-
-            # --- Actions - USING THE WORKING APPROACH FROM StaffRequests ---
-            actions = QFrame()
-            actions_layout = QHBoxLayout(actions)
-            actions_layout.setContentsMargins(8, 5, 8, 5)  # Same as working module
-            actions_layout.setSpacing(6)  # Same as working module
-            actions_layout.addStretch()
-
-            # Edit Button - using same approach as working module
-            edit_btn = QPushButton("✏️")
-            edit_btn.setFont(QFont("Segoe UI", 12))
-            edit_btn.setFixedSize(32, 23)
-            edit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            edit_btn.setToolTip("Edit resident")
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #F1F5F9;
-                    border: 1px solid #E2E8F0;
-                    border-radius: 6px;
-                }
-                QPushButton:hover {
-                    background-color: #E2E8F0;
-                }
-            """)
-            edit_btn.clicked.connect(partial(self.edit_resident, r["id"]))
-            actions_layout.addWidget(edit_btn)
-
-            # Delete button - using same approach as working module
-            delete_btn = QPushButton("🗑️")
-            delete_btn.setFont(QFont("Segoe UI", 12))
-            delete_btn.setFixedSize(32, 23)
-            delete_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            delete_btn.setToolTip("Delete resident")
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #FEE2E2;
-                    border: 1px solid #FECACA;
-                    border-radius: 6px;
-                    color: #DC2626;
-                }
-                QPushButton:hover {
-                    background-color: #FECACA;
-                }
-            """)
-            delete_btn.clicked.connect(partial(self.delete_resident, r["id"]))
-            actions_layout.addWidget(delete_btn)
-
-            actions_layout.addStretch()
-            self.table.setCellWidget(row, 10, actions)
-
-            # Set row height like the working module
-            self.table.setRowHeight(row, 60)
+            self.fill_row(row, r)
+        self.thumbnails.refresh()
+
+    def fill_row(self, row, r):
+        # Name
+        name_item = QTableWidgetItem(r["name"])
+        name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        name_item.setData(PHOTO_ROLE, r["photo_hash"])
+        self.table.setItem(row, 0, name_item)
+
+        # Age with color coding for seniors
+        age_item = QTableWidgetItem("" if r["age"] is None else str(r["age"]))
+        age_item.setFlags(age_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        age_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        if r["age"] is not None and r["age"] >= 60:
+            age_item.setForeground(QColor(231, 76, 60))  # Red for seniors
+        self.table.setItem(row, 1, age_item)
+
+        # Gender with color coding
+        gender_item = QTableWidgetItem(r["gender"])
+        gender_item.setFlags(gender_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        gender_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        if r["gender"].lower() == "female":
+            gender_item.setForeground(QColor(155, 89, 182))  # Purple
+        else:
+            gender_item.setForeground(QColor(52, 152, 219))  # Blue
+        self.table.setItem(row, 2, gender_item)
+
+        # Address
+        address_item = QTableWidgetItem(r["address"])
+        address_item.setFlags(address_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self.table.setItem(row, 3, address_item)
+
+        # Contact
+        contact_item = QTableWidgetItem(r["contact_number"])
+        contact_item.setFlags(contact_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        contact_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 4, contact_item)
+
+        # Civil Status
+        civil_status_item = QTableWidgetItem(r["civil_status"])
+        civil_status_item.setFlags(civil_status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        civil_status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 5, civil_status_item)
+
+        # Employment Status
+        employment_item = QTableWidgetItem(r["employment_status"])
+        employment_item.setFlags(employment_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        employment_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 6, employment_item)
+
+        # Education Level
+        education_item = QTableWidgetItem(r["education_level"])
+        education_item.setFlags(education_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        education_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 7, education_item)
+
+        # Residency Years
+        residency_item = QTableWidgetItem(str(r["residency_years"]))
+        residency_item.setFlags(residency_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        residency_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 8, residency_item)
+
+        # Added By
+        added_by_item = QTableWidgetItem(r.get("added_by", "Unknown"))
+        added_by_item.setFlags(added_by_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        added_by_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 9, added_by_item)
+
+        # --- Actions - USING THE WORKING APPROACH FROM StaffRequests ---
+        actions = QFrame()
+        actions_layout = QHBoxLayout(actions)
+        actions_layout.setContentsMargins(8, 5, 8, 5)  # Same as working module
+        actions_layout.setSpacing(6)  # Same as working module
+        actions_layout.addStretch()
+
+        # Edit Button - using same approach as working module
+        edit_btn = QPushButton("✏️")
+        edit_btn.setObjectName("editButton")
+        edit_btn.setFont(QFont("Segoe UI", 12))
+        edit_btn.setFixedSize(32, 23)
+        edit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        edit_btn.setToolTip("Edit resident")
+        edit_btn.clicked.connect(partial(self.edit_resident, r["id"]))
+        actions_layout.addWidget(edit_btn)
+
+        # Delete button - using same approach as working module
+        delete_btn = QPushButton("🗑️")
+        delete_btn.setObjectName("deleteButton")
+        delete_btn.setFont(QFont("Segoe UI", 12))
+        delete_btn.setFixedSize(32, 23)
+        delete_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        delete_btn.setToolTip("Delete resident")
+        delete_btn.clicked.connect(partial(self.delete_resident, r["id"]))
+        actions_layout.addWidget(delete_btn)
+
+        actions_layout.addStretch()
+        self.table.setCellWidget(row, 10, actions)
+
+        # Set row height like the working module
+        self.table.setRowHeight(row, 60)
 
     # ---------------------------------------
     # Filtering (NO CHANGES)
@@ -399,7 +419,6 @@ class AdminResidents(QWidget):
             dialog.setModal(True)
             if dialog.exec():
                 self.load_residents()
-                self.residents_changed.emit()  # ⬅️ ADD THIS
                 log_admin_activity(self.admin_id, "EDIT_RESIDENT", f"Edited resident ID {resident_id}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to edit resident:\n{e}")
@@ -441,105 +460,40 @@ class AdminResidents(QWidget):
                 conn = get_connection()
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM residents WHERE id=%s", (resident_id,))
+                delete_photo(cursor, resident_id)
+                record_change(cursor, "resident", resident_id, "delete")
                 conn.commit()
                 cursor.close()
                 conn.close()
 
                 log_admin_activity(self.admin_id, "DELETE_RESIDENT", f"Deleted resident ID {resident_id}")
                 self.load_residents()
-                self.residents_changed.emit()
+                publish(ResidentChanged(resident_id, "delete"))
                 QMessageBox.information(self, "Deleted", "Resident removed successfully.")
 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Database error:\n{e}")
 
+    # ---------------------------------------
+    # Duplicate review queue
+    # ---------------------------------------
+    def review_duplicates(self):
+        from Panels.duplicate_review import DuplicateReviewDialog
+        dialog = DuplicateReviewDialog(self, self.admin_id)
+        dialog.exec()
+        if dialog.changed:
+            self.filter_residents()
+
     # ---------------------------------------
     # File Handling: Export CSV (NO CHANGES)
     # ---------------------------------------
     def export_to_csv(self):
-        import csv
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.*, s.username AS added_by
-            FROM residents r
-            LEFT JOIN staff s ON r.created_by = s.id
-            ORDER BY r.created_at DESC
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"residents_admin_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Name", "Age", "Gender", "Address", "Contact", "Civil Status",
-                             "Employment", "Education", "Residency Years", "Added By"])
-            for r in rows:
-                writer.writerow([
-                    r["name"], r["age"], r["gender"], r["address"], r["contact_number"],
-                    r["civil_status"], r["employment_status"], r["education_level"],
-                    r["residency_years"], r.get("added_by", "Unknown")
-                ])
-
+        filename = export_csv("residents")
         QMessageBox.information(self, "Export Successful", f"Residents exported to:\n{filename}")
 
     # ---------------------------------------
-    # File Handling: Export PDF (NO CHANGES)
+    # File Handling: Export PDF
     # ---------------------------------------
     def export_to_pdf(self):
-        from reportlab.lib.pagesizes import landscape, letter
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import inch
-
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.*, s.username AS added_by
-            FROM residents r
-            LEFT JOIN staff s ON r.created_by = s.id
-            ORDER BY r.created_at DESC
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"residents_admin_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-
-        c = canvas.Canvas(filename, pagesize=landscape(letter))
-        width, height = landscape(letter)
-
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(1 * inch, height - 0.75 * inch, "Barangay Residents Report (Admin Copy)")
-
-        c.setFont("Helvetica", 10)
-        c.drawString(1 * inch, height - 1 * inch, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        y = height - 1.5 * inch
-        headers = ["Name", "Gender", "Address", "Added By"]
-        x_positions = [0.5, 2.5, 4.0, 7.0]
-
-        c.setFont("Helvetica-Bold", 10)
-        for i, h in enumerate(headers):
-            c.drawString(x_positions[i] * inch, y, h)
-
-        y -= 0.25 * inch
-        c.setFont("Helvetica", 9)
-        for r in rows:
-            if y < 1 * inch:
-                c.showPage()
-                y = height - 1 * inch
-                c.setFont("Helvetica", 9)
-            c.drawString(x_positions[0] * inch, y, r["name"])
-            c.drawString(x_positions[1] * inch, y, r["gender"])
-            c.drawString(x_positions[2] * inch, y, r["address"][:40])
-            c.drawString(x_positions[3] * inch, y, r.get("added_by", "Unknown"))
-            y -= 0.25 * inch
-
-        c.save()
-        QMessageBox.information(self, "Export Successful", f"PDF generated:\n{filename}")
\ No newline at end of file
+        filename = export_pdf("residents")
+        QMessageBox.information(self, "Export Successful", f"PDF generated:\n{filename}")
@@ -0,0 +1,170 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame,
+    QTableWidget, QTableWidgetItem, QScrollArea, QPlainTextEdit
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from Panels.slow_queries import LOG_PATH, SLOW_QUERY_MS, summarize
+from Panels.styles import apply_style_scope
+
+TOP_STATEMENTS = 20
+COLUMNS = ["Statement", "Calls", "Total ms", "Avg ms", "Max ms", "Avg Rows", "Called From", "Plan"]
+
+
+class AdminSlowQueries(QWidget):
+    """Slowest statements on this desk, from the slow-query log (Panels/slow_queries.py)."""
+
+    def __init__(self):
+        super().__init__()
+        self.summary = []
+
+        # --- Stylesheet (Styles/admin_slow_queries.qss) ---
+        apply_style_scope(self, "admin_slow_queries")
+
+        self.init_ui()
+        self.load_summary()
+
+    def init_ui(self):
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setObjectName("slowQueriesScroll")
+
+        content = QWidget()
+        content.setObjectName("slowQueriesContent")
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(25)
+
+        # --- Header Section ---
+        header_frame = QFrame()
+        header_frame.setObjectName("headerSection")
+        header_layout = QHBoxLayout(header_frame)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+
+        page_title = QLabel("Slow Queries")
+        page_title.setObjectName("pageTitle")
+        title_font = QFont()
+        title_font.setPointSize(18)
+        title_font.setBold(True)
+        page_title.setFont(title_font)
+        header_layout.addWidget(page_title, alignment=Qt.AlignmentFlag.AlignLeft)
+        header_layout.addStretch()
+
+        self.refresh_btn = QPushButton("🔄 Refresh")
+        self.refresh_btn.setObjectName("refreshButton")
+        self.refresh_btn.setFixedHeight(40)
+        self.refresh_btn.clicked.connect(self.load_summary)
+        header_layout.addWidget(self.refresh_btn, alignment=Qt.AlignmentFlag.AlignRight)
+        layout.addWidget(header_frame)
+
+        # --- Subtitle Section ---
+        main_subtitle = QLabel("Database Performance")
+        main_subtitle.setObjectName("mainSubtitle")
+        if SLOW_QUERY_MS > 0:
+            text = f"Statements that took longer than {SLOW_QUERY_MS:g} ms on this computer, logged in {LOG_PATH}"
+        else:
+            text = "Slow-query capture is off (BRMS_SLOW_QUERY_MS=0)"
+        description = QLabel(text)
+        description.setObjectName("description")
+        description.setWordWrap(True)
+        layout.addWidget(main_subtitle)
+        layout.addWidget(description)
+
+        # --- Statements Table Card ---
+        table_card = QFrame()
+        table_card.setObjectName("tableCard")
+        table_layout = QVBoxLayout(table_card)
+        table_layout.setContentsMargins(25, 25, 25, 25)
+        table_layout.setSpacing(15)
+
+        list_title = QLabel(f"Top {TOP_STATEMENTS} Statements by Total Time")
+        list_title.setObjectName("listTitle")
+        list_subtitle = QLabel("Calls of the same statement are grouped; select one to see its latest plan")
+        list_subtitle.setObjectName("listSubtitle")
+        table_layout.addWidget(list_title)
+        table_layout.addWidget(list_subtitle)
+
+        self.table = QTableWidget()
+        self.table.setObjectName("slowQueriesTable")
+        self.table.setColumnCount(len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+
+        header = self.table.horizontalHeader()
+        for i in range(len(COLUMNS)):
+            header.setSectionResizeMode(i, header.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(0, header.ResizeMode.Stretch)  # Statement
+
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(self.table.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(self.table.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(self.table.EditTrigger.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        self.table.setShowGrid(False)
+        self.table.setMinimumHeight(360)
+        self.table.itemSelectionChanged.connect(self.show_details)
+        table_layout.addWidget(self.table)
+
+        # --- Selected statement ---
+        details_title = QLabel("Latest Capture")
+        details_title.setObjectName("listTitle")
+        self.details = QPlainTextEdit()
+        self.details.setObjectName("queryDetails")
+        self.details.setReadOnly(True)
+        self.details.setMinimumHeight(220)
+        self.details.setPlaceholderText("Select a statement above")
+        table_layout.addWidget(details_title)
+        table_layout.addWidget(self.details)
+
+        layout.addWidget(table_card)
+        scroll.setWidget(content)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addWidget(scroll)
+
+    def load_summary(self):
+        """Re-read the log; it is written by every panel as it runs, so refresh shows new entries"""
+        self.summary = summarize(TOP_STATEMENTS)
+        self.details.clear()
+        self.table.setRowCount(len(self.summary))
+
+        for row, entry in enumerate(self.summary):
+            values = [
+                entry["fingerprint"],
+                f"{entry['calls']:,}",
+                f"{entry['total_ms']:,.0f}",
+                f"{entry['mean_ms']:,.0f}",
+                f"{entry['max_ms']:,.0f}",
+                f"{entry['rows']:,.0f}",
+                "\n".join(entry["callers"]),
+                "⚠️ Full scan" if entry["full_scan"] else "Indexed",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setToolTip(value)
+                if 1 <= column <= 5:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        self.table.resizeRowsToContents()
+
+    def show_details(self):
+        row = self.table.currentRow()
+        if not 0 <= row < len(self.summary):
+            return
+        sample = self.summary[row]["sample"]
+        lines = [
+            f"Last run:   {sample['at']}  ({sample['ms']:,.0f} ms, {sample['rows']} rows)",
+            f"Called from: {sample['caller']}",
+            f"Parameters: {sample['params']}",
+            "",
+            sample["sql"],
+            "",
+            "EXPLAIN:",
+        ]
+        if not sample["plan"]:
+            lines.append("  (not captured for this statement)")
+        for step in sample["plan"]:
+            lines.append(f"  {step.get('table')}: type={step.get('type')} key={step.get('key')} "
+                         f"rows={step.get('rows')} {step.get('Extra') or ''}".rstrip())
+        self.details.setPlainText("\n".join(lines))
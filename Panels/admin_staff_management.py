@@ -1,28 +1,19 @@
-import os
 from PyQt6.QtWidgets import QSizePolicy, QHeaderView
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFrame, QTableWidget, QTableWidgetItem
 )
+from Panels.styles import apply_style_scope
 # from PyQt6.QtCore import Qt
 
 class StaffManagementPage(QWidget):
     def __init__(self):
         super().__init__()
-        self.init_ui()
-
-        # --- Project Paths ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
 
-        qss_path = os.path.join(styles_dir, "admin_worker_management.qss")
+        # --- Apply Stylesheet (Styles/admin_worker_management.qss) ---
+        apply_style_scope(self, "admin_worker_management")
 
-        # --- Apply Stylesheet ---
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
+        self.init_ui()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
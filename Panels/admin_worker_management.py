@@ -1,26 +1,24 @@
-import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QPushButton,
     QTableWidget, QTableWidgetItem, QFrame, QMessageBox, QDialog, QFormLayout,
     QLabel, QScrollArea
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from Panels.db import get_connection, hash_password
+from Panels.change_feed import record_change
+from Panels.events import ACCOUNT_EVENTS, AccountChanged, get_event_bus, publish
+from Panels.styles import apply_style_scope
 from Panels.logger import log_admin_activity
 
 
 class AdminWorkerManagement(QWidget):
-    workers_changed = pyqtSignal()
-
     def __init__(self, admin_id=None):
         super().__init__()
         self.admin_id = admin_id
 
-        # --- Project Paths ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
-        qss_path = os.path.join(styles_dir, "admin_worker_management.qss")
+        # --- Stylesheet (Styles/admin_worker_management.qss) ---
+        apply_style_scope(self, "admin_worker_management")
 
         # Main scroll area
         scroll = QScrollArea()
@@ -207,16 +205,16 @@ class AdminWorkerManagement(QWidget):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.addWidget(scroll)
 
-        # Load stylesheet
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
-
         # Load users initially
         self.load_users()
         self.update_metrics()
+        get_event_bus().subscribe(ACCOUNT_EVENTS, self.on_accounts_changed, owner=self)
+
+    def on_accounts_changed(self, events):
+        """Event-bus handler: reload for account changes made at another desk"""
+        if any(getattr(e, "remote", True) for e in events):
+            self.load_users()
+            self.update_metrics()
 
     def create_metric_card(self, title, value, icon, color):
         """Create a metric card with left border accent"""
@@ -394,20 +392,11 @@ class AdminWorkerManagement(QWidget):
 
             # Edit Button
             btn_edit = QPushButton("✏️")
+            btn_edit.setObjectName("editButton")
             btn_edit.setFont(QFont("Segoe UI", 12))
             btn_edit.setFixedSize(32, 22)
             btn_edit.setCursor(Qt.CursorShape.PointingHandCursor)
             btn_edit.setToolTip("Edit user")
-            btn_edit.setStyleSheet("""
-                QPushButton {
-                    background-color: #F1F5F9;
-                    border: 1px solid #E2E8F0;
-                    border-radius: 6px;
-                }
-                QPushButton:hover {
-                    background-color: #E2E8F0;
-                }
-            """)
             btn_edit.clicked.connect(lambda _, u=user: self.edit_user_dialog(u))
             actions_layout.addWidget(btn_edit)
 
@@ -416,42 +405,22 @@ class AdminWorkerManagement(QWidget):
                 status_icon = "✅" if user["status"] == "inactive" else "⏸️"
                 status_tooltip = "Activate" if user["status"] == "inactive" else "Deactivate"
                 btn_toggle = QPushButton(status_icon)
+                btn_toggle.setObjectName("toggleButton")
                 btn_toggle.setFont(QFont("Segoe UI", 12))
                 btn_toggle.setFixedSize(32, 22)
                 btn_toggle.setCursor(Qt.CursorShape.PointingHandCursor)
                 btn_toggle.setToolTip(status_tooltip)
-                btn_toggle.setStyleSheet("""
-                    QPushButton {
-                        background-color: #F0FDF4;
-                        border: 1px solid #BBF7D0;
-                        border-radius: 6px;
-                        color: #166534;
-                    }
-                    QPushButton:hover {
-                        background-color: #DCFCE7;
-                    }
-                """)
                 btn_toggle.clicked.connect(lambda _, u=user: self.toggle_status(u))
                 actions_layout.addWidget(btn_toggle)
 
             # Delete button (prevent self-deletion)
             if not (user["role"] == "Admin" and user["id"] == self.admin_id):
                 btn_delete = QPushButton("🗑️")
+                btn_delete.setObjectName("deleteButton")
                 btn_delete.setFont(QFont("Segoe UI", 12))
                 btn_delete.setFixedSize(32, 22)
                 btn_delete.setCursor(Qt.CursorShape.PointingHandCursor)
                 btn_delete.setToolTip("Delete user")
-                btn_delete.setStyleSheet("""
-                    QPushButton {
-                        background-color: #FEE2E2;
-                        border: 1px solid #FECACA;
-                        border-radius: 6px;
-                        color: #DC2626;
-                    }
-                    QPushButton:hover {
-                        background-color: #FECACA;
-                    }
-                """)
                 btn_delete.clicked.connect(lambda _, uid=user["id"], uname=user["username"], role=user["role"]:
                                            self.delete_user(uid, uname, role))
                 actions_layout.addWidget(btn_delete)
@@ -528,6 +497,8 @@ class AdminWorkerManagement(QWidget):
                     "INSERT INTO admins (username, email, password, role) VALUES (%s, %s, %s, %s)",
                     (username, email, hashed_pw, "Admin")
                 )
+            account_id = cursor.lastrowid
+            record_change(cursor, role.lower(), account_id, "insert")
 
             conn.commit()
             cursor.close()
@@ -535,7 +506,7 @@ class AdminWorkerManagement(QWidget):
 
             log_admin_activity(self.admin_id, f"ADD_{role.upper()}", f"Added {role.lower()} {username}")
             self.load_users()
-            self.workers_changed.emit()
+            publish(AccountChanged(role.lower(), account_id, "insert"))
             dialog.accept()
             QMessageBox.information(self, "Success", f"{role} {username} added successfully.")
 
@@ -587,6 +558,7 @@ class AdminWorkerManagement(QWidget):
         else:
             query = "UPDATE staff SET email=%s WHERE id=%s"
             cursor.execute(query, (email, user_id))
+        record_change(cursor, "staff", user_id, "update")
 
         conn.commit()
         cursor.close()
@@ -594,7 +566,7 @@ class AdminWorkerManagement(QWidget):
 
         log_admin_activity(self.admin_id, "EDIT_STAFF", f"Updated staff {user_id}")
         self.load_users()
-        self.workers_changed.emit()  # ✅ ADDED: Emit signal for dashboard refresh
+        publish(AccountChanged("staff", user_id))
         dialog.accept()
         QMessageBox.information(self, "Success", "Staff updated successfully.")
 
@@ -618,13 +590,14 @@ class AdminWorkerManagement(QWidget):
                 else:  # Admin
                     cursor.execute("DELETE FROM admins WHERE id=%s", (user_id,))
                     log_admin_activity(self.admin_id, "DELETE_ADMIN", f"Deleted admin {username}")
+                record_change(cursor, role.lower(), user_id, "delete")
 
                 conn.commit()
                 cursor.close()
                 conn.close()
 
                 self.load_users()
-                self.workers_changed.emit()
+                publish(AccountChanged(role.lower(), user_id, "delete"))
                 QMessageBox.information(self, "Success", f"{role} '{username}' deleted successfully.")
 
             except Exception as e:
@@ -636,6 +609,7 @@ class AdminWorkerManagement(QWidget):
 
         new_status = "inactive" if user["status"] == "active" else "active"
         cursor.execute("UPDATE staff SET status=%s WHERE id=%s", (new_status, user["id"]))
+        record_change(cursor, "staff", user["id"], "update")
         conn.commit()
 
         cursor.close()
@@ -643,5 +617,5 @@ class AdminWorkerManagement(QWidget):
 
         log_admin_activity(self.admin_id, "TOGGLE_STAFF", f"Set {user['username']} to {new_status}")
         self.load_users()
-        self.workers_changed.emit()  # ✅ ADDED: Emit signal for dashboard refresh
+        publish(AccountChanged("staff", user["id"]))
         QMessageBox.information(self, "Success", f"Staff {user['username']} is now {new_status}.")
\ No newline at end of file
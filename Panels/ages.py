@@ -0,0 +1,86 @@
+# Panels/ages.py
+"""
+Ages from residents.birth_date.
+
+A stored age goes stale on every birthday, so residents keep birth_date
+(Migrations/008_birth_date.sql) and the age is worked out when it is read:
+
+- age_sql() is the SQL expression, for SELECTs that show or compare an age.
+- age_on() does the same in Python for a date already loaded.
+- bucket_counts() counts residents per age group (bucket_query() builds the SQL).
+  Each group is a birth_date range for today, so every count is a range scan of
+  idx_residents_birth_date rather than an age computed for every resident.
+
+No Qt imports here.
+"""
+import datetime
+
+
+def age_sql(alias=""):
+    """SQL for the age in whole years, NULL when the birth date is unknown."""
+    column = f"{alias}." if alias else ""
+    return f"TIMESTAMPDIFF(YEAR, {column}birth_date, CURDATE())"
+
+
+def years_before(day, years):
+    """``day`` ``years`` years earlier (Feb 29 becomes Feb 28 in common years)."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def age_on(birth_date, today=None):
+    """Whole years from ``birth_date`` to ``today``, None when the birth date is unknown."""
+    if birth_date is None:
+        return None
+    today = today or datetime.date.today()
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+
+def estimated_birth_date(age, on=None):
+    """The middle of the year a resident recorded as ``age`` on ``on`` was born in."""
+    on = on or datetime.date.today()
+    return years_before(on, age) - datetime.timedelta(days=182)
+
+
+def birth_date_range(low, high, today=None):
+    """
+    ``(after, until)`` such that age low..high means ``after < birth_date <= until``;
+    ``high`` None is open-ended and ``after`` is None then.
+    """
+    today = today or datetime.date.today()
+    until = years_before(today, low)
+    after = years_before(today, high + 1) if high is not None else None
+    return after, until
+
+
+def bucket_query(groups, where="", params=(), today=None):
+    """
+    ``(sql, params)`` counting residents per age group: one ``label, total`` row per
+    group of ``(label, low, high)`` ages (high None for "and over"). ``where`` narrows
+    the residents further, e.g. ``"status = %s"``.
+    """
+    parts, args = [], []
+    for label, low, high in groups:
+        after, until = birth_date_range(low, high, today)
+        sql = "SELECT %s AS label, COUNT(*) AS total FROM residents WHERE birth_date <= %s"
+        args.extend([label, until])
+        if after is not None:
+            sql += " AND birth_date > %s"
+            args.append(after)
+        if where:
+            sql += f" AND {where}"
+            args.extend(params)
+        parts.append(sql)
+    return " UNION ALL ".join(parts), args
+
+
+def bucket_counts(cursor, groups, where="", params=(), today=None):
+    """``{label: residents}`` per age group (see bucket_query); unknown birth dates are not counted."""
+    counts = {label: 0 for label, _, _ in groups}
+    if groups:
+        cursor.execute(*bucket_query(groups, where, params, today))
+        for row in cursor.fetchall():
+            counts[row["label"]] = int(row["total"] or 0)
+    return counts
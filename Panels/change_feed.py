@@ -0,0 +1,77 @@
+# Panels/change_feed.py
+"""
+Cross-workstation change feed.
+
+Every write to residents / requests / staff / admins also appends a change_log row
+(Migrations/003_change_log.sql) with record_change(), using the same cursor before the
+commit, so the entry exists exactly when the change does. Each desk runs a
+ChangeFeedPoller that asks "anything since seq N?" every few seconds and publishes the
+changes on the event bus (Panels/events.py) as remote events; panels then patch just
+those rows with patch_table_rows() instead of re-querying everything. A desk skips
+entries it wrote itself, since it already published those when it made them.
+
+This module is the data side (writing and reading change_log) that every writer and
+the CLI import. The poller and the QTableWidget patching are in change_poller.py.
+
+No Qt imports here.
+"""
+import os
+import socket
+
+# More pending entries than this and the poller asks panels for a full reload instead
+MAX_BATCH = 500
+
+ORIGIN = f"{socket.gethostname()}:{os.getpid()}"[:64]
+
+
+# -----------------------------
+# change_log access
+# -----------------------------
+def record_change(cursor, entity, entity_id, op):
+    """Log a change to ``entity`` ('resident', 'request', 'staff', 'admin'); call before commit."""
+    cursor.execute(
+        "INSERT INTO change_log (entity, entity_id, op, origin) VALUES (%s, %s, %s, %s)",
+        (entity, entity_id, op, ORIGIN)
+    )
+
+
+def latest_seq(cursor):
+    cursor.execute("SELECT COALESCE(MAX(seq), 0) AS seq FROM change_log")
+    return cursor.fetchone()["seq"]
+
+
+def changes_since(cursor, seq, limit=MAX_BATCH):
+    cursor.execute("""
+        SELECT seq, entity, entity_id, op, origin
+        FROM change_log
+        WHERE seq > %s
+        ORDER BY seq
+        LIMIT %s
+    """, (seq, limit))
+    return cursor.fetchall()
+
+
+def collapse_changes(entries, origin=ORIGIN):
+    """``{entity: {entity_id: op}}`` for other desks' entries; the latest op per row wins."""
+    changes = {}
+    for entry in entries:
+        if entry["origin"] != origin:
+            changes.setdefault(entry["entity"], {})[entry["entity_id"]] = entry["op"]
+    return changes
+
+
+# -----------------------------
+# Row-level updates
+# -----------------------------
+def patch_rows(rows, changed_ids, fresh_rows):
+    """
+    ``rows`` with ``changed_ids`` brought up to date the way change_poller.patch_table_rows() does it,
+    for panels that also keep the rows behind the table (e.g. to re-filter them).
+    """
+    fresh = {row["id"]: row for row in fresh_rows}
+    known = {row["id"] for row in rows}
+    added = [fresh[entity_id] for entity_id in changed_ids if entity_id in fresh and entity_id not in known]
+    changed = set(changed_ids)
+    kept = [fresh[row["id"]] if row["id"] in fresh else row
+            for row in rows if row["id"] not in changed or row["id"] in fresh]
+    return added[::-1] + kept
@@ -0,0 +1,119 @@
+# Panels/change_poller.py
+"""
+The GUI side of the change feed (Panels/change_feed.py).
+
+ChangeFeedPoller runs on each dashboard: every POLL_INTERVAL_MS it reads the change_log
+entries since the last seq it saw and publishes other desks' changes on the event bus
+as remote events. patch_table_rows() then brings just those rows of a panel's
+QTableWidget up to date.
+"""
+import os
+
+from PyQt6.QtCore import QObject, QTimer
+
+from Panels.change_feed import MAX_BATCH, changes_since, collapse_changes, latest_seq
+from Panels.db import get_connection
+from Panels.events import AccountChanged, RequestChanged, ResidentChanged, ResyncRequired, publish
+
+POLL_INTERVAL_MS = int(os.environ.get("BRMS_CHANGE_POLL_MS", "3000"))
+
+# AUTO_INCREMENT seqs are handed out before commit, so a slow transaction can make seq 10
+# visible after seq 11. Each poll re-reads this many seqs behind the newest one seen.
+REORDER_WINDOW = 50
+
+
+# -----------------------------
+# Remote events
+# -----------------------------
+def remote_events(changes):
+    """Event-bus events for a collapse_changes() result."""
+    events = []
+    for entity, ops in changes.items():
+        for entity_id, op in ops.items():
+            if entity == "resident":
+                events.append(ResidentChanged(entity_id, op, remote=True))
+            elif entity == "request":
+                events.append(RequestChanged(entity_id, op, remote=True))
+            elif entity in ("staff", "admin"):
+                events.append(AccountChanged(entity, entity_id, op, remote=True))
+    return events
+
+
+# -----------------------------
+# Poller
+# -----------------------------
+class ChangeFeedPoller(QObject):
+    def __init__(self, parent=None, interval_ms=POLL_INTERVAL_MS):
+        super().__init__(parent)
+        self.last_seq = None
+        self._floor = 0     # entries up to here predate the current (re)load
+        self._seen = set()  # seqs inside the reorder window that were already delivered
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.poll)
+
+    def start(self):
+        self.poll()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def poll(self):
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            try:
+                if self.last_seq is None:
+                    self.last_seq = self._floor = latest_seq(cursor)  # panels were just loaded
+                    return
+                entries = changes_since(cursor, max(0, self.last_seq - REORDER_WINDOW), MAX_BATCH + 1)
+                if len(entries) > MAX_BATCH:
+                    self.last_seq = self._floor = latest_seq(cursor)
+                    self._seen.clear()
+                    publish(ResyncRequired())
+                    return
+            finally:
+                cursor.close()
+                conn.close()
+        except Exception as e:
+            print(f"⚠️ Change feed poll failed: {e}")
+            return
+
+        new = [e for e in entries if e["seq"] > self._floor and e["seq"] not in self._seen]
+        if not new:
+            return
+        self._seen.update(e["seq"] for e in new)
+        self.last_seq = max(self.last_seq, new[-1]["seq"])
+        self._seen = {seq for seq in self._seen if seq > self.last_seq - REORDER_WINDOW}
+
+        for event in remote_events(collapse_changes(new)):
+            publish(event)
+
+
+# -----------------------------
+# Row-level table updates
+# -----------------------------
+def patch_table_rows(table, row_ids, changed_ids, fresh_rows, fill_row):
+    """
+    Bring ``changed_ids`` up to date in a QTableWidget without reloading it.
+
+    ``row_ids`` is the id shown on each table row and is kept in sync. ``fresh_rows`` are
+    the changed rows that still match the panel's filters: known rows are refilled, new
+    ones are inserted at the top (panels list newest first), and rows that were deleted
+    or no longer match are removed. ``fill_row(index, row)`` draws one row.
+    """
+    fresh = {row["id"]: row for row in fresh_rows}
+    for entity_id in changed_ids:
+        index = row_ids.index(entity_id) if entity_id in row_ids else None
+        row = fresh.get(entity_id)
+        if row is None:
+            if index is not None:
+                table.removeRow(index)
+                del row_ids[index]
+        elif index is None:
+            table.insertRow(0)
+            row_ids.insert(0, entity_id)
+            fill_row(0, row)
+        else:
+            fill_row(index, row)
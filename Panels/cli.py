@@ -0,0 +1,339 @@
+# Panels/cli.py
+"""
+Headless command line for the server: exports, report summaries, seeding and migrations
+without opening the GUI. Nothing here imports PyQt6 (matplotlib is only loaded by
+`report snapshot`, with its Agg backend), so it starts fast and can run from cron:
+
+    python -m Panels.cli export requests --format pdf
+    python -m Panels.cli export all --format csv --output-dir /srv/brims/exports
+    python -m Panels.cli report summary --json
+    python -m Panels.cli report snapshot               # pre-render the Reports page cache
+    python -m Panels.cli analytics --format parquet    # typed columnar hand-off (Panels/columnar_export.py)
+    python -m Panels.cli dedup scan --workers 4        # queue possible duplicate residents (Panels/dedup.py)
+    python -m Panels.cli address backfill              # parse addresses into purok / household columns
+    python -m Panels.cli slow-queries --top 10         # this desk's slowest statements (Panels/slow_queries.py)
+    python -m Panels.cli serials gaps --year 2026      # unused control numbers (Panels/serials.py)
+    python -m Panels.cli turnaround show --by staff    # P50/P90/P99 hours to complete (Panels/turnaround.py)
+    python -m Panels.cli productivity refresh          # daily staff rollups (Panels/productivity.py)
+    python -m Panels.cli seed --residents 10000        # same options as Panels.seed_data
+    python -m Panels.cli migrate --status              # same options as Panels.migrate
+
+    # crontab: monthly PDF pack on the 1st at 06:00
+    0 6 1 * *  cd /opt/brims && python -m Panels.cli export all --format pdf --output-dir /srv/brims/exports
+
+Exports use the same queries and layout as the panels' Export buttons (Panels/reporting.py).
+"""
+import argparse
+import json
+import sys
+from datetime import date, datetime
+
+from Panels.db import DEFAULT_DATABASE
+
+
+# -----------------------------
+# Commands
+# -----------------------------
+def cmd_export(args):
+    from Panels import reporting
+
+    names = list(reporting.EXPORTS) if args.name == "all" else [args.name]
+    write = reporting.export_pdf if args.format == "pdf" else reporting.export_csv
+    for name in names:
+        try:
+            filename = write(name, export_dir=args.output_dir, database=args.database)
+        except Exception as e:
+            print(f"❌ Export {name} failed: {e}")
+            return 1
+        print(f"📦 {name}: {filename}")
+    return 0
+
+
+def cmd_report(args):
+    if args.kind == "snapshot":
+        from Panels.report_snapshots import build_snapshot, snapshot_dir
+        try:
+            manifest = build_snapshot(args.database)
+        except Exception as e:
+            print(f"❌ Snapshot failed: {e}")
+            return 1
+        print(f"📦 Snapshot {manifest['dir']} (data v{manifest['data_version']}, "
+              f"{manifest['build_ms']} ms) in {snapshot_dir(args.database)}")
+        return 0
+
+    from Panels.reporting import report_summary
+    try:
+        summary = report_summary(args.database)
+    except Exception as e:
+        print(f"❌ Report failed: {e}")
+        return 1
+
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2, default=str)
+        print()
+        return 0
+
+    print(f"📊 {args.database} summary, {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print(f"  Residents: {summary['total_residents']:,}")
+    print(f"  Requests:  {summary['total_requests']:,}")
+    print("  Requests by month (last 12):")
+    for month, total in summary["requests_by_month"][-12:]:
+        print(f"    {month}  {total:>8,}")
+    print("  Requests by document type:")
+    for doc_type, total in summary["requests_by_type"]:
+        print(f"    {doc_type:<28}{total:>8,}")
+    print("  Residents by age:")
+    for group, total in summary["age_groups"]:
+        print(f"    {group:<8}{total:>8,}")
+    print("  Top activity (last 7 days):")
+    for role, action_type, total in summary["top_activity"]:
+        print(f"    [{role}] {action_type:<24}{total:>6,}")
+    turnaround = summary["turnaround"]
+    print(f"  Turnaround hours, P50 / P90 / P99 (last {turnaround['months']} months):")
+    for doc_type, total, hours in turnaround["by_type"]:
+        print(f"    {doc_type:<28}{total:>8,}  " + " / ".join(f"{h:.1f}" for h in hours))
+    return 0
+
+
+def cmd_analytics(args):
+    from Panels.columnar_export import export_datasets, have_parquet
+
+    if args.format == "parquet" and not have_parquet():
+        print("❌ Parquet needs pyarrow (pip install pyarrow); use --format csv.gz or auto.")
+        return 1
+    try:
+        manifest_path = export_datasets(args.datasets, args.format, args.output_dir, args.database)
+    except Exception as e:
+        print(f"❌ Analytics export failed: {e}")
+        return 1
+    print(f"✅ Manifest: {manifest_path}")
+    return 0
+
+
+def cmd_dedup(args):
+    from Panels import dedup
+
+    try:
+        if args.action == "keys":
+            print(f"✅ Keyed {dedup.refresh_keys(args.database, args.rekey):,} resident(s)")
+            return 0
+        keyed, found, pending = dedup.scan_registry(args.database, args.workers or dedup.DEDUP_WORKERS,
+                                                    args.rekey)
+    except Exception as e:
+        print(f"❌ Duplicate scan failed: {e}")
+        return 1
+    print(f"✅ Keyed {keyed:,} resident(s), found {found:,} possible duplicate pair(s); "
+          f"{pending:,} waiting for review")
+    return 0
+
+
+def cmd_address(args):
+    from Panels import addresses
+
+    try:
+        parsed = addresses.backfill_addresses(args.database, args.rebuild)
+        zones, unparsed = addresses.zone_summary(args.database, refresh=True)
+    except Exception as e:
+        print(f"❌ Address backfill failed: {e}")
+        return 1
+    print(f"✅ Parsed {parsed:,} address(es); {len(zones)} purok / sitio zone(s), "
+          f"{sum(z['households'] for z in zones):,} household(s)")
+    if unparsed:
+        print(f"⚠️ {unparsed:,} resident(s) still unparsed")
+    return 0
+
+
+def cmd_slow_queries(args):
+    from Panels.slow_queries import LOG_PATH, SLOW_QUERY_MS, summarize
+
+    summary = summarize(args.top)
+    if not summary:
+        print(f"✅ No statement over {SLOW_QUERY_MS:g} ms logged in {LOG_PATH}")
+        return 0
+    print(f"🐢 Slowest statements by total time (over {SLOW_QUERY_MS:g} ms, {LOG_PATH})")
+    for entry in summary:
+        flag = "  ⚠️ full scan" if entry["full_scan"] else ""
+        print(f"  {entry['total_ms']:>10,.0f} ms  {entry['calls']:>5}×  mean {entry['mean_ms']:>8,.0f} ms  "
+              f"max {entry['max_ms']:>8,.0f} ms{flag}")
+        print(f"      {', '.join(entry['callers'])}")
+        print(f"      {entry['fingerprint'][:160]}")
+    return 0
+
+
+def cmd_serials(args):
+    from Panels import serials
+
+    try:
+        if args.action == "backfill":
+            print(f"✅ Numbered {serials.backfill_control_numbers(args.database):,} completed request(s)")
+            return 0
+        gaps = serials.serial_gaps(args.year, args.database)
+    except Exception as e:
+        print(f"❌ Serials {args.action} failed: {e}")
+        return 1
+    if not gaps:
+        print("✅ No gaps in the control numbers")
+        return 0
+    for gap in gaps:
+        missing = ", ".join(f"{a}" if a == b else f"{a}-{b}" for a, b in gap["missing"])
+        state = "⏳ in use" if gap["open"] else "⚠️ abandoned"
+        print(f"  {gap['document_type']:<32} {gap['year']} block {gap['first']}-{gap['last']} "
+              f"({gap['workstation']}, {gap['reserved_at']:%Y-%m-%d %H:%M}) {state}: "
+              f"{gap['issued']} issued, missing {missing}")
+    return 0
+
+
+def cmd_turnaround(args):
+    from Panels import turnaround
+    from Panels.db import get_connection
+
+    if args.action == "rebuild":
+        try:
+            covered = turnaround.rebuild_sketches(args.database)
+        except Exception as e:
+            print(f"❌ Turnaround rebuild failed: {e}")
+            return 1
+        print(f"✅ Rebuilt turnaround sketches from {covered:,} completed request(s)")
+        return 0
+
+    try:
+        conn = get_connection(args.database)
+        cursor = conn.cursor()
+        try:
+            if args.by == "staff":  # keyed by staff id; the summary has the usernames
+                rows = turnaround.turnaround_summary(cursor, args.months)["by_staff"]
+            else:
+                rows = turnaround.turnaround_quantiles(cursor, args.by, args.months)
+        finally:
+            cursor.close()
+            conn.close()
+    except Exception as e:
+        print(f"❌ Turnaround show failed: {e}")
+        return 1
+    print(f"⏱️ Turnaround hours by {args.by}, last {args.months} months:")
+    print(f"    {'':<28}{'Requests':>9}{'P50':>9}{'P90':>9}{'P99':>9}")
+    for key, total, hours in rows:
+        print(f"    {key or 'All requests':<28}{total:>9,}" + "".join(f"{h:>9.1f}" for h in hours))
+    return 0
+
+
+def cmd_productivity(args):
+    from datetime import timedelta
+
+    from Panels import productivity
+
+    try:
+        if args.action in ("refresh", "rebuild"):
+            since = args.since
+            if since is None and args.action == "rebuild":
+                since = productivity.rebuild_start(args.database)
+            written = productivity.refresh_rollups(since, args.database)
+            print(f"✅ Wrote {written:,} staff/day rollup(s)")
+            return 0
+        end = date.today()
+        rows = productivity.productivity(end - timedelta(days=args.days - 1), end, args.period,
+                                         database=args.database)
+    except Exception as e:
+        print(f"❌ Productivity {args.action} failed: {e}")
+        return 1
+    print(f"📈 Staff productivity, last {args.days} days ({args.period}):")
+    print(f"    {'Staff':<20}{'Period':<12}{'Completed':>10}{'Registered':>11}{'Served≈':>9}{'Activity':>10}")
+    for row in rows:
+        period = f"{row['period']:%Y-%m-%d}" if row["period"] else "all"
+        print(f"    {row['username']:<20}{period:<12}{row['requests_completed']:>10,}"
+              f"{row['residents_registered']:>11,}{row['residents_served']:>9,}{row['activity']:>10,}")
+    return 0
+
+
+def cmd_seed(argv):
+    from Panels import seed_data
+    return seed_data.main(argv)
+
+
+def cmd_migrate(argv):
+    from Panels import migrate
+    return migrate.main(argv)
+
+
+# Subcommands that hand their options to an existing module's main()
+DELEGATED = {"seed": cmd_seed, "migrate": cmd_migrate}
+
+
+def main(argv=None):
+    from Panels.columnar_export import DATASETS
+    from Panels.reporting import EXPORTS
+
+    parser = argparse.ArgumentParser(prog="python -m Panels.cli", description="BRIMS command line (no GUI)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write a report as CSV or PDF")
+    export.add_argument("name", choices=list(EXPORTS) + ["all"])
+    export.add_argument("--format", choices=["csv", "pdf"], default="csv")
+    export.add_argument("--output-dir", help="default: ./exports")
+    export.add_argument("--database", default=DEFAULT_DATABASE)
+
+    report = commands.add_parser("report", help="print report figures, or pre-render the Reports page")
+    report.add_argument("kind", choices=["summary", "snapshot"])
+    report.add_argument("--json", action="store_true", help="print JSON instead of text")
+    report.add_argument("--database", default=DEFAULT_DATABASE)
+
+    analytics = commands.add_parser("analytics", help="typed columnar export of the raw tables")
+    analytics.add_argument("--datasets", nargs="*", choices=list(DATASETS), help="default: all")
+    analytics.add_argument("--format", choices=["auto", "parquet", "csv.gz"], default="auto",
+                           help="auto: Parquet when pyarrow is installed, else gzip CSV")
+    analytics.add_argument("--output-dir", help="default: ./exports")
+    analytics.add_argument("--database", default=DEFAULT_DATABASE)
+
+    dedup = commands.add_parser("dedup", help="find possible duplicate residents for review")
+    dedup.add_argument("action", choices=["scan", "keys"], help="keys: only fill in missing blocking keys")
+    dedup.add_argument("--workers", type=int, default=None, help="scoring processes (default: CPU count)")
+    dedup.add_argument("--rekey", action="store_true", help="recompute every resident's keys, not just missing ones")
+    dedup.add_argument("--database", default=DEFAULT_DATABASE)
+
+    address = commands.add_parser("address", help="parse resident addresses into purok / household columns")
+    address.add_argument("action", choices=["backfill"])
+    address.add_argument("--rebuild", action="store_true", help="re-parse every address, not just new ones")
+    address.add_argument("--database", default=DEFAULT_DATABASE)
+
+    slow = commands.add_parser("slow-queries", help="summarize this desk's slow-query log")
+    slow.add_argument("--top", type=int, default=20, help="statements to list, by total time")
+
+    serials = commands.add_parser("serials", help="document control numbers")
+    serials.add_argument("action", choices=["gaps", "backfill"],
+                         help="gaps: unused numbers per block; backfill: number past completed requests")
+    serials.add_argument("--year", type=int, default=None, help="gaps for this year (default: current)")
+    serials.add_argument("--database", default=DEFAULT_DATABASE)
+
+    turnaround = commands.add_parser("turnaround", help="request turnaround quantiles")
+    turnaround.add_argument("action", choices=["show", "rebuild"],
+                            help="rebuild: recompute every sketch from requests.turnaround_hours "
+                                 "(completions wait for it; run while the desks are idle)")
+    turnaround.add_argument("--by", choices=["all", "document_type", "staff"], default="document_type")
+    turnaround.add_argument("--months", type=int, default=12, help="months to merge, this one included")
+    turnaround.add_argument("--database", default=DEFAULT_DATABASE)
+
+    productivity = commands.add_parser("productivity", help="daily staff productivity rollups")
+    productivity.add_argument("action", choices=["refresh", "rebuild", "show"],
+                              help="refresh: from the newest rollup; rebuild: from the oldest retained activity")
+    productivity.add_argument("--since", type=date.fromisoformat, default=None,
+                              help="refresh/rebuild from this day (YYYY-MM-DD); archived days keep their activity")
+    productivity.add_argument("--period", choices=["total", "week", "day"], default="total")
+    productivity.add_argument("--days", type=int, default=28, help="days to show, today included")
+    productivity.add_argument("--database", default=DEFAULT_DATABASE)
+
+    commands.add_parser("seed", add_help=False, help="Panels.seed_data (see: seed --help)")
+    commands.add_parser("migrate", add_help=False, help="Panels.migrate (see: migrate --help)")
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command in DELEGATED:
+        return DELEGATED[args.command](rest)
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    handlers = {"export": cmd_export, "report": cmd_report, "analytics": cmd_analytics, "dedup": cmd_dedup,
+                "address": cmd_address, "slow-queries": cmd_slow_queries, "serials": cmd_serials,
+                "turnaround": cmd_turnaround, "productivity": cmd_productivity}
+    return handlers[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# Panels/conflict_dialog.py
+"""
+Optimistic concurrency for the resident and request edit dialogs.
+
+residents and requests carry a ``version`` column (Migrations/005_row_versions.sql) that
+every content write bumps. An edit dialog remembers the version it loaded and saves with
+versioned_update(), whose UPDATE only matches while the row is still at that version, so
+nothing is locked while the dialog is open. If another desk saved first, nothing is
+written and ConflictDialog shows what changed so the user can overwrite it, take the
+other desk's version, or keep editing.
+"""
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView
+)
+
+from Panels.db import get_connection
+from Panels.styles import apply_style_scope
+
+
+# -----------------------------
+# Versioned writes
+# -----------------------------
+def versioned_update(cursor, table, row_id, version, values):
+    """
+    ``UPDATE table SET <values>, version=version+1 WHERE id=row_id AND version=version``.
+
+    Returns False, having changed nothing, when the row was saved elsewhere since
+    ``version`` was read (or deleted).
+    """
+    assignments = ", ".join(f"{column}=%s" for column in values)
+    cursor.execute(
+        f"UPDATE {table} SET {assignments}, version=version+1 WHERE id=%s AND version=%s",
+        (*values.values(), row_id, version)
+    )
+    return cursor.rowcount == 1
+
+
+def current_row(table, entity, row_id):
+    """``(row, last change_log entry)`` as saved now; row is None if it was deleted."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM {table} WHERE id=%s", (row_id,))
+    row = cursor.fetchone()
+    cursor.execute("""
+        SELECT origin, changed_at
+        FROM change_log
+        WHERE entity=%s AND entity_id=%s
+        ORDER BY seq DESC
+        LIMIT 1
+    """, (entity, row_id))
+    change = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return row, change
+
+
+# -----------------------------
+# Dialog
+# -----------------------------
+class ConflictDialog(QDialog):
+    """
+    Side-by-side view of the user's edit and the version another desk saved.
+
+    ``fields`` is ``[(label, loaded, mine, theirs)]``; only fields where mine and theirs
+    differ are listed, and the ones both sides changed are marked. After exec(),
+    ``choice`` is KEEP_MINE, USE_THEIRS or None (keep editing).
+    """
+    KEEP_MINE = "keep_mine"
+    USE_THEIRS = "use_theirs"
+
+    def __init__(self, parent, what, fields, change=None):
+        super().__init__(parent)
+        self.choice = None
+        self.setWindowTitle("Edit Conflict")
+        self.setMinimumWidth(560)
+        apply_style_scope(self, "conflict_dialog")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(25, 20, 25, 20)
+        layout.setSpacing(12)
+
+        title = QLabel(f"This {what} was changed at another desk")
+        title.setObjectName("conflictTitle")
+        title.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
+        layout.addWidget(title)
+
+        detail = "Your changes have not been saved."
+        if change:
+            detail = (f"Saved from {change['origin']} at "
+                      f"{change['changed_at'].strftime('%I:%M %p')} while you were editing. ") + detail
+        subtitle = QLabel(detail)
+        subtitle.setObjectName("conflictSubtitle")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        differing = [f for f in fields if _shown(f[2]) != _shown(f[3])]
+        table = QTableWidget(len(differing), 3)
+        table.setObjectName("conflictTable")
+        table.setHorizontalHeaderLabels(["Field", "Your edit", "Saved by other desk"])
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        any_both_changed = False
+        for row, (label, loaded, mine, theirs) in enumerate(differing):
+            both_changed = _shown(mine) != _shown(loaded) and _shown(theirs) != _shown(loaded)
+            any_both_changed = any_both_changed or both_changed
+            table.setItem(row, 0, QTableWidgetItem(f"⚠️ {label}" if both_changed else label))
+            table.setItem(row, 1, QTableWidgetItem(_shown(mine)))
+            table.setItem(row, 2, QTableWidgetItem(_shown(theirs)))
+        layout.addWidget(table)
+
+        hint = QLabel("⚠️ marks fields both of you changed.")
+        hint.setObjectName("conflictHint")
+        hint.setVisible(any_both_changed)
+        layout.addWidget(hint)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        btn_cancel = QPushButton("Keep Editing")
+        btn_cancel.setObjectName("cancelButton")
+        btn_cancel.clicked.connect(self.reject)
+        btn_theirs = QPushButton("Use Their Version")
+        btn_theirs.setObjectName("useTheirsButton")
+        btn_theirs.clicked.connect(lambda: self.choose(self.USE_THEIRS))
+        btn_mine = QPushButton("Overwrite with Mine")
+        btn_mine.setObjectName("keepMineButton")
+        btn_mine.clicked.connect(lambda: self.choose(self.KEEP_MINE))
+        for btn in (btn_cancel, btn_theirs, btn_mine):
+            btn.setFixedHeight(38)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            buttons.addWidget(btn)
+        layout.addLayout(buttons)
+
+    def choose(self, choice):
+        self.choice = choice
+        self.accept()
+
+
+def _shown(value):
+    return "" if value is None else str(value)
@@ -1,13 +1,13 @@
 # create_test_users.py
 import bcrypt
-from Panels.db import get_connection
+from Panels.db import DEFAULT_DATABASE, get_connection
 
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
-def create_test_users():
+def create_test_users(database=DEFAULT_DATABASE):
     try:
-        conn = get_connection()
+        conn = get_connection(database)
         cursor = conn.cursor()
 
         # ✅ Test Admin
@@ -37,4 +37,5 @@ def create_test_users():
         print(f"⚠️ Failed to create test users: {e}")
 
 if __name__ == "__main__":
+    # For bulk synthetic residents/requests/activity, see seed_data.py
     create_test_users()
@@ -1,16 +1,26 @@
 # Panels/db.py
+import os
 import pymysql
 from pymysql.cursors import DictCursor
 import bcrypt   # ✅ add this
 
-def get_connection():
+from Panels.slow_queries import TimedDictCursor
+
+# Benchmarks and scripts point the whole app at a scratch database with BRMS_DATABASE
+DEFAULT_DATABASE = os.environ.get("BRMS_DATABASE", "brms_db")
+
+def get_connection(database=DEFAULT_DATABASE, **options):
+    # database=None connects to the server only (used by scripts that create databases)
+    # extra options go straight to pymysql.connect (e.g. local_infile=True for the seeder)
+    # DictCursor rows, timed: statements over BRMS_SLOW_QUERY_MS are logged (Panels/slow_queries.py)
     return pymysql.connect(
         host="localhost",
         user="root",
         password="",
-        database="brms_db",
-        cursorclass=pymysql.cursors.DictCursor,
-        autocommit=False
+        database=database,
+        cursorclass=TimedDictCursor,
+        autocommit=False,
+        **options
     )
 
 # ✅ Hash a plain text password
@@ -0,0 +1,477 @@
+# Panels/dedup.py
+"""
+Fuzzy duplicate-resident detection.
+
+Comparing every resident with every other is O(n²), so residents are grouped by blocking
+keys stored in indexed columns (Migrations/006_resident_match_keys.sql):
+
+    name_key     Soundex of the surname + given-name initial   "Juan dela Cruz Jr." -> C620J
+    contact_key  last 10 digits of the contact number           "+63 917 123 4567"   -> 9171234567
+
+and only residents sharing a key are scored against each other. A score combines name
+similarity (after dropping accents, middle initials, suffixes and the dela/de los/san
+particles) with the contact number, age and address when both records have them.
+
+- ResidentDialog calls find_matches() on save: two indexed lookups, then scoring.
+- scan_registry() fills in missing keys, then streams the registry block by block to a
+  pool of worker processes and stores every pair scoring at least REVIEW_SCORE in
+  duplicate_candidates, the queue admins work through in DuplicateReviewDialog
+  (Panels/duplicate_review.py), merging or dismissing each pair.
+
+    python -m Panels.cli dedup scan --workers 4
+
+No Qt imports here.
+"""
+import os
+import re
+import unicodedata
+from collections import deque
+from itertools import groupby
+from multiprocessing import Pool
+
+from pymysql.cursors import SSCursor
+
+from Panels.ages import age_sql
+from Panels.change_feed import record_change
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+REVIEW_SCORE = float(os.environ.get("BRMS_DEDUP_REVIEW_SCORE", "0.8"))
+DEDUP_WORKERS = int(os.environ.get("BRMS_DEDUP_WORKERS", "0")) or os.cpu_count() or 1
+
+# Blocks larger than this (a very common surname) are compared by sorted neighbourhood:
+# each resident against the next BLOCK_WINDOW in name order, not against all of them.
+MAX_BLOCK = 400
+BLOCK_WINDOW = 40
+JOB_ROWS = 5_000        # residents sent to a worker at a time
+KEY_BATCH = 2_000
+
+PARTICLES = frozenset({"de", "del", "dela", "della", "la", "las", "los", "delos", "san", "santa", "sta", "sto"})
+GLUED_PARTICLES = ("delos", "delas", "dela")
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv"})
+
+_SOUNDEX = {letter: digit for digits, digit in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"),
+                                                ("l", "4"), ("mn", "5"), ("r", "6"))
+            for letter in digits}
+
+
+# -----------------------------
+# Normalization and keys
+# -----------------------------
+def _fold(text):
+    """Lowercase ASCII: "Peña" -> "pena"."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return text.encode("ascii", "ignore").decode("ascii").lower()
+
+
+def parse_name(name):
+    """
+    ``(given, middle, surname, suffix, full)`` for a resident name.
+
+    "Cruz, Juan" is read as "Juan Cruz". ``middle`` holds the middle initials; initials
+    and surname particles are left out of ``full``, so "Juan M. dela Cruz Jr." gives
+    ("juan", "m", "cruz", "jr", "juan cruz").
+    """
+    name = _fold(name)
+    if "," in name:
+        last, _, first = name.partition(",")
+        name = f"{first} {last}"
+    tokens = re.findall(r"[a-z]+", name)
+
+    suffix = ""
+    while tokens and tokens[-1] in SUFFIXES:
+        suffix = tokens.pop()
+    if not tokens:
+        return "", "", "", suffix, ""
+
+    words = tokens[:1] + [_unglue(t) for t in tokens[1:] if t not in PARTICLES]
+    middle = "".join(w[0] for w in words[1:-1])
+    words = [w for w in words if len(w) > 1] or words
+    return words[0], middle, words[-1], suffix, " ".join(words)
+
+
+def _unglue(word):
+    # "Delacruz" / "Delossantos" written as one word
+    for particle in GLUED_PARTICLES:
+        if word.startswith(particle) and len(word) - len(particle) >= 3:
+            return word[len(particle):]
+    return word
+
+
+def soundex(word):
+    word = _fold(word)
+    word = re.sub(r"[^a-z]", "", word)
+    if not word:
+        return ""
+    code, previous = word[0].upper(), _SOUNDEX.get(word[0])
+    for letter in word[1:]:
+        digit = _SOUNDEX.get(letter)
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in "hw":  # h and w do not separate letters with the same code
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def name_key(name):
+    """Blocking key for ``name``; "" when there is nothing to key on."""
+    given, _, surname, _, _ = parse_name(name)
+    if not surname:
+        return ""
+    return soundex(surname) + (given[0].upper() if given != surname else "")
+
+
+def contact_key(contact_number):
+    """Last 10 digits of a contact number (drops +63 / 0 prefixes); None if too short."""
+    digits = re.sub(r"\D", "", contact_number or "")
+    return digits[-10:] if len(digits) >= 7 else None
+
+
+# -----------------------------
+# Scoring
+# -----------------------------
+def trigrams(text):
+    """Character trigrams of ``text`` with word boundaries marked, e.g. " ju", "jua", ..."""
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2)) if text else frozenset()
+
+
+def similarity(a, b):
+    """Dice coefficient of two trigram sets (0..1); independent of word order."""
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+def name_similarity(a, b):
+    """
+    Mean of the spelling similarity (trigrams) and the share of words that sound alike
+    (Soundex), so "Jon" / "Juan" still count as close. ``a`` / ``b`` are profile names.
+    """
+    spelling_a, sound_a = a
+    spelling_b, sound_b = b
+    sound = 2 * len(sound_a & sound_b) / (len(sound_a) + len(sound_b)) if sound_a and sound_b else 0.0
+    return (similarity(spelling_a, spelling_b) + sound) / 2
+
+
+def profile(row):
+    """Precomputed comparison fields for ``(id, name, age, address, contact_number)``."""
+    resident_id, name, age, address, contact = row
+    _, middle, _, suffix, full = parse_name(name)
+    address = " ".join(re.findall(r"[a-z0-9]+", _fold(address)))
+    name = (trigrams(full), frozenset(soundex(word) for word in full.split()))
+    return resident_id, full, name, (middle, suffix), age or None, trigrams(address), contact_key(contact)
+
+
+def score_pair(a, b):
+    """``(score, reasons)`` for two profiles; score is 0..1."""
+    _, _, name_a, (middle_a, suffix_a), age_a, address_a, contact_a = a
+    _, _, name_b, (middle_b, suffix_b), age_b, address_b, contact_b = b
+
+    name = name_similarity(name_a, name_b)
+    reasons = ["same name" if name == 1.0 else f"name {name:.0%}"]
+
+    support = []
+    if contact_a and contact_b:
+        support.append(1.0 if contact_a == contact_b else 0.0)
+        if contact_a == contact_b:
+            reasons.append("same contact")
+    age_gap = abs(age_a - age_b) if age_a and age_b else None
+    if age_gap is not None:
+        support.append(1.0 if age_gap <= 1 else 0.5 if age_gap <= 3 else 0.0)
+        if age_gap <= 1:
+            reasons.append("same age" if age_gap == 0 else "age ±1")
+    if address_a and address_b:
+        address = similarity(address_a, address_b)
+        support.append(address)
+        if address >= 0.8:
+            reasons.append("same address" if address == 1.0 else f"address {address:.0%}")
+
+    # Only the name counts when there is nothing else to compare
+    score = 0.7 * name + 0.3 * (sum(support) / len(support) if support else name)
+    if middle_a and middle_b and middle_a != middle_b:
+        score *= 0.8
+        reasons.append("middle initials differ")
+    if suffix_a and suffix_b and suffix_a != suffix_b:
+        score *= 0.7
+        reasons.append(f"{suffix_a.title()}./{suffix_b.title()}.")
+    if age_gap is not None and age_gap > 15:
+        score *= 0.8
+        reasons.append(f"ages {age_gap} years apart")
+    return round(score, 3), ", ".join(reasons)
+
+
+def score_block(block, threshold=REVIEW_SCORE):
+    """
+    Pairs within one block of ``(id, name, age, address, contact_number)`` rows scoring
+    at least ``threshold``: ``[(id_a, id_b, score, reasons)]`` with id_a < id_b.
+    """
+    profiles = sorted((profile(row) for row in block), key=lambda p: (p[1], p[0]))
+    window = len(profiles) if len(profiles) <= MAX_BLOCK else BLOCK_WINDOW
+    # The name is 70% of the score: skip pairs whose names alone rule them out
+    min_name = (threshold - 0.3) / 0.7
+    found = []
+    for i, a in enumerate(profiles):
+        for b in profiles[i + 1:i + 1 + window]:
+            if name_similarity(a[2], b[2]) < min_name:
+                continue
+            score, reasons = score_pair(a, b)
+            if score >= threshold:
+                found.append((min(a[0], b[0]), max(a[0], b[0]), score, reasons))
+    return found
+
+
+def score_blocks(blocks, threshold=REVIEW_SCORE):
+    """score_block() over a batch of blocks (one pool job)."""
+    return [pair for block in blocks for pair in score_block(block, threshold)]
+
+
+# -----------------------------
+# Save-time check
+# -----------------------------
+def find_matches(cursor, name, contact_number, age=None, address=None, exclude_id=None, threshold=REVIEW_SCORE):
+    """
+    Residents that look like ``name`` / ``contact_number``, best first, as dict rows with
+    ``score`` and ``reasons`` added. Exact name or contact matches are always included.
+
+    Looks only at the name_key and contact_key blocks, plus an exact name match among
+    rows not keyed yet. A name with no key (no surname to code) skips the name_key block,
+    which would otherwise be every other keyless resident.
+    """
+    columns = f"SELECT id, name, {age_sql()} AS age, address, contact_number FROM residents"
+    cursor.execute(f"""
+        {columns} WHERE name_key = %s
+        UNION {columns} WHERE contact_key = %s
+        UNION {columns} WHERE name_key IS NULL AND name = %s
+    """, (name_key(name) or None, contact_key(contact_number), name))
+
+    mine = profile((None, name, age, address, contact_number))
+    matches = []
+    for row in cursor.fetchall():
+        if row["id"] == exclude_id:
+            continue
+        score, reasons = score_pair(mine, profile((row["id"], row["name"], row["age"],
+                                                   row["address"], row["contact_number"])))
+        exact = (row["name"].casefold() == name.casefold()
+                 or (contact_number and row["contact_number"] == contact_number))
+        if exact or score >= threshold:
+            matches.append(dict(row, score=score, reasons=reasons))
+    return sorted(matches, key=lambda m: -m["score"])
+
+
+# -----------------------------
+# Batch scan
+# -----------------------------
+def refresh_keys(database=DEFAULT_DATABASE, rekey=False):
+    """Compute name_key / contact_key for residents that lack them (all of them with ``rekey``)."""
+    reader = get_connection(database)
+    writer = get_connection(database)
+    cursor = reader.cursor(SSCursor)
+    write = writer.cursor()
+    updated = 0
+    try:
+        write.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS resident_keys (
+                id INT PRIMARY KEY, name_key CHAR(5) NOT NULL, contact_key VARCHAR(10) NULL
+            ) ENGINE=InnoDB
+        """)
+        cursor.execute(f"SELECT id, name, contact_number FROM residents"
+                       f"{'' if rekey else ' WHERE name_key IS NULL'}")
+        while True:
+            rows = cursor.fetchmany(KEY_BATCH)
+            if not rows:
+                break
+            write.executemany("INSERT INTO resident_keys (id, name_key, contact_key) VALUES (%s, %s, %s)",
+                              [(rid, name_key(name), contact_key(contact)) for rid, name, contact in rows])
+            write.execute("""
+                UPDATE residents r JOIN resident_keys k ON r.id = k.id
+                SET r.name_key = k.name_key, r.contact_key = k.contact_key
+            """)
+            write.execute("DELETE FROM resident_keys")
+            writer.commit()
+            updated += len(rows)
+    finally:
+        cursor.close()
+        reader.close()
+        write.close()
+        writer.close()
+    return updated
+
+
+def _blocks(cursor, key_column):
+    cursor.execute(f"""
+        SELECT id, name, {age_sql()} AS age, address, contact_number, {key_column}
+        FROM residents
+        WHERE {key_column} <> ''
+        ORDER BY {key_column}, id
+    """)
+    while True:
+        rows = cursor.fetchmany(JOB_ROWS)
+        if not rows:
+            return
+        yield from rows
+
+
+def _jobs(rows):
+    """Group consecutive rows by key into blocks of 2+, and blocks into ~JOB_ROWS-row jobs."""
+    job, size = [], 0
+    for _, group in groupby(rows, key=lambda row: row[-1]):
+        block = [row[:-1] for row in group]
+        if len(block) < 2:
+            continue
+        job.append(block)
+        size += len(block)
+        if size >= JOB_ROWS:
+            yield job
+            job, size = [], 0
+    if job:
+        yield job
+
+
+def find_candidates(database=DEFAULT_DATABASE, workers=DEDUP_WORKERS, threshold=REVIEW_SCORE):
+    """``{(id_a, id_b): (score, reasons)}`` over the name_key and contact_key blocks."""
+    pairs = {}
+
+    def collect(found):
+        for a, b, score, reasons in found:
+            if score > pairs.get((a, b), (0,))[0]:
+                pairs[(a, b)] = (score, reasons)
+
+    conn = get_connection(database)
+    try:
+        for key_column in ("name_key", "contact_key"):
+            cursor = conn.cursor(SSCursor)
+            try:
+                jobs = _jobs(_blocks(cursor, key_column))
+                if workers < 2:
+                    for job in jobs:
+                        collect(score_blocks(job, threshold))
+                    continue
+                with Pool(workers) as pool:
+                    pending = deque()
+                    for job in jobs:
+                        pending.append(pool.apply_async(score_blocks, (job, threshold)))
+                        if len(pending) >= workers * 2:  # keep reading only as fast as workers score
+                            collect(pending.popleft().get())
+                    for result in pending:
+                        collect(result.get())
+            finally:
+                cursor.close()
+    finally:
+        conn.close()
+    return pairs
+
+
+def store_candidates(pairs, database=DEFAULT_DATABASE):
+    """Queue ``pairs`` for review; reviewed pairs keep their status. Returns the Pending count."""
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        rows = [(a, b, score, reasons[:255]) for (a, b), (score, reasons) in pairs.items()]
+        for start in range(0, len(rows), KEY_BATCH):
+            cursor.executemany("""
+                INSERT INTO duplicate_candidates (resident_a, resident_b, score, reasons)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    reasons = IF(status = 'Pending', VALUES(reasons), reasons),
+                    score = IF(status = 'Pending', VALUES(score), score)
+            """, rows[start:start + KEY_BATCH])
+        # Pairs whose resident was deleted since the last scan
+        cursor.execute("""
+            DELETE dc FROM duplicate_candidates dc
+            LEFT JOIN residents a ON a.id = dc.resident_a
+            LEFT JOIN residents b ON b.id = dc.resident_b
+            WHERE dc.status = 'Pending' AND (a.id IS NULL OR b.id IS NULL)
+        """)
+        conn.commit()
+        cursor.execute("SELECT COUNT(*) AS pending FROM duplicate_candidates WHERE status = 'Pending'")
+        return cursor.fetchone()["pending"]
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def scan_registry(database=DEFAULT_DATABASE, workers=DEDUP_WORKERS, rekey=False):
+    """Key, block, score and queue the whole registry. Returns ``(keyed, pairs found, pending)``."""
+    keyed = refresh_keys(database, rekey)
+    pairs = find_candidates(database, workers)
+    return keyed, len(pairs), store_candidates(pairs, database)
+
+
+# -----------------------------
+# Review queue
+# -----------------------------
+def pending_candidates(limit=200, database=DEFAULT_DATABASE):
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT dc.id, dc.resident_a, dc.resident_b, dc.score, dc.reasons,
+               a.name AS name_a, b.name AS name_b
+        FROM duplicate_candidates dc
+        JOIN residents a ON a.id = dc.resident_a
+        JOIN residents b ON b.id = dc.resident_b
+        WHERE dc.status = 'Pending'
+        ORDER BY dc.score DESC, dc.id
+        LIMIT %s
+    """, (limit,))
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return rows
+
+
+def dismiss_candidate(candidate_id, reviewer_id, database=DEFAULT_DATABASE):
+    """Mark a pair as two different people; later scans leave it alone."""
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE duplicate_candidates
+        SET status = 'Dismissed', reviewed_by = %s, reviewed_at = NOW()
+        WHERE id = %s
+    """, (reviewer_id, candidate_id))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def merge_residents(keep_id, drop_id, reviewer_id, database=DEFAULT_DATABASE):
+    """
+    Move ``drop_id``'s requests to ``keep_id`` and delete ``drop_id``, in one transaction.
+
+    Returns the ids of the requests that moved.
+    """
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        conn.begin()
+        cursor.execute("SELECT id FROM residents WHERE id IN (%s, %s) FOR UPDATE", (keep_id, drop_id))
+        if len(cursor.fetchall()) != 2:
+            raise ValueError("one of the residents no longer exists")
+
+        cursor.execute("SELECT id FROM requests WHERE resident_id = %s FOR UPDATE", (drop_id,))
+        moved = [row["id"] for row in cursor.fetchall()]
+        cursor.execute("UPDATE requests SET resident_id = %s, version = version + 1 WHERE resident_id = %s",
+                       (keep_id, drop_id))
+        for request_id in moved:
+            record_change(cursor, "request", request_id, "update")
+
+        cursor.execute("DELETE FROM residents WHERE id = %s", (drop_id,))
+        cursor.execute("DELETE FROM resident_photos WHERE resident_id = %s", (drop_id,))
+        record_change(cursor, "resident", drop_id, "delete")
+
+        cursor.execute("""
+            UPDATE duplicate_candidates
+            SET status = 'Merged', reviewed_by = %s, reviewed_at = NOW()
+            WHERE resident_a = LEAST(%s, %s) AND resident_b = GREATEST(%s, %s)
+        """, (reviewer_id, keep_id, drop_id, keep_id, drop_id))
+        cursor.execute("""
+            DELETE FROM duplicate_candidates
+            WHERE status = 'Pending' AND (resident_a = %s OR resident_b = %s)
+        """, (drop_id, drop_id))
+        conn.commit()
+        return moved
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,5 +1,19 @@
 # document_templates.py
 
+# Where the resident's photo goes on the ID; ViewRequestDialog replaces it with the picture
+PHOTO_PLACEHOLDER = "[Photo Here]"
+
+
+def stamp_control_number(document, control_number):
+    """The document with its control number (Panels/serials.py) under the title."""
+    lines = document.split("\n")
+    for index, line in enumerate(lines):
+        if line.strip():
+            lines.insert(index + 1, f"Control No. {control_number}")
+            break
+    return "\n".join(lines)
+
+
 # Sample document templates
 def generate_barangay_clearance(resident_name, address, purpose="Employment"):
     return f"""
@@ -59,7 +73,7 @@ Issued this ______ day of ____________, 20__.
 _________________________
 Barangay Captain
 
-[Photo Here] [Signature of Bearer]
+{PHOTO_PLACEHOLDER} [Signature of Bearer]
 """
 
 
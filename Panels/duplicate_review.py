@@ -0,0 +1,211 @@
+# Panels/duplicate_review.py
+"""
+Review queue for possible duplicate residents (AdminResidents' "Review Duplicates").
+
+Lists the Pending pairs `python -m Panels.cli dedup scan` stored in duplicate_candidates
+(Panels/dedup.py), best score first, and shows the selected pair side by side. The admin
+merges the pair, keeping either record (the other one's requests move to it and it is
+deleted), or dismisses it as two different people.
+"""
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView, QMessageBox
+)
+
+from Panels.db import get_connection
+from Panels.dedup import dismiss_candidate, merge_residents, pending_candidates
+from Panels.events import RequestChanged, ResidentChanged, publish
+from Panels.logger import log_admin_activity
+from Panels.staff_resident_dialog import RESIDENT_FIELDS
+from Panels.styles import apply_style_scope
+
+
+class DuplicateReviewDialog(QDialog):
+    """Work through duplicate_candidates; ``changed`` is True once anything was merged."""
+
+    def __init__(self, parent, admin_id):
+        super().__init__(parent)
+        self.admin_id = admin_id
+        self.changed = False
+        self.candidates = []
+        self.pair = {}
+        self.setWindowTitle("Possible Duplicate Residents")
+        self.setMinimumSize(820, 640)
+        apply_style_scope(self, "duplicate_review")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(25, 20, 25, 20)
+        layout.setSpacing(12)
+
+        title = QLabel("Possible Duplicate Residents")
+        title.setObjectName("reviewTitle")
+        title.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
+        layout.addWidget(title)
+
+        self.subtitle = QLabel()
+        self.subtitle.setObjectName("reviewSubtitle")
+        self.subtitle.setWordWrap(True)
+        layout.addWidget(self.subtitle)
+
+        self.pairs_table = QTableWidget(0, 4)
+        self.pairs_table.setObjectName("pairsTable")
+        self.pairs_table.setHorizontalHeaderLabels(["Score", "Resident A", "Resident B", "Why"])
+        self.pairs_table.verticalHeader().setVisible(False)
+        self.pairs_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.pairs_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.pairs_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        header = self.pairs_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.pairs_table.itemSelectionChanged.connect(self.show_pair)
+        layout.addWidget(self.pairs_table, 1)
+
+        self.compare_table = QTableWidget(0, 3)
+        self.compare_table.setObjectName("compareTable")
+        self.compare_table.setHorizontalHeaderLabels(["Field", "Resident A", "Resident B"])
+        self.compare_table.verticalHeader().setVisible(False)
+        self.compare_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.compare_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.compare_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.compare_table, 1)
+
+        buttons = QHBoxLayout()
+        btn_close = QPushButton("Close")
+        btn_close.setObjectName("cancelButton")
+        btn_close.clicked.connect(self.accept)
+        buttons.addWidget(btn_close)
+        buttons.addStretch()
+        self.btn_dismiss = QPushButton("Not Duplicates")
+        self.btn_dismiss.setObjectName("dismissButton")
+        self.btn_dismiss.clicked.connect(self.dismiss_pair)
+        self.btn_keep_a = QPushButton("Keep A, Merge B")
+        self.btn_keep_a.setObjectName("mergeButton")
+        self.btn_keep_a.clicked.connect(lambda: self.merge_pair(keep="a"))
+        self.btn_keep_b = QPushButton("Keep B, Merge A")
+        self.btn_keep_b.setObjectName("mergeButton")
+        self.btn_keep_b.clicked.connect(lambda: self.merge_pair(keep="b"))
+        for btn in (btn_close, self.btn_dismiss, self.btn_keep_a, self.btn_keep_b):
+            btn.setFixedHeight(38)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        for btn in (self.btn_dismiss, self.btn_keep_a, self.btn_keep_b):
+            buttons.addWidget(btn)
+        layout.addLayout(buttons)
+
+        self.load_candidates()
+
+    # -----------------------------
+    # Loading
+    # -----------------------------
+    def load_candidates(self):
+        try:
+            self.candidates = pending_candidates()
+        except Exception as e:
+            print(f"⚠️ load_candidates failed: {e}")
+            self.candidates = []
+
+        self.pairs_table.setRowCount(len(self.candidates))
+        for row, c in enumerate(self.candidates):
+            for col, value in enumerate((f"{float(c['score']):.0%}", f"{c['name_a']} (ID {c['resident_a']})",
+                                         f"{c['name_b']} (ID {c['resident_b']})", c["reasons"])):
+                self.pairs_table.setItem(row, col, QTableWidgetItem(value))
+
+        if self.candidates:
+            self.subtitle.setText(f"{len(self.candidates)} pair(s) to review, most likely first. "
+                                  "Merging moves the requests of the record you drop to the one you keep.")
+            self.pairs_table.selectRow(0)
+        else:
+            self.subtitle.setText("Nothing to review. Run `python -m Panels.cli dedup scan` to look for "
+                                  "duplicates across the registry.")
+            self.compare_table.setRowCount(0)
+        self.update_buttons()
+
+    def selected_candidate(self):
+        rows = self.pairs_table.selectionModel().selectedRows()
+        return self.candidates[rows[0].row()] if rows else None
+
+    def update_buttons(self):
+        enabled = self.selected_candidate() is not None
+        for btn in (self.btn_dismiss, self.btn_keep_a, self.btn_keep_b):
+            btn.setEnabled(enabled)
+
+    def show_pair(self):
+        self.update_buttons()
+        candidate = self.selected_candidate()
+        if candidate is None:
+            return
+        ids = (candidate["resident_a"], candidate["resident_b"])
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT r.*, (SELECT COUNT(*) FROM requests q WHERE q.resident_id = r.id) AS request_count
+            FROM residents r
+            WHERE r.id IN (%s, %s)
+        """, ids)
+        self.pair = {row["id"]: row for row in cursor.fetchall()}
+        cursor.close()
+        conn.close()
+
+        a, b = (self.pair.get(i, {}) for i in ids)
+        fields = RESIDENT_FIELDS + [("Requests", "request_count"), ("Added", "created_at")]
+        self.compare_table.setRowCount(len(fields))
+        for row, (label, column) in enumerate(fields):
+            values = [_shown(a.get(column)), _shown(b.get(column))]
+            self.compare_table.setItem(row, 0, QTableWidgetItem(label if values[0] == values[1] else f"≠ {label}"))
+            self.compare_table.setItem(row, 1, QTableWidgetItem(values[0]))
+            self.compare_table.setItem(row, 2, QTableWidgetItem(values[1]))
+
+    # -----------------------------
+    # Decisions
+    # -----------------------------
+    def dismiss_pair(self):
+        candidate = self.selected_candidate()
+        if candidate is None:
+            return
+        try:
+            dismiss_candidate(candidate["id"], self.admin_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to dismiss the pair:\n{e}")
+            return
+        self.load_candidates()
+
+    def merge_pair(self, keep):
+        candidate = self.selected_candidate()
+        if candidate is None:
+            return
+        keep_id, drop_id = ((candidate["resident_a"], candidate["resident_b"]) if keep == "a"
+                            else (candidate["resident_b"], candidate["resident_a"]))
+        keep_name = candidate["name_a"] if keep == "a" else candidate["name_b"]
+        drop_name = candidate["name_b"] if keep == "a" else candidate["name_a"]
+
+        reply = QMessageBox.question(
+            self, "Merge Residents",
+            f"Keep {keep_name} (ID {keep_id}) and delete {drop_name} (ID {drop_id})?\n\n"
+            f"{drop_name}'s requests will be moved to {keep_name}. This cannot be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            moved = merge_residents(keep_id, drop_id, self.admin_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to merge residents:\n{e}")
+            self.load_candidates()
+            return
+
+        self.changed = True
+        publish(ResidentChanged(drop_id, "delete"))
+        for request_id in moved:
+            publish(RequestChanged(request_id))
+        try:
+            log_admin_activity(self.admin_id, "MERGE_RESIDENT",
+                               f"Merged resident ID {drop_id} into ID {keep_id} ({len(moved)} request(s) moved)")
+        except Exception as le:
+            print("⚠️ Logging failed:", le)
+        self.load_candidates()
+
+
+def _shown(value):
+    return "" if value is None else str(value)
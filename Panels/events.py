@@ -0,0 +1,185 @@
+# Panels/events.py
+"""
+Application event bus.
+
+Panels publish typed events after they change data (ResidentChanged, RequestStatusChanged,
+...) and subscribe to the event types they display, instead of wiring pyqtSignals through
+the dashboards and debouncing each refresh with its own QTimer.
+
+Events published during one pass of the Qt event loop are coalesced: duplicates collapse
+into one, and every subscriber gets a single call with the batch of events it asked for.
+A subscriber can also ask for a longer ``delay_ms`` (e.g. search-as-you-type), in which
+case batches keep merging until the bus has been quiet for that long.
+
+    bus = get_event_bus()
+    bus.subscribe((ResidentChanged, RequestChanged), self.on_data_changed, owner=self)
+    bus.publish(ResidentChanged(resident_id, "delete"))
+
+``stats`` counts what the coalescing saved; ``suppressed`` is the number of refreshes
+subscribers would have run had every event been delivered on its own.
+"""
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QTimer
+
+
+# -----------------------------
+# Events
+# -----------------------------
+@dataclass(frozen=True)
+class ResidentChanged:
+    resident_id: int
+    op: str = "update"      # insert / update / delete
+    remote: bool = False    # made at another desk (Panels/change_poller.py)
+
+
+@dataclass(frozen=True)
+class RequestChanged:
+    request_id: int
+    op: str = "update"
+    remote: bool = False
+
+
+@dataclass(frozen=True)
+class RequestStatusChanged:
+    request_id: int
+    old: str
+    new: str
+    remote: bool = False
+
+
+@dataclass(frozen=True)
+class AccountChanged:
+    role: str               # staff / admin
+    account_id: int
+    op: str = "update"
+    remote: bool = False
+
+
+@dataclass(frozen=True)
+class ResidentSearchChanged:
+    text: str
+
+
+@dataclass(frozen=True)
+class ResyncRequired:
+    """The change feed fell too far behind; panels should reload everything."""
+
+
+RESIDENT_EVENTS = (ResidentChanged, ResyncRequired)
+REQUEST_EVENTS = (RequestChanged, RequestStatusChanged, ResyncRequired)
+ACCOUNT_EVENTS = (AccountChanged, ResyncRequired)
+DATA_EVENTS = (ResidentChanged, RequestChanged, RequestStatusChanged, AccountChanged, ResyncRequired)
+
+
+def remote_ids(events, event_type, field):
+    """Ids (``field``) of the remote ``event_type`` events in a batch, in order, without repeats."""
+    return list(dict.fromkeys(getattr(e, field) for e in events
+                              if isinstance(e, event_type) and e.remote))
+
+
+# -----------------------------
+# Bus
+# -----------------------------
+class _Subscription:
+    def __init__(self, event_types, handler, delay_ms, owner):
+        self.event_types = event_types
+        self.handler = handler
+        self.delay_ms = delay_ms
+        self.owner = owner
+        self.pending = {}   # event -> None, keeps first-seen order
+        self.raw_count = 0  # events matched before coalescing
+        self.timer = None
+
+
+class EventBus:
+    def __init__(self):
+        self._subscriptions = []
+        self._frame = []    # events published since the last flush, duplicates included
+        self._flush_scheduled = False
+        self.stats = {"published": 0, "coalesced": 0, "deliveries": 0, "suppressed": 0}
+
+    def subscribe(self, event_types, handler, delay_ms=0, owner=None):
+        """
+        Call ``handler(events)`` with each coalesced batch of ``event_types`` events.
+
+        With ``owner`` (a QObject), the subscription ends when the owner is destroyed
+        or passed to unsubscribe().
+        """
+        subscription = _Subscription(tuple(event_types), handler, delay_ms, owner)
+        self._subscriptions.append(subscription)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self.unsubscribe(owner))
+        return subscription
+
+    def unsubscribe(self, owner):
+        """Drop every subscription owned by ``owner`` or by a widget inside it."""
+        def owned(subscription):
+            o = subscription.owner
+            if o is None:
+                return False
+            try:
+                return o is owner or (hasattr(owner, "isAncestorOf") and owner.isAncestorOf(o))
+            except RuntimeError:  # the owner's C++ object is already gone
+                return True
+
+        for subscription in [s for s in self._subscriptions if owned(s)]:
+            if subscription.timer is not None:
+                subscription.timer.stop()
+            self._subscriptions.remove(subscription)
+
+    def publish(self, event):
+        self.stats["published"] += 1
+        self._frame.append(event)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        """Hand this frame's events to their subscribers (runs once per event-loop pass)."""
+        frame, self._frame = self._frame, []
+        self._flush_scheduled = False
+        unique = list(dict.fromkeys(frame))
+        self.stats["coalesced"] += len(frame) - len(unique)
+
+        for subscription in list(self._subscriptions):
+            matched = [e for e in frame if isinstance(e, subscription.event_types)]
+            if not matched:
+                continue
+            subscription.raw_count += len(matched)
+            subscription.pending.update(dict.fromkeys(matched))
+            if subscription.delay_ms:
+                if subscription.timer is None:
+                    subscription.timer = QTimer()
+                    subscription.timer.setSingleShot(True)
+                    subscription.timer.timeout.connect(lambda s=subscription: self._deliver(s))
+                subscription.timer.start(subscription.delay_ms)  # restart: wait for a quiet period
+            else:
+                self._deliver(subscription)
+
+    def _deliver(self, subscription):
+        if subscription not in self._subscriptions or not subscription.pending:
+            return
+        events = list(subscription.pending)
+        self.stats["deliveries"] += 1
+        self.stats["suppressed"] += subscription.raw_count - 1
+        subscription.pending = {}
+        subscription.raw_count = 0
+        try:
+            subscription.handler(events)
+        except Exception as e:
+            print(f"⚠️ Event handler {getattr(subscription.handler, '__qualname__', subscription.handler)} failed: {e}")
+
+
+_bus = None
+
+
+def get_event_bus():
+    global _bus
+    if _bus is None:
+        _bus = EventBus()
+    return _bus
+
+
+def publish(event):
+    get_event_bus().publish(event)
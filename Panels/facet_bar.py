@@ -0,0 +1,90 @@
+# Panels/facet_bar.py
+"""
+Facet filters for the resident tables (AdminResidents, StaffResidentProfiles).
+
+FacetBar shows one drop-down per facet of Panels/facets.py, each value with the number
+of residents it would leave given the other facets and the panel's own search. The
+panel keeps the rows its search returned and passes them through filter_rows(): the
+counts and the matching rows come from the facet bitmaps, so changing a facet
+re-filters those rows in memory instead of querying residents again.
+"""
+from PyQt6.QtWidgets import QComboBox, QHBoxLayout, QPushButton, QWidget
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from Panels.facets import FACETS, contains, get_facet_index
+
+
+class FacetBar(QWidget):
+    changed = pyqtSignal()  # the user picked or cleared a facet value
+
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("facetBar")
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        self.combos = {}
+        for facet, title in FACETS.items():
+            combo = QComboBox()
+            combo.setObjectName("facetFilter")
+            combo.addItem(f"{title}: All", None)
+            combo.currentIndexChanged.connect(lambda _: self.changed.emit())
+            layout.addWidget(combo)
+            self.combos[facet] = combo
+
+        self.clear_btn = QPushButton("✖ Clear")
+        self.clear_btn.setObjectName("clearFacetsButton")
+        self.clear_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.clear_btn.clicked.connect(self.clear)
+        layout.addWidget(self.clear_btn)
+        layout.addStretch()
+
+    def selection(self):
+        """``{facet: [value]}`` for the facets with a value picked."""
+        return {facet: [combo.currentData()] for facet, combo in self.combos.items()
+                if combo.currentData() is not None}
+
+    def clear(self):
+        if not self.selection():
+            return
+        for combo in self.combos.values():
+            combo.blockSignals(True)
+            combo.setCurrentIndex(0)
+            combo.blockSignals(False)
+        self.changed.emit()
+
+    def set_counts(self, counts):
+        """Relabel every facet's values with ``counts`` (FacetIndex.counts), keeping the picks."""
+        for facet, combo in self.combos.items():
+            picked = combo.currentData()
+            values = counts.get(facet, {})
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(f"{FACETS[facet]}: All", None)
+            for value, total in values.items():
+                combo.addItem(f"{value} ({total:,})", value)
+            if picked is not None and picked not in values:
+                combo.addItem(f"{picked} (0)", picked)
+            combo.setCurrentIndex(max(0, combo.findData(picked)) if picked is not None else 0)
+            combo.blockSignals(False)
+
+    def filter_rows(self, rows, refresh=True):
+        """
+        The resident ``rows`` (dicts / Resident records with "id") matching the picked facets,
+        in order; the counts are updated for ``rows``. ``refresh`` first catches the facet
+        index up with change_log, which a facet click on unchanged rows can skip.
+        """
+        try:
+            index = get_facet_index(refresh=refresh)
+            selection = self.selection()
+            ids = [row["id"] for row in rows]
+            within = index.bitmap_of(ids)
+            self.set_counts(index.counts(selection, within))
+            if not selection:
+                return rows
+            keep = contains(index.select(selection, within), ids)
+            return [row for row, matches in zip(rows, keep) if matches]
+        except Exception as e:
+            print(f"⚠️ Facet filters unavailable: {e}")
+            return rows
@@ -9,6 +9,7 @@ from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
 
 from Panels.db import get_connection, verify_password
+from Panels.styles import apply_style_scope, install_app_stylesheet
 from Panels.logger import log_staff_activity, log_admin_activity
 from Panels.staff_dashboard import DashboardWindow
 from Panels.admin_dashboard import AdminDashboard
@@ -20,12 +21,13 @@ class LoginPage(QMainWindow):
 
         # --- Project Paths ---
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
         images_dir = os.path.join(base_dir, "Images")
 
-        qss_path = os.path.join(styles_dir, "login.qss")
         logo_path = os.path.join(images_dir, "BRIMS_logo.png")
 
+        # --- Stylesheet (Styles/login.qss) ---
+        apply_style_scope(self, "login")
+
         # --- Window Config ---
         self.setWindowTitle("BRIMS - Login")
         self.setMinimumSize(1200, 800)
@@ -134,13 +136,6 @@ class LoginPage(QMainWindow):
         # Add the card to main layout
         main_layout.addWidget(login_card)
 
-        # --- Apply Stylesheet ---
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
-
     def handle_login(self):
         """Handle login - NO CHANGES TO LOGIC"""
         username = self.username_input.text().strip()
@@ -185,6 +180,7 @@ class LoginPage(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    install_app_stylesheet(app)  # every Styles/*.qss, parsed once for the whole session
     window = LoginPage()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,120 @@
+# Panels/migrate.py
+"""
+Schema migration runner.
+
+Applies the numbered Migrations/NNN_name.sql files in order and records each one in a
+schema_version table, so every database (live, seeded, benchmark) can be brought to the
+same schema with one command:
+
+    python -m Panels.migrate                 # apply pending migrations to brms_db
+    python -m Panels.migrate --status        # list applied / pending migrations
+    python -m Panels.migrate --database brms_load
+
+`python -m Benchmarks.explain_queries` builds a database from these files and EXPLAINs
+every panel query against it, failing on full table scans; a query that needs a new
+index gets it through a migration here.
+
+MariaDB commits DDL implicitly, so a migration that fails half-way is not rolled back;
+fix the cause and re-run (statements are written to be re-runnable where possible).
+"""
+import argparse
+import os
+import re
+import sys
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, "Migrations")
+
+_MIGRATION_FILE = re.compile(r"^(\d{3})_(\w+)\.sql$")
+
+
+def split_statements(sql_text):
+    """Split a .sql file into statements, dropping ``--`` comment lines."""
+    lines = [line for line in sql_text.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def migration_files(migrations_dir=MIGRATIONS_DIR):
+    """``[(version, name, path)]`` for every NNN_name.sql file, in version order."""
+    found = []
+    for filename in os.listdir(migrations_dir):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            found.append((int(match.group(1)), match.group(2), os.path.join(migrations_dir, filename)))
+    return sorted(found)
+
+
+def applied_versions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    cursor.execute("SELECT version FROM schema_version")
+    return {row["version"] for row in cursor.fetchall()}
+
+
+def migrate(database=DEFAULT_DATABASE, target=None):
+    """Apply pending migrations up to ``target`` (default: all). Returns the versions applied."""
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    done = applied_versions(cursor)
+    applied = []
+
+    try:
+        for version, name, path in migration_files():
+            if version in done or (target is not None and version > target):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                statements = split_statements(f.read())
+
+            print(f"  • {version:03d}_{name} ({len(statements)} statements)")
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute("INSERT INTO schema_version (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+            applied.append(version)
+    finally:
+        cursor.close()
+        conn.close()
+    return applied
+
+
+def status(database=DEFAULT_DATABASE):
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    done = applied_versions(cursor)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return [(version, name, version in done) for version, name, _ in migration_files()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply Migrations/*.sql to a BRIMS database")
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--target", type=int, help="stop after this migration number")
+    parser.add_argument("--status", action="store_true", help="list migrations without applying")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        for version, name, is_applied in status(args.database):
+            print(f"  {'✅' if is_applied else '⏳'} {version:03d}_{name}")
+        return 0
+
+    try:
+        applied = migrate(args.database, args.target)
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return 1
+    print(f"✅ {args.database}: applied {len(applied)} migration(s)" if applied
+          else f"✅ {args.database} is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
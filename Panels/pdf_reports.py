@@ -0,0 +1,208 @@
+# Panels/pdf_reports.py
+"""
+Table PDF engine for the report exports (Panels/reporting.py).
+
+Rows are laid out as a platypus LongTable whose cells are Paragraphs, so long purposes,
+addresses and descriptions wrap instead of being cut off, and the header row repeats on
+every page.
+
+Large reports are split into chunks of PDF_CHUNK_ROWS rows. Worker processes render the
+chunks to temporary PDFs in parallel while the caller keeps streaming rows in, and at
+most two chunks per worker are in flight, so memory stays bounded however many rows
+there are. The parts are then merged in order and stamped "Page X of N" with pypdf.
+Each chunk starts on a new page.
+
+pypdf is optional. Without it, or when everything fits in one chunk, the report is
+rendered in this process as a single document.
+"""
+import os
+import shutil
+import tempfile
+from collections import deque
+from datetime import datetime
+from io import BytesIO
+from itertools import chain, islice
+from multiprocessing import Pool
+from xml.sax.saxutils import escape
+
+PDF_CHUNK_ROWS = int(os.environ.get("BRMS_PDF_CHUNK_ROWS", "2000"))
+PDF_WORKERS = int(os.environ.get("BRMS_PDF_WORKERS", "0")) or os.cpu_count() or 1
+
+POINTS_PER_INCH = 72
+PAGE_WIDTH_IN, PAGE_HEIGHT_IN = 11, 8.5     # landscape letter
+MARGIN_IN = 0.5
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _draw_page_number(c, number, total):
+    c.setFont("Helvetica", 8)
+    c.setFillGray(0.4)
+    c.drawRightString((PAGE_WIDTH_IN - MARGIN_IN) * POINTS_PER_INCH, 0.4 * POINTS_PER_INCH,
+                      f"Page {number} of {total}")
+
+
+def _numbered_canvas():
+    from reportlab.pdfgen import canvas
+
+    class NumberedCanvas(canvas.Canvas):
+        """Holds the pages until save() so each footer can say "Page X of N"."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._page_states = []
+
+        def showPage(self):
+            self._page_states.append(dict(self.__dict__))
+            self._startPage()
+
+        def save(self):
+            total = len(self._page_states)
+            for state in self._page_states:
+                self.__dict__.update(state)
+                _draw_page_number(self, self._pageNumber, total)
+                super().showPage()
+            super().save()
+
+    return NumberedCanvas
+
+
+# -----------------------------
+# Chunk rendering (worker side)
+# -----------------------------
+def render_chunk(job):
+    """
+    Lay out one chunk of rows (tuples of str) as a wrapping table in ``job["path"]``.
+
+    The first chunk carries the title block. Returns ``(path, pages)``.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, Spacer, TableStyle
+
+    size = job["font_size"]
+    cell = ParagraphStyle("cell", fontName="Helvetica", fontSize=size, leading=size + 2)
+    head = ParagraphStyle("head", parent=cell, fontName="Helvetica-Bold")
+
+    story = []
+    if job.get("title"):
+        story.append(Paragraph(escape(job["title"]),
+                               ParagraphStyle("title", fontName="Helvetica-Bold", fontSize=16, leading=20)))
+        story.append(Paragraph(escape(f"Generated on: {job['generated_on']}"),
+                               ParagraphStyle("generated", fontName="Helvetica", fontSize=10, leading=14)))
+        story.append(Spacer(1, 0.2 * POINTS_PER_INCH))
+
+    data = [[Paragraph(escape(h), head) for h in job["headers"]]]
+    data.extend([Paragraph(escape(value), cell) for value in row] for row in job["rows"])
+    table = LongTable(data, colWidths=[w * POINTS_PER_INCH for w in job["widths"]], repeatRows=1)
+    table.setStyle(TableStyle([
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LINEBELOW", (0, 0), (-1, 0), 0.75, colors.black),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F5F5F5")]),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ]))
+    story.append(table)
+
+    margin = MARGIN_IN * POINTS_PER_INCH
+    doc = SimpleDocTemplate(job["path"], pagesize=landscape(letter), title=job["document_title"],
+                            leftMargin=margin, rightMargin=margin, topMargin=margin, bottomMargin=0.7 * POINTS_PER_INCH)
+    if job.get("number_pages"):
+        doc.build(story, canvasmaker=_numbered_canvas())
+    else:
+        doc.build(story)
+    return job["path"], doc.page
+
+
+# -----------------------------
+# Merging
+# -----------------------------
+def _page_number_overlay(total):
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(PAGE_WIDTH_IN * POINTS_PER_INCH, PAGE_HEIGHT_IN * POINTS_PER_INCH))
+    for number in range(1, total + 1):
+        _draw_page_number(c, number, total)
+        c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+
+def merge_chunks(parts, filename):
+    """Concatenate the chunk PDFs ``[(path, pages)]`` into ``filename``, numbering every page."""
+    from pypdf import PdfReader, PdfWriter
+
+    total = sum(pages for _, pages in parts)
+    numbers = PdfReader(_page_number_overlay(total)).pages
+    writer = PdfWriter()
+    index = 0
+    for path, _ in parts:
+        for page in PdfReader(path).pages:
+            page.merge_page(numbers[index])
+            writer.add_page(page)
+            index += 1
+    with open(filename, "wb") as f:
+        writer.write(f)
+    return total
+
+
+def _have_pypdf():
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# -----------------------------
+# Entry point
+# -----------------------------
+def render_table_pdf(filename, title, headers, widths, rows, font_size=9,
+                     workers=PDF_WORKERS, chunk_rows=PDF_CHUNK_ROWS):
+    """
+    Write ``rows`` (an iterable of str tuples, consumed once) as a titled table PDF.
+
+    ``widths`` are column widths in inches. Returns the number of pages.
+    """
+    job = {
+        "document_title": title,
+        "generated_on": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "headers": list(headers),
+        "widths": list(widths),
+        "font_size": font_size,
+    }
+    chunks = _chunks(rows, chunk_rows)
+    first = next(chunks, [])
+    second = next(chunks, None)
+
+    if second is None or workers < 2 or not _have_pypdf():
+        if second is not None:
+            if workers > 1:
+                print("⚠️ pypdf is not installed; rendering the PDF in a single process.")
+            first = first + second + [row for chunk in chunks for row in chunk]
+        return render_chunk(dict(job, path=filename, title=title, rows=first, number_pages=True))[1]
+
+    workdir = tempfile.mkdtemp(prefix="brims_pdf_")
+    try:
+        parts, pending = [], deque()
+        with Pool(workers) as pool:
+            for index, chunk in enumerate(chain([first, second], chunks)):
+                part = dict(job, path=os.path.join(workdir, f"part_{index:05d}.pdf"),
+                            title=title if index == 0 else None, rows=chunk)
+                pending.append(pool.apply_async(render_chunk, (part,)))
+                if len(pending) >= workers * 2:  # wait here instead of queueing the whole report
+                    parts.append(pending.popleft().get())
+            parts.extend(result.get() for result in pending)
+        return merge_chunks(parts, filename)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,194 @@
+# Panels/photos.py
+"""
+Resident photos and their thumbnail cache.
+
+Photos live in resident_photos (Migrations/010_resident_photos.sql), one row per
+resident, never in residents itself: the lists keep selecting residents rows, and those
+only carry the photo's photo_hash (SHA-256 of the stored JPEG), which is also the
+photo's address in the thumbnail cache.
+
+- prepare_photo() turns an uploaded file into the stored JPEG: upright (EXIF
+  orientation applied, metadata dropped) and at most MAX_PHOTO_PX on its long side.
+- store_photo() / delete_photo() write resident_photos inside the caller's transaction.
+- write_thumbnails() renders every size in THUMBNAIL_SIZES once, into
+
+      cache/thumbnails/<first 2 of hash>/<hash>-<size>.jpg
+
+  thumbnail() returns a cached path, or renders the sizes from the stored photo on a
+  miss (a desk that did not upload it). Each hit touches the file, and evict() removes
+  the least recently used files once the cache is over BRMS_PHOTO_CACHE_MB; the
+  thumbnail worker runs it whenever its queue drains. The cache directory is only
+  scanned when the running total of bytes written (seeded by the first scan) goes over
+  the limit, so a drained queue usually costs nothing.
+
+Pillow does the image work and is imported only when an image is actually read or
+rendered. The GUI side (worker thread, visible-rows loading) is thumbnail_loader.py.
+
+No Qt imports here.
+"""
+import hashlib
+import io
+import os
+import threading
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("BRMS_PHOTO_CACHE", os.path.join(BASE_DIR, "cache", "thumbnails"))
+CACHE_BYTES = int(os.environ.get("BRMS_PHOTO_CACHE_MB", "200")) * 1024 * 1024
+
+MAX_PHOTO_PX = 1024
+PHOTO_QUALITY = 88
+THUMBNAIL_QUALITY = 82
+
+LIST_SIZE = 48       # resident tables
+PREVIEW_SIZE = 120   # ResidentDialog
+CARD_SIZE = 240      # Barangay ID
+THUMBNAIL_SIZES = (LIST_SIZE, PREVIEW_SIZE, CARD_SIZE)
+
+# Bytes in the cache as of the last evict() scan plus what this process wrote since;
+# None until the first scan. Other desks sharing the cache are picked up by the next scan.
+_cache_bytes = None
+_cache_lock = threading.Lock()
+
+
+# -----------------------------
+# Stored photos
+# -----------------------------
+def prepare_photo(data):
+    """
+    ``{"photo", "photo_hash", "width", "height"}`` for an uploaded image file's bytes.
+    Raises ValueError when ``data`` is not an image Pillow can read.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f"not a readable image ({e})") from e
+    image.thumbnail((MAX_PHOTO_PX, MAX_PHOTO_PX), Image.LANCZOS)
+
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=PHOTO_QUALITY, optimize=True)
+    photo = out.getvalue()
+    return {"photo": photo, "photo_hash": hashlib.sha256(photo).hexdigest(),
+            "width": image.width, "height": image.height}
+
+
+def store_photo(cursor, resident_id, prepared, user_id=None):
+    """Save a prepare_photo() result as the resident's photo; the caller sets residents.photo_hash and commits."""
+    cursor.execute("""
+        INSERT INTO resident_photos (resident_id, photo_hash, width, height, photo, uploaded_by)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE photo_hash = VALUES(photo_hash), width = VALUES(width),
+            height = VALUES(height), photo = VALUES(photo), uploaded_by = VALUES(uploaded_by),
+            uploaded_at = NOW()
+    """, (resident_id, prepared["photo_hash"], prepared["width"], prepared["height"],
+          prepared["photo"], user_id))
+
+
+def delete_photo(cursor, resident_id):
+    """Drop the resident's photo (its thumbnails age out of the cache); caller commits."""
+    cursor.execute("DELETE FROM resident_photos WHERE resident_id = %s", (resident_id,))
+
+
+def load_photo(photo_hash, database=DEFAULT_DATABASE):
+    """The stored JPEG with ``photo_hash``, or None when no resident has it any more."""
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT photo FROM resident_photos WHERE photo_hash = %s LIMIT 1", (photo_hash,))
+        row = cursor.fetchone()
+        return row["photo"] if row else None
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# -----------------------------
+# Thumbnail cache
+# -----------------------------
+def thumbnail_path(photo_hash, size):
+    return os.path.join(CACHE_DIR, photo_hash[:2], f"{photo_hash}-{size}.jpg")
+
+
+def cached_thumbnail(photo_hash, size):
+    """The cached thumbnail's path, marked as just used, or None on a miss."""
+    path = thumbnail_path(photo_hash, size)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def write_thumbnails(photo_hash, photo):
+    """Render every THUMBNAIL_SIZES square of ``photo`` (JPEG bytes) into the cache."""
+    from PIL import Image, ImageOps
+
+    global _cache_bytes
+    image = Image.open(io.BytesIO(photo)).convert("RGB")
+    os.makedirs(os.path.dirname(thumbnail_path(photo_hash, 0)), exist_ok=True)
+    written = 0
+    for size in THUMBNAIL_SIZES:
+        path = thumbnail_path(photo_hash, size)
+        # Center crop to a square, like an ID photo; written aside then renamed into place
+        thumb = ImageOps.fit(image, (size, size), Image.LANCZOS, centering=(0.5, 0.4))
+        temp = f"{path}.{os.getpid()}.tmp"
+        thumb.save(temp, "JPEG", quality=THUMBNAIL_QUALITY)
+        written += os.path.getsize(temp)
+        try:
+            written -= os.path.getsize(path)  # re-rendered over an existing file
+        except OSError:
+            pass
+        os.replace(temp, path)
+    with _cache_lock:
+        if _cache_bytes is not None:
+            _cache_bytes += written
+
+
+def thumbnail(photo_hash, size, database=DEFAULT_DATABASE):
+    """Path of the ``size`` thumbnail, rendered from the stored photo on a cache miss; None without one."""
+    path = cached_thumbnail(photo_hash, size)
+    if path:
+        return path
+    photo = load_photo(photo_hash, database)
+    if photo is None:
+        return None
+    write_thumbnails(photo_hash, photo)
+    return thumbnail_path(photo_hash, size)
+
+
+def evict(max_bytes=CACHE_BYTES):
+    """
+    Delete least recently used thumbnails until the cache fits in ``max_bytes``; returns
+    files removed. Scans the cache only on the first call and once the running total
+    goes over ``max_bytes``.
+    """
+    global _cache_bytes
+    with _cache_lock:
+        if _cache_bytes is not None and _cache_bytes <= max_bytes:
+            return 0
+    files, total = [], 0
+    for entry in os.scandir(CACHE_DIR) if os.path.isdir(CACHE_DIR) else ():
+        if not entry.is_dir():
+            continue
+        for item in os.scandir(entry.path):
+            if item.name.endswith(".jpg"):
+                stat = item.stat()
+                files.append((stat.st_mtime, stat.st_size, item.path))
+                total += stat.st_size
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    with _cache_lock:
+        _cache_bytes = total
+    return removed
@@ -0,0 +1,309 @@
+# Panels/productivity.py
+"""
+Staff productivity: per staff member and day, how many requests they completed, how many
+residents they registered, how many distinct residents they served and how many
+actions they logged.
+
+Counting those from requests / residents / staff_activity for every view would read
+millions of activity rows, so they are rolled up once per day into staff_daily_rollups
+(Migrations/013_staff_productivity.sql). Counts add up across days; distinct residents
+do not (the same resident served on Monday and Friday is one resident that week), so
+each rollup also keeps a HyperLogLog sketch of the residents served that day. Sketches
+merge by taking register maxima, so a week, a month or every staff member together is
+the merge of the daily sketches, within about 2% of the exact count.
+
+- refresh_rollups() recomputes the days from the newest rollup (its day may have been
+  partial) up to today; AdminProductivity runs it when opened, cron may run it nightly.
+- productivity() sums and merges the rollups of a date range per staff member and
+  day / week / whole range.
+
+Days whose staff_activity months were archived (Panels/retention.py) keep the activity
+counts rolled up while they were live: a refresh from an earlier day recomputes their
+other columns and carries the stored activity over. A rebuild starts at the oldest
+retained activity by default.
+
+    python -m Panels.cli productivity refresh
+    python -m Panels.cli productivity show --period week
+
+No Qt imports here.
+"""
+import hashlib
+import math
+import struct
+from datetime import date, datetime, timedelta
+
+from pymysql.cursors import SSCursor
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+HLL_PRECISION = 12  # 4,096 registers: about 1.6% standard error
+REFRESH_CHUNK_DAYS = 31
+PERIODS = ("total", "week", "day")
+
+# Rollup sources for [start, end); each is a range on an indexed timestamp
+COMPLETED_SQL = """
+    SELECT created_by, DATE(completed_date) AS day, resident_id
+    FROM requests
+    WHERE completed_date >= %s AND completed_date < %s
+      AND status = 'Completed' AND created_by IS NOT NULL
+"""
+REGISTERED_SQL = """
+    SELECT created_by, DATE(created_at) AS day, COUNT(*) AS total
+    FROM residents
+    WHERE created_at >= %s AND created_at < %s AND created_by IS NOT NULL
+    GROUP BY created_by, DATE(created_at)
+"""
+ACTIVITY_SQL = """
+    SELECT staff_id, DATE(created_at) AS day, COUNT(*) AS total
+    FROM staff_activity
+    WHERE created_at >= %s AND created_at < %s AND staff_id IS NOT NULL
+    GROUP BY staff_id, DATE(created_at)
+"""
+
+
+# -----------------------------
+# HyperLogLog
+# -----------------------------
+class HyperLogLog:
+    """
+    Distinct-count sketch (Flajolet et al., with the small-range correction).
+
+    Stored sparse (index, rank pairs) while few registers are set, which is every
+    single-day sketch in practice, and dense (one byte per register) otherwise.
+    """
+
+    _PAIR = struct.Struct("<HB")
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @staticmethod
+    def _hash(value):
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+
+    def add(self, value):
+        h = self._hash(value)
+        bits = 64 - self.precision
+        index = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        zeros = self.registers.count(0)
+        if zeros == m:
+            return 0
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self):
+        pairs = [(i, r) for i, r in enumerate(self.registers) if r]
+        if len(pairs) * self._PAIR.size < len(self.registers):
+            return b"S" + b"".join(self._PAIR.pack(i, r) for i, r in pairs)
+        return b"D" + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data, precision=HLL_PRECISION):
+        sketch = cls(precision)
+        if data[:1] == b"D":
+            sketch.registers = bytearray(data[1:])
+        else:
+            for i, r in cls._PAIR.iter_unpack(data[1:]):
+                sketch.registers[i] = r
+        return sketch
+
+
+# -----------------------------
+# Rollups
+# -----------------------------
+def _day(value):
+    return value if isinstance(value, date) else datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def _first_day(cursor, tables):
+    """Day of the oldest row among ``[(table, timestamp column)]``, None when all are empty."""
+    days = []
+    for table, column in tables:
+        cursor.execute(f"SELECT MIN({column}) AS first FROM {table}")
+        first = cursor.fetchone()["first"]
+        if first:
+            days.append(first.date() if isinstance(first, datetime) else _day(first))
+    return min(days) if days else None
+
+
+def _refresh_start(cursor):
+    """The newest rollup's day, or the first day with any data when there are none."""
+    cursor.execute("SELECT MAX(day) AS day FROM staff_daily_rollups")
+    newest = cursor.fetchone()["day"]
+    if newest:
+        return _day(newest)
+    return _first_day(cursor, [("requests", "completed_date"), ("residents", "created_at"),
+                               ("staff_activity", "created_at")]) or date.today()
+
+
+def _activity_start(cursor):
+    """Day of the oldest staff_activity row still stored (today when there are none)."""
+    return _first_day(cursor, [("staff_activity", "created_at")]) or date.today()
+
+
+def rebuild_start(database=DEFAULT_DATABASE):
+    """Oldest day a rebuild can recompute without losing archived activity counts."""
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        return _activity_start(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _rollup_chunk(conn, start, end, activity_from=None):
+    """
+    Recompute the rollups of the days in [start, end) in one transaction. Days before
+    ``activity_from`` (archived staff_activity) keep the activity count already stored.
+    """
+    cursor = conn.cursor(SSCursor)
+    rollups = {}  # (staff_id, day) -> [completed, registered, activity, HyperLogLog]
+
+    def rollup(staff_id, day):
+        key = (staff_id, _day(day))
+        if key not in rollups:
+            rollups[key] = [0, 0, 0, HyperLogLog()]
+        return rollups[key]
+
+    try:
+        cursor.execute(COMPLETED_SQL, (start, end))
+        for staff_id, day, resident_id in cursor:
+            counts = rollup(staff_id, day)
+            counts[0] += 1
+            counts[3].add(resident_id)
+        cursor.execute(REGISTERED_SQL, (start, end))
+        for staff_id, day, total in cursor:
+            rollup(staff_id, day)[1] += total
+        cursor.execute(ACTIVITY_SQL, (start, end))
+        for staff_id, day, total in cursor:
+            rollup(staff_id, day)[2] += total
+        if activity_from and start < activity_from:
+            cursor.execute("""
+                SELECT staff_id, day, activity FROM staff_daily_rollups
+                WHERE day >= %s AND day < %s
+            """, (start, min(end, activity_from)))
+            for staff_id, day, activity in cursor:
+                rollup(staff_id, day)[2] = activity
+    finally:
+        cursor.close()
+
+    write = conn.cursor()
+    try:
+        write.execute("DELETE FROM staff_daily_rollups WHERE day >= %s AND day < %s", (start, end))
+        write.executemany("""
+            INSERT INTO staff_daily_rollups
+                (staff_id, day, requests_completed, residents_registered, activity,
+                 residents_served, served_sketch)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, [(staff_id, day, done, registered, activity, served.count(), served.to_bytes())
+              for (staff_id, day), (done, registered, activity, served) in rollups.items()])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        write.close()
+    return len(rollups)
+
+
+def refresh_rollups(since=None, database=DEFAULT_DATABASE, chunk_days=REFRESH_CHUNK_DAYS):
+    """
+    Recompute the daily rollups from ``since`` (default: the newest rollup's day) through
+    today, ``chunk_days`` at a time; returns how many (staff, day) rows were written.
+    Days before rebuild_start() keep their stored activity counts.
+    """
+    conn = get_connection(database)
+    try:
+        cursor = conn.cursor()
+        start = _day(since) if since else _refresh_start(cursor)
+        activity_from = _activity_start(cursor)
+        cursor.close()
+        end = date.today() + timedelta(days=1)
+        written = 0
+        while start < end:
+            stop = min(start + timedelta(days=chunk_days), end)
+            written += _rollup_chunk(conn, start, stop, activity_from)
+            start = stop
+        return written
+    finally:
+        conn.close()
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def period_start(day, period):
+    if period == "week":
+        return day - timedelta(days=day.weekday())  # Monday
+    if period == "day":
+        return day
+    return None
+
+
+def productivity(start, end, period="total", staff_id=None, database=DEFAULT_DATABASE):
+    """
+    Rows for the days ``start`` .. ``end`` (inclusive), one per staff member and period
+    ("total", "week" or "day"), busiest first within a period, as dicts: staff_id,
+    username, period (its first day; None for "total"), first_day, last_day,
+    requests_completed, residents_registered, residents_served (estimated), activity.
+    """
+    query = """
+        SELECT r.staff_id, s.username, r.day, r.requests_completed, r.residents_registered,
+               r.activity, r.served_sketch
+        FROM staff_daily_rollups r
+        LEFT JOIN staff s ON r.staff_id = s.id
+        WHERE r.day >= %s AND r.day <= %s
+    """
+    params = [start, end]
+    if staff_id is not None:
+        query += " AND r.staff_id = %s"
+        params.append(staff_id)
+
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        rollups = cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+    groups = {}
+    for row in rollups:
+        day = _day(row["day"])
+        key = (row["staff_id"], period_start(day, period))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "staff_id": row["staff_id"], "username": row["username"] or f"Staff #{row['staff_id']}",
+                "period": key[1], "first_day": day, "last_day": day, "requests_completed": 0,
+                "residents_registered": 0, "activity": 0, "served": HyperLogLog(),
+            }
+        group["first_day"] = min(group["first_day"], day)
+        group["last_day"] = max(group["last_day"], day)
+        group["requests_completed"] += row["requests_completed"]
+        group["residents_registered"] += row["residents_registered"]
+        group["activity"] += row["activity"]
+        group["served"].merge(HyperLogLog.from_bytes(row["served_sketch"]))
+
+    rows = []
+    for group in groups.values():
+        group["residents_served"] = group.pop("served").count()
+        rows.append(group)
+    rows.sort(key=lambda g: (-(g["period"] or date.min).toordinal(), -g["requests_completed"], g["username"]))
+    return rows
@@ -0,0 +1,139 @@
+# Panels/records.py
+"""
+Compact row objects for bulk loads.
+
+get_connection() returns DictCursor rows, so loading 100k residents builds 100k dicts
+plus a fresh string for every repeated value ("Female", "Married", "Pending"...).
+query_rows() fetches with a plain tuple cursor and builds ``__slots__`` objects
+instead, interning the low-cardinality string columns so every row shares one copy.
+
+Rows still support ``row["name"]`` and ``row.get("added_by", "Unknown")``, so panel code
+written against DictCursor rows works unchanged.
+
+    residents = query_rows(Resident, "SELECT * FROM residents ORDER BY created_at DESC")
+"""
+import sys
+
+from Panels.db import get_connection
+from Panels.slow_queries import TimedCursor
+
+
+class Row:
+    """Base for slotted rows. Subclasses list their columns in __slots__ and INTERNED."""
+    __slots__ = ("_extra",)
+    INTERNED = frozenset()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            extra = getattr(self, "_extra", None)
+            if extra and key in extra:
+                return extra[key]
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        names = [n for n in _all_slots(type(self)) if n != "_extra" and hasattr(self, n)]
+        return names + list(getattr(self, "_extra", None) or ())
+
+    def as_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={self[k]!r}' for k in self.keys())})"
+
+
+_MISSING = object()
+
+
+def _all_slots(cls):
+    return [name for klass in reversed(cls.__mro__) for name in getattr(klass, "__slots__", ())]
+
+
+# -----------------------------
+# Entities
+# -----------------------------
+class Resident(Row):
+    __slots__ = (
+        "id", "name", "age", "gender", "address", "contact_number", "civil_status",
+        "employment_status", "education_level", "residency_years", "status",
+        "created_by", "created_at", "added_by", "version", "name_key", "contact_key",
+        "house_no", "street", "purok", "sitio", "household_key", "birth_date",
+        "birth_date_estimated", "photo_hash",
+    )
+    INTERNED = frozenset({"gender", "civil_status", "employment_status", "education_level",
+                          "status", "added_by", "street", "sitio"})
+
+
+class Request(Row):
+    __slots__ = (
+        "id", "resident_id", "resident", "resident_name", "document_type", "purpose",
+        "request_date", "status", "staff_notes", "completed_date", "created_by", "created_at",
+        "handled_by", "version", "control_number", "serial_year", "serial_value", "turnaround_hours",
+    )
+    INTERNED = frozenset({"document_type", "purpose", "status", "handled_by"})
+
+
+class ActivityEntry(Row):
+    __slots__ = (
+        "id", "staff_id", "admin_id", "role", "action_type", "description", "ip_address",
+        "created_at", "username",
+    )
+    INTERNED = frozenset({"role", "action_type", "ip_address", "username"})
+
+
+class Account(Row):
+    __slots__ = ("id", "username", "password", "email", "role", "status", "created_at")
+    INTERNED = frozenset({"role", "status"})
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+def rows_from_cursor(cursor, row_class):
+    """Build ``row_class`` objects from an executed tuple cursor."""
+    slots = set(_all_slots(row_class))
+    columns = [d[0] for d in cursor.description]
+    setters = []
+    extra_columns = []
+    for index, name in enumerate(columns):
+        if name in slots:
+            setters.append((getattr(row_class, name).__set__, index, name in row_class.INTERNED))
+        else:
+            extra_columns.append((name, index))  # columns the class does not know yet
+
+    intern = sys.intern
+    new = row_class.__new__
+    rows = []
+    for values in cursor.fetchall():
+        row = new(row_class)
+        for set_value, index, interned in setters:
+            value = values[index]
+            if interned and value.__class__ is str:
+                value = intern(value)
+            set_value(row, value)
+        if extra_columns:
+            row._extra = {name: values[index] for name, index in extra_columns}
+        rows.append(row)
+    return rows
+
+
+def query_rows(row_class, sql, params=None, database=None):
+    """Run ``sql`` and return its rows as ``row_class`` objects."""
+    conn = get_connection(database) if database else get_connection()
+    cursor = conn.cursor(TimedCursor)
+    try:
+        cursor.execute(sql, params)
+        return rows_from_cursor(cursor, row_class)
+    finally:
+        cursor.close()
+        conn.close()
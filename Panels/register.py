@@ -1,28 +1,20 @@
-import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
     QMessageBox, QComboBox
 )
 
 from Panels.db import get_connection, hash_password
+from Panels.change_feed import record_change
+from Panels.events import AccountChanged, publish
+from Panels.styles import apply_style_scope
 
 
 class RegisterPage(QWidget):
     def __init__(self):
         super().__init__()
 
-        # --- Project Paths ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
-
-        qss_path = os.path.join(styles_dir, "register.qss")
-
-        # --- Apply Stylesheet ---
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
+        # --- Apply Stylesheet (Styles/register.qss) ---
+        apply_style_scope(self, "register")
 
         self.setWindowTitle("Register Account")
         self.resize(400, 300)
@@ -93,7 +85,10 @@ class RegisterPage(QWidget):
                 "INSERT INTO staff (username, password, role, email, status) VALUES (%s, %s, %s, %s, %s)",
                 (username, hashed_pw, role, email, status)
             )
+            staff_id = cursor.lastrowid
+            record_change(cursor, "staff", staff_id, "insert")
             conn.commit()
+            publish(AccountChanged("staff", staff_id, "insert"))
 
             QMessageBox.information(self, "Success", f"Staff account created for {username}.")
 
@@ -0,0 +1,226 @@
+# Panels/report_snapshots.py
+"""
+Pre-rendered snapshots of the Reports page.
+
+build_snapshot() runs report_summary() (Panels/reporting.py), renders the four charts
+to PNG with matplotlib's Agg backend and writes them, with a manifest.json, under the
+local cache directory:
+
+    cache/reports/<database>/manifest.json            current snapshot (replaced atomically)
+    cache/reports/<database>/snapshot-<stamp>/*.png
+
+The manifest records when the snapshot was built and its data version (the newest
+change_log seq it saw), so AdminReports can show the last snapshot as soon as it opens,
+say how old it is, and rebuild it in the background once it is older than
+SNAPSHOT_MINUTES or SNAPSHOT_CHANGES resident/request/account changes behind. Activity
+counts are not in change_log and only refresh with the interval.
+
+    python -m Panels.cli report snapshot     # e.g. from cron, ahead of office hours
+
+No Qt imports here; the GUI side lives in admin_reports.py.
+"""
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+from Panels.reporting import report_summary
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("BRMS_REPORT_CACHE", os.path.join(BASE_DIR, "cache", "reports"))
+SNAPSHOT_MINUTES = int(os.environ.get("BRMS_REPORT_SNAPSHOT_MINUTES", "15"))
+SNAPSHOT_CHANGES = int(os.environ.get("BRMS_REPORT_SNAPSHOT_CHANGES", "100"))
+
+MANIFEST_FORMAT = 2  # 2: turnaround chart and summary
+CHART_DPI = 144     # rendered for 1.5x screens; admin_reports.py scales the pixmaps to match
+CHARTS = ("requests_by_month", "requests_by_type", "age_groups", "turnaround_by_type")
+
+
+def snapshot_dir(database=DEFAULT_DATABASE):
+    return os.path.join(CACHE_DIR, database)
+
+
+def data_version(database=DEFAULT_DATABASE):
+    """Newest change_log seq: grows with every resident / request / account write."""
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    cursor.execute("SELECT COALESCE(MAX(seq), 0) AS seq FROM change_log")
+    seq = cursor.fetchone()["seq"]
+    cursor.close()
+    conn.close()
+    return int(seq)
+
+
+# -----------------------------
+# Chart rendering (Agg, no GUI)
+# -----------------------------
+def _figure(width, height):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(width, height))
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def render_line_chart(path, months, totals, label="Requests"):
+    import matplotlib.dates as mdates
+
+    fig = _figure(4, 3)
+    ax = fig.add_subplot(111)
+    try:
+        x_dates = [datetime.strptime(m, "%Y-%m") for m in months]
+        ax.plot(x_dates, totals, marker="o", label=label)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
+        fig.autofmt_xdate()
+    except Exception:
+        ax.plot(months, totals, marker="o", label=label)
+    ax.set_ylabel("Requests")
+    ax.legend()
+    fig.savefig(path, dpi=CHART_DPI)
+
+
+def render_pie_chart(path, labels, sizes):
+    fig = _figure(3, 3)
+    ax = fig.add_subplot(111)
+    if sum(sizes) > 0:
+        ax.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=90)
+        ax.axis("equal")
+    else:  # a pie of nothing is an error in matplotlib (fresh install, no requests yet)
+        ax.text(0.5, 0.5, "No requests yet", ha="center", va="center", color="#888888")
+        ax.axis("off")
+    fig.savefig(path, dpi=CHART_DPI)
+
+
+def render_bar_chart(path, labels, values, color="#9C27B0"):
+    fig = _figure(4, 3)
+    ax = fig.add_subplot(111)
+    ax.bar(labels, values, color=color)
+    fig.savefig(path, dpi=CHART_DPI)
+
+
+def render_quantile_chart(path, labels, quantiles, names=("P50", "P90", "P99")):
+    """Horizontal bars per label, one per quantile (hours), slowest label at the top."""
+    fig = _figure(4, 3)
+    ax = fig.add_subplot(111)
+    height = 0.8 / len(names)
+    rows = range(len(labels))
+    colors = ("#4CAF50", "#FF9800", "#F44336")
+    for i, name in enumerate(names):
+        values = [(q[i] or 0) for q in quantiles]
+        ax.barh([r + (i - (len(names) - 1) / 2) * height for r in rows], values, height=height,
+                label=name, color=colors[i % len(colors)])
+    ax.set_yticks(list(rows))
+    ax.set_yticklabels(labels, fontsize=7)
+    ax.invert_yaxis()
+    ax.set_xlabel("Hours to complete")
+    ax.legend(fontsize=7)
+    fig.tight_layout()
+    fig.savefig(path, dpi=CHART_DPI)
+
+
+def render_charts(summary, directory):
+    """Write the Reports charts for ``summary`` into ``directory``; ``{chart: file name}``."""
+    def split(pairs):
+        return [a for a, _ in pairs], [b for _, b in pairs]
+
+    files = {chart: f"{chart}.png" for chart in CHARTS}
+    render_line_chart(os.path.join(directory, files["requests_by_month"]), *split(summary["requests_by_month"]))
+    render_pie_chart(os.path.join(directory, files["requests_by_type"]), *split(summary["requests_by_type"]))
+    render_bar_chart(os.path.join(directory, files["age_groups"]), *split(summary["age_groups"]))
+    by_type = sorted(summary["turnaround"]["by_type"], key=lambda r: -(r[2][-1] or 0))
+    render_quantile_chart(os.path.join(directory, files["turnaround_by_type"]),
+                          [key for key, _, _ in by_type], [hours for _, _, hours in by_type])
+    return files
+
+
+# -----------------------------
+# Snapshots
+# -----------------------------
+def build_snapshot(database=DEFAULT_DATABASE):
+    """Compute and store a new snapshot; returns its manifest."""
+    started = time.perf_counter()
+    version = data_version(database)  # read first: the snapshot is at least this fresh
+    summary = report_summary(database)
+
+    root = snapshot_dir(database)
+    name = f"snapshot-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+    directory = os.path.join(root, name)
+    os.makedirs(directory)
+    try:
+        charts = render_charts(summary, directory)
+    except Exception:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "database": database,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "data_version": version,
+        "build_ms": round((time.perf_counter() - started) * 1000),
+        "dir": name,
+        "charts": charts,
+        "summary": summary,
+    }
+    tmp = os.path.join(root, f"manifest.json.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp, os.path.join(root, "manifest.json"))
+
+    _prune(root, keep={name, _previous_dir(root, name)})
+    return manifest
+
+
+def _previous_dir(root, current):
+    older = sorted(d for d in os.listdir(root) if d.startswith("snapshot-") and d < current)
+    return older[-1] if older else None
+
+
+def _prune(root, keep):
+    # The previous snapshot stays one round, in case a desk is still reading its images
+    for entry in os.listdir(root):
+        if entry.startswith("snapshot-") and entry not in keep:
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+
+def load_snapshot(database=DEFAULT_DATABASE):
+    """The current manifest, with ``charts`` as full paths; None if there is no usable snapshot."""
+    root = snapshot_dir(database)
+    try:
+        with open(os.path.join(root, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != MANIFEST_FORMAT:
+        return None
+    directory = os.path.join(root, manifest["dir"])
+    manifest["charts"] = {chart: os.path.join(directory, file) for chart, file in manifest["charts"].items()}
+    if not all(os.path.exists(path) for path in manifest["charts"].values()):
+        return None
+    return manifest
+
+
+def snapshot_age(manifest):
+    """Seconds since ``manifest`` was built."""
+    return (datetime.now() - datetime.fromisoformat(manifest["created_at"])).total_seconds()
+
+
+def is_stale(manifest, current_version=None, max_minutes=SNAPSHOT_MINUTES, max_changes=SNAPSHOT_CHANGES):
+    if manifest is None:
+        return True
+    if snapshot_age(manifest) >= max_minutes * 60:
+        return True
+    return current_version is not None and current_version - manifest["data_version"] >= max_changes
+
+
+def describe_age(seconds):
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h ago"
+    return f"{int(seconds // 86400)} d ago"
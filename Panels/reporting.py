@@ -0,0 +1,315 @@
+# Panels/reporting.py
+"""
+Report queries and CSV / PDF export formatting, shared by the panels' Export buttons and
+the headless CLI (Panels/cli.py).
+
+Nothing here imports Qt or matplotlib; reportlab is only imported when a PDF is written
+(Panels/pdf_reports.py lays the rows out as wrapping tables, in parallel for large reports).
+Each export is described once in EXPORTS (query, CSV columns, PDF layout):
+
+    filename = export_csv("requests")
+    filename = export_pdf("staff_activity", export_dir="/srv/brims/reports")
+"""
+import csv
+import os
+from datetime import datetime
+
+from pymysql.cursors import SSDictCursor
+
+from Panels.ages import age_sql
+from Panels.db import DEFAULT_DATABASE, get_connection
+from Panels.pdf_reports import MARGIN_IN, PAGE_WIDTH_IN, render_table_pdf
+from Panels.resident_snapshot import get_resident_snapshot
+from Panels.turnaround import turnaround_summary
+
+EXPORT_DIR = os.path.join(os.getcwd(), "exports")
+
+
+def _stamp(value, fmt="%Y-%m-%d %H:%M:%S", empty=""):
+    if value and hasattr(value, "strftime"):
+        return value.strftime(fmt)
+    return str(value) if value else empty
+
+
+class Export:
+    """
+    One exportable report.
+
+    ``csv_columns`` is ``[(header, format(row))]``; ``pdf_columns`` is
+    ``[(header, x in inches, format(row))]``, each column running to the next one's x and
+    wrapping its text. ``pdf_limit`` caps the PDF's rows (recent activity only); the CSV
+    always has every row.
+    """
+
+    def __init__(self, title, filename, sql, csv_columns, pdf_columns, pdf_font_size=9, pdf_limit=None):
+        self.title = title
+        self.filename = filename
+        self.sql = sql
+        self.csv_columns = csv_columns
+        self.pdf_columns = pdf_columns
+        self.pdf_font_size = pdf_font_size
+        self.pdf_limit = pdf_limit
+
+
+# -----------------------------
+# Export definitions
+# -----------------------------
+_REQUESTS_SQL = """
+    SELECT r.id, res.name AS resident, r.document_type, r.purpose,
+           r.request_date, r.status, r.completed_date, r.control_number, s.username AS handled_by
+    FROM requests r
+    JOIN residents res ON r.resident_id = res.id
+    LEFT JOIN staff s ON r.created_by = s.id
+    ORDER BY r.created_at DESC
+"""
+
+_RESIDENTS_SQL = f"""
+    SELECT r.*, {age_sql("r")} AS age, s.username AS added_by
+    FROM residents r
+    LEFT JOIN staff s ON r.created_by = s.id
+    ORDER BY r.created_at DESC
+"""
+
+_RESIDENT_COLUMNS = [
+    ("Name", lambda r: r["name"]),
+    ("Age", lambda r: r["age"]),
+    ("Gender", lambda r: r["gender"]),
+    ("Address", lambda r: r["address"]),
+    ("Contact", lambda r: r["contact_number"]),
+    ("Civil Status", lambda r: r["civil_status"]),
+    ("Employment", lambda r: r["employment_status"]),
+    ("Education", lambda r: r["education_level"]),
+    ("Residency Years", lambda r: r["residency_years"]),
+]
+
+_ACTIVITY_PDF_COLUMNS = [
+    ("Timestamp", 0.5, lambda a: a["created_at"].strftime("%m/%d %H:%M")),
+    # "Staff" / "Admin" header is filled in per export below
+    (None, 2.0, lambda a: a["username"] or "Unknown"),
+    ("Activity", 3.0, lambda a: a["action_type"] or "N/A"),
+    ("Description", 4.5, lambda a: a["description"] or "N/A"),
+]
+
+
+def _activity_pdf_columns(who):
+    return [(header or who, x, fmt) for header, x, fmt in _ACTIVITY_PDF_COLUMNS]
+
+
+EXPORTS = {
+    "requests": Export(
+        "Barangay Document Requests Report", "requests_report", _REQUESTS_SQL,
+        csv_columns=[
+            ("Resident", lambda r: r["resident"]),
+            ("Document Type", lambda r: r["document_type"]),
+            ("Purpose", lambda r: r["purpose"]),
+            ("Request Date", lambda r: _stamp(r["request_date"])),
+            ("Status", lambda r: r["status"]),
+            ("Completed Date", lambda r: _stamp(r["completed_date"])),
+            ("Control No.", lambda r: r["control_number"] or ""),
+            ("Handled By", lambda r: r["handled_by"] or ""),
+        ],
+        pdf_columns=[
+            ("Resident", 0.5, lambda r: str(r["resident"])),
+            ("Document Type", 2.0, lambda r: str(r["document_type"])),
+            ("Purpose", 3.5, lambda r: str(r["purpose"])),
+            ("Request Date", 5.0, lambda r: _stamp(r["request_date"])),
+            ("Status", 6.5, lambda r: str(r["status"])),
+            ("Completed Date", 7.5, lambda r: _stamp(r["completed_date"], empty="-")),
+            ("Handled By", 8.5, lambda r: str(r["handled_by"] or "-")),
+        ],
+    ),
+    # Admin copy (Admin > Residents)
+    "residents": Export(
+        "Barangay Residents Report (Admin Copy)", "residents_admin", _RESIDENTS_SQL,
+        csv_columns=_RESIDENT_COLUMNS + [("Added By", lambda r: r["added_by"] or "Unknown")],
+        pdf_columns=[
+            ("Name", 0.5, lambda r: r["name"]),
+            ("Gender", 2.5, lambda r: r["gender"]),
+            ("Address", 4.0, lambda r: r["address"]),
+            ("Added By", 7.0, lambda r: r["added_by"] or "Unknown"),
+        ],
+    ),
+    # Staff copy (Staff > Resident Profiles)
+    "resident_directory": Export(
+        "Barangay Resident Directory", "residents", _RESIDENTS_SQL,
+        csv_columns=_RESIDENT_COLUMNS + [("Status", lambda r: r["status"])],
+        pdf_columns=[
+            ("Name", 0.5, lambda r: r["name"]),
+            ("Age", 2.0, lambda r: "" if r["age"] is None else str(r["age"])),
+            ("Gender", 2.5, lambda r: r["gender"]),
+            ("Address", 3.0, lambda r: r["address"]),
+            ("Contact", 5.5, lambda r: r["contact_number"] or ""),
+            ("Civil Status", 6.5, lambda r: r["civil_status"] or ""),
+            ("Employment", 7.5, lambda r: r["employment_status"] or ""),
+            ("Status", 8.5, lambda r: r["status"]),
+        ],
+        pdf_font_size=8,
+    ),
+    "staff_activity": Export(
+        "Staff Activity Report", "staff_activities", """
+            SELECT sa.created_at, s.username, sa.action_type, sa.description, sa.role, sa.ip_address
+            FROM staff_activity sa
+            LEFT JOIN staff s ON sa.staff_id = s.id
+            ORDER BY sa.created_at DESC
+        """,
+        csv_columns=[
+            ("Timestamp", lambda a: a["created_at"].strftime("%Y-%m-%d %H:%M:%S")),
+            ("Staff Member", lambda a: a["username"] or "Unknown"),
+            ("Activity Type", lambda a: a["action_type"] or "N/A"),
+            ("Description", lambda a: a["description"] or "N/A"),
+            ("Role", lambda a: a["role"] or "Staff"),
+            ("IP Address", lambda a: a["ip_address"] or "N/A"),
+        ],
+        pdf_columns=_activity_pdf_columns("Staff"),
+        pdf_font_size=8,
+        pdf_limit=100,
+    ),
+    "admin_activity": Export(
+        "Admin Activity Report", "admin_activities", """
+            SELECT aa.created_at, a.username, aa.action_type, aa.description, aa.ip_address
+            FROM admin_activity aa
+            LEFT JOIN admins a ON aa.admin_id = a.id
+            ORDER BY aa.created_at DESC
+        """,
+        csv_columns=[
+            ("Timestamp", lambda a: a["created_at"].strftime("%Y-%m-%d %H:%M:%S")),
+            ("Admin User", lambda a: a["username"] or "Unknown"),
+            ("Activity Type", lambda a: a["action_type"] or "N/A"),
+            ("Description", lambda a: a["description"] or "N/A"),
+            ("IP Address", lambda a: a["ip_address"] or "N/A"),
+        ],
+        pdf_columns=_activity_pdf_columns("Admin"),
+        pdf_font_size=8,
+        pdf_limit=100,
+    ),
+}
+
+
+# -----------------------------
+# Writing
+# -----------------------------
+def fetch_rows(export, limit=None, database=DEFAULT_DATABASE):
+    sql = export.sql + (f" LIMIT {int(limit)}" if limit else "")
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    cursor.execute(sql)
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return rows
+
+
+def iter_rows(export, limit=None, database=DEFAULT_DATABASE):
+    """Like fetch_rows, but streamed from the server (unbuffered cursor) for large reports."""
+    sql = export.sql + (f" LIMIT {int(limit)}" if limit else "")
+    conn = get_connection(database)
+    cursor = conn.cursor(SSDictCursor)
+    try:
+        cursor.execute(sql)
+        yield from cursor
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def export_path(export, ext, export_dir=None):
+    export_dir = export_dir or EXPORT_DIR
+    os.makedirs(export_dir, exist_ok=True)
+    return os.path.join(export_dir, f"{export.filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}")
+
+
+def write_csv(export, rows, filename):
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _ in export.csv_columns])
+        for row in rows:
+            writer.writerow([fmt(row) for _, fmt in export.csv_columns])
+
+
+def pdf_widths(export):
+    """Column widths in inches: each column runs to the next one's x, the last to the margin."""
+    xs = [x for _, x, _ in export.pdf_columns] + [PAGE_WIDTH_IN - MARGIN_IN]
+    return [right - left for left, right in zip(xs, xs[1:])]
+
+
+def write_pdf(export, rows, filename):
+    """Render ``rows`` (any iterable, read once) with the table engine in Panels/pdf_reports.py."""
+    formatted = (tuple(str(fmt(row)) for _, _, fmt in export.pdf_columns) for row in rows)
+    return render_table_pdf(filename, export.title, [header for header, _, _ in export.pdf_columns],
+                            pdf_widths(export), formatted, font_size=export.pdf_font_size)
+
+
+def export_csv(name, export_dir=None, database=DEFAULT_DATABASE):
+    """Write export ``name`` (a key of EXPORTS) as CSV; returns the file's path."""
+    export = EXPORTS[name]
+    filename = export_path(export, "csv", export_dir)
+    write_csv(export, iter_rows(export, database=database), filename)
+    return filename
+
+
+def export_pdf(name, export_dir=None, database=DEFAULT_DATABASE):
+    """Write export ``name`` (a key of EXPORTS) as PDF; returns the file's path."""
+    export = EXPORTS[name]
+    filename = export_path(export, "pdf", export_dir)
+    write_pdf(export, iter_rows(export, export.pdf_limit, database), filename)
+    return filename
+
+
+# -----------------------------
+# Report summary (Admin > Reports)
+# -----------------------------
+AGE_GROUPS = [("0-17", 0, 17), ("18-35", 18, 35), ("36-50", 36, 50), ("51-65", 51, 65), ("65+", 66, None)]
+
+
+def report_summary(database=DEFAULT_DATABASE):
+    """The numbers behind the Reports panel's KPIs and charts."""
+    snapshot = get_resident_snapshot(database)
+    total_residents = snapshot.count()
+    age_groups = list(snapshot.age_histogram(AGE_GROUPS).items())
+
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+
+        cursor.execute("SELECT COUNT(*) AS total FROM requests")
+        total_requests = cursor.fetchone()["total"]
+
+        cursor.execute("""
+            SELECT DATE_FORMAT(request_date, '%Y-%m') AS month, COUNT(*) AS total
+            FROM requests
+            GROUP BY month ORDER BY month
+        """)
+        by_month = [(r["month"], r["total"]) for r in cursor.fetchall()]
+
+        cursor.execute("SELECT document_type, COUNT(*) AS total FROM requests GROUP BY document_type")
+        by_type = [(r["document_type"], r["total"]) for r in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT 'Staff' AS role, sa.action_type, COUNT(*) AS total
+            FROM staff_activity sa
+            WHERE sa.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+            GROUP BY sa.action_type
+            UNION ALL
+            SELECT 'Admin' AS role, aa.action_type, COUNT(*) AS total
+            FROM admin_activity aa
+            WHERE aa.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+            GROUP BY aa.action_type
+            ORDER BY total DESC
+            LIMIT 5
+        """)
+        top_activity = [(r["role"], r["action_type"], r["total"]) for r in cursor.fetchall()]
+
+        turnaround = turnaround_summary(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+    return {
+        "total_residents": total_residents,
+        "total_requests": total_requests,
+        "requests_by_month": by_month,
+        "requests_by_type": by_type,
+        "age_groups": age_groups,
+        "top_activity": top_activity,
+        "turnaround": turnaround,
+    }
@@ -0,0 +1,292 @@
+# Panels/resident_snapshot.py
+"""
+In-memory columnar snapshot of the residents table for the analytics panels.
+
+StaffResidentDemographics, StaffInfographics and the Reports summary used to query
+residents and loop over the rows in Python each. They now share one ResidentSnapshot
+per database (get_resident_snapshot()), held as NumPy arrays:
+
+    id                       int64, ascending
+    birth_year, birth_md     int16 year and month * 100 + day (0 when unknown); ages
+                             are worked out from them for today, so they never go stale
+    gender, civil_status,    int16 category codes (-1 when empty) into labels[column]
+    education_level,
+    employment_status
+    residency_years          int16 (-1 when unknown)
+    created_at               datetime64[s]
+
+refresh() loads it once, then catches up from change_log (the same entries the change
+feed publishes, Panels/change_feed.py): only the residents changed since the last
+refresh are re-read and patched in. A refresh builds new arrays and swaps them in, so
+a Reports build on a worker thread and the GUI thread can read the snapshot at once.
+subscribe() tells other structures kept from the snapshot (Panels/facets.py) which
+residents a refresh changed.
+
+The analytics are vectorized over the arrays: filter() builds a row mask,
+value_counts(), age_histogram(), crosstab() and mean_age() count under it.
+Benchmarks/bench_snapshot.py compares them with the per-row Python they replace.
+
+No Qt imports here.
+"""
+import datetime
+import threading
+
+import numpy as np
+from pymysql.cursors import SSCursor
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+CATEGORIES = ("gender", "civil_status", "education_level", "employment_status")
+SNAPSHOT_SELECT = f"SELECT id, birth_date, {', '.join(CATEGORIES)}, residency_years, created_at FROM residents"
+LOAD_BATCH = 20_000
+# More changed residents than this since the last refresh and it reloads everything
+MAX_CHANGES = 5_000
+# Same allowance as the change feed for seqs that commit out of order
+REORDER_WINDOW = 50
+MAX_YEARS = 150  # ages and residency years are binned up to this
+
+
+def ages_of(columns, today):
+    """Age in whole years per row of ``columns`` on ``today``, -1 when the birth date is unknown."""
+    year, md = columns["birth_year"], columns["birth_md"]
+    ages = (today.year - year - (today.month * 100 + today.day < md)).astype(np.int16)
+    ages[year == 0] = -1
+    return ages
+
+
+def bin_codes(values, groups):
+    """Index into ``(label, low, high)`` ``groups`` per value (high None: open-ended), -1 for none."""
+    lookup = np.full(MAX_YEARS + 2, -1, dtype=np.int16)  # index MAX_YEARS + 1: unknown
+    for code, (_, low, high) in enumerate(groups):
+        lookup[low:(high if high is not None else MAX_YEARS) + 1] = code
+    return lookup[np.where(values < 0, MAX_YEARS + 1, np.minimum(values, MAX_YEARS))]
+
+
+class ResidentSnapshot:
+    def __init__(self, database=DEFAULT_DATABASE):
+        self.database = database
+        self.seq = None  # newest change_log seq applied
+        self.labels = {column: [] for column in CATEGORIES}
+        self._codes = {column: {} for column in CATEGORIES}
+        self._columns = self._build([])
+        self._seen = set()
+        self._ages = (None, None, None)  # (columns, today, ages)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """A snapshot of ``(id, birth_date, gender, civil_status, education_level, employment_status,
+        residency_years, created_at)`` tuples, ascending by id, without a database (benchmarks)."""
+        snapshot = cls(database=None)
+        snapshot._columns = snapshot._build(rows)
+        return snapshot
+
+    # -----------------------------
+    # Columns
+    # -----------------------------
+    def _code(self, column, value):
+        if not value:
+            return -1
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.labels[column].append(value)
+        return code
+
+    def _build(self, rows):
+        n = len(rows)
+        births = [row[1] for row in rows]
+        columns = {
+            "id": np.fromiter((row[0] for row in rows), np.int64, n),
+            "birth_year": np.fromiter((b.year if b else 0 for b in births), np.int16, n),
+            "birth_md": np.fromiter((b.month * 100 + b.day if b else 0 for b in births), np.int16, n),
+            "residency_years": np.fromiter((row[-2] if row[-2] is not None else -1 for row in rows), np.int16, n),
+            "created_at": np.array([row[-1] for row in rows], dtype="datetime64[s]"),
+        }
+        for i, column in enumerate(CATEGORIES, 2):
+            columns[column] = np.fromiter((self._code(column, row[i]) for row in rows), np.int16, n)
+        return columns
+
+    def __len__(self):
+        return len(self._columns["id"])
+
+    @property
+    def columns(self):
+        """The current arrays by column name; a refresh replaces them rather than changing them."""
+        return self._columns
+
+    def subscribe(self, callback):
+        """
+        Call ``callback(changed_ids, columns)`` after every refresh that changed something:
+        ``changed_ids`` None and the whole snapshot on a full load, otherwise the changed ids
+        and the columns of those still present. It is called once right away with the
+        current snapshot, under the refresh lock, so no change falls between the two.
+        """
+        with self._lock:
+            callback(None, self._columns)
+            self._listeners.append(callback)
+
+    def _notify(self, changed_ids, columns):
+        for callback in self._listeners:
+            try:
+                callback(changed_ids, columns)
+            except Exception as e:
+                print(f"⚠️ Resident snapshot listener failed: {e}")
+
+    # -----------------------------
+    # Loading and catching up
+    # -----------------------------
+    def refresh(self):
+        """Load the snapshot, or apply the residents changed since the last refresh; returns self."""
+        with self._lock:
+            conn = get_connection(self.database)
+            cursor = conn.cursor()
+            try:
+                if self.seq is None or not self._catch_up(cursor):
+                    self._load(conn, cursor)
+            finally:
+                cursor.close()
+                conn.close()
+        return self
+
+    def _load(self, conn, cursor):
+        cursor.execute("SELECT COALESCE(MAX(seq), 0) AS seq FROM change_log")
+        seq = cursor.fetchone()["seq"]  # read first: the rows are at least this fresh
+
+        stream = conn.cursor(SSCursor)
+        parts = []
+        try:
+            stream.execute(f"{SNAPSHOT_SELECT} ORDER BY id")
+            while True:
+                rows = stream.fetchmany(LOAD_BATCH)
+                if not rows:
+                    break
+                parts.append(self._build(rows))
+        finally:
+            stream.close()
+        self._columns = {name: np.concatenate([p[name] for p in parts]) if parts else array
+                         for name, array in self._build([]).items()}
+        self.seq = seq
+        self._seen.clear()
+        self._notify(None, self._columns)
+
+    def _catch_up(self, cursor):
+        """Patch in changed residents; False when a full reload is needed instead."""
+        cursor.execute("SELECT MIN(seq) AS seq FROM change_log")
+        oldest = cursor.fetchone()["seq"]
+        if oldest is not None and oldest > self.seq + 1:
+            return False  # entries we never saw were pruned
+        cursor.execute("""
+            SELECT seq, entity_id FROM change_log
+            WHERE seq > %s AND entity = 'resident'
+            ORDER BY seq
+            LIMIT %s
+        """, (max(0, self.seq - REORDER_WINDOW), MAX_CHANGES + 1))
+        entries = [e for e in cursor.fetchall() if e["seq"] not in self._seen]
+        if len(entries) > MAX_CHANGES:
+            return False
+        if not entries:
+            return True
+
+        changed = np.array(sorted({e["entity_id"] for e in entries}), dtype=np.int64)
+        cursor.execute(f"{SNAPSHOT_SELECT} WHERE id IN ({', '.join(['%s'] * len(changed))}) ORDER BY id",
+                       changed.tolist())
+        fresh = self._build([tuple(row.values()) for row in cursor.fetchall()])
+
+        current = self._columns
+        keep = ~np.isin(current["id"], changed)
+        at = np.searchsorted(current["id"][keep], fresh["id"])
+        self._columns = {name: np.insert(array[keep], at, fresh[name]) for name, array in current.items()}
+        self._notify(changed, fresh)
+
+        self.seq = max(self.seq, entries[-1]["seq"])
+        self._seen.update(e["seq"] for e in entries)
+        self._seen = {seq for seq in self._seen if seq > self.seq - REORDER_WINDOW}
+        return True
+
+    # -----------------------------
+    # Vectorized analytics
+    # -----------------------------
+    def ages(self, today=None, columns=None):
+        """Age in whole years per row for ``today``, -1 when the birth date is unknown."""
+        today = today or datetime.date.today()
+        columns = columns or self._columns
+        cached_columns, cached_today, ages = self._ages
+        if cached_columns is columns and cached_today == today:
+            return ages
+        ages = ages_of(columns, today)
+        self._ages = (columns, today, ages)
+        return ages
+
+    def filter(self, min_age=None, max_age=None, created_from=None, created_until=None, today=None,
+               **categories):
+        """
+        Row mask: ages ``min_age``..``max_age``, created_at in [created_from, created_until),
+        and each ``column=value`` (or list of values) of CATEGORIES.
+        """
+        columns = self._columns
+        mask = np.ones(len(columns["id"]), dtype=bool)
+        if min_age is not None or max_age is not None:
+            ages = self.ages(today, columns)
+            mask &= ages >= (min_age or 0)
+            if max_age is not None:
+                mask &= ages <= max_age
+        if created_from is not None:
+            mask &= columns["created_at"] >= np.datetime64(created_from, "s")
+        if created_until is not None:
+            mask &= columns["created_at"] < np.datetime64(created_until, "s")
+        for column, values in categories.items():
+            values = [values] if isinstance(values, str) else values
+            codes = [self._codes[column][v] for v in values if v in self._codes[column]]
+            mask &= np.isin(columns[column], codes)
+        return mask
+
+    def count(self, mask=None):
+        return int(mask.sum()) if mask is not None else len(self)
+
+    def _dimension(self, columns, name, groups=None, today=None):
+        """``(codes, labels)``: a CATEGORIES column, or "age" binned into ``groups``."""
+        if name != "age":
+            return columns[name], list(self.labels[name])
+        return bin_codes(self.ages(today, columns), groups), [g[0] for g in groups]
+
+    def value_counts(self, column, mask=None, groups=None, today=None):
+        """``{label: rows}`` for every label of ``column`` (or age ``groups``), zeros included."""
+        codes, labels = self._dimension(self._columns, column, groups, today)
+        selected = codes if mask is None else codes[mask]
+        counts = np.bincount(selected[selected >= 0], minlength=len(labels))
+        return {label: int(n) for label, n in zip(labels, counts)}
+
+    def age_histogram(self, groups, mask=None, today=None):
+        """``{label: residents}`` per ``(label, low, high)`` age group, like ages.bucket_counts()."""
+        return self.value_counts("age", mask, groups, today)
+
+    def crosstab(self, rows, columns, mask=None, groups=None, today=None):
+        """``(row_labels, column_labels, counts)``; counts[i, j] residents in both. "age" uses ``groups``."""
+        snapshot = self._columns
+        row_codes, row_labels = self._dimension(snapshot, rows, groups, today)
+        col_codes, col_labels = self._dimension(snapshot, columns, groups, today)
+        both = (row_codes >= 0) & (col_codes >= 0)
+        if mask is not None:
+            both &= mask
+        flat = row_codes[both].astype(np.int64) * len(col_labels) + col_codes[both]
+        counts = np.bincount(flat, minlength=len(row_labels) * len(col_labels))
+        return row_labels, col_labels, counts.reshape(len(row_labels), len(col_labels))
+
+    def mean_age(self, mask=None, today=None):
+        """Mean age of the rows with a known birth date, 0.0 when there are none."""
+        ages = self.ages(today)
+        known = ages >= 0 if mask is None else (ages >= 0) & mask
+        return float(ages[known].mean()) if known.any() else 0.0
+
+
+_snapshots = {}
+
+
+def get_resident_snapshot(database=DEFAULT_DATABASE):
+    """This process's snapshot of ``database``, brought up to date."""
+    if database not in _snapshots:
+        _snapshots[database] = ResidentSnapshot(database)
+    return _snapshots[database].refresh()
@@ -0,0 +1,309 @@
+# Panels/retention.py
+"""
+Retention for the activity tables (staff_activity, admin_activity).
+
+Both tables are range-partitioned by month (Migrations/002_partition_activity_by_month.sql).
+The retention job keeps monthly pYYYYMM partitions a few months ahead of today, and moves
+every month older than the horizon into a gzip-compressed JSON Lines file under
+Archives/<table>/ before dropping its partition. Archives/manifest.json lists each
+archive with its row count, time range and SHA-256.
+
+History viewers call archived_activity() to read archived months back transparently.
+Each run also prunes change_log entries older than BRMS_CHANGE_LOG_KEEP_DAYS (default 7).
+
+Run it from cron / Task Scheduler, e.g. nightly:
+
+    python -m Panels.retention run                      # horizon: BRMS_ACTIVITY_RETENTION_MONTHS or 12
+    python -m Panels.retention run --horizon-months 6 --dry-run
+    python -m Panels.retention status
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import date, datetime
+
+import pymysql
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_DIR = os.environ.get("BRMS_ARCHIVE_DIR", os.path.join(BASE_DIR, "Archives"))
+DEFAULT_HORIZON_MONTHS = int(os.environ.get("BRMS_ACTIVITY_RETENTION_MONTHS", "12"))
+MONTHS_AHEAD = 3
+CHANGE_LOG_KEEP_DAYS = int(os.environ.get("BRMS_CHANGE_LOG_KEEP_DAYS", "7"))
+
+ACTIVITY_TABLES = ("staff_activity", "admin_activity")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -----------------------------
+# Month helpers
+# -----------------------------
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def partition_month(name):
+    """pYYYYMM -> date of the month's first day; None for p_future."""
+    if len(name) == 7 and name[1:].isdigit():
+        return date(int(name[1:5]), int(name[5:7]), 1)
+    return None
+
+
+# -----------------------------
+# Manifest
+# -----------------------------
+def manifest_path(archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, "manifest.json")
+
+
+def load_manifest(archive_dir=ARCHIVE_DIR):
+    path = manifest_path(archive_dir)
+    if not os.path.exists(path):
+        return {"version": 1, "archives": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, archive_dir=ARCHIVE_DIR):
+    path = manifest_path(archive_dir)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)  # readers never see a half-written manifest
+
+
+def record_archive(entry, archive_dir=ARCHIVE_DIR):
+    manifest = load_manifest(archive_dir)
+    manifest["archives"] = [a for a in manifest["archives"]
+                            if (a["table"], a["month"]) != (entry["table"], entry["month"])]
+    manifest["archives"].append(entry)
+    manifest["archives"].sort(key=lambda a: (a["table"], a["month"]))
+    save_manifest(manifest, archive_dir)
+
+
+# -----------------------------
+# Partition maintenance
+# -----------------------------
+def list_partitions(cursor, table):
+    cursor.execute("""
+        SELECT PARTITION_NAME AS name, TABLE_ROWS AS row_estimate
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (table,))
+    return cursor.fetchall()
+
+
+def ensure_partitions(cursor, table, months_ahead=MONTHS_AHEAD, today=None):
+    """Split p_future into monthly partitions up to ``months_ahead`` months past today."""
+    today = today or date.today()
+    months = [partition_month(p["name"]) for p in list_partitions(cursor, table)]
+    months = [m for m in months if m]
+
+    if months:
+        first_new = add_months(max(months), 1)
+    else:
+        cursor.execute(f"SELECT MIN(created_at) AS oldest FROM {table}")
+        oldest = cursor.fetchone()["oldest"]
+        first_new = month_start(oldest) if oldest else month_start(today)
+
+    last_new = add_months(month_start(today), months_ahead)
+    new_months = []
+    month = first_new
+    while month <= last_new:
+        new_months.append(month)
+        month = add_months(month, 1)
+    if not new_months:
+        return []
+
+    definitions = ",\n".join(
+        f"PARTITION {partition_name(m)} VALUES LESS THAN (TO_DAYS('{add_months(m, 1):%Y-%m-%d}'))"
+        for m in new_months
+    )
+    cursor.execute(f"""
+        ALTER TABLE {table} REORGANIZE PARTITION p_future INTO (
+            {definitions},
+            PARTITION p_future VALUES LESS THAN MAXVALUE
+        )
+    """)
+    return [partition_name(m) for m in new_months]
+
+
+def archive_partition(conn, table, month, archive_dir=ARCHIVE_DIR):
+    """Write one monthly partition to Archives/<table>/<table>_YYYY-MM.jsonl.gz and return its manifest entry."""
+    table_dir = os.path.join(archive_dir, table)
+    os.makedirs(table_dir, exist_ok=True)
+    filename = f"{table}_{month:%Y-%m}.jsonl.gz"
+    path = os.path.join(table_dir, filename)
+    tmp_path = path + ".tmp"
+
+    rows, oldest, newest = 0, None, None
+    cursor = conn.cursor(pymysql.cursors.SSDictCursor)  # stream; a month can be millions of rows
+    cursor.execute(f"SELECT * FROM {table} PARTITION ({partition_name(month)}) ORDER BY created_at")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for row in cursor:
+            created = row["created_at"]
+            oldest = oldest or created
+            newest = created
+            f.write(json.dumps(row, default=lambda v: v.strftime(TIMESTAMP_FORMAT)
+                               if isinstance(v, datetime) else str(v)) + "\n")
+            rows += 1
+    cursor.close()
+
+    sha256 = hashlib.sha256()
+    with open(tmp_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(block)
+    os.replace(tmp_path, path)
+
+    return {
+        "table": table,
+        "month": f"{month:%Y-%m}",
+        "file": f"{table}/{filename}",
+        "rows": rows,
+        "min_created_at": oldest.strftime(TIMESTAMP_FORMAT) if oldest else None,
+        "max_created_at": newest.strftime(TIMESTAMP_FORMAT) if newest else None,
+        "sha256": sha256.hexdigest(),
+        "archived_at": datetime.now().strftime(TIMESTAMP_FORMAT),
+    }
+
+
+def prune_change_log(cursor, keep_days=CHANGE_LOG_KEEP_DAYS):
+    """Drop change-feed entries (Panels/change_feed.py) older than any desk still polling for."""
+    cursor.execute("DELETE FROM change_log WHERE changed_at < NOW() - INTERVAL %s DAY", (keep_days,))
+    return cursor.rowcount
+
+
+def run_retention(database=DEFAULT_DATABASE, horizon_months=DEFAULT_HORIZON_MONTHS,
+                  archive_dir=ARCHIVE_DIR, dry_run=False, today=None):
+    """Maintain partitions and archive months older than the horizon. Returns archived manifest entries."""
+    today = today or date.today()
+    cutoff = add_months(month_start(today), -horizon_months)
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    archived = []
+
+    try:
+        for table in ACTIVITY_TABLES:
+            if not list_partitions(cursor, table):
+                print(f"⚠️ {table} is not partitioned; run `python -m Panels.migrate` first.")
+                continue
+
+            if not dry_run:
+                created = ensure_partitions(cursor, table, today=today)
+                if created:
+                    print(f"  • {table}: added partitions {created[0]}..{created[-1]}")
+
+            old_months = [m for m in (partition_month(p["name"]) for p in list_partitions(cursor, table))
+                          if m and m < cutoff]
+            for month in old_months:
+                if dry_run:
+                    print(f"  • {table}: would archive {month:%Y-%m}")
+                    continue
+                entry = archive_partition(conn, table, month, archive_dir)
+                record_archive(entry, archive_dir)
+                cursor.execute(f"ALTER TABLE {table} DROP PARTITION {partition_name(month)}")
+                archived.append(entry)
+                print(f"  • {table}: archived {entry['month']} ({entry['rows']:,} rows) -> {entry['file']}")
+
+        if not dry_run:
+            pruned = prune_change_log(cursor)
+            conn.commit()
+            if pruned:
+                print(f"  • change_log: pruned {pruned:,} old entries")
+    finally:
+        cursor.close()
+        conn.close()
+    return archived
+
+
+# -----------------------------
+# Reading archives back
+# -----------------------------
+def read_archive(entry, archive_dir=ARCHIVE_DIR):
+    """Yield the rows of one archive, with created_at parsed back to datetime."""
+    with gzip.open(os.path.join(archive_dir, entry["file"]), "rt", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            row["created_at"] = datetime.strptime(row["created_at"], TIMESTAMP_FORMAT)
+            yield row
+
+
+def archived_activity(table, start, end, actor_field=None, actor_id=None, action_type=None,
+                      search="", usernames=None, archive_dir=ARCHIVE_DIR):
+    """
+    Archived rows of ``table`` with start <= created_at < end, filtered like the history panels.
+
+    ``usernames`` maps actor ids to usernames; it fills the ``username`` column the live
+    queries get from their JOIN and is used by the search filter. Returns [] without
+    touching the disk when no archived month overlaps the range.
+    """
+    entries = [a for a in load_manifest(archive_dir)["archives"] if a["table"] == table and a["rows"]
+               and a["min_created_at"] < end.strftime(TIMESTAMP_FORMAT)
+               and a["max_created_at"] >= start.strftime(TIMESTAMP_FORMAT)]
+    usernames = usernames or {}
+    needle = search.lower()
+    rows = []
+
+    for entry in entries:
+        for row in read_archive(entry, archive_dir):
+            if not (start <= row["created_at"] < end):
+                continue
+            if actor_id is not None and row.get(actor_field) != actor_id:
+                continue
+            if action_type and row.get("action_type") != action_type:
+                continue
+            row["username"] = usernames.get(row.get(actor_field))
+            if needle and not any(needle in (row.get(k) or "").lower()
+                                  for k in ("username", "description", "action_type")):
+                continue
+            rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive old activity-log months and maintain partitions")
+    parser.add_argument("command", choices=["run", "status"])
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--horizon-months", type=int, default=DEFAULT_HORIZON_MONTHS,
+                        help="keep this many months in the database (default %(default)s)")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="only list the months that would be archived")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        conn = get_connection(args.database)
+        cursor = conn.cursor()
+        for table in ACTIVITY_TABLES:
+            partitions = list_partitions(cursor, table)
+            print(f"{table}: {len(partitions)} partitions, ~{sum(p['row_estimate'] or 0 for p in partitions):,} rows")
+        cursor.close()
+        conn.close()
+        for entry in load_manifest(args.archive_dir)["archives"]:
+            print(f"  📦 {entry['table']:<15} {entry['month']}  {entry['rows']:>10,} rows  {entry['file']}")
+        return 0
+
+    try:
+        archived = run_retention(args.database, args.horizon_months, args.archive_dir, args.dry_run)
+    except Exception as e:
+        print(f"❌ Retention run failed: {e}")
+        return 1
+    print(f"✅ Archived {len(archived)} month(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
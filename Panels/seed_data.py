@@ -0,0 +1,190 @@
+# Panels/seed_data.py
+"""
+High-volume synthetic data seeder for load and capacity testing.
+
+Fills admins, staff, residents, requests and both activity tables with deterministic
+synthetic data (Panels/synthetic_data.py). Each table is split into chunks that worker
+processes generate and insert in parallel over their own connections, either as
+multi-row INSERTs or through LOAD DATA LOCAL INFILE. Rows carry explicit ids, so the
+result for a given seed is the same whatever the worker count or finishing order.
+
+    python -m Panels.seed_data --residents 100000
+    python -m Panels.seed_data --residents 1000000 --workers 8 --method load-data --history-years 5
+    python -m Panels.seed_data --database brms_load --residents 1000000 --truncate --test-users
+
+Seeded accounts cannot log in unless --password is given.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from multiprocessing import Pool
+
+from Panels import synthetic_data
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+# -----------------------------
+# Chunk workers
+# -----------------------------
+def _tsv_value(value):
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _insert_chunk(cursor, table, columns, rows, batch_size):
+    placeholders = ", ".join("%s" for _ in columns)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(sql, rows[start:start + batch_size])  # sent as one multi-row INSERT
+
+
+def _load_data_chunk(cursor, table, columns, rows):
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", encoding="utf-8", newline="\n", delete=False) as f:
+        for row in rows:
+            f.write("\t".join(_tsv_value(v) for v in row) + "\n")
+        path = f.name
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+            (path.replace("\\", "/"),)
+        )
+    finally:
+        os.remove(path)
+
+
+def seed_chunk(task):
+    """Generate and insert one chunk. Runs in a worker process with its own connection."""
+    (table, chunk, first_id, row_count, counts, seed, anchor, history_days,
+     password_hash, database, method, batch_size) = task
+
+    generated = synthetic_data.generate_chunk(
+        table, chunk, row_count, counts, seed, anchor, history_days, password_hash)
+    rows = [(first_id + i,) + row for i, row in enumerate(generated)]
+    columns = ("id",) + synthetic_data.TABLE_COLUMNS[table]
+
+    conn = get_connection(database, local_infile=(method == "load-data"))
+    cursor = conn.cursor()
+    cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+    if method == "load-data":
+        _load_data_chunk(cursor, table, columns, rows)
+    else:
+        _insert_chunk(cursor, table, columns, rows, batch_size)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return table, row_count
+
+
+# -----------------------------
+# Seeder
+# -----------------------------
+def table_counts(database, tables):
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    counts = {}
+    for table in tables:
+        cursor.execute(f"SELECT COUNT(*) AS total FROM {table}")
+        counts[table] = cursor.fetchone()["total"]
+    cursor.close()
+    conn.close()
+    return counts
+
+
+def truncate_tables(database, tables):
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    for table in tables:
+        cursor.execute(f"TRUNCATE TABLE {table}")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def seed(residents, seed=42, workers=None, method="insert", batch_size=2_000,
+         history_years=3, database=DEFAULT_DATABASE, password_hash=synthetic_data.DISABLED_PASSWORD):
+    """Seed every table for a dataset of ``residents`` residents. Returns rows inserted per table."""
+    counts = synthetic_data.dataset_counts(residents)
+    # Requests and activity grow with the length of history (dataset_counts assumes 3 years)
+    for table in ("requests", "staff_activity", "admin_activity"):
+        counts[table] = counts[table] * history_years // 3
+    anchor = synthetic_data.default_anchor()
+    history_days = history_years * 365
+
+    tasks = [
+        (table, chunk, first_id, row_count, counts, seed, anchor, history_days,
+         password_hash, database, method, batch_size)
+        for table, chunk, first_id, row_count in synthetic_data.table_chunks(counts)
+    ]
+    total = sum(counts.values())
+    print(f"📦 Seeding {total:,} rows into {database} "
+          f"({len(tasks)} chunks, {workers or os.cpu_count()} workers, {method})")
+
+    inserted = dict.fromkeys(counts, 0)
+    done = 0
+    started = time.perf_counter()
+    with Pool(workers) as pool:
+        for table, row_count in pool.imap_unordered(seed_chunk, tasks):
+            inserted[table] += row_count
+            done += row_count
+            elapsed = time.perf_counter() - started
+            print(f"  • {table:<15} {inserted[table]:>10,}/{counts[table]:,}"
+                  f"   total {done / total:6.1%}  {done / elapsed:>10,.0f} rows/s")
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Seeded {done:,} rows in {timedelta(seconds=round(elapsed))} ({done / elapsed:,.0f} rows/s)")
+    return inserted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the BRIMS database with synthetic barangay data")
+    parser.add_argument("--residents", type=int, default=1_000, help="number of residents (default 1000)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; same seed gives the same data")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--method", choices=["insert", "load-data"], default="insert",
+                        help="multi-row INSERT, or LOAD DATA LOCAL INFILE (needs local_infile on the server)")
+    parser.add_argument("--batch-size", type=int, default=2_000, help="rows per multi-row INSERT")
+    parser.add_argument("--history-years", type=int, default=3, help="years of request and activity history")
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--password", help="login password for every seeded admin/staff account")
+    parser.add_argument("--truncate", action="store_true", help="empty the seeded tables first")
+    parser.add_argument("--test-users", action="store_true",
+                        help="also create admin_test / staff_test (see create_test_users.py)")
+    parser.add_argument("--yes", action="store_true", help="required to --truncate the live brms_db")
+    args = parser.parse_args(argv)
+
+    if args.residents < 1 or args.history_years < 1:
+        parser.error("--residents and --history-years must be at least 1")
+
+    tables = synthetic_data.TABLE_ORDER
+    if args.truncate:
+        if args.database == "brms_db" and not args.yes:
+            print("❌ Refusing to truncate brms_db without --yes.")
+            return 1
+        truncate_tables(args.database, tables)
+    else:
+        existing = {t: n for t, n in table_counts(args.database, tables).items() if n}
+        if existing:
+            print(f"⚠️ Tables already hold data ({', '.join(f'{t}: {n:,}' for t, n in existing.items())}). "
+                  "Use --truncate or seed a different --database.")
+            return 1
+
+    password_hash = synthetic_data.DISABLED_PASSWORD
+    if args.password:
+        from Panels.create_test_users import hash_password
+        password_hash = hash_password(args.password)  # hashed once; bcrypt per row would dominate
+
+    seed(args.residents, args.seed, args.workers, args.method, args.batch_size,
+         args.history_years, args.database, password_hash)
+
+    if args.test_users:
+        from Panels.create_test_users import create_test_users
+        create_test_users(args.database)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+# Panels/serials.py
+"""
+Control numbers for issued documents ("BC-2026-000123").
+
+Each request gets one when it is completed, numbered per document type and per year.
+Counting with SELECT MAX(...) + 1 at issue time would make every desk wait on the
+same rows, so numbers are handed out in blocks instead (Migrations/011_document_serials.sql):
+
+- reserve_block() claims the next BRMS_SERIAL_BLOCK numbers of a type and year for
+  this workstation with one INSERT ... SELECT ... RETURNING into serial_blocks. Two desks
+  reserving at the same moment compute the same first number; the unique key (or
+  InnoDB's deadlock check) lets one of them in and the other retries, so blocks never
+  overlap.
+- SerialAllocator (get_allocator()) hands out the numbers of its blocks from memory.
+  Most completions never touch serial_blocks at all.
+- assign_control_number() stamps the next number on a request inside the caller's
+  transaction. The unique key on requests (document_type, serial_year, serial_value)
+  is the last guarantee that a number is only ever used once.
+
+A request whose document type is changed after it was numbered loses its number and
+is numbered again under the new type (StaffRequestDialog), since the prefix and the
+series belong to the type.
+
+A block a desk does not finish leaves a gap: the desk closed, a save failed after
+its number was taken, or a numbered request changed type. Numbers are never handed out twice, so gaps are expected;
+serial_gaps() lists them per block for the auditor.
+
+    python -m Panels.cli serials gaps --year 2026
+    python -m Panels.cli serials backfill          # number requests completed before this
+
+No Qt imports here.
+"""
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from pymysql.err import IntegrityError, OperationalError
+from pymysql.cursors import SSCursor
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+BLOCK_SIZE = int(os.environ.get("BRMS_SERIAL_BLOCK", "20"))
+WORKSTATION = socket.gethostname()[:64]
+RESERVE_ATTEMPTS = 5
+ER_LOCK_DEADLOCK = 1213
+# A desk's newest block younger than this may still be in use, so its gaps are not final
+OPEN_BLOCK_HOURS = 12
+
+# Control number prefixes; other document types use their initials
+PREFIXES = {
+    "Barangay Clearance": "BC",
+    "Certificate of Residency": "CR",
+    "Barangay ID": "ID",
+    "Indigency Certificate": "IC",
+    "Business Permit": "BP",
+    "Travel Clearance": "TC",
+    "Solo Parent Certificate": "SP",
+    "First-time Jobseeker Certificate": "FJ",
+    "Cedula": "CTC",
+}
+
+
+def prefix(document_type):
+    if document_type in PREFIXES:
+        return PREFIXES[document_type]
+    words = [w for w in document_type.replace("-", " ").split() if w.lower() not in ("of", "for", "the")]
+    return "".join(w[0] for w in words).upper()[:4] or "DOC"
+
+
+def control_number(document_type, year, value):
+    return f"{prefix(document_type)}-{year}-{value:06d}"
+
+
+# -----------------------------
+# Blocks
+# -----------------------------
+def reserve_block(document_type, year, size=BLOCK_SIZE, database=DEFAULT_DATABASE):
+    """``(first, last)``: the next ``size`` numbers of ``document_type`` in ``year``, now this desk's."""
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        for _ in range(RESERVE_ATTEMPTS):
+            try:
+                cursor.execute("""
+                    INSERT INTO serial_blocks (document_type, serial_year, first_value, last_value, workstation)
+                    SELECT %s, %s, COALESCE(MAX(last_value), 0) + 1, COALESCE(MAX(last_value), 0) + %s, %s
+                    FROM serial_blocks
+                    WHERE document_type = %s AND serial_year = %s
+                    RETURNING first_value, last_value
+                """, (document_type, year, size, WORKSTATION, document_type, year))
+                block = cursor.fetchone()
+                conn.commit()
+                return block["first_value"], block["last_value"]
+            except IntegrityError:
+                conn.rollback()  # another desk took that block first; the next MAX sees it
+            except OperationalError as e:
+                if e.args[0] != ER_LOCK_DEADLOCK:
+                    raise
+                conn.rollback()
+        raise RuntimeError(f"could not reserve {document_type} {year} serials after {RESERVE_ATTEMPTS} tries")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+class SerialAllocator:
+    """This desk's reserved blocks, one per (document type, year), handed out in order."""
+
+    def __init__(self, database=DEFAULT_DATABASE, block_size=BLOCK_SIZE):
+        self.database = database
+        self.block_size = block_size
+        self._blocks = {}    # (document_type, year) -> [next value, last value]
+        self._returned = {}  # (document_type, year) -> values taken but not used, reused first
+        self._lock = threading.Lock()
+
+    def take(self, document_type, year):
+        key = (document_type, year)
+        with self._lock:
+            if self._returned.get(key):
+                return self._returned[key].pop()
+            block = self._blocks.get(key)
+            if block is None or block[0] > block[1]:
+                block = self._blocks[key] = list(reserve_block(document_type, year, self.block_size,
+                                                               self.database))
+            value = block[0]
+            block[0] += 1
+            return value
+
+    def give_back(self, document_type, year, value):
+        """A number taken for a save that did not use it; the next take() reuses it."""
+        with self._lock:
+            self._returned.setdefault((document_type, year), []).append(value)
+
+
+_allocators = {}
+
+
+def get_allocator(database=DEFAULT_DATABASE):
+    if database not in _allocators:
+        _allocators[database] = SerialAllocator(database)
+    return _allocators[database]
+
+
+# -----------------------------
+# Stamping requests
+# -----------------------------
+def assign_control_number(cursor, request_id, database=DEFAULT_DATABASE):
+    """
+    Give a completed request its control number, in the caller's transaction (call it
+    right after setting status = 'Completed', before commit). Returns the number; a
+    request keeps the one it already has.
+    """
+    cursor.execute("SELECT document_type, control_number, completed_date FROM requests WHERE id = %s",
+                   (request_id,))
+    row = cursor.fetchone()
+    if row is None or row["control_number"]:
+        return row["control_number"] if row else None
+
+    document_type = row["document_type"]
+    year = (row["completed_date"] or datetime.now()).year
+    allocator = get_allocator(database)
+    value = allocator.take(document_type, year)
+    number = control_number(document_type, year, value)
+    try:
+        cursor.execute("""
+            UPDATE requests SET control_number = %s, serial_year = %s, serial_value = %s
+            WHERE id = %s AND control_number IS NULL
+        """, (number, year, value, request_id))
+    except Exception:
+        allocator.give_back(document_type, year, value)
+        raise
+    if cursor.rowcount != 1:  # numbered by another desk in the meantime
+        allocator.give_back(document_type, year, value)
+        cursor.execute("SELECT control_number FROM requests WHERE id = %s", (request_id,))
+        return cursor.fetchone()["control_number"]
+    return number
+
+
+def backfill_control_numbers(database=DEFAULT_DATABASE, batch_rows=500):
+    """Number requests completed without one, oldest first; returns how many were numbered."""
+    reader = get_connection(database)
+    writer = get_connection(database)
+    cursor = reader.cursor(SSCursor)
+    write = writer.cursor()
+    allocator = SerialAllocator(database, block_size=max(BLOCK_SIZE, batch_rows))
+    numbered = 0
+    try:
+        cursor.execute("""
+            SELECT id, document_type, completed_date FROM requests
+            WHERE status = 'Completed' AND control_number IS NULL
+            ORDER BY completed_date, id
+        """)
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            updates = []
+            for request_id, document_type, completed_date in rows:
+                year = (completed_date or datetime.now()).year
+                value = allocator.take(document_type, year)
+                updates.append((control_number(document_type, year, value), year, value, request_id))
+            write.executemany("""
+                UPDATE requests SET control_number = %s, serial_year = %s, serial_value = %s
+                WHERE id = %s AND control_number IS NULL
+            """, updates)
+            writer.commit()
+            numbered += len(updates)
+    finally:
+        cursor.close()
+        reader.close()
+        write.close()
+        writer.close()
+    return numbered
+
+
+# -----------------------------
+# Gap report
+# -----------------------------
+def _ranges(values):
+    """[3, 4, 5, 9] -> [(3, 5), (9, 9)]"""
+    ranges = []
+    for value in values:
+        if ranges and value == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], value)
+        else:
+            ranges.append((value, value))
+    return ranges
+
+
+def serial_gaps(year=None, database=DEFAULT_DATABASE):
+    """
+    Blocks with numbers that were never used, as dicts: document_type, year, first, last,
+    workstation, reserved_at, issued, missing (``[(from, to)]``) and open (the block may
+    still be handing out numbers at its desk).
+    """
+    year = year or datetime.now().year
+    conn = get_connection(database)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT document_type, serial_year, first_value, last_value, workstation, reserved_at
+            FROM serial_blocks
+            WHERE serial_year = %s
+            ORDER BY document_type, first_value
+        """, (year,))
+        blocks = cursor.fetchall()
+        cursor.execute("""
+            SELECT document_type, serial_value FROM requests
+            WHERE serial_year = %s AND serial_value IS NOT NULL
+        """, (year,))
+        issued = {}
+        for row in cursor.fetchall():
+            issued.setdefault(row["document_type"], set()).add(row["serial_value"])
+    finally:
+        cursor.close()
+        conn.close()
+
+    newest = {}
+    for block in blocks:
+        newest[(block["document_type"], block["workstation"])] = block["first_value"]
+    recent = datetime.now() - timedelta(hours=OPEN_BLOCK_HOURS)
+
+    gaps = []
+    for block in blocks:
+        used = issued.get(block["document_type"], set())
+        values = range(block["first_value"], block["last_value"] + 1)
+        missing = [v for v in values if v not in used]
+        if not missing:
+            continue
+        gaps.append({
+            "document_type": block["document_type"], "year": block["serial_year"],
+            "first": block["first_value"], "last": block["last_value"],
+            "workstation": block["workstation"], "reserved_at": block["reserved_at"],
+            "issued": len(values) - len(missing), "missing": _ranges(missing),
+            "open": (newest[(block["document_type"], block["workstation"])] == block["first_value"]
+                     and block["reserved_at"] >= recent),
+        })
+    return gaps
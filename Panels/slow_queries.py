@@ -0,0 +1,226 @@
+# Panels/slow_queries.py
+"""
+Slow-query capture.
+
+get_connection() hands out TimedDictCursor, and records.query_rows() uses TimedCursor.
+Both time every execute(). A statement slower than BRMS_SLOW_QUERY_MS (default 250;
+0 turns capture off) is written as one JSON line to a rotating local log with:
+
+- the SQL, whitespace-collapsed, and a fingerprint that folds IN (%s, %s, ...) lists
+- the shape of its parameters (types and string lengths, never the values)
+- the row count and duration
+- the panel method that ran it ("Panels/admin_residents.py:AdminResidents.load_residents")
+- the EXPLAIN plan, captured right after it ran on the same connection
+
+The log is BRMS_SLOW_QUERY_LOG (default logs/slow_queries.log), rotated at 5 MB with 5
+old files kept, so every desk keeps its own recent history. summarize() groups the
+entries by fingerprint for the admin Slow Queries page (Panels/admin_slow_queries.py)
+and for `python -m Panels.cli slow-queries`.
+
+Streaming cursors (SSCursor / SSDictCursor) are not timed: their execute() returns
+before the rows are read.
+
+No Qt imports here.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from pymysql.cursors import Cursor, DictCursor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SLOW_QUERY_MS = float(os.environ.get("BRMS_SLOW_QUERY_MS", "250"))
+LOG_PATH = os.environ.get("BRMS_SLOW_QUERY_LOG", os.path.join(BASE_DIR, "logs", "slow_queries.log"))
+LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 5
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE|WITH)\b", re.I)
+_IN_LIST = re.compile(r"%s(?:\s*,\s*%s)+")
+# Frames in these files are plumbing, not the caller worth reporting
+_PLUMBING = ("slow_queries.py", "records.py", "db.py")
+
+_logger = None
+
+
+def _log():
+    global _logger
+    if _logger is None:
+        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+        handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _logger = logging.getLogger("brms.slow_queries")
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+        _logger.addHandler(handler)
+    return _logger
+
+
+# -----------------------------
+# Describing a statement
+# -----------------------------
+def normalize(sql):
+    return " ".join(sql.split())
+
+
+def fingerprint(sql):
+    """The statement with variable-length IN lists folded, so they group together."""
+    return _IN_LIST.sub("%s, …", normalize(sql))
+
+
+def _shape(value):
+    if value is None:
+        return "None"
+    if isinstance(value, str):
+        return f"str({len(value)})"
+    return type(value).__name__
+
+
+def params_shape(params, many=False):
+    """Types of the parameters (``"(int, str(12))"``); the values themselves are never logged."""
+    if many:
+        params = list(params or ())
+        return f"{len(params)} × {params_shape(params[0]) if params else '()'}"
+    if params is None:
+        return "None"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {_shape(value)}" for key, value in params.items()) + "}"
+    if isinstance(params, (list, tuple)):
+        return "(" + ", ".join(_shape(value) for value in params) + ")"
+    return _shape(params)
+
+
+def caller():
+    """``"Panels/<file>.py:<Class>.<method>"`` of the nearest frame outside the DB plumbing."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if os.path.basename(filename) not in _PLUMBING and "pymysql" not in filename:
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            if owner is not None:
+                name = f"{type(owner).__name__}.{name}"
+            return f"{os.path.relpath(filename, BASE_DIR).replace(os.sep, '/')}:{name}"
+        frame = frame.f_back
+    return "?"
+
+
+def explain(connection, statement):
+    """EXPLAIN rows for an already-bound ``statement``, or [] when it cannot be explained."""
+    if not _EXPLAINABLE.match(statement):
+        return []
+    cursor = connection.cursor(DictCursor)
+    try:
+        cursor.execute("EXPLAIN " + statement)
+        return [{key: row.get(key) for key in ("table", "type", "key", "rows", "Extra")}
+                for row in cursor.fetchall()]
+    except Exception:
+        return []
+    finally:
+        cursor.close()
+
+
+def record(cursor, query, args, elapsed_ms, many=False):
+    """Write one slow statement to the log. Never raises: capture must not break the query."""
+    try:
+        bound = None if many else cursor.mogrify(query, args)
+        entry = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "ms": round(elapsed_ms, 1),
+            "rows": cursor.rowcount,
+            "sql": normalize(query),
+            "fingerprint": fingerprint(query),
+            "params": params_shape(args, many),
+            "caller": caller(),
+            "plan": explain(cursor.connection, bound) if bound else [],
+        }
+        _log().info(json.dumps(entry, default=str))
+    except Exception as e:
+        print(f"⚠️ Slow query capture failed: {e}")
+
+
+# -----------------------------
+# Cursors
+# -----------------------------
+class SlowQueryCapture:
+    """Cursor mixin timing execute() / executemany() against SLOW_QUERY_MS."""
+
+    def execute(self, query, args=None):
+        if SLOW_QUERY_MS <= 0:
+            return super().execute(query, args)
+        started = time.perf_counter()
+        result = super().execute(query, args)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= SLOW_QUERY_MS:
+            record(self, query, args, elapsed_ms)
+        return result
+
+    def executemany(self, query, args):
+        if SLOW_QUERY_MS <= 0:
+            return super().executemany(query, args)
+        started = time.perf_counter()
+        result = super().executemany(query, args)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= SLOW_QUERY_MS:
+            record(self, query, args, elapsed_ms, many=True)
+        return result
+
+
+class TimedDictCursor(SlowQueryCapture, DictCursor):
+    pass
+
+
+class TimedCursor(SlowQueryCapture, Cursor):
+    pass
+
+
+# -----------------------------
+# Summary
+# -----------------------------
+def read_entries(path=LOG_PATH):
+    """Every entry in the log and its rotated files, oldest first."""
+    entries = []
+    for index in range(LOG_BACKUPS, -1, -1):
+        name = f"{path}.{index}" if index else path
+        if not os.path.exists(name):
+            continue
+        with open(name, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # a line cut short by a crash
+    return entries
+
+
+def summarize(top=20, path=LOG_PATH):
+    """
+    The ``top`` statements by total time, as dicts: fingerprint, calls, total_ms, mean_ms,
+    max_ms, rows (mean), callers, last_at, full_scan (the latest plan reads a table in
+    full), and the latest entry (``sample``) for its SQL, parameters and plan.
+    """
+    groups = {}
+    for entry in read_entries(path):
+        group = groups.setdefault(entry["fingerprint"], {
+            "fingerprint": entry["fingerprint"], "calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+            "row_total": 0, "callers": set(),
+        })
+        group["calls"] += 1
+        group["total_ms"] += entry["ms"]
+        group["max_ms"] = max(group["max_ms"], entry["ms"])
+        group["row_total"] += max(entry.get("rows") or 0, 0)
+        group["callers"].add(entry["caller"])
+        group["last_at"] = entry["at"]
+        group["sample"] = entry
+
+    summary = sorted(groups.values(), key=lambda g: -g["total_ms"])[:top]
+    for group in summary:
+        group["mean_ms"] = group["total_ms"] / group["calls"]
+        group["rows"] = group.pop("row_total") / group["calls"]
+        group["callers"] = sorted(group["callers"])
+        group["full_scan"] = any(step.get("type") == "ALL" for step in group["sample"]["plan"])
+    return summary
@@ -5,10 +5,13 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFrame, QStackedWidget, QMessageBox, QScrollArea, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QFont
 
 from Panels.db import get_connection
+from Panels.change_poller import ChangeFeedPoller
+from Panels.events import REQUEST_EVENTS, RESIDENT_EVENTS, get_event_bus
+from Panels.styles import apply_style_scope
 from Panels.staff_resident_profiles import StaffResidentProfiles
 from Panels.staff_requests import StaffRequests
 from Panels.staff_infographics import StaffInfographics
@@ -19,23 +22,16 @@ class DashboardWindow(QMainWindow):
     def __init__(self, staff_id):
         super().__init__()
         self.staff_id = staff_id
-        self._refresh_pending = False  # Prevent multiple rapid refreshes
 
         # --- Project Paths ---
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
         images_dir = os.path.join(base_dir, "Images")
 
-        qss_path = os.path.join(styles_dir, "staff_dashboard.qss")
         logo_path = os.path.join(images_dir, "BRIMS_logo.png")
 
         self.logo_path = logo_path
 
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
+        apply_style_scope(self, "staff_dashboard")
 
         self.setWindowTitle("BRIMS - Barangay Management System")
         self.setGeometry(100, 100, 1400, 800)
@@ -88,11 +84,10 @@ class DashboardWindow(QMainWindow):
         self.infographics_panel = StaffInfographics(self.staff_id)
         self.pages.addWidget(self.infographics_panel)
 
-        # Safe signal connections with debouncing
-        self.resident_profiles.residents_changed.connect(self.safe_handle_residents_changed)
-        self.requests_panel.requests_changed.connect(self.safe_handle_requests_changed)
-        self.resident_profiles.residents_changed.connect(self.infographics_panel.safe_refresh_data)
-        self.requests_panel.requests_changed.connect(self.infographics_panel.safe_refresh_data)
+        # Data changes from any panel, or from other desks via the change feed
+        get_event_bus().subscribe(RESIDENT_EVENTS + REQUEST_EVENTS, self.handle_data_changed, owner=self)
+        self.change_feed = ChangeFeedPoller(self)
+        self.change_feed.start()
 
     # -------------------------
     # DB Helpers (no changes)
@@ -118,7 +113,7 @@ class DashboardWindow(QMainWindow):
         cursor.execute("""
             SELECT COUNT(*) AS total
             FROM staff_activity
-            WHERE staff_id=%s AND DATE(created_at)=CURDATE() 
+            WHERE staff_id=%s AND created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
               AND action_type LIKE '%%REQUEST%%'
         """, (self.staff_id,))
         processed = cursor.fetchone()["total"] or 0
@@ -127,7 +122,7 @@ class DashboardWindow(QMainWindow):
         cursor.execute("""
             SELECT COUNT(*) AS total
             FROM staff_activity
-            WHERE staff_id=%s AND DATE(created_at)=CURDATE() 
+            WHERE staff_id=%s AND created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
               AND action_type='ADD_RESIDENT'
         """, (self.staff_id,))
         residents_added = cursor.fetchone()["total"] or 0
@@ -480,7 +475,6 @@ class DashboardWindow(QMainWindow):
         # ✅ Add date label (created_at)
         date_label = QLabel(created_time)
         date_label.setObjectName("activityDate")
-        date_label.setStyleSheet("color: #94A3B8; font-size: 10px;")
         desc_layout.addWidget(date_label)
 
         # Tag badge
@@ -573,55 +567,23 @@ class DashboardWindow(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             from Panels.login import LoginPage
+            self.change_feed.stop()
+            get_event_bus().unsubscribe(self)
             self.close()
             self.login_page = LoginPage()
             self.login_page.show()
 
-    def safe_handle_residents_changed(self):
-        """Safely handle residents changed signal with debouncing"""
-        if self._refresh_pending:
-            return
-
-        self._refresh_pending = True
-        QTimer.singleShot(200, self._execute_residents_refresh)
-
-    def _execute_residents_refresh(self):
-        """Execute the actual refresh after delay"""
+    def handle_data_changed(self, events):
+        """Event-bus handler: one refresh per batch of resident / request changes"""
         try:
-            # Only refresh if we're on a relevant page
-            current_index = self.pages.currentIndex()
-            if current_index == 0:  # Dashboard
-                self.refresh_dashboard()
-            elif current_index == 3:  # Demographics
+            # Charts only need redrawing when they are on screen
+            if self.pages.currentIndex() == 3 and any(isinstance(e, RESIDENT_EVENTS) for e in events):
                 self.demographics_panel.update_charts()
-            elif current_index == 4:  # Infographics
-                self.infographics_panel.refresh_data()
-
-            # Always refresh dashboard metrics
-            self.refresh_dashboard_metrics()
-
-        except Exception as e:
-            print(f"Error during residents refresh: {e}")
-        finally:
-            self._refresh_pending = False
-
-    def safe_handle_requests_changed(self):
-        """Safely handle requests changed signal with debouncing"""
-        QTimer.singleShot(200, self._execute_requests_refresh)
-
-    def _execute_requests_refresh(self):
-        """Execute the actual requests refresh after delay"""
-        try:
-            current_index = self.pages.currentIndex()
-            if current_index == 0:  # Dashboard
-                self.refresh_dashboard()
-            elif current_index == 4:  # Infographics
-                self.infographics_panel.refresh_data()
 
             self.refresh_dashboard_metrics()
 
         except Exception as e:
-            print(f"Error during requests refresh: {e}")
+            print(f"Error during data refresh: {e}")
 
     def refresh_dashboard_metrics(self):
         """Refresh only the metric numbers without rebuilding UI"""
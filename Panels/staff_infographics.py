@@ -1,4 +1,3 @@
-import os
 import matplotlib.dates as mdates
 import datetime
 from PyQt6.QtWidgets import (
@@ -10,22 +9,20 @@ from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 
 from Panels.db import get_connection
+from Panels.resident_snapshot import get_resident_snapshot
+from Panels.styles import apply_style_scope
+from Panels.events import REQUEST_EVENTS, RESIDENT_EVENTS, get_event_bus
+
+AGE_GROUPS = [("0-17", 0, 17), ("18-35", 18, 35), ("36-60", 36, 60), ("61+", 61, None)]
 
 
 class StaffInfographics(QWidget):
     def __init__(self, staff_id=None):
         super().__init__()
         self.staff_id = staff_id
-        self._refresh_pending = False  # Prevent multiple rapid refreshes
-
-        # --- Load stylesheet ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
-        qss_path = os.path.join(styles_dir, "staff_infographics.qss")
 
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
+        # --- Load stylesheet (Styles/staff_infographics.qss) ---
+        apply_style_scope(self, "staff_infographics")
 
         # Main layout with scroll area
         main_layout = QVBoxLayout(self)
@@ -137,22 +134,14 @@ class StaffInfographics(QWidget):
         # ✅ Initial data load with delay to ensure UI is ready
         QTimer.singleShot(100, self.refresh_data)
 
-    def safe_refresh_data(self):
-        """Safely refresh data with debouncing"""
-        if self._refresh_pending:
-            return
-
-        self._refresh_pending = True
-        QTimer.singleShot(300, self._execute_refresh)
+        get_event_bus().subscribe(RESIDENT_EVENTS + REQUEST_EVENTS, self.safe_refresh_data, owner=self)
 
-    def _execute_refresh(self):
-        """Execute the actual refresh after delay"""
+    def safe_refresh_data(self, events=None):
+        """Refresh the charts; as the event-bus handler it runs once per batch of changes"""
         try:
             self.refresh_data()
         except Exception as e:
             print(f"Error refreshing infographics: {e}")
-        finally:
-            self._refresh_pending = False
 
     # --- KPI box ---
     def create_kpi_box(self, title, value, color):
@@ -203,11 +192,10 @@ class StaffInfographics(QWidget):
     def refresh_data(self):
         conn = get_connection()
         cursor = conn.cursor()
+        snapshot = get_resident_snapshot()
 
         # --- KPIs ---
-        cursor.execute("SELECT COUNT(*) AS total FROM residents")
-        row = cursor.fetchone()
-        total_residents = row["total"] if row and row["total"] is not None else 0
+        total_residents = snapshot.count()
 
         cursor.execute("SELECT COUNT(*) AS total FROM requests")
         row = cursor.fetchone()
@@ -244,22 +232,9 @@ class StaffInfographics(QWidget):
             self.add_pie_chart(self.doc_distribution_box.layout_box, labels, sizes)
 
         # --- Resident Demographics ---
-        cursor.execute("""
-            SELECT 
-                SUM(age BETWEEN 0 AND 17) AS age_0_17,
-                SUM(age BETWEEN 18 AND 35) AS age_18_35,
-                SUM(age BETWEEN 36 AND 60) AS age_36_60,
-                SUM(age >= 61) AS age_61_plus
-            FROM residents
-        """)
-        age_data = cursor.fetchone() or {}
-        groups = ["0-17", "18-35", "36-60", "61+"]
-        values = [
-            age_data.get("age_0_17") or 0,
-            age_data.get("age_18_35") or 0,
-            age_data.get("age_36_60") or 0,
-            age_data.get("age_61_plus") or 0,
-        ]
+        age_data = snapshot.age_histogram(AGE_GROUPS)
+        groups = list(age_data)
+        values = list(age_data.values())
         if sum(values) > 0:
             self.add_bar_chart(self.demographics_box.layout_box, groups, values, "#3498db")
         else:
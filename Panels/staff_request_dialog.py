@@ -1,4 +1,3 @@
-import os
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QComboBox,
@@ -6,6 +5,12 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import QDate, Qt
 from Panels.db import get_connection
+from Panels.change_feed import record_change
+from Panels.conflict_dialog import ConflictDialog, current_row, versioned_update
+from Panels.events import RequestChanged, RequestStatusChanged, publish
+from Panels.serials import assign_control_number
+from Panels.turnaround import record_turnaround
+from Panels.styles import apply_style_scope
 import datetime
 
 
@@ -18,10 +23,15 @@ class NewRequestDialog(QDialog):
     def __init__(self, parent=None, request_id=None):
         super().__init__(parent)
         self.request_id = request_id
+        self.original_status = None
+        self.loaded = None  # row as loaded for editing; its version guards the save
         self.setWindowTitle("New Document Request" if not request_id else "Edit Request")
         self.setMinimumWidth(500)
         self.setMinimumHeight(550)
 
+        # Stylesheet (Styles/staff_request_dialog.qss)
+        apply_style_scope(self, "staff_request_dialog")
+
         # Main layout
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -169,16 +179,6 @@ class NewRequestDialog(QDialog):
 
         main_layout.addWidget(footer)
 
-        # Load QSS
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        qss_path = os.path.join(base_dir, "Styles", "staff_request_dialog.qss")
-
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ QSS file not found at: {qss_path}")
-
         # -------------------------------
         # EDIT MODE
         # -------------------------------
@@ -233,6 +233,8 @@ class NewRequestDialog(QDialog):
                 self.date_input.setDate(QDate.currentDate())
 
             self.status_input.setCurrentText(req["status"])
+            self.original_status = req["status"]
+            self.loaded = req
 
     # -------------------------------
     # SAVE NEW OR UPDATED REQUEST (NO CHANGES)
@@ -275,25 +277,75 @@ class NewRequestDialog(QDialog):
             if self.request_id:
                 # Update existing - keep the original request date, only update status-related fields
                 completed_date = now if status == "Completed" else None
-                cursor.execute("""
-                    UPDATE requests 
-                    SET resident_id=%s, document_type=%s, purpose=%s, 
-                        status=%s, completed_date=%s
-                    WHERE id=%s
-                """, (resident_id, doc_type, purpose, status, completed_date, self.request_id))
+                values = {
+                    "resident_id": resident_id, "document_type": doc_type, "purpose": purpose,
+                    "status": status, "completed_date": completed_date,
+                }
+                if self.loaded["control_number"] and doc_type != self.loaded["document_type"]:
+                    # The number carries the old type's prefix and series: drop it in the same
+                    # UPDATE (so the new type's unique key is never hit) and reissue it below
+                    values.update(control_number=None, serial_year=None, serial_value=None)
+                if not versioned_update(cursor, "requests", self.request_id, self.loaded["version"], values):
+                    conn.rollback()
+                    cursor.close()
+                    conn.close()
+                    if self.resolve_conflict(values):
+                        self.save_request()
+                    return
+                record_change(cursor, "request", self.request_id, "update")
+                saved_id, op = self.request_id, "update"
             else:
                 # Insert new (include staff ID) - use current datetime for request_date
                 cursor.execute("""
                     INSERT INTO requests (resident_id, document_type, purpose, request_date, status, staff_notes, created_at, created_by)
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 """, (resident_id, doc_type, purpose, request_date, status, None, now, self.parent().staff_id))
+                saved_id, op = cursor.lastrowid, "insert"
+                record_change(cursor, "request", saved_id, op)
 
+            if status == "Completed":
+                assign_control_number(cursor, saved_id)
+                record_turnaround(cursor, saved_id)
             conn.commit()
             cursor.close()
             conn.close()
 
+            publish(RequestChanged(saved_id, op))
+            if op == "update" and status != self.original_status:
+                publish(RequestStatusChanged(saved_id, self.original_status, status))
+
             QMessageBox.information(self, "Success", "Request saved successfully.")
             self.accept()
 
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save request:\n{e}")
\ No newline at end of file
+            QMessageBox.critical(self, "Error", f"Failed to save request:\n{e}")
+
+    # -------------------------------
+    # EDIT CONFLICT (saved elsewhere since loaded)
+    # -------------------------------
+    def resolve_conflict(self, values):
+        """Another desk saved this request since it was loaded. True to save again over it."""
+        current, change = current_row("requests", "request", self.request_id)
+        if current is None:
+            QMessageBox.warning(self, "Request Deleted",
+                                "This request was deleted at another desk; your changes were not saved.")
+            self.reject()
+            return False
+
+        names = {resident_id: name for name, resident_id in self.resident_map.items()}
+        fields = [
+            ("Resident", names.get(self.loaded["resident_id"]), names.get(values["resident_id"]),
+             names.get(current["resident_id"])),
+            ("Document Type", self.loaded["document_type"], values["document_type"], current["document_type"]),
+            ("Purpose", self.loaded["purpose"], values["purpose"], current["purpose"]),
+            ("Status", self.loaded["status"], values["status"], current["status"]),
+        ]
+        dialog = ConflictDialog(self, "request", fields, change)
+        dialog.exec()
+
+        if dialog.choice is not None:
+            self.loaded = current  # the version the next save is checked against
+            self.original_status = current["status"]
+        if dialog.choice == ConflictDialog.USE_THEIRS:
+            self.load_request_data(self.request_id)
+        return dialog.choice == ConflictDialog.KEEP_MINE
@@ -1,7 +1,7 @@
-import os
+import time
 from datetime import datetime
 
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFrame, QTableWidget, QTableWidgetItem, QSizePolicy, QHeaderView, QMessageBox
@@ -9,26 +9,33 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QIcon, QFont
 
 from Panels.db import get_connection
+from Panels.change_feed import record_change
+from Panels.change_poller import patch_table_rows
+from Panels.events import (
+    REQUEST_EVENTS, RequestChanged, RequestStatusChanged, ResyncRequired, get_event_bus, publish, remote_ids
+)
+from Panels.records import Request, query_rows
+from Panels.serials import assign_control_number
+from Panels.turnaround import record_turnaround
+from Panels.styles import apply_style_scope
 from Panels.logger import log_staff_activity
 from Panels.staff_request_dialog import NewRequestDialog
 from Panels.staff_view_request import ViewRequestDialog
+from Panels.work_queue import DeskStats, claim_next, complete_claim, queue_depth, release_claim
 
 
 class StaffRequests(QWidget):
-    requests_changed = pyqtSignal()
-
     def __init__(self, staff_id):
         super().__init__()
         self.staff_id = staff_id
+        self.desk_stats = DeskStats()
+
+        # --- Load stylesheet (Styles/staff_requests.qss) ---
+        apply_style_scope(self, "staff_requests")
+
         self.init_ui()
         self.load_requests()
-
-        # --- Load stylesheet ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        qss_path = os.path.join(base_dir, "Styles", "staff_requests.qss")
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
+        get_event_bus().subscribe(REQUEST_EVENTS, self.on_requests_changed, owner=self)
 
     # ------------------------------
     # UI Setup
@@ -65,8 +72,14 @@ class StaffRequests(QWidget):
         subtitle_label.setFont(QFont("Segoe UI", 11))
         subtitle_label.setStyleSheet("color: #64748B;")
 
+        # Work queue status (filled by update_queue_info)
+        self.queue_info = QLabel("")
+        self.queue_info.setObjectName("queueInfo")
+        self.queue_info.setFont(QFont("Segoe UI", 10))
+
         title_layout.addWidget(title_label)
         title_layout.addWidget(subtitle_label)
+        title_layout.addWidget(self.queue_info)
         header_layout.addLayout(title_layout)
 
         header_layout.addStretch()
@@ -139,7 +152,18 @@ class StaffRequests(QWidget):
         """)
         btn_new_request.clicked.connect(self.open_new_request_dialog)
 
+        # Work-queue mode: claim the oldest Pending request no other desk holds
+        btn_next_request = QPushButton("▶ Next Request")
+        btn_next_request.setObjectName("nextRequestButton")
+        btn_next_request.setFont(QFont("Segoe UI", 11, QFont.Weight.Medium))
+        btn_next_request.setFixedHeight(45)
+        btn_next_request.setMaximumWidth(170)
+        btn_next_request.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_next_request.setToolTip("Claim the oldest pending request nobody else is working on")
+        btn_next_request.clicked.connect(self.take_next_request)
+
         right_layout.addWidget(self.completed_card)
+        right_layout.addWidget(btn_next_request)
         right_layout.addWidget(btn_new_request)
         header_layout.addLayout(right_layout)
 
@@ -222,190 +246,169 @@ class StaffRequests(QWidget):
     # ------------------------------
     # Load Requests
     # ------------------------------
-    def load_requests(self):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+    def request_query(self, ids=None):
+        query = """
             SELECT r.id, res.name AS resident, r.document_type, r.purpose,
                    r.request_date, r.status, r.completed_date
             FROM requests r
             JOIN residents res ON r.resident_id = res.id
-            ORDER BY r.created_at DESC
-        """)
-        requests = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        """
+        params = []
+        if ids is not None:
+            query += f" WHERE r.id IN ({', '.join(['%s'] * len(ids))})"
+            params.extend(ids)
+        return query + " ORDER BY r.created_at DESC", params
 
+    def load_requests(self):
+        requests = query_rows(Request, *self.request_query())
 
         completed_count = sum(1 for r in requests if r["status"] == "Completed")
         self.completed_number.setText(str(completed_count))
 
         self.table.setRowCount(len(requests))
+        self.row_ids = [req["id"] for req in requests]
         for row, req in enumerate(requests):
-            # Format date cleanly (no time)
-            if req["request_date"]:
-                if isinstance(req["request_date"], str):
-                    formatted_date = req["request_date"]  # Keep the full timestamp
-                else:
-                    formatted_date = req["request_date"].strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                formatted_date = "N/A"
-
-            # Table items
-            items = [
-                f"👤 {req['resident']}",
-                f"📄 {req['document_type']}",
-                req["purpose"],
-                f"📅 {formatted_date}"
-            ]
-
-            for col, text in enumerate(items):
-                item = QTableWidgetItem(text)
-                item.setFont(QFont("Segoe UI", 10))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
-                self.table.setItem(row, col, item)
-
-            # Status Badge
-            status_widget = QWidget()
-            status_layout = QHBoxLayout(status_widget)
-            status_layout.setContentsMargins(8, 5, 8, 5)
-            status_layout.setSpacing(8)
-            status_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-
-            if req["status"] == "Completed":
-                status_label = QLabel("✅ Completed")
-                status_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
-                status_label.setStyleSheet("""
-                    background-color: #D1FAE5;
-                    color: #059669;
-                    padding: 5px 12px;
-                    border-radius: 12px;
-                """)
-                status_layout.addWidget(status_label)
-
-                # Add completion date
-                if req["completed_date"]:
-                    # completion_info = QLabel(f"Completed {req['completed_date'].strftime('%m/%d/%Y')}")
-                    # completion_info.setFont(QFont("Segoe UI", 9))
-                    # completion_info.setStyleSheet("color: #94A3B8;")
-                    # status_layout.addWidget(completion_info)
-                    pass
-            else:
-                status_label = QLabel(req["status"])
-                status_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
-                status_label.setStyleSheet("""
-                    background-color: #FEF3C7;
-                    color: #D97706;
-                    padding: 5px 12px;
-                    border-radius: 12px;
-                """)
-                status_layout.addWidget(status_label)
-
-            status_layout.addStretch()
-            self.table.setCellWidget(row, 4, status_widget)
-
-            # --- Actions ---
-            actions = QWidget()
-            actions_layout = QHBoxLayout(actions)
-            actions_layout.setContentsMargins(8, 5, 8, 5)
-            actions_layout.setSpacing(6)
-
-            # Only show "Complete" button for non-completed requests
-            if req["status"] != "Completed":
-                btn_complete = QPushButton("Complete")
-                btn_complete.setObjectName("completeButton")
-                btn_complete.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
-                btn_complete.setFixedHeight(32)
-                btn_complete.setMinimumWidth(90)
-                btn_complete.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_complete.setStyleSheet("""
-                    QPushButton#completeButton {
-                        background-color: #10B981;
-                        color: white;
-                        border: none;
-                        border-radius: 6px;
-                        padding: 0 12px;
-                    }
-                    QPushButton#completeButton:hover {
-                        background-color: #059669;
-                    }
-                """)
-                btn_complete.clicked.connect(lambda _, rid=req["id"]: self.mark_as_completed(rid))
-                actions_layout.addWidget(btn_complete)
+            self.fill_row(row, req)
+
+        self.update_queue_info()
+
+    def on_requests_changed(self, events):
+        """Event-bus handler: this panel reloads itself after its own changes, so only remote ones matter."""
+        if any(isinstance(e, ResyncRequired) for e in events):
+            self.load_requests()
+            return
+        ids = remote_ids(events, RequestChanged, "request_id") + remote_ids(events, RequestStatusChanged, "request_id")
+        if ids:
+            self.apply_changes(list(dict.fromkeys(ids)))
+
+    def apply_changes(self, ids):
+        """Patch the rows of requests ``ids`` instead of reloading the table."""
+        fresh = query_rows(Request, *self.request_query(ids))
+        patch_table_rows(self.table, self.row_ids, ids, fresh, self.fill_row)
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS total FROM requests WHERE status='Completed'")
+        self.completed_number.setText(str(cursor.fetchone()["total"]))
+        cursor.close()
+        conn.close()
+        self.update_queue_info()
+
+    def fill_row(self, row, req):
+        # Format date cleanly (no time)
+        if req["request_date"]:
+            if isinstance(req["request_date"], str):
+                formatted_date = req["request_date"]  # Keep the full timestamp
             else:
-                # Show completion date for completed requests
-                completed_label = QLabel(
-                    f"Completed {req['completed_date'].strftime('%m/%d/%Y') if req['completed_date'] else ''}")
-                completed_label.setFont(QFont("Segoe UI", 9))
-                completed_label.setStyleSheet("color: #94A3B8;")
-                actions_layout.addWidget(completed_label)
-
-            # Additional action buttons (view, edit, delete) - hidden but functional
-            # View Button (icon only for compact display)
-            btn_view = QPushButton("👁️‍🗨️")
-            btn_view.setObjectName("iconButton")
-            btn_view.setFont(QFont("Segoe UI", 12))
-            btn_view.setFixedSize(32, 32)
-            btn_view.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn_view.setToolTip("View Request")
-            btn_view.setStyleSheet("""
-                QPushButton#iconButton {
-                    background-color: #F1F5F9;
-                    border: 1px solid #E2E8F0;
-                    border-radius: 6px;
-                }
-                QPushButton#iconButton:hover {
-                    background-color: #E2E8F0;
-                }
-            """)
-            btn_view.clicked.connect(lambda _, rid=req["id"]: self.open_view_request(rid))
-            actions_layout.addWidget(btn_view)
-
-            # Edit and Delete only for non-completed
-            if req["status"] != "Completed":
-                btn_edit = QPushButton("📰")
-                btn_edit.setObjectName("iconButton")
-                btn_edit.setFont(QFont("Segoe UI", 12))
-                btn_edit.setFixedSize(32, 32)
-                btn_edit.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_edit.setToolTip("Edit Request")
-                btn_edit.setStyleSheet("""
-                    QPushButton#iconButton {
-                        background-color: #F1F5F9;
-                        border: 1px solid #E2E8F0;
-                        border-radius: 6px;
-                    }
-                    QPushButton#iconButton:hover {
-                        background-color: #E2E8F0;
-                    }
-                """)
-                btn_edit.clicked.connect(lambda _, rid=req["id"]: self.open_edit_request(rid))
-                actions_layout.addWidget(btn_edit)
-
-                btn_delete = QPushButton("🗑️")
-                btn_delete.setObjectName("iconButton")
-                btn_delete.setFont(QFont("Segoe UI", 12))
-                btn_delete.setFixedSize(32, 32)
-                btn_delete.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_delete.setToolTip("Delete Request")
-                btn_delete.setStyleSheet("""
-                    QPushButton#iconButton {
-                        background-color: #FEE2E2;
-                        border: 1px solid #FECACA;
-                        border-radius: 6px;
-                    }
-                    QPushButton#iconButton:hover {
-                        background-color: #FECACA;
-                    }
-                """)
-                btn_delete.clicked.connect(lambda _, rid=req["id"]: self.delete_request(rid))
-                actions_layout.addWidget(btn_delete)
-
-            actions_layout.addStretch()
-            self.table.setCellWidget(row, 5, actions)
-
-            # Set row height
-            self.table.setRowHeight(row, 60)
+                formatted_date = req["request_date"].strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            formatted_date = "N/A"
+
+        # Table items
+        items = [
+            f"👤 {req['resident']}",
+            f"📄 {req['document_type']}",
+            req["purpose"],
+            f"📅 {formatted_date}"
+        ]
+
+        for col, text in enumerate(items):
+            item = QTableWidgetItem(text)
+            item.setFont(QFont("Segoe UI", 10))
+            item.setTextAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
+            self.table.setItem(row, col, item)
+
+        # Status Badge
+        status_widget = QWidget()
+        status_layout = QHBoxLayout(status_widget)
+        status_layout.setContentsMargins(8, 5, 8, 5)
+        status_layout.setSpacing(8)
+        status_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
+
+        if req["status"] == "Completed":
+            status_label = QLabel("✅ Completed")
+            status_label.setObjectName("statusBadge")
+            status_label.setProperty("statusType", "completed")
+            status_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
+            status_layout.addWidget(status_label)
+
+            # Add completion date
+            if req["completed_date"]:
+                # completion_info = QLabel(f"Completed {req['completed_date'].strftime('%m/%d/%Y')}")
+                # completion_info.setFont(QFont("Segoe UI", 9))
+                # completion_info.setStyleSheet("color: #94A3B8;")
+                # status_layout.addWidget(completion_info)
+                pass
+        else:
+            status_label = QLabel(req["status"])
+            status_label.setObjectName("statusBadge")
+            status_label.setProperty("statusType", "open")
+            status_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
+            status_layout.addWidget(status_label)
+
+        status_layout.addStretch()
+        self.table.setCellWidget(row, 4, status_widget)
+
+        # --- Actions ---
+        actions = QWidget()
+        actions_layout = QHBoxLayout(actions)
+        actions_layout.setContentsMargins(8, 5, 8, 5)
+        actions_layout.setSpacing(6)
+
+        # Only show "Complete" button for non-completed requests
+        if req["status"] != "Completed":
+            btn_complete = QPushButton("Complete")
+            btn_complete.setObjectName("completeButton")
+            btn_complete.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
+            btn_complete.setFixedHeight(32)
+            btn_complete.setMinimumWidth(90)
+            btn_complete.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn_complete.clicked.connect(lambda _, rid=req["id"]: self.mark_as_completed(rid))
+            actions_layout.addWidget(btn_complete)
+        else:
+            # Show completion date for completed requests
+            completed_label = QLabel(
+                f"Completed {req['completed_date'].strftime('%m/%d/%Y') if req['completed_date'] else ''}")
+            completed_label.setObjectName("completionInfo")
+            completed_label.setFont(QFont("Segoe UI", 9))
+            actions_layout.addWidget(completed_label)
+
+        # Additional action buttons (view, edit, delete) - hidden but functional
+        # View Button (icon only for compact display)
+        btn_view = QPushButton("👁️‍🗨️")
+        btn_view.setObjectName("viewButton")
+        btn_view.setFont(QFont("Segoe UI", 12))
+        btn_view.setFixedSize(32, 32)
+        btn_view.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_view.setToolTip("View Request")
+        btn_view.clicked.connect(lambda _, rid=req["id"]: self.open_view_request(rid))
+        actions_layout.addWidget(btn_view)
+
+        # Edit and Delete only for non-completed
+        if req["status"] != "Completed":
+            btn_edit = QPushButton("📰")
+            btn_edit.setObjectName("editButton")
+            btn_edit.setFont(QFont("Segoe UI", 12))
+            btn_edit.setFixedSize(32, 32)
+            btn_edit.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn_edit.setToolTip("Edit Request")
+            btn_edit.clicked.connect(lambda _, rid=req["id"]: self.open_edit_request(rid))
+            actions_layout.addWidget(btn_edit)
+
+            btn_delete = QPushButton("🗑️")
+            btn_delete.setObjectName("deleteButton")
+            btn_delete.setFont(QFont("Segoe UI", 12))
+            btn_delete.setFixedSize(32, 32)
+            btn_delete.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn_delete.setToolTip("Delete Request")
+            btn_delete.clicked.connect(lambda _, rid=req["id"]: self.delete_request(rid))
+            actions_layout.addWidget(btn_delete)
+
+        actions_layout.addStretch()
+        self.table.setCellWidget(row, 5, actions)
+
+        # Set row height
+        self.table.setRowHeight(row, 60)
 
     # ------------------------------
     # CRUD + STATUS Operations
@@ -418,7 +421,6 @@ class StaffRequests(QWidget):
         if dialog.exec():
             log_staff_activity(self.staff_id, "ADD_REQUEST", "Created a new document request", role="Staff")
             self.load_requests()
-            self.requests_changed.emit()
 
     # --- Edit Request ---
     def open_edit_request(self, request_id):
@@ -427,7 +429,66 @@ class StaffRequests(QWidget):
         if dialog.exec():
             log_staff_activity(self.staff_id, "EDIT_REQUEST", f"Edited request {request_id}", role="Staff")
             self.load_requests()
-            self.requests_changed.emit()
+
+    # --- Work Queue ---
+    def update_queue_info(self):
+        try:
+            depth = queue_depth()
+        except Exception as e:
+            print(f"⚠️ Failed to read work queue: {e}")
+            return
+        self.queue_info.setText(
+            f"Queue: {depth['waiting']} waiting, {depth['claimed']} being handled · {self.desk_stats.summary()}"
+        )
+
+    def take_next_request(self):
+        """Claim the next request and let the staff member complete or release it."""
+        started = time.perf_counter()
+        try:
+            req = claim_next(self.staff_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Work Queue", f"Failed to claim a request:\n{e}")
+            return
+        if req is None:
+            self.desk_stats.empty += 1
+            QMessageBox.information(self, "Work Queue", "No unclaimed pending requests. 🎉")
+            self.update_queue_info()
+            return
+        self.desk_stats.claimed += 1
+        self.desk_stats.claim_ms += (time.perf_counter() - started) * 1000
+
+        log_staff_activity(self.staff_id, "CLAIM_REQUEST", f"Claimed request {req['id']}", role="Staff")
+        self.load_requests()
+
+        box = QMessageBox(self)
+        box.setWindowTitle("Next Request")
+        box.setText(f"📄 {req['document_type']} for 👤 {req['resident']}")
+        box.setInformativeText(
+            f"Purpose: {req['purpose'] or '—'}\n"
+            f"Requested: {req['request_date']}\n"
+            f"Reserved for you until {req['claimed_until'].strftime('%I:%M %p')}."
+        )
+        btn_complete = box.addButton("Complete", QMessageBox.ButtonRole.AcceptRole)
+        btn_release = box.addButton("Release", QMessageBox.ButtonRole.DestructiveRole)
+        box.addButton("Keep for Later", QMessageBox.ButtonRole.RejectRole)
+        box.exec()
+
+        if box.clickedButton() == btn_complete:
+            if complete_claim(req["id"], self.staff_id):
+                self.desk_stats.completed += 1
+                log_staff_activity(self.staff_id, "COMPLETE_REQUEST",
+                                   f"Marked request {req['id']} as completed", role="Staff")
+                publish(RequestStatusChanged(req["id"], req["status"], "Completed"))
+            else:
+                QMessageBox.warning(self, "Work Queue",
+                                    "Your reservation expired, or the request was taken by another desk or\n"
+                                    "is no longer Pending. It was not changed.")
+        elif box.clickedButton() == btn_release:
+            if release_claim(req["id"], self.staff_id):
+                self.desk_stats.released += 1
+                publish(RequestChanged(req["id"]))
+
+        self.load_requests()
 
     # --- View Request ---
     def open_view_request(self, request_id):
@@ -448,13 +509,14 @@ class StaffRequests(QWidget):
             conn = get_connection()
             cursor = conn.cursor()
             cursor.execute("DELETE FROM requests WHERE id=%s", (request_id,))
+            record_change(cursor, "request", request_id, "delete")
             conn.commit()
             cursor.close()
             conn.close()
 
             log_staff_activity(self.staff_id, "DELETE_REQUEST", f"Deleted request {request_id}", role="Staff")
             self.load_requests()
-            self.requests_changed.emit()
+            publish(RequestChanged(request_id, "delete"))
 
     # --- Mark as Completed ---
     def mark_as_completed(self, request_id):
@@ -462,12 +524,19 @@ class StaffRequests(QWidget):
         conn = get_connection()
         cursor = conn.cursor()
 
+        cursor.execute("SELECT status FROM requests WHERE id=%s", (request_id,))
+        row = cursor.fetchone()
+        old_status = row["status"] if row else None
+
         completed_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         cursor.execute("""
             UPDATE requests
-            SET status='Completed', completed_date=IFNULL(completed_date, %s)
+            SET status='Completed', completed_date=IFNULL(completed_date, %s), version=version+1
             WHERE id=%s
         """, (completed_time, request_id))
+        assign_control_number(cursor, request_id)
+        record_turnaround(cursor, request_id)
+        record_change(cursor, "request", request_id, "update")
         conn.commit()
         cursor.close()
         conn.close()
@@ -476,4 +545,4 @@ class StaffRequests(QWidget):
         QMessageBox.information(self, "Success", "Request marked as completed!")
 
         self.load_requests()
-        self.requests_changed.emit()
\ No newline at end of file
+        publish(RequestStatusChanged(request_id, old_status, "Completed"))
\ No newline at end of file
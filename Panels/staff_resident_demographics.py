@@ -1,9 +1,7 @@
 # Panels/staff_resident_demographics.py
-import os
-import numpy as np
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QFrame, QGridLayout, QScrollArea
+    QFrame, QGridLayout, QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
 from PyQt6.QtCore import Qt
 
@@ -11,7 +9,11 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 
-from Panels.db import get_connection
+from Panels.addresses import zone_summary
+from Panels.resident_snapshot import get_resident_snapshot
+from Panels.styles import apply_style_scope
+
+AGE_GROUPS = [("0–17", 0, 17), ("18–35", 18, 35), ("36–60", 36, 60), ("61+", 61, None)]
 
 
 class StaffResidentDemographics(QWidget):
@@ -19,16 +21,8 @@ class StaffResidentDemographics(QWidget):
         super().__init__()
         self.staff_id = staff_id
 
-        # --- Load stylesheet ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
-        qss_path = os.path.join(styles_dir, "staff_demographics.qss")
-
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
+        # --- Load stylesheet (Styles/staff_demographics.qss) ---
+        apply_style_scope(self, "staff_demographics")
 
         # --- Scrollable content wrapper ---
         scroll = QScrollArea()
@@ -85,10 +79,12 @@ class StaffResidentDemographics(QWidget):
         self.total_residents_card = self.create_stat_card("Total Residents", "0", "All registered residents")
         self.avg_age_card = self.create_stat_card("Average Age", "0", "Mean age of population")
         self.gender_ratio_card = self.create_stat_card("Gender Ratio", "0:0", "Male:Female ratio")
+        self.households_card = self.create_stat_card("Households", "0", "Distinct house addresses")
 
         stats_layout.addWidget(self.total_residents_card)
         stats_layout.addWidget(self.avg_age_card)
         stats_layout.addWidget(self.gender_ratio_card)
+        stats_layout.addWidget(self.households_card)
         stats_layout.addStretch()
 
         main_layout.addWidget(self.stats_frame)
@@ -106,6 +102,25 @@ class StaffResidentDemographics(QWidget):
 
         main_layout.addWidget(self.charts_container)
 
+        # --- Residents per Purok / Sitio (precomputed zone_counts) ---
+        zones_header = QLabel("Residents by Purok / Sitio")
+        zones_header.setObjectName("sectionHeader")
+        main_layout.addWidget(zones_header)
+
+        self.zones_note = QLabel()
+        self.zones_note.setObjectName("zonesNote")
+        main_layout.addWidget(self.zones_note)
+
+        self.zones_table = QTableWidget(0, 5)
+        self.zones_table.setObjectName("zonesTable")
+        self.zones_table.setHorizontalHeaderLabels(["Purok", "Sitio", "Residents", "Households", "Avg. Household"])
+        self.zones_table.verticalHeader().setVisible(False)
+        self.zones_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.zones_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.zones_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.zones_table.setMinimumHeight(320)
+        main_layout.addWidget(self.zones_table)
+
         # Attach scroll area
         scroll.setWidget(content)
 
@@ -154,16 +169,14 @@ class StaffResidentDemographics(QWidget):
             if item.widget():
                 item.widget().deleteLater()
 
-        # Fetch residents
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT age, gender, civil_status, education_level, employment_status FROM residents")
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        self.update_zones()
+
+        # Shared columnar snapshot (Panels/resident_snapshot.py), caught up from change_log
+        snapshot = get_resident_snapshot()
+        total_residents = snapshot.count()
 
         # If no rows found — friendly message and stop
-        if not rows:
+        if not total_residents:
             msg = QLabel("📊 No residents found in the database.\nAdd residents to see demographic insights.")
             msg.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.charts_layout.addWidget(msg, 0, 0, 1, 2)
@@ -173,24 +186,13 @@ class StaffResidentDemographics(QWidget):
             self.gender_ratio_card.layout().itemAt(1).widget().setText("0:0")
             return
 
-        # Prepare data (defensively convert and filter None)
-        ages = []
-        for r in rows:
-            a = r.get("age")
-            try:
-                if a is not None:
-                    ages.append(int(a))
-            except Exception:
-                # ignore badly formatted ages
-                continue
-
-        genders = [r["gender"] for r in rows if r.get("gender")]
-        statuses = [r["civil_status"] for r in rows if r.get("civil_status")]
-        education = [r["education_level"] for r in rows if r.get("education_level")]
-        employment = [r["employment_status"] for r in rows if r.get("employment_status")]
+        genders = snapshot.value_counts("gender")
+        statuses = {s: n for s, n in snapshot.value_counts("civil_status").items() if n}
+        education = {e: n for e, n in snapshot.value_counts("education_level").items() if n}
+        age_counts = snapshot.age_histogram(AGE_GROUPS)
 
         # Update statistics cards
-        self.update_statistics(rows, ages, genders)
+        self.update_statistics(total_residents, snapshot.mean_age(), genders)
 
         # plotting styles
         plt.style.use('seaborn-v0_8')
@@ -198,7 +200,7 @@ class StaffResidentDemographics(QWidget):
         colors_bar = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12']
 
         # --- Gender Pie Chart ---
-        gender_counts = [genders.count("Male"), genders.count("Female")]
+        gender_counts = [genders.get("Male", 0), genders.get("Female", 0)]
         gender_labels = ["Male", "Female"]
         # Only create pie if sum > 0
         if sum(gender_counts) > 0:
@@ -217,19 +219,8 @@ class StaffResidentDemographics(QWidget):
             self.charts_layout.addWidget(placeholder, 0, 0)
 
         # --- Age Group Bar Chart ---
-        def age_group(age):
-            if age <= 17:
-                return "0–17"
-            elif age <= 35:
-                return "18–35"
-            elif age <= 60:
-                return "36–60"
-            else:
-                return "60+"
-
-        age_groups = [age_group(a) for a in ages if isinstance(a, int)]
-        group_labels = ["0–17", "18–35", "36–60", "60+"]
-        group_counts = [age_groups.count(lbl) for lbl in group_labels]
+        group_labels = list(age_counts)
+        group_counts = list(age_counts.values())
 
         # Create age chart even if all zeros (bar chart will show zero height)
         age_chart = self.make_chart(
@@ -246,8 +237,8 @@ class StaffResidentDemographics(QWidget):
         self.charts_layout.addWidget(age_chart, 0, 1)
 
         # --- Civil Status Pie Chart ---
-        status_labels = list(filter(None, set(statuses)))
-        status_counts = [statuses.count(s) for s in status_labels]
+        status_labels = list(statuses)
+        status_counts = list(statuses.values())
         if status_labels and sum(status_counts) > 0:
             civil_chart = self.make_chart(
                 title="Civil Status Breakdown",
@@ -264,8 +255,8 @@ class StaffResidentDemographics(QWidget):
             self.charts_layout.addWidget(placeholder, 1, 0)
 
         # --- Education Bar Chart ---
-        edu_labels = list(filter(None, set(education)))
-        edu_counts = [education.count(e) for e in edu_labels]
+        edu_labels = list(education)
+        edu_counts = list(education.values())
         if edu_labels and sum(edu_counts) > 0:
             edu_chart = self.make_chart(
                 title="Education Levels",
@@ -285,12 +276,37 @@ class StaffResidentDemographics(QWidget):
             placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.charts_layout.addWidget(placeholder, 1, 1)
 
-    def update_statistics(self, rows, ages, genders):
+    def update_zones(self):
+        """Fill the Purok / Sitio table from zone_counts (recomputed there only if residents changed)."""
+        try:
+            zones, unparsed = zone_summary()
+        except Exception as e:
+            print(f"⚠️ update_zones failed: {e}")
+            return
+
+        self.zones_table.setRowCount(len(zones))
+        households = 0
+        for row, z in enumerate(zones):
+            households += z["households"]
+            average = f"{z['residents'] / z['households']:.1f}" if z["households"] else "—"
+            values = [str(z["purok"]) if z["purok"] else "No purok", z["sitio"] or "—",
+                      f"{z['residents']:,}", f"{z['households']:,}", average]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col >= 2:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.zones_table.setItem(row, col, item)
+
+        self.households_card.layout().itemAt(1).widget().setText(f"{households:,}")
+        self.zones_note.setText(
+            f"⚠️ {unparsed:,} address(es) not indexed yet; run `python -m Panels.cli address backfill`."
+            if unparsed else "Search \"Purok 3\" or a house address in Resident Profiles to list its residents."
+        )
+
+    def update_statistics(self, total_residents, avg_age, genders):
         """Update the statistics cards with current data"""
-        total_residents = len(rows)
-        avg_age = np.mean(ages) if ages else 0.0
-        male_count = genders.count("Male")
-        female_count = genders.count("Female")
+        male_count = genders.get("Male", 0)
+        female_count = genders.get("Female", 0)
 
         # update stat cards safely
         try:
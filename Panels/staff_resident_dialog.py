@@ -1,16 +1,36 @@
 # Panels/staff_resident_dialog.py
-import os
 import datetime
 import traceback
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QComboBox, QSpinBox,
-    QPushButton, QMessageBox, QLabel, QWidget, QFrame
+    QPushButton, QMessageBox, QLabel, QWidget, QFrame, QDateEdit, QFileDialog
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QDate
+from PyQt6.QtGui import QPixmap
 
 from Panels.db import get_connection
+from Panels.change_feed import record_change
+from Panels.addresses import address_columns
+from Panels.ages import age_on
+from Panels.conflict_dialog import ConflictDialog, current_row, versioned_update
+from Panels.dedup import contact_key, find_matches, name_key
+from Panels.events import ResidentChanged, publish
+from Panels.photos import PREVIEW_SIZE, delete_photo, prepare_photo, store_photo
+from Panels.thumbnail_loader import get_thumbnail_loader
+from Panels.styles import apply_style_scope
 from Panels.logger import log_staff_activity, log_admin_activity
 
+# The birth date field shows this (as "Select birth date") until a date is picked
+NO_BIRTH_DATE = QDate(1900, 1, 1)
+
+# (label, residents column) for the fields the dialog edits
+RESIDENT_FIELDS = [
+    ("Name", "name"), ("Birth Date", "birth_date"), ("Gender", "gender"), ("Address", "address"),
+    ("Contact Number", "contact_number"), ("Civil Status", "civil_status"),
+    ("Employment Status", "employment_status"), ("Education Level", "education_level"),
+    ("Years of Residency", "residency_years"), ("Status", "status"),
+]
+
 
 class ResidentDialog(QDialog):
     """Dialog for adding or editing residents with safe operations."""
@@ -20,7 +40,10 @@ class ResidentDialog(QDialog):
         self.resident_id = resident_id
         self.role = role
         self.user_id = user_id
+        self.loaded = None    # row as loaded for editing; its version guards the save
         self._saving = False  # Prevent duplicate saves
+        self.new_photo = None        # prepare_photo() result for a photo picked in this dialog
+        self.photo_removed = False
 
         self.setWindowTitle("Add New Resident" if not resident_id else "Edit Resident")
         self.setMinimumWidth(650)
@@ -107,6 +130,34 @@ class ResidentDialog(QDialog):
         form.setLabelAlignment(Qt.AlignmentFlag.AlignLeft)
         form.setFormAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
 
+        # Photo (stored apart from the residents row, see Panels/photos.py)
+        photo_label = QLabel("Photo")
+        photo_label.setObjectName("fieldLabel")
+        photo_container = QWidget()
+        photo_layout = QHBoxLayout(photo_container)
+        photo_layout.setContentsMargins(0, 0, 0, 0)
+        photo_layout.setSpacing(15)
+        self.photo_preview = QLabel("No photo")
+        self.photo_preview.setObjectName("photoPreview")
+        self.photo_preview.setFixedSize(PREVIEW_SIZE, PREVIEW_SIZE)
+        self.photo_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        photo_buttons = QVBoxLayout()
+        photo_buttons.setSpacing(8)
+        choose_photo_btn = QPushButton("📷 Choose Photo")
+        choose_photo_btn.setObjectName("photoButton")
+        choose_photo_btn.clicked.connect(self.choose_photo)
+        self.remove_photo_btn = QPushButton("Remove Photo")
+        self.remove_photo_btn.setObjectName("photoButton")
+        self.remove_photo_btn.setEnabled(False)
+        self.remove_photo_btn.clicked.connect(self.remove_photo)
+        photo_buttons.addWidget(choose_photo_btn)
+        photo_buttons.addWidget(self.remove_photo_btn)
+        photo_buttons.addStretch()
+        photo_layout.addWidget(self.photo_preview)
+        photo_layout.addLayout(photo_buttons)
+        photo_layout.addStretch()
+        form.addRow(photo_label, photo_container)
+
         # Name
         name_label = QLabel("Full Name")
         name_label.setObjectName("fieldLabel")
@@ -115,25 +166,33 @@ class ResidentDialog(QDialog):
         self.name_input.setPlaceholderText("Enter full name")
         form.addRow(name_label, self.name_input)
 
-        # Age & Gender
+        # Birth date & Gender
         age_gender_container = QWidget()
         age_gender_layout = QHBoxLayout(age_gender_container)
         age_gender_layout.setContentsMargins(0, 0, 0, 0)
         age_gender_layout.setSpacing(15)
 
-        # Age
+        # Birth date (the age is shown under it, never stored)
         age_widget = QWidget()
         age_widget_layout = QVBoxLayout(age_widget)
         age_widget_layout.setContentsMargins(0, 0, 0, 0)
         age_widget_layout.setSpacing(8)
-        age_label = QLabel("Age")
+        age_label = QLabel("Birth Date")
         age_label.setObjectName("fieldLabel")
-        self.age_input = QSpinBox()
-        self.age_input.setObjectName("dialogSpinBox")
-        self.age_input.setRange(0, 120)
-        self.age_input.setFixedHeight(60)
+        self.birth_date_input = QDateEdit()
+        self.birth_date_input.setObjectName("dialogDateEdit")
+        self.birth_date_input.setCalendarPopup(True)
+        self.birth_date_input.setDisplayFormat("yyyy-MM-dd")
+        self.birth_date_input.setDateRange(NO_BIRTH_DATE, QDate.currentDate())
+        self.birth_date_input.setSpecialValueText("Select birth date")
+        self.birth_date_input.setDate(NO_BIRTH_DATE)
+        self.birth_date_input.setFixedHeight(60)
+        self.birth_date_input.dateChanged.connect(self.update_age_hint)
+        self.age_hint = QLabel("")
+        self.age_hint.setObjectName("fieldHint")
         age_widget_layout.addWidget(age_label)
-        age_widget_layout.addWidget(self.age_input)
+        age_widget_layout.addWidget(self.birth_date_input)
+        age_widget_layout.addWidget(self.age_hint)
 
         # Gender
         gender_widget = QWidget()
@@ -225,16 +284,80 @@ class ResidentDialog(QDialog):
         content_layout.addLayout(form)
         content_layout.addStretch()
 
+    def birth_date(self):
+        """The picked birth date as a datetime.date, or None."""
+        picked = self.birth_date_input.date()
+        return None if picked == NO_BIRTH_DATE else picked.toPyDate()
+
+    def birth_date_estimated(self):
+        """True while the birth date is still the one migrated from a recorded age."""
+        return bool(self.loaded and self.loaded.get("birth_date_estimated")
+                    and self.birth_date() == self.loaded.get("birth_date"))
+
+    def update_age_hint(self):
+        birth_date = self.birth_date()
+        if birth_date is None:
+            self.age_hint.setText("")
+        elif self.birth_date_estimated():
+            self.age_hint.setText(f"Age {age_on(birth_date)} (estimated, enter the real birth date if known)")
+        else:
+            self.age_hint.setText(f"Age {age_on(birth_date)}")
+
+    def choose_photo(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Choose Photo", "", "Images (*.jpg *.jpeg *.png *.bmp *.webp)"
+        )
+        if not path:
+            return
+        try:
+            with open(path, "rb") as f:
+                self.new_photo = prepare_photo(f.read())
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Photo", f"Could not use this photo:\n{e}")
+            return
+        except ImportError:
+            QMessageBox.warning(self, "Photo", "Photos need Pillow (pip install Pillow).")
+            return
+        self.photo_removed = False
+        pixmap = QPixmap()
+        pixmap.loadFromData(self.new_photo["photo"])
+        self.show_photo(pixmap)
+
+    def remove_photo(self):
+        self.new_photo = None
+        self.photo_removed = True
+        self.show_photo(None)
+
+    def show_photo(self, pixmap):
+        if pixmap is None or pixmap.isNull():
+            self.photo_preview.setPixmap(QPixmap())
+            self.photo_preview.setText("No photo")
+            self.remove_photo_btn.setEnabled(False)
+            return
+        self.photo_preview.setPixmap(pixmap.scaled(
+            PREVIEW_SIZE, PREVIEW_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        ))
+        self.remove_photo_btn.setEnabled(True)
+
+    def on_thumbnail_loaded(self, photo_hash, size, path):
+        """The saved photo's preview thumbnail, from the thumbnail worker."""
+        if (size != PREVIEW_SIZE or not self.loaded or self.new_photo or self.photo_removed
+                or photo_hash != self.loaded.get("photo_hash")):
+            return
+        self.show_photo(QPixmap(path) if path else None)
+
+    def photo_hash(self):
+        """residents.photo_hash after this save."""
+        if self.new_photo:
+            return self.new_photo["photo_hash"]
+        if self.photo_removed:
+            return None
+        return self.loaded.get("photo_hash") if self.loaded else None
+
     def load_styles(self):
-        """Load QSS styles"""
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        qss_path = os.path.join(base_dir, "Styles", "staff_resident_dialog.qss")
-        if os.path.exists(qss_path):
-            try:
-                with open(qss_path, "r") as style_file:
-                    self.setStyleSheet(style_file.read())
-            except Exception as e:
-                print(f"⚠️ Style loading failed: {e}")
+        """Attach the dialog to Styles/staff_resident_dialog.qss in the app-wide stylesheet"""
+        apply_style_scope(self, "staff_resident_dialog")
 
     def load_resident_data(self):
         """Load resident data for editing"""
@@ -247,6 +370,7 @@ class ResidentDialog(QDialog):
             conn.close()
 
             if resident:
+                self.loaded = resident
                 self.populate_form(resident)
 
         except Exception as e:
@@ -258,7 +382,15 @@ class ResidentDialog(QDialog):
         """Populate form with resident data"""
         # Protect against None values
         self.name_input.setText(resident.get("name") or "")
-        self.age_input.setValue(int(resident.get("age") or 0))
+        birth_date = resident.get("birth_date")
+        self.birth_date_input.setDate(QDate(birth_date.year, birth_date.month, birth_date.day)
+                                      if birth_date else NO_BIRTH_DATE)
+        self.update_age_hint()
+
+        if resident.get("photo_hash"):
+            loader = get_thumbnail_loader()
+            loader.loaded.connect(self.on_thumbnail_loaded)
+            loader.request(resident["photo_hash"], PREVIEW_SIZE)
 
         gender = resident.get("gender") or ""
         gender_index = self.gender_input.findText(gender)
@@ -314,23 +446,11 @@ class ResidentDialog(QDialog):
         self._saving = False
         self.save_button.setEnabled(True)
 
-    def check_duplicate_resident(self, name, contact_number):
-        """Check if resident with same name or contact number already exists"""
+    def check_duplicate_resident(self, name, contact_number, age=None, address=None):
+        """Residents that exactly or probably match (Panels/dedup.py), best match first"""
         conn = get_connection()
         cursor = conn.cursor()
-
-        if self.resident_id:  # For edit mode - exclude current resident
-            cursor.execute("""
-                SELECT id, name, contact_number FROM residents 
-                WHERE (name = %s OR contact_number = %s) AND id != %s
-            """, (name, contact_number, self.resident_id))
-        else:  # For add mode
-            cursor.execute("""
-                SELECT id, name, contact_number FROM residents 
-                WHERE name = %s OR contact_number = %s
-            """, (name, contact_number))
-
-        duplicates = cursor.fetchall()
+        duplicates = find_matches(cursor, name, contact_number, age, address, exclude_id=self.resident_id)
         cursor.close()
         conn.close()
 
@@ -340,7 +460,8 @@ class ResidentDialog(QDialog):
         """Save resident data with duplicate checking"""
         # Get and validate form data
         name = (self.name_input.text() or "").strip()
-        age = int(self.age_input.value())
+        birth_date = self.birth_date()
+        estimated = self.birth_date_estimated()
         gender = (self.gender_input.currentText() or "").strip()
         address = (self.address_input.text() or "").strip()
         contact = (self.contact_input.text() or "").strip()
@@ -357,6 +478,9 @@ class ResidentDialog(QDialog):
         if not address:
             QMessageBox.warning(self, "Validation Error", "Address is required.")
             return
+        if birth_date is None:
+            QMessageBox.warning(self, "Validation Error", "Please enter a birth date.")
+            return
         if gender == "Select gender" or gender == "":
             QMessageBox.warning(self, "Validation Error", "Please select a gender.")
             return
@@ -365,20 +489,36 @@ class ResidentDialog(QDialog):
             return
 
         # Check for duplicates
-        duplicates = self.check_duplicate_resident(name, contact)
+        duplicates = self.check_duplicate_resident(name, contact, age_on(birth_date), address)
         if duplicates:
             duplicate_messages = []
+            possible = []
             for dup in duplicates:
-                if dup["name"] == name:
+                exact = False
+                if dup["name"].casefold() == name.casefold():
                     duplicate_messages.append(f"• Name '{name}' already exists (ID: {dup['id']})")
+                    exact = True
                 if dup["contact_number"] == contact and contact:  # Only check if contact is provided
                     duplicate_messages.append(f"• Contact number '{contact}' already exists (ID: {dup['id']})")
+                    exact = True
+                if not exact:
+                    possible.append(f"• {dup['name']} (ID: {dup['id']}), {dup['score']:.0%} match: {dup['reasons']}")
 
             if duplicate_messages:
                 error_msg = "Cannot save resident due to duplicates:\n\n" + "\n".join(duplicate_messages)
                 QMessageBox.warning(self, "Duplicate Resident", error_msg)
                 return
 
+            if possible:
+                reply = QMessageBox.question(
+                    self, "Possible Duplicate",
+                    "This resident looks like an existing record:\n\n" + "\n".join(possible[:5])
+                    + "\n\nSave as a new, separate resident anyway?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply != QMessageBox.StandardButton.Yes:
+                    return
+
         # Database operations
         conn = None
         cursor = None
@@ -387,36 +527,55 @@ class ResidentDialog(QDialog):
             cursor = conn.cursor()
 
             if self.resident_id:
-                # UPDATE
-                cursor.execute("""
-                    UPDATE residents
-                    SET name=%s, age=%s, gender=%s, address=%s, contact_number=%s,
-                        civil_status=%s, employment_status=%s, education_level=%s,
-                        residency_years=%s, status=%s
-                    WHERE id=%s
-                """, (name, age, gender, address, contact, civil, employment, education,
-                      residency, status, self.resident_id))
+                # UPDATE, only if nobody saved this resident since it was loaded
+                values = {
+                    "name": name, "birth_date": birth_date, "birth_date_estimated": int(estimated),
+                    "gender": gender, "address": address,
+                    "contact_number": contact, "civil_status": civil,
+                    "employment_status": employment, "education_level": education,
+                    "residency_years": residency, "status": status,
+                    "name_key": name_key(name), "contact_key": contact_key(contact),
+                    "photo_hash": self.photo_hash(), **address_columns(address),
+                }
+                if not versioned_update(cursor, "residents", self.resident_id, self.loaded["version"], values):
+                    conn.rollback()
+                    if self.resolve_conflict(values):
+                        return self.save_resident()
+                    return
+                record_change(cursor, "resident", self.resident_id, "update")
+                saved_id, op = self.resident_id, "update"
             else:
                 # INSERT
                 created_by = self.user_id if self.user_id is not None else None
-                cursor.execute("""
+                parsed = address_columns(address)
+                cursor.execute(f"""
                     INSERT INTO residents
-                    (name, age, gender, address, contact_number, civil_status,
+                    (name, birth_date, gender, address, contact_number, civil_status,
                      employment_status, education_level, residency_years,
-                     created_by, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (name, age, gender, address, contact, civil, employment, education,
-                      residency, created_by, status))
+                     created_by, status, name_key, contact_key, photo_hash, {", ".join(parsed)})
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s{", %s" * len(parsed)})
+                """, (name, birth_date, gender, address, contact, civil, employment, education,
+                      residency, created_by, status, name_key(name), contact_key(contact), self.photo_hash(),
+                      *parsed.values()))
+                saved_id, op = cursor.lastrowid, "insert"
+                record_change(cursor, "resident", saved_id, op)
+
+            if self.new_photo:
+                store_photo(cursor, saved_id, self.new_photo, self.user_id)
+            elif self.photo_removed:
+                delete_photo(cursor, saved_id)
 
             conn.commit()
+            if self.new_photo:  # thumbnails rendered once, off the GUI thread
+                get_thumbnail_loader().generate(self.new_photo["photo_hash"], self.new_photo["photo"])
+            publish(ResidentChanged(saved_id, op))
 
             # Logging
             try:
                 if self.resident_id:
                     action = f"Edited resident ID {self.resident_id}"
                 else:
-                    inserted_id = cursor.lastrowid if cursor else None
-                    action = f"Added new resident {name} (id={inserted_id})"
+                    action = f"Added new resident {name} (id={saved_id})"
 
                 if self.role == "Admin":
                     log_admin_activity(self.user_id, "EDIT_RESIDENT" if self.resident_id else "ADD_RESIDENT", action)
@@ -438,4 +597,24 @@ class ResidentDialog(QDialog):
             if cursor:
                 cursor.close()
             if conn:
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    def resolve_conflict(self, values):
+        """Another desk saved this resident since it was loaded. True to save again over it."""
+        current, change = current_row("residents", "resident", self.resident_id)
+        if current is None:
+            QMessageBox.warning(self, "Resident Deleted",
+                                "This resident was deleted at another desk; your changes were not saved.")
+            self.reject()
+            return False
+
+        fields = [(label, self.loaded[column], values[column], current[column])
+                  for label, column in RESIDENT_FIELDS]
+        dialog = ConflictDialog(self, "resident", fields, change)
+        dialog.exec()
+
+        if dialog.choice is not None:
+            self.loaded = current  # the version the next save is checked against
+        if dialog.choice == ConflictDialog.USE_THEIRS:
+            self.populate_form(current)
+        return dialog.choice == ConflictDialog.KEEP_MINE
@@ -1,32 +1,43 @@
-import os
 import faulthandler
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame,
     QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QScrollArea
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt
 from PyQt6.QtCore import QTimer
 from functools import partial
 
+from Panels.addresses import resident_search
+from Panels.ages import age_sql
 from Panels.db import get_connection
+from Panels.change_feed import patch_rows, record_change
+from Panels.change_poller import patch_table_rows
+from Panels.events import (
+    RESIDENT_EVENTS, ResidentChanged, ResidentSearchChanged, ResyncRequired, get_event_bus, publish, remote_ids
+)
+from Panels.facet_bar import FacetBar
+from Panels.records import Resident, query_rows
+from Panels.reporting import export_csv, export_pdf
+from Panels.styles import apply_style_scope
 from Panels.logger import log_staff_activity
+from Panels.photos import delete_photo
 from Panels.staff_resident_dialog import ResidentDialog
+from Panels.thumbnail_loader import PHOTO_ROLE, TableThumbnails
 
 faulthandler.enable()
 
 
 class StaffResidentProfiles(QWidget):
-    residents_changed = pyqtSignal()
-
     def __init__(self, staff_id):
         super().__init__()
         self.staff_id = staff_id
         self._is_loading = False  # Prevent recursive loads
+        self.row_ids = []  # resident id on each table row (see apply_changes)
+        self.current_search = ""
+        self.search_results = []  # rows of the current search, before the facet filters
 
-        # --- Project Paths ---
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        styles_dir = os.path.join(base_dir, "Styles")
-        qss_path = os.path.join(styles_dir, "staff_resident_profiles.qss")
+        # --- Stylesheet (Styles/staff_resident_profiles.qss) ---
+        apply_style_scope(self, "staff_resident_profiles")
 
         # Main scroll area
         scroll = QScrollArea()
@@ -131,8 +142,8 @@ class StaffResidentProfiles(QWidget):
 
         # Right side - Search bar
         self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText("🔍 Search residents...")
-        self.search_bar.textChanged.connect(self.safe_filter_residents)
+        self.search_bar.setPlaceholderText("🔍 Search residents, or e.g. \"Purok 3\"...")
+        self.search_bar.textChanged.connect(lambda text: publish(ResidentSearchChanged(text)))
         self.search_bar.setObjectName("searchBar")
         self.search_bar.setFixedWidth(300)
         self.search_bar.setFixedHeight(40)
@@ -140,6 +151,11 @@ class StaffResidentProfiles(QWidget):
 
         table_layout.addLayout(card_header)
 
+        # Facets (gender, civil status, ..., with live counts)
+        self.facet_bar = FacetBar()
+        self.facet_bar.changed.connect(self.apply_facets)
+        table_layout.addWidget(self.facet_bar)
+
         # Table
         self.table = QTableWidget()
         self.table.setObjectName("residentsTable")
@@ -177,6 +193,7 @@ class StaffResidentProfiles(QWidget):
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
         self.table.setMinimumHeight(400)
+        self.thumbnails = TableThumbnails(self.table)  # photos next to names, for rows in view
 
         table_layout.addWidget(self.table)
         layout.addWidget(table_card)
@@ -187,24 +204,16 @@ class StaffResidentProfiles(QWidget):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.addWidget(scroll)
 
-        # Load stylesheet
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as style_file:
-                self.setStyleSheet(style_file.read())
-        else:
-            print(f"⚠️ Could not find QSS file at {qss_path}")
-
         # Load residents from DB
         QTimer.singleShot(100, self.load_residents)
 
-    def safe_filter_residents(self, text):
-        """Safe filtering with debounce to prevent rapid updates"""
-        if hasattr(self, '_filter_timer'):
-            self._filter_timer.stop()
-        self._filter_timer = QTimer()
-        self._filter_timer.setSingleShot(True)
-        self._filter_timer.timeout.connect(lambda: self.load_residents(text))
-        self._filter_timer.start(300)  # 300ms delay
+        bus = get_event_bus()
+        bus.subscribe(RESIDENT_EVENTS, self.on_residents_changed, owner=self)
+        bus.subscribe((ResidentSearchChanged,), self.on_search_changed, delay_ms=300, owner=self)
+
+    def on_search_changed(self, events):
+        """Search-as-you-type: the bus delivers once typing pauses for 300ms"""
+        self.load_residents(self.search_bar.text())
 
     def clear_table(self):
         """Safely clear table contents"""
@@ -218,6 +227,19 @@ class StaffResidentProfiles(QWidget):
         except Exception as e:
             print(f"Error clearing table: {e}")
 
+    def resident_query(self, search_query="", ids=None):
+        """SQL and params for the residents matching the search (only ``ids`` if given)."""
+        query = f"SELECT *, {age_sql()} AS age FROM residents WHERE 1=1"
+        params = []
+        if search_query:  # name / address, or "purok 3", "sitio ilaya", "364 mabini st"
+            search, search_params = resident_search(search_query)
+            query += f" AND {search}"
+            params.extend(search_params)
+        if ids is not None:
+            query += f" AND id IN ({', '.join(['%s'] * len(ids))})"
+            params.extend(ids)
+        return query, params
+
     def load_residents(self, search_query=""):
         """Load residents with proper memory management"""
         if self._is_loading:
@@ -225,106 +247,9 @@ class StaffResidentProfiles(QWidget):
 
         self._is_loading = True
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-
-            if search_query:
-                cursor.execute(
-                    "SELECT * FROM residents WHERE name LIKE %s OR address LIKE %s",
-                    (f"%{search_query}%", f"%{search_query}%")
-                )
-            else:
-                cursor.execute("SELECT * FROM residents")
-
-            residents = cursor.fetchall()
-            cursor.close()
-            conn.close()
-
-            # Clear table safely
-            self.clear_table()
-            self.table.setRowCount(len(residents))
-
-            for row, resident in enumerate(residents):
-                # Name
-                name_item = QTableWidgetItem(resident["name"])
-                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 0, name_item)
-
-                # Age
-                age_item = QTableWidgetItem(str(resident["age"]))
-                age_item.setFlags(age_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                age_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 1, age_item)
-
-                # Gender
-                gender_item = QTableWidgetItem(resident["gender"])
-                gender_item.setFlags(gender_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                gender_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 2, gender_item)
-
-                # Address
-                address_item = QTableWidgetItem(resident["address"])
-                address_item.setFlags(address_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 3, address_item)
-
-                # Contact
-                contact_item = QTableWidgetItem(resident["contact_number"])
-                contact_item.setFlags(contact_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 4, contact_item)
-
-                # Civil Status
-                civil_status_item = QTableWidgetItem(resident.get("civil_status", ""))
-                civil_status_item.setFlags(civil_status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                civil_status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 5, civil_status_item)
-
-                # Employment Status
-                employment_item = QTableWidgetItem(resident.get("employment_status", ""))
-                employment_item.setFlags(employment_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                employment_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 6, employment_item)
-
-                # Education Level
-                education_item = QTableWidgetItem(resident.get("education_level", ""))
-                education_item.setFlags(education_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                education_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 7, education_item)
-
-                # Residency Years
-                residency_item = QTableWidgetItem(str(resident.get("residency_years", "")))
-                residency_item.setFlags(residency_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                residency_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 8, residency_item)
-
-                # Actions column
-                actions = QWidget()
-                actions_layout = QHBoxLayout(actions)
-                actions_layout.setContentsMargins(5, 5, 5, 5)
-                actions_layout.setSpacing(8)
-
-                btn_edit = QPushButton("✏️")
-                btn_edit.setObjectName("editButton")
-                btn_edit.setFixedSize(50, 28)
-                btn_edit.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_edit.setToolTip("Edit resident")
-                btn_edit.clicked.connect(partial(self.open_edit_resident_dialog, resident["id"]))
-
-                btn_delete = QPushButton("🗑️")
-                btn_delete.setObjectName("deleteButton")
-                btn_delete.setFixedSize(50, 28)
-                btn_delete.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_delete.setToolTip("Delete resident")
-                btn_delete.clicked.connect(partial(self.delete_resident, resident["id"]))
-
-                actions_layout.addWidget(btn_edit)
-                actions_layout.addWidget(btn_delete)
-                actions_layout.addStretch()
-                self.table.setCellWidget(row, 9, actions)
-
-                # Set row height
-                self.table.setRowHeight(row, 65)
-
-            self.list_subtitle.setText(f"Total of {len(residents)} registered residents")
+            self.current_search = search_query
+            self.search_results = query_rows(Resident, *self.resident_query(search_query))
+            self.show_residents(self.facet_bar.filter_rows(self.search_results))
 
         except Exception as e:
             print(f"Error loading residents: {e}")
@@ -332,6 +257,131 @@ class StaffResidentProfiles(QWidget):
         finally:
             self._is_loading = False
 
+    def apply_facets(self):
+        """A facet was picked: re-filter the rows of the current search, no query needed."""
+        if self._is_loading:
+            return
+        self.show_residents(self.facet_bar.filter_rows(self.search_results, refresh=False))
+
+    def show_residents(self, residents):
+        # Clear table safely
+        self.clear_table()
+        self.table.setRowCount(len(residents))
+        self.row_ids = [resident["id"] for resident in residents]
+
+        for row, resident in enumerate(residents):
+            self.fill_row(row, resident)
+        self.thumbnails.refresh()
+        self.update_subtitle()
+
+    def update_subtitle(self):
+        if len(self.row_ids) == len(self.search_results):
+            self.list_subtitle.setText(f"Total of {len(self.row_ids)} registered residents")
+        else:
+            self.list_subtitle.setText(f"Showing {len(self.row_ids)} of {len(self.search_results)} residents")
+
+    def on_residents_changed(self, events):
+        """Event-bus handler: this panel reloads itself after its own changes, so only remote ones matter."""
+        if any(isinstance(e, ResyncRequired) for e in events):
+            self.load_residents(self.current_search)
+            return
+        ids = remote_ids(events, ResidentChanged, "resident_id")
+        if ids:
+            self.apply_changes(ids)
+
+    def apply_changes(self, ids):
+        """Patch the rows of residents ``ids`` instead of reloading the table."""
+        if self._is_loading:
+            return
+        fresh = query_rows(Resident, *self.resident_query(self.current_search, ids))
+        self.search_results = patch_rows(self.search_results, ids, fresh)
+        matching = {r["id"] for r in self.facet_bar.filter_rows(self.search_results)}
+        fresh = [r for r in fresh if r["id"] in matching]
+        patch_table_rows(self.table, self.row_ids, ids, fresh, self.fill_row)
+        self.thumbnails.refresh()
+        self.update_subtitle()
+
+    def fill_row(self, row, resident):
+        # Name
+        name_item = QTableWidgetItem(resident["name"])
+        name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        name_item.setData(PHOTO_ROLE, resident["photo_hash"])
+        self.table.setItem(row, 0, name_item)
+
+        # Age
+        age_item = QTableWidgetItem("" if resident["age"] is None else str(resident["age"]))
+        age_item.setFlags(age_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        age_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 1, age_item)
+
+        # Gender
+        gender_item = QTableWidgetItem(resident["gender"])
+        gender_item.setFlags(gender_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        gender_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 2, gender_item)
+
+        # Address
+        address_item = QTableWidgetItem(resident["address"])
+        address_item.setFlags(address_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self.table.setItem(row, 3, address_item)
+
+        # Contact
+        contact_item = QTableWidgetItem(resident["contact_number"])
+        contact_item.setFlags(contact_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self.table.setItem(row, 4, contact_item)
+
+        # Civil Status
+        civil_status_item = QTableWidgetItem(resident.get("civil_status", ""))
+        civil_status_item.setFlags(civil_status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        civil_status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 5, civil_status_item)
+
+        # Employment Status
+        employment_item = QTableWidgetItem(resident.get("employment_status", ""))
+        employment_item.setFlags(employment_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        employment_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 6, employment_item)
+
+        # Education Level
+        education_item = QTableWidgetItem(resident.get("education_level", ""))
+        education_item.setFlags(education_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        education_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 7, education_item)
+
+        # Residency Years
+        residency_item = QTableWidgetItem(str(resident.get("residency_years", "")))
+        residency_item.setFlags(residency_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        residency_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 8, residency_item)
+
+        # Actions column
+        actions = QWidget()
+        actions_layout = QHBoxLayout(actions)
+        actions_layout.setContentsMargins(5, 5, 5, 5)
+        actions_layout.setSpacing(8)
+
+        btn_edit = QPushButton("✏️")
+        btn_edit.setObjectName("editButton")
+        btn_edit.setFixedSize(50, 28)
+        btn_edit.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_edit.setToolTip("Edit resident")
+        btn_edit.clicked.connect(partial(self.open_edit_resident_dialog, resident["id"]))
+
+        btn_delete = QPushButton("🗑️")
+        btn_delete.setObjectName("deleteButton")
+        btn_delete.setFixedSize(50, 28)
+        btn_delete.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_delete.setToolTip("Delete resident")
+        btn_delete.clicked.connect(partial(self.delete_resident, resident["id"]))
+
+        actions_layout.addWidget(btn_edit)
+        actions_layout.addWidget(btn_delete)
+        actions_layout.addStretch()
+        self.table.setCellWidget(row, 9, actions)
+
+        # Set row height
+        self.table.setRowHeight(row, 65)
+
     def open_add_resident_dialog(self):
         """Open add resident dialog with proper user_id"""
         try:
@@ -357,10 +407,8 @@ class StaffResidentProfiles(QWidget):
             QMessageBox.critical(self, "Error", f"Failed to open dialog:\n{e}")
 
     def delayed_refresh(self):
-        """Delayed refresh to prevent signal recursion"""
+        """Delayed refresh to prevent signal recursion (the dialog already published the change)"""
         self.load_residents()
-        # Emit signal with delay to break any potential recursion
-        QTimer.singleShot(50, self.residents_changed.emit)
 
     def resident_has_requests(self, resident_id):
         """Check if resident has any requests"""
@@ -399,12 +447,14 @@ class StaffResidentProfiles(QWidget):
                 conn = get_connection()
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM residents WHERE id = %s", (resident_id,))
+                delete_photo(cursor, resident_id)
+                record_change(cursor, "resident", resident_id, "delete")
                 conn.commit()
                 cursor.close()
                 conn.close()
 
                 self.load_residents()
-                self.residents_changed.emit()
+                publish(ResidentChanged(resident_id, "delete"))
                 log_staff_activity(self.staff_id, "DELETE_RESIDENT", f"Deleted resident {resident_id}", role="Staff")
 
             except Exception as e:
@@ -412,83 +462,10 @@ class StaffResidentProfiles(QWidget):
 
     # --- CSV Export ---
     def export_to_csv(self):
-        import csv
-        from datetime import datetime
-
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM residents ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"residents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Name", "Age", "Gender", "Address", "Contact", "Civil Status", "Employment", "Education",
-                             "Residency Years", "Status"])
-            for r in rows:
-                writer.writerow([
-                    r["name"], r["age"], r["gender"], r["address"], r["contact_number"], r["civil_status"],
-                    r["employment_status"], r["education_level"], r["residency_years"], r["status"]
-                ])
-
+        filename = export_csv("resident_directory")
         QMessageBox.information(self, "Export Successful", f"Residents exported to:\n{filename}")
 
     # --- PDF Export ---
     def export_to_pdf(self):
-        from datetime import datetime
-        from reportlab.lib.pagesizes import letter, landscape
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import inch
-
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM residents ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        export_dir = os.path.join(os.getcwd(), "exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"residents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-
-        c = canvas.Canvas(filename, pagesize=landscape(letter))
-        width, height = landscape(letter)
-
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(1 * inch, height - 0.75 * inch, "Barangay Resident Directory")
-
-        c.setFont("Helvetica", 10)
-        c.drawString(1 * inch, height - 1 * inch, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        y = height - 1.5 * inch
-        headers = ["Name", "Age", "Gender", "Address", "Contact", "Civil Status", "Employment", "Status"]
-        x_positions = [0.5, 2.0, 2.5, 3.0, 5.5, 6.5, 7.5, 8.5]
-
-        c.setFont("Helvetica-Bold", 10)
-        for i, h in enumerate(headers):
-            c.drawString(x_positions[i] * inch, y, h)
-
-        y -= 0.25 * inch
-        c.setFont("Helvetica", 8)  # Smaller font to fit more columns
-        for r in rows:
-            if y < 1 * inch:
-                c.showPage()
-                y = height - 1 * inch
-                c.setFont("Helvetica", 8)
-            c.drawString(x_positions[0] * inch, y, r["name"][:20])  # Truncate long names
-            c.drawString(x_positions[1] * inch, y, str(r["age"]))
-            c.drawString(x_positions[2] * inch, y, r["gender"])
-            c.drawString(x_positions[3] * inch, y, r["address"][:25])  # Truncate address
-            c.drawString(x_positions[4] * inch, y, r["contact_number"][:15])
-            c.drawString(x_positions[5] * inch, y, r.get("civil_status", "")[:12])
-            c.drawString(x_positions[6] * inch, y, r.get("employment_status", "")[:12])
-            c.drawString(x_positions[7] * inch, y, r["status"])
-            y -= 0.25 * inch
-
-        c.save()
-        QMessageBox.information(self, "Export Successful", f"PDF generated:\n{filename}")
\ No newline at end of file
+        filename = export_pdf("resident_directory")
+        QMessageBox.information(self, "Export Successful", f"PDF generated:\n{filename}")
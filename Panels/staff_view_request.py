@@ -3,8 +3,12 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QPushButton, QTextEdit, QLabel, QFrame, QHBoxLayout
 )
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextCursor
 from Panels.db import get_connection
+from Panels.photos import CARD_SIZE, thumbnail
 from Panels.document_templates import (
+    PHOTO_PLACEHOLDER,
+    stamp_control_number,
     generate_barangay_clearance,
     generate_certificate_of_residency,
     generate_barangay_id,
@@ -86,11 +90,13 @@ class ViewRequestDialog(QDialog):
                 r.id,
                 res.name AS resident_name,
                 res.address,
+                res.photo_hash,
                 r.document_type,
                 r.purpose,
                 r.request_date,
                 r.status,
-                r.completed_date
+                r.completed_date,
+                r.control_number
             FROM requests r
             JOIN residents res ON r.resident_id = res.id
             WHERE r.id=%s
@@ -123,6 +129,7 @@ class ViewRequestDialog(QDialog):
             <b>Purpose:</b> {req['purpose']}<br>
             <b>Request Date:</b> {req['request_date']}<br>
             <b>Status:</b> <span style="color:{status_color}; font-weight:bold;">{req['status']}</span><br>
+            <b>Control No.:</b> {req['control_number'] or "Issued on completion"}<br>
             <b>{completed_text}</b>
             """
         )
@@ -130,8 +137,25 @@ class ViewRequestDialog(QDialog):
         # --- Generate the document body using proper template ---
         doc_type = req["document_type"]
         doc_text = self.generate_document_text(doc_type, req)
+        if req["control_number"]:
+            doc_text = stamp_control_number(doc_text, req["control_number"])
 
         self.document_view.setPlainText(doc_text)
+        if doc_type == "Barangay ID" and req["photo_hash"]:
+            self.insert_photo(req["photo_hash"])
+
+    def insert_photo(self, photo_hash):
+        """Put the resident's ID-card thumbnail where the template says [Photo Here]."""
+        try:
+            path = thumbnail(photo_hash, CARD_SIZE)
+        except Exception as e:
+            print(f"⚠️ Could not load the resident photo: {e}")
+            return
+        if path and self.document_view.find(PHOTO_PLACEHOLDER):
+            cursor = self.document_view.textCursor()
+            cursor.insertImage(path)
+            cursor.insertText("\n")
+            self.document_view.moveCursor(QTextCursor.MoveOperation.Start)
 
     # ---------------------------------
     # Template Dispatcher
@@ -0,0 +1,154 @@
+# Panels/styles.py
+"""
+Stylesheet registry: every Styles/*.qss file is read from disk once per process.
+
+A widget picks its file with apply_style_scope(self, "<qss name>"), which tags it with a
+``styleScope`` property and then:
+
+- for the top-level windows (WINDOW_SCOPES: login, register and the two dashboards),
+  relies on the application stylesheet, where each window file's rules are rewritten
+  to match only inside the tagged window;
+- for panels and dialogs, sets the file on the widget itself with setStyleSheet().
+
+Panels keep their own sheet because Qt always prefers a widget's own stylesheet to
+an inherited one, whatever the specificity. Scoped into one app-wide sheet, a dashboard
+rule such as ``QWidget#contentArea QPushButton`` would outrank a panel's plain
+``QPushButton`` and restyle every button inside the panel.
+
+Row widgets (table actions, badges) pick their look through objectName / dynamic
+properties such as ``QPushButton#approveButton`` or ``QLabel#statusBadge[statusType=...]``
+instead of calling setStyleSheet() per widget.
+"""
+import os
+import re
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STYLES_DIR = os.path.join(BASE_DIR, "Styles")
+SCOPE_PROPERTY = "styleScope"
+
+# Window files shared through the application stylesheet; every other Styles/*.qss
+# file is a panel or dialog sheet set on its widget (see the module docstring)
+WINDOW_SCOPES = ["login", "register", "admin_dashboard", "staff_dashboard"]
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+# Filled in by install_app_stylesheet(); read by Benchmarks/bench_panels.py
+stats = {"files": 0, "rules": 0, "build_ms": 0.0, "install_ms": 0.0}
+
+_sheets = {}  # scope -> file contents, read once
+
+
+# -----------------------------
+# QSS scoping
+# -----------------------------
+def iter_rules(qss):
+    """Yield ``(selector_text, body)`` for each top-level rule; @-blocks are skipped (Qt ignores them)."""
+    qss = _COMMENT.sub("", qss)
+    pos = 0
+    while True:
+        start = qss.find("{", pos)
+        if start == -1:
+            return
+        selector = qss[pos:start].strip()
+        depth, end = 1, start + 1
+        while depth and end < len(qss):
+            depth += {"{": 1, "}": -1}.get(qss[end], 0)
+            end += 1
+        if selector and not selector.startswith("@"):
+            yield selector, qss[start + 1:end - 1].strip()
+        pos = end
+
+
+def _split_top_level(text, separators):
+    """Split on any separator character that is not inside [...] or (...)."""
+    parts, depth, current = [], 0, ""
+    for ch in text:
+        depth += {"[": 1, "(": 1, "]": -1, ")": -1}.get(ch, 0)
+        if ch in separators and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    parts.append(current)
+    return parts
+
+
+def scope_selector(selector, scope):
+    """Rewrite one selector to match only inside (or on) widgets tagged with ``scope``."""
+    tag = f'[{SCOPE_PROPERTY}="{scope}"]'
+    selector = " ".join(selector.split())
+    first, _, rest = selector.partition(" ")
+
+    # The panel itself: attach the tag to the first compound, before any :state / ::subcontrol
+    head = _split_top_level(first, ":")[0]
+    on_panel = head + tag + first[len(head):]
+    if rest:
+        on_panel += " " + rest
+    return [f"*{tag} {selector}", on_panel]
+
+
+def scope_stylesheet(qss, scope):
+    """Return ``(scoped_qss, rule_count)`` for one .qss file."""
+    blocks = []
+    for selector_text, body in iter_rules(qss):
+        selectors = [s.strip() for s in _split_top_level(selector_text, ",") if s.strip()]
+        scoped = [s for sel in selectors for s in scope_selector(sel, scope)]
+        blocks.append(",\n".join(scoped) + " {\n    " + body + "\n}")
+    return "\n\n".join(blocks), len(blocks)
+
+
+def read_stylesheet(scope, styles_dir=STYLES_DIR):
+    """Contents of Styles/<scope>.qss, read from disk on first use only."""
+    key = (styles_dir, scope)
+    if key not in _sheets:
+        with open(os.path.join(styles_dir, f"{scope}.qss"), "r", encoding="utf-8") as style_file:
+            _sheets[key] = style_file.read()
+    return _sheets[key]
+
+
+def build_app_stylesheet(styles_dir=STYLES_DIR):
+    """Concatenate the WINDOW_SCOPES files in ``styles_dir``, each scoped to its own file name."""
+    ordered = [s for s in WINDOW_SCOPES if os.path.exists(os.path.join(styles_dir, f"{s}.qss"))]
+
+    sheets, total_rules = [], 0
+    for scope in ordered:
+        scoped, rules = scope_stylesheet(read_stylesheet(scope, styles_dir), scope)
+        sheets.append(f"/* ===== {scope}.qss ===== */\n{scoped}")
+        total_rules += rules
+    return "\n\n".join(sheets), len(ordered), total_rules
+
+
+# -----------------------------
+# Installation
+# -----------------------------
+def install_app_stylesheet(app=None):
+    """Build the app-wide stylesheet and set it on the QApplication (only the first call does work)."""
+    app = app or QApplication.instance()
+    if app is None or app.property("styleRegistryInstalled"):
+        return
+
+    try:
+        started = time.perf_counter()
+        stylesheet, files, rules = build_app_stylesheet()
+        built = time.perf_counter()
+        app.setStyleSheet(app.styleSheet() + "\n" + stylesheet)
+        app.setProperty("styleRegistryInstalled", True)
+        stats.update(files=files, rules=rules,
+                     build_ms=(built - started) * 1000,
+                     install_ms=(time.perf_counter() - built) * 1000)
+    except Exception as e:
+        print(f"⚠️ Failed to load stylesheets from {STYLES_DIR}: {e}")
+
+
+def apply_style_scope(widget, scope):
+    """Style ``widget`` and its children with Styles/<scope>.qss. Call before the widget is shown."""
+    install_app_stylesheet()
+    widget.setProperty(SCOPE_PROPERTY, scope)
+    if scope not in WINDOW_SCOPES:
+        try:
+            widget.setStyleSheet(read_stylesheet(scope))
+        except OSError as e:
+            print(f"⚠️ Failed to load Styles/{scope}.qss: {e}")
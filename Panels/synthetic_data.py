@@ -0,0 +1,285 @@
+# Panels/synthetic_data.py
+"""
+Deterministic synthetic barangay data.
+
+Every generator takes a seeded ``random.Random`` and an ``anchor`` datetime, so the
+same seed and size always produce the same rows relative to the anchor. Rows are
+yielded as tuples in the column order given by the matching ``*_COLUMNS`` constant,
+ready for ``cursor.executemany``.
+
+Residents follow rough barangay demographics: ages come from a young-skewed population
+pyramid (birth dates are drawn to match the age at ``anchor``), and civil status,
+employment and education are drawn conditionally on age.
+"""
+import random
+from itertools import chain
+from datetime import datetime, timedelta
+
+from Panels.ages import years_before
+
+# -----------------------------
+# Dataset sizes
+# -----------------------------
+SIZES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+# -----------------------------
+# Column orders (match INSERT statements)
+# -----------------------------
+STAFF_COLUMNS = ("username", "password", "email", "role", "status", "created_at")
+ADMIN_COLUMNS = ("username", "password", "email", "role", "created_at")
+RESIDENT_COLUMNS = (
+    "name", "birth_date", "gender", "address", "contact_number", "civil_status",
+    "employment_status", "education_level", "residency_years", "status",
+    "created_by", "created_at",
+)
+REQUEST_COLUMNS = (
+    "resident_id", "document_type", "purpose", "request_date", "status",
+    "completed_date", "created_by", "created_at",
+)
+STAFF_ACTIVITY_COLUMNS = ("staff_id", "role", "action_type", "description", "ip_address", "created_at")
+ADMIN_ACTIVITY_COLUMNS = ("admin_id", "action_type", "description", "ip_address", "created_at")
+
+# Synthetic accounts cannot log in: verify_password() rejects this value.
+DISABLED_PASSWORD = "!synthetic"
+
+# -----------------------------
+# Value pools
+# -----------------------------
+FIRST_NAMES_MALE = [
+    "Juan", "Jose", "Mark", "John Paul", "Rodel", "Jericho", "Carlo", "Ramon", "Angelo", "Christian",
+    "Jayson", "Michael", "Ronaldo", "Rogelio", "Danilo", "Ernesto", "Romeo", "Eduardo", "Francis",
+    "Joshua", "Kenneth", "Arnel", "Noel", "Reynaldo", "Rafael", "Emmanuel", "Benjie", "Marvin",
+]
+FIRST_NAMES_FEMALE = [
+    "Maria", "Ana", "Angelica", "Kristine", "Rowena", "Mary Grace", "Liza", "Teresa", "Jocelyn",
+    "Rosalie", "Marites", "Lourdes", "Cristina", "Princess", "Jasmine", "Erlinda", "Luzviminda",
+    "Shiela", "Rachelle", "Maricel", "Nenita", "Evangeline", "Divina", "Camille", "Janine", "Mylene",
+]
+LAST_NAMES = [
+    "Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Bautista", "Villanueva", "Ramos", "Aquino",
+    "Castillo", "Fernandez", "Gonzales", "Navarro", "Torres", "Cruz", "Flores", "Lopez", "Rivera",
+    "De Leon", "Del Rosario", "Mercado", "Soriano", "Manalo", "Pascual", "Salazar", "Tolentino",
+    "Domingo", "Valdez", "Aguilar", "Dizon", "Santiago", "Panganiban", "Macaraeg", "Lacson",
+]
+STREETS = [
+    "Rizal St.", "Mabini St.", "Bonifacio Ave.", "Luna St.", "Del Pilar St.", "Quezon Blvd.",
+    "Burgos St.", "Jacinto St.", "Aguinaldo Hwy.", "Sampaguita St.", "Narra St.", "Acacia St.",
+]
+PUROKS = 7
+SITIOS = ["Centro", "Ilaya", "Ibaba", "Looban", "Riverside", "Mangga", "Bagong Silang"]
+GENDERS = ["Male", "Female"]
+CIVIL_STATUSES = ["Single", "Married", "Widowed", "Divorced", "Separated"]
+EMPLOYMENT_STATUSES = ["Employed", "Unemployed", "Self-employed", "Student", "Retired", "Others"]
+EDUCATION_LEVELS = [
+    "No formal education", "Elementary", "High School", "College", "Vocational", "Postgraduate",
+]
+
+# Young-skewed 5-year age bands, roughly the shape of the PSA population pyramid.
+AGE_BANDS = [(0, 4), (5, 9), (10, 14), (15, 19), (20, 24), (25, 29), (30, 34), (35, 39), (40, 44),
+             (45, 49), (50, 54), (55, 59), (60, 64), (65, 69), (70, 74), (75, 79), (80, 95)]
+AGE_BAND_WEIGHTS = [10, 10, 10, 10, 9, 9, 8, 7, 6, 6, 5, 4, 3, 2, 1.5, 1, 0.8]
+
+DOCUMENT_TYPES = [
+    "Barangay Clearance", "Certificate of Residency", "Barangay ID", "Indigency Certificate", "Permit",
+]
+PURPOSES = ["Employment", "Scholarship", "Medical Assistance", "Travel", "Business", "Bank requirement"]
+REQUEST_STATUSES = ["Completed", "Pending", "In Progress", "Rejected"]
+REQUEST_STATUS_WEIGHTS = [55, 20, 15, 10]
+STAFF_ACTIONS = [
+    "LOGIN", "ADD_RESIDENT", "EDIT_RESIDENT", "DELETE_RESIDENT", "ADD_REQUEST",
+    "EDIT_REQUEST", "VIEW_REQUEST", "DELETE_REQUEST", "COMPLETE_REQUEST",
+]
+STAFF_ACTION_WEIGHTS = [20, 15, 8, 1, 20, 6, 18, 2, 10]
+ADMIN_ACTIONS = [
+    "LOGIN", "APPROVE_REQUEST", "REJECT_REQUEST", "REOPEN_REQUEST", "EDIT_RESIDENT",
+    "DELETE_RESIDENT", "EXPORT_REQUESTS", "EXPORT_PDF", "ADD_STAFF",
+]
+ADMIN_ACTION_WEIGHTS = [25, 30, 8, 3, 10, 2, 10, 10, 2]
+
+
+def dataset_counts(rows):
+    """Row counts per table for a dataset whose main tables hold ``rows`` rows."""
+    return {
+        "admins": max(2, rows // 20_000),
+        "staff": max(5, rows // 2_000),
+        "residents": rows,
+        "requests": rows,
+        "staff_activity": rows,
+        "admin_activity": max(100, rows // 10),
+    }
+
+
+def default_anchor():
+    """Midnight tonight, so 'today' queries always see the newest generated rows."""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today + timedelta(days=1)
+
+
+def _random_timestamp(rng, anchor, history_days):
+    """A timestamp within ``history_days`` before the anchor (second resolution)."""
+    return anchor - timedelta(seconds=rng.randrange(1, history_days * 86_400))
+
+
+# -----------------------------
+# Generators
+# -----------------------------
+def generate_admins(rng, count, anchor, password_hash=DISABLED_PASSWORD, first_id=1):
+    for i in range(first_id, first_id + count):
+        yield (f"admin_{i:04d}", password_hash, f"admin_{i:04d}@example.com", "Admin",
+               _random_timestamp(rng, anchor, 5 * 365))
+
+
+def generate_staff(rng, count, anchor, password_hash=DISABLED_PASSWORD, first_id=1):
+    for i in range(first_id, first_id + count):
+        status = "active" if rng.random() < 0.9 else "inactive"
+        yield (f"staff_{i:05d}", password_hash, f"staff_{i:05d}@example.com", "Staff", status,
+               _random_timestamp(rng, anchor, 5 * 365))
+
+
+def _civil_status(rng, age):
+    if age < 18:
+        return "Single"
+    if age < 25:
+        return rng.choices(CIVIL_STATUSES, [75, 23, 0, 0, 2])[0]
+    if age < 60:
+        return rng.choices(CIVIL_STATUSES, [25, 65, 3, 2, 5])[0]
+    return rng.choices(CIVIL_STATUSES, [8, 60, 27, 1, 4])[0]
+
+
+def _employment_status(rng, age):
+    if age < 15:
+        return "Student" if age >= 5 else "Others"
+    if age < 22:
+        return rng.choices(EMPLOYMENT_STATUSES, [15, 10, 5, 68, 0, 2])[0]
+    if age < 60:
+        return rng.choices(EMPLOYMENT_STATUSES, [50, 15, 25, 2, 1, 7])[0]
+    return rng.choices(EMPLOYMENT_STATUSES, [8, 5, 12, 0, 70, 5])[0]
+
+
+def _education_level(rng, age):
+    if age < 6:
+        return "No formal education"
+    if age < 12:
+        return "Elementary"
+    if age < 17:
+        return rng.choices(EDUCATION_LEVELS[:3], [2, 30, 68])[0]
+    return rng.choices(EDUCATION_LEVELS, [3, 17, 38, 28, 11, 3])[0]
+
+
+def generate_residents(rng, count, staff_count, anchor, history_days=3 * 365):
+    for _ in range(count):
+        gender = rng.choice(GENDERS)
+        first_names = FIRST_NAMES_MALE if gender == "Male" else FIRST_NAMES_FEMALE
+        middle_initial = rng.choice(LAST_NAMES)[0]
+        name = f"{rng.choice(first_names)} {middle_initial}. {rng.choice(LAST_NAMES)}"
+        low, high = rng.choices(AGE_BANDS, AGE_BAND_WEIGHTS)[0]
+        age = rng.randint(low, high)
+        birth_date = years_before(anchor.date(), age) - timedelta(days=rng.randint(1, 364))
+        address = (f"{rng.randint(1, 999)} {rng.choice(STREETS)}, "
+                   f"Purok {rng.randint(1, PUROKS)}, Sitio {rng.choice(SITIOS)}")
+        contact = f"09{rng.randrange(10 ** 9):09d}"
+        yield (
+            name, birth_date, gender, address, contact,
+            _civil_status(rng, age), _employment_status(rng, age), _education_level(rng, age),
+            rng.randint(0, age), "Active",
+            rng.randint(1, staff_count), _random_timestamp(rng, anchor, history_days),
+        )
+
+
+def generate_requests(rng, count, resident_count, staff_count, anchor, history_days=3 * 365):
+    for _ in range(count):
+        requested = _random_timestamp(rng, anchor, history_days)
+        status = rng.choices(REQUEST_STATUSES, REQUEST_STATUS_WEIGHTS)[0]
+        completed = None
+        if status == "Completed":
+            completed = min(anchor, requested + timedelta(minutes=rng.randint(10, 7 * 24 * 60)))
+        yield (
+            rng.randint(1, resident_count), rng.choice(DOCUMENT_TYPES), rng.choice(PURPOSES),
+            requested, status, completed, rng.randint(1, staff_count), requested,
+        )
+
+
+def generate_staff_activity(rng, count, staff_count, anchor, history_days=3 * 365):
+    for _ in range(count):
+        action = rng.choices(STAFF_ACTIONS, STAFF_ACTION_WEIGHTS)[0]
+        staff_id = rng.randint(1, staff_count)
+        yield (
+            staff_id, "Staff", action, f"{action.replace('_', ' ').title()} by staff {staff_id}",
+            f"192.168.{rng.randint(0, 3)}.{rng.randint(2, 254)}", _random_timestamp(rng, anchor, history_days),
+        )
+
+
+def generate_admin_activity(rng, count, admin_count, anchor, history_days=3 * 365):
+    for _ in range(count):
+        action = rng.choices(ADMIN_ACTIONS, ADMIN_ACTION_WEIGHTS)[0]
+        admin_id = rng.randint(1, admin_count)
+        yield (
+            admin_id, action, f"{action.replace('_', ' ').title()} by admin {admin_id}",
+            f"192.168.10.{rng.randint(2, 254)}", _random_timestamp(rng, anchor, history_days),
+        )
+
+
+# -----------------------------
+# Chunked datasets
+# -----------------------------
+# Tables are generated in fixed-size chunks, each with its own Random derived from
+# (seed, table, chunk). A chunk's rows depend only on those three values, so chunks can
+# be generated by parallel workers in any order and still match a sequential run.
+CHUNK_ROWS = 50_000
+
+TABLE_COLUMNS = {
+    "admins": ADMIN_COLUMNS,
+    "staff": STAFF_COLUMNS,
+    "residents": RESIDENT_COLUMNS,
+    "requests": REQUEST_COLUMNS,
+    "staff_activity": STAFF_ACTIVITY_COLUMNS,
+    "admin_activity": ADMIN_ACTIVITY_COLUMNS,
+}
+TABLE_ORDER = list(TABLE_COLUMNS)  # parents first
+
+
+def table_chunks(counts, tables=TABLE_ORDER):
+    """Yield ``(table, chunk_index, first_id, row_count)`` covering ``tables``."""
+    for table in tables:
+        total = counts[table]
+        for chunk, start in enumerate(range(0, total, CHUNK_ROWS)):
+            yield table, chunk, start + 1, min(CHUNK_ROWS, total - start)
+
+
+def generate_chunk(table, chunk, row_count, counts, seed, anchor, history_days=3 * 365,
+                   password_hash=DISABLED_PASSWORD):
+    """Rows for one chunk of ``table``; the chunk's first id is ``chunk * CHUNK_ROWS + 1``."""
+    rng = random.Random(f"{seed}:{table}:{chunk}")
+    first_id = chunk * CHUNK_ROWS + 1
+    if table == "admins":
+        return generate_admins(rng, row_count, anchor, password_hash, first_id)
+    if table == "staff":
+        return generate_staff(rng, row_count, anchor, password_hash, first_id)
+    if table == "residents":
+        return generate_residents(rng, row_count, counts["staff"], anchor, history_days)
+    if table == "requests":
+        return generate_requests(rng, row_count, counts["residents"], counts["staff"], anchor, history_days)
+    if table == "staff_activity":
+        return generate_staff_activity(rng, row_count, counts["staff"], anchor, history_days)
+    if table == "admin_activity":
+        return generate_admin_activity(rng, row_count, counts["admins"], anchor, history_days)
+    raise ValueError(f"Unknown table: {table}")
+
+
+def generate_dataset(rows, seed=42, anchor=None, history_days=3 * 365, counts=None):
+    """
+    Yield ``(table, columns, row_iterator)`` for a full dataset, parents first.
+
+    Equivalent to generating every chunk from ``table_chunks`` in order.
+    """
+    anchor = anchor or default_anchor()
+    counts = counts or dataset_counts(rows)
+    for table in TABLE_ORDER:
+        yield table, TABLE_COLUMNS[table], chain.from_iterable(
+            generate_chunk(table, chunk, row_count, counts, seed, anchor, history_days)
+            for _, chunk, _, row_count in table_chunks(counts, [table])
+        )
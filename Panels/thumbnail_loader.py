@@ -0,0 +1,160 @@
+# Panels/thumbnail_loader.py
+"""
+Resident photo thumbnails in the GUI.
+
+One ThumbnailLoader per process (get_thumbnail_loader()) owns a worker thread that
+does all the Pillow and disk work from Panels/photos.py: rendering the thumbnail sizes
+of a freshly uploaded photo, and fetching cache misses from resident_photos. Results
+come back to the GUI thread through the ``loaded`` signal.
+
+TableThumbnails puts them on a resident table: fill_row() stores the row's photo_hash
+on the Name item (PHOTO_ROLE) and the thumbnail is requested only for rows in view,
+again whenever the table scrolls or is resized. A table of 5,000 residents loads the
+dozen thumbnails on screen, not 5,000 photos.
+"""
+import queue
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QEvent, QObject, QSize, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QIcon, QPixmap
+
+from Panels import photos
+
+# Item data role holding a row's photo_hash
+PHOTO_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# Visible rows are looked up once scrolling pauses this long
+SCROLL_DEBOUNCE_MS = 60
+# Decoded thumbnails a table keeps for rows scrolled back into view
+MAX_PIXMAPS = 500
+
+
+class ThumbnailLoader(QObject):
+    loaded = pyqtSignal(str, int, str)  # photo_hash, size, path ("" when there is no photo)
+
+    def __init__(self):
+        super().__init__()
+        self._jobs = queue.Queue()
+        self._pending = set()  # (photo_hash, size) queued and not answered yet
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def request(self, photo_hash, size):
+        """Ask for a thumbnail; ``loaded`` fires with its path, at once on a cache hit."""
+        path = photos.cached_thumbnail(photo_hash, size)
+        if path:
+            self.loaded.emit(photo_hash, size, path)
+            return
+        with self._lock:
+            if (photo_hash, size) in self._pending:
+                return
+            self._pending.add((photo_hash, size))
+        self._submit(("fetch", photo_hash, size))
+
+    def generate(self, photo_hash, photo):
+        """Render every thumbnail size of a just-uploaded photo (JPEG bytes) ahead of its first use."""
+        self._submit(("render", photo_hash, photo))
+
+    def _submit(self, job):
+        self._jobs.put(job)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="thumbnails", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        # Worker thread: photos.py only, no widgets
+        while True:
+            kind, photo_hash, arg = self._jobs.get()
+            try:
+                if kind == "render":
+                    photos.write_thumbnails(photo_hash, arg)
+                else:
+                    path = photos.thumbnail(photo_hash, arg)
+                    with self._lock:
+                        self._pending.discard((photo_hash, arg))
+                    self.loaded.emit(photo_hash, arg, path or "")
+            except Exception as e:
+                print(f"⚠️ Thumbnail {photo_hash[:12]} failed: {e}")
+                with self._lock:
+                    self._pending.discard((photo_hash, arg))
+            if self._jobs.empty():
+                try:
+                    photos.evict()
+                except Exception as e:
+                    print(f"⚠️ Thumbnail cache eviction failed: {e}")
+
+
+_loader = None
+
+
+def get_thumbnail_loader():
+    global _loader
+    if _loader is None:
+        _loader = ThumbnailLoader()
+    return _loader
+
+
+class TableThumbnails(QObject):
+    """Lazily shows ``size`` thumbnails as the icon of ``column`` for the rows in view."""
+
+    def __init__(self, table, column=0, size=photos.LIST_SIZE):
+        super().__init__(table)
+        self.table = table
+        self.column = column
+        self.size = size
+        self._pixmaps = OrderedDict()  # photo_hash -> QPixmap, least recently used first
+        table.setIconSize(QSize(size, size))
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SCROLL_DEBOUNCE_MS)
+        self._timer.timeout.connect(self.load_visible)
+        table.verticalScrollBar().valueChanged.connect(self.refresh)
+        table.viewport().installEventFilter(self)
+        get_thumbnail_loader().loaded.connect(self.on_loaded)
+
+    def eventFilter(self, watched, event):
+        if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
+            self.refresh()
+        return False
+
+    def refresh(self):
+        """Call after filling or patching rows: icons follow once the table settles."""
+        self._timer.start()
+
+    def visible_rows(self):
+        if self.table.rowCount() == 0:
+            return range(0)
+        first = self.table.rowAt(0)
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        first = 0 if first < 0 else first
+        last = self.table.rowCount() - 1 if last < 0 else last
+        return range(first, last + 1)
+
+    def load_visible(self):
+        loader = get_thumbnail_loader()
+        for row in self.visible_rows():
+            item = self.table.item(row, self.column)
+            photo_hash = item.data(PHOTO_ROLE) if item else None
+            if not photo_hash or not item.icon().isNull():
+                continue
+            if photo_hash in self._pixmaps:
+                self._pixmaps.move_to_end(photo_hash)
+                item.setIcon(QIcon(self._pixmaps[photo_hash]))
+            else:
+                loader.request(photo_hash, self.size)
+
+    def on_loaded(self, photo_hash, size, path):
+        if size != self.size or not path:
+            return
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return
+        self._pixmaps[photo_hash] = pixmap
+        if len(self._pixmaps) > MAX_PIXMAPS:
+            self._pixmaps.popitem(last=False)
+        for row in self.visible_rows():
+            item = self.table.item(row, self.column)
+            if item and item.data(PHOTO_ROLE) == photo_hash:
+                item.setIcon(QIcon(pixmap))
@@ -0,0 +1,312 @@
+# Panels/turnaround.py
+"""
+Request turnaround: hours from request_date to completed_date.
+
+Quantiles (P50 / P90 / P99) over years of requests would mean sorting every completed
+request on each Reports refresh. Instead each completion is folded into small t-digest
+sketches (Migrations/012_turnaround_sketches.sql), one per month for:
+
+    ("all", "")                      every request
+    ("document_type", <type>)        per document type
+    ("staff", <requests.created_by>) per staff member handling the request
+
+A t-digest keeps about a hundred weighted centroids, the small ones at the tails, so
+P99 stays accurate, and two digests merge into one. Each workstation updates its own
+sketch rows (record_turnaround(), inside the completion transaction), so desks never
+wait on each other; turnaround_quantiles() merges the rows of the months asked for.
+
+requests.turnaround_hours is set once, at the first completion, and only then is the
+request added to the sketches: reopening and completing again does not count twice.
+rebuild_sketches() recomputes every sketch from that column. It locks
+turnaround_sketches before reading requests, so a completion at another desk waits for
+it instead of being counted by neither the old rows nor the rebuilt ones; run it while
+the desks are quiet (e.g. from cron after hours).
+
+    python -m Panels.cli turnaround show --by document_type
+    python -m Panels.cli turnaround rebuild
+
+No Qt imports here.
+"""
+import math
+import socket
+import struct
+from datetime import datetime
+
+from pymysql.cursors import SSCursor
+
+from Panels.db import DEFAULT_DATABASE, get_connection
+
+COMPRESSION = 200  # about 120 centroids, 2 KB a sketch; P99 within ~1%
+QUANTILES = (0.5, 0.9, 0.99)
+REPORT_MONTHS = 12
+WORKSTATION = socket.gethostname()[:64]
+REBUILD_WORKSTATION = "rebuild"
+
+DIMENSIONS = ("all", "document_type", "staff")
+
+
+# -----------------------------
+# t-digest
+# -----------------------------
+class TDigest:
+    """Merging t-digest (Dunning & Ertl) with the arcsine scale function."""
+
+    _HEADER = struct.Struct("<BddI")  # format, min, max, centroids
+    _FORMAT = 1
+
+    def __init__(self, compression=COMPRESSION):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+
+    def add(self, value, weight=1.0):
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other):
+        other._compress()
+        self._buffer.extend(zip(other.means, other.weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+        return self
+
+    def _k(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q(self, k):
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+        total = self.count
+        means, weights = [], []
+        mean, weight = points[0]
+        before = 0.0  # weight of the centroids already emitted
+        limit = self._q(self._k(0) + 1) * total
+        for value, w in points[1:]:
+            if before + weight + w <= limit:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                limit = self._q(self._k(min(before / total, 1.0)) + 1) * total
+                mean, weight = value, w
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q):
+        """The value at quantile ``q`` (0..1), None for an empty digest."""
+        self._compress()
+        if not self.means:
+            return None
+        if len(self.means) == 1:
+            return self.means[0]
+        target = q * self.count
+        first, last = self.weights[0], self.weights[-1]
+        if target <= first / 2:
+            return self.min + (self.means[0] - self.min) * target / (first / 2)
+        if target >= self.count - last / 2:
+            return self.max - (self.max - self.means[-1]) * (self.count - target) / (last / 2)
+        before = 0.0
+        for i in range(len(self.means) - 1):
+            here = before + self.weights[i] / 2
+            there = before + self.weights[i] + self.weights[i + 1] / 2
+            if target <= there:
+                return self.means[i] + (self.means[i + 1] - self.means[i]) * (target - here) / (there - here)
+            before += self.weights[i]
+        return self.max
+
+    def to_bytes(self):
+        self._compress()
+        pairs = [x for pair in zip(self.means, self.weights) for x in pair]
+        return (self._HEADER.pack(self._FORMAT, self.min, self.max, len(self.means))
+                + struct.pack(f"<{len(pairs)}d", *pairs))
+
+    @classmethod
+    def from_bytes(cls, data, compression=COMPRESSION):
+        digest = cls(compression)
+        _, digest.min, digest.max, n = cls._HEADER.unpack_from(data)
+        pairs = struct.unpack_from(f"<{2 * n}d", data, cls._HEADER.size)
+        digest.means, digest.weights = list(pairs[0::2]), list(pairs[1::2])
+        digest.count = sum(digest.weights)
+        return digest
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+def sketch_keys(document_type, staff_id):
+    keys = [("all", ""), ("document_type", document_type)]
+    if staff_id is not None:
+        keys.append(("staff", str(staff_id)))
+    return keys
+
+
+def record_turnaround(cursor, request_id):
+    """
+    Fold a just-completed request into this desk's sketches, in the caller's transaction
+    (call it after setting status = 'Completed', before commit). Returns its turnaround in
+    hours, or None when it was already counted or has no dates.
+    """
+    cursor.execute("""
+        UPDATE requests
+        SET turnaround_hours = GREATEST(TIMESTAMPDIFF(SECOND, request_date, completed_date), 0) / 3600
+        WHERE id = %s AND turnaround_hours IS NULL
+          AND request_date IS NOT NULL AND completed_date IS NOT NULL
+    """, (request_id,))
+    if cursor.rowcount != 1:
+        return None
+    cursor.execute("""
+        SELECT document_type, created_by, turnaround_hours, DATE_FORMAT(completed_date, '%%Y-%%m') AS month
+        FROM requests WHERE id = %s
+    """, (request_id,))
+    row = cursor.fetchone()
+    hours = float(row["turnaround_hours"])
+    keys = sketch_keys(row["document_type"], row["created_by"])
+
+    cursor.execute(f"""
+        SELECT dimension, sketch_key, digest FROM turnaround_sketches
+        WHERE month = %s AND workstation = %s
+          AND ({" OR ".join(["(dimension = %s AND sketch_key = %s)"] * len(keys))})
+        FOR UPDATE
+    """, (row["month"], WORKSTATION, *[part for key in keys for part in key]))
+    stored = {(r["dimension"], r["sketch_key"]): TDigest.from_bytes(r["digest"]) for r in cursor.fetchall()}
+
+    updates = []
+    for key in keys:
+        digest = stored.get(key) or TDigest()
+        digest.add(hours)
+        updates.append((*key, row["month"], WORKSTATION, int(digest.count), digest.to_bytes()))
+    _upsert(cursor, updates)
+    return hours
+
+
+def _upsert(cursor, rows):
+    cursor.executemany("""
+        INSERT INTO turnaround_sketches (dimension, sketch_key, month, workstation, samples, digest)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE samples = VALUES(samples), digest = VALUES(digest), updated_at = NOW()
+    """, rows)
+
+
+def rebuild_sketches(database=DEFAULT_DATABASE, batch_rows=5_000):
+    """
+    Fill in turnaround_hours for completed requests that lack it and rebuild every sketch
+    from the column; returns how many requests the sketches now cover.
+
+    Every sketch row (and, under InnoDB's default REPEATABLE READ, the gaps between them)
+    is locked FOR UPDATE before requests is read. record_turnaround() takes the same
+    locks inside a completion, so a completion either committed before the read (and is
+    counted) or waits until the rebuilt rows are committed and adds itself to them.
+    Completions wait for the whole rebuild, so run it outside office hours.
+    """
+    reader = get_connection(database)
+    writer = get_connection(database)
+    cursor = reader.cursor(SSCursor)
+    write = writer.cursor()
+    digests = {}
+    covered = 0
+    try:
+        write.execute("""
+            UPDATE requests
+            SET turnaround_hours = GREATEST(TIMESTAMPDIFF(SECOND, request_date, completed_date), 0) / 3600
+            WHERE turnaround_hours IS NULL AND status = 'Completed'
+              AND request_date IS NOT NULL AND completed_date IS NOT NULL
+        """)
+        writer.commit()
+
+        # Lock the sketches first; the reader's snapshot starts after, at its first SELECT
+        write.execute("SELECT dimension, sketch_key, month, workstation FROM turnaround_sketches FOR UPDATE")
+        cursor.execute("""
+            SELECT document_type, created_by, DATE_FORMAT(completed_date, '%Y-%m'), turnaround_hours
+            FROM requests
+            WHERE turnaround_hours IS NOT NULL AND completed_date IS NOT NULL
+        """)
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            for document_type, staff_id, month, hours in rows:
+                for key in sketch_keys(document_type, staff_id):
+                    digests.setdefault((*key, month), TDigest()).add(float(hours))
+            covered += len(rows)
+
+        write.execute("DELETE FROM turnaround_sketches")
+        rows = [(*key, REBUILD_WORKSTATION, int(d.count), d.to_bytes()) for key, d in digests.items()]
+        for start in range(0, len(rows), batch_rows):
+            _upsert(write, rows[start:start + batch_rows])
+        writer.commit()
+    finally:
+        cursor.close()
+        reader.close()
+        write.close()
+        writer.close()
+    return covered
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def first_month(months, today=None):
+    """'YYYY-MM' of the oldest month in a window of ``months`` ending with this one."""
+    today = today or datetime.now()
+    index = today.year * 12 + today.month - 1 - (months - 1)
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def merged_sketches(cursor, dimension, months=REPORT_MONTHS):
+    """``{sketch_key: TDigest}`` for ``dimension``, merged over desks and the last ``months`` months."""
+    cursor.execute("""
+        SELECT sketch_key, digest FROM turnaround_sketches
+        WHERE dimension = %s AND month >= %s
+    """, (dimension, first_month(months)))
+    merged = {}
+    for row in cursor.fetchall():
+        digest = TDigest.from_bytes(row["digest"])
+        if row["sketch_key"] in merged:
+            merged[row["sketch_key"]].merge(digest)
+        else:
+            merged[row["sketch_key"]] = digest
+    return merged
+
+
+def turnaround_quantiles(cursor, dimension, months=REPORT_MONTHS, quantiles=QUANTILES):
+    """``[(key, requests, [hours at each quantile])]``, most requests first."""
+    merged = merged_sketches(cursor, dimension, months)
+    rows = [(key, int(round(d.count)), [d.quantile(q) for q in quantiles]) for key, d in merged.items()]
+    return sorted(rows, key=lambda r: -r[1])
+
+
+def turnaround_summary(cursor, months=REPORT_MONTHS):
+    """Turnaround figures for report_summary(): overall, per document type and per staff username."""
+    overall = turnaround_quantiles(cursor, "all", months)
+    by_type = turnaround_quantiles(cursor, "document_type", months)
+    by_staff = turnaround_quantiles(cursor, "staff", months)
+    if by_staff:
+        ids = [int(key) for key, _, _ in by_staff]
+        cursor.execute(f"SELECT id, username FROM staff WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+        names = {str(r["id"]): r["username"] for r in cursor.fetchall()}
+        by_staff = [(names.get(key, f"Staff #{key}"), total, hours) for key, total, hours in by_staff]
+    return {
+        "months": months,
+        "overall": overall[0][1:] if overall else (0, [None] * len(QUANTILES)),
+        "by_type": by_type,
+        "by_staff": by_staff,
+    }
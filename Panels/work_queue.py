@@ -0,0 +1,139 @@
+# Panels/work_queue.py
+"""
+Work queue over Pending requests (StaffRequests' "Next Request" button).
+
+claim_next() hands a desk the oldest Pending request nobody holds. It selects with
+FOR UPDATE SKIP LOCKED (MariaDB 10.6+), so a row another desk is claiming at that moment
+is skipped instead of waited on: N desks drain the backlog in parallel, never block each
+other and never get the same request. A claim is a lease (claimed_by / claimed_until,
+Migrations/004_request_work_queue.sql); if a desk closes or walks away, the request goes
+back in the queue when the lease runs out.
+"""
+import os
+import time
+
+from Panels.change_feed import record_change
+from Panels.db import get_connection
+from Panels.serials import assign_control_number
+from Panels.turnaround import record_turnaround
+
+LEASE_MINUTES = int(os.environ.get("BRMS_CLAIM_LEASE_MINUTES", "15"))
+
+UNCLAIMED_PENDING = "r.status = 'Pending' AND (r.claimed_until IS NULL OR r.claimed_until < NOW())"
+
+
+def claim_next(staff_id, lease_minutes=LEASE_MINUTES):
+    """Claim the oldest unclaimed Pending request for ``staff_id``; None when the queue is empty."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        conn.begin()
+        cursor.execute(f"""
+            SELECT r.id
+            FROM requests r
+            WHERE {UNCLAIMED_PENDING}
+            ORDER BY r.request_date, r.id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        """)
+        row = cursor.fetchone()
+        if row is None:
+            conn.rollback()
+            return None
+
+        cursor.execute(
+            "UPDATE requests SET claimed_by=%s, claimed_until=NOW() + INTERVAL %s MINUTE WHERE id=%s",
+            (staff_id, lease_minutes, row["id"])
+        )
+        record_change(cursor, "request", row["id"], "update")
+        conn.commit()
+
+        cursor.execute("""
+            SELECT r.id, res.name AS resident, r.document_type, r.purpose,
+                   r.request_date, r.status, r.claimed_until
+            FROM requests r
+            JOIN residents res ON r.resident_id = res.id
+            WHERE r.id = %s
+        """, (row["id"],))
+        return cursor.fetchone()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _finish_claim(request_id, staff_id, completed):
+    set_clause = "claimed_by=NULL, claimed_until=NULL"
+    if completed:
+        set_clause += ", status='Completed', completed_date=IFNULL(completed_date, NOW()), version=version+1"
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        # Only while this desk's lease is live and the request is still Pending: an expired
+        # lease may already belong to another desk, and an admin may have rejected or
+        # completed the request meanwhile
+        cursor.execute(f"""
+            UPDATE requests SET {set_clause}
+            WHERE id=%s AND claimed_by=%s AND status='Pending' AND claimed_until >= NOW()
+        """, (request_id, staff_id))
+        held = cursor.rowcount == 1
+        if held:
+            if completed:
+                assign_control_number(cursor, request_id)
+                record_turnaround(cursor, request_id)
+            record_change(cursor, "request", request_id, "update")
+        conn.commit()
+        return held
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def complete_claim(request_id, staff_id):
+    """Mark a claimed request Completed. False if the claim was lost (lease expired, taken or no longer Pending)."""
+    return _finish_claim(request_id, staff_id, completed=True)
+
+
+def release_claim(request_id, staff_id):
+    """Put a claimed request back in the queue. False if the claim was already gone (as in complete_claim)."""
+    return _finish_claim(request_id, staff_id, completed=False)
+
+
+def queue_depth():
+    """``{"waiting": unclaimed Pending requests, "claimed": live leases}``"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT SUM({UNCLAIMED_PENDING}) AS waiting,
+               SUM(r.claimed_until >= NOW()) AS claimed
+        FROM requests r
+        WHERE r.status = 'Pending'
+    """)
+    row = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return {"waiting": int(row["waiting"] or 0), "claimed": int(row["claimed"] or 0)}
+
+
+class DeskStats:
+    """Throughput of this desk's work-queue session."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.claimed = 0
+        self.completed = 0
+        self.released = 0
+        self.empty = 0        # "Next Request" found nothing to claim
+        self.claim_ms = 0.0   # total time spent in claim_next()
+
+    def per_hour(self):
+        hours = (time.monotonic() - self.started) / 3600
+        return self.completed / hours if hours > 0 else 0.0
+
+    def summary(self):
+        avg_claim = self.claim_ms / self.claimed if self.claimed else 0.0
+        return (f"this desk: {self.completed} completed ({self.per_hour():.1f}/h), "
+                f"{self.released} released, avg claim {avg_claim:.0f} ms")